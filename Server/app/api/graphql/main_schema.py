@@ -3,21 +3,22 @@ import strawberry
 
 from app.utils.exceptions_base import AppException
 from app.utils.mappers import (
+    map_graphql_to_pydantic_aggregate_query,
     map_graphql_to_pydantic_metadata_query,
     map_graphql_to_pydantic_sensor_data_query
 )
 from app.models.schemas.graphQL.types import (
-    PaginatedSensorMetadata, Sensor, SensorData, PaginatedSensorData
+    FieldAggregate, PaginatedSensorMetadata, Sensor, SensorAggregateBucket, SensorData, PaginatedSensorData
 )
 from app.models.schemas.graphQL.inputs import (
-    SensorDataQueryInput, SensorMetadataQueryInput
+    SensorAggregateInput, SensorDataQueryInput, SensorMetadataQueryInput
 )
 from loguru import logger
 from app.utils.config import settings
 from app.middleware.rate_limit_middleware import limiter
 
 # Import domain logic
-from app.domain.sensor_data_logic import query_sensor_data_advanced
+from app.domain.sensor_data_logic import aggregate_sensor_data, query_sensor_data_advanced
 from app.domain.sensor_logic import (
     query_sensor_metadata_advanced
 )
@@ -41,7 +42,7 @@ class QuerySensorData:
         - location/model/is_active: Metadata filters
         - timestamp_filter: Exact or range-based time query
         - range_filters: Per-field [min, max] numeric filters
-        - Pagination: page and page_size
+        - Pagination: page and page_size, or keyset via cursor/use_cursor
 
         Flow:
         - Rate limit the request using GRAPHQL_DATA_QUERY_LIMIT
@@ -61,8 +62,11 @@ class QuerySensorData:
             return PaginatedSensorData(
                 items=items,
                 total=resp.total,
+                total_policy=resp.total_policy.value,
+                has_more=resp.has_more,
                 page=resp.page,
                 page_size=resp.page_size,
+                next_cursor=resp.next_cursor,
             )
         except Exception as e:
             logger.exception("[GraphQL] sensor_data failed | %s", e)
@@ -70,6 +74,35 @@ class QuerySensorData:
                 "Sensor data query failed", domain="sensor"
             )
 
+    @strawberry.field(name="sensorDataAggregate")
+    async def sensor_data_aggregate(
+        self, filters: SensorAggregateInput, info
+    ) -> list[SensorAggregateBucket]:
+        """
+        Resolve sensorDataAggregate GraphQL query.
+
+        Returns count/min/max/avg/p95 per time bucket for the requested fields,
+        computed in the database. Shares the GRAPHQL_DATA_QUERY_LIMIT rate limit.
+        """
+        try:
+            logger.info("[GraphQL] sensor_data_aggregate | %s", filters)
+            pyd_query = map_graphql_to_pydantic_aggregate_query(filters)
+            buckets = await aggregate_sensor_data(pyd_query)
+            return [
+                SensorAggregateBucket(
+                    bucket_start=b.bucket_start,
+                    device_id=b.device_id,
+                    count=b.count,
+                    aggregates=[FieldAggregate(**a.model_dump()) for a in b.aggregates],
+                )
+                for b in buckets
+            ]
+        except Exception as e:
+            logger.exception("[GraphQL] sensor_data_aggregate failed | %s", e)
+            raise AppException.from_internal_error(
+                "Sensor data aggregation failed", domain="sensor"
+            )
+
 
 # ------------------------------------------------------------------ metadata
 @strawberry.type
@@ -107,6 +140,8 @@ class QuerySensorMeta:
             return PaginatedSensorMetadata(
                 items=items,
                 total=resp.total,
+                total_policy=resp.total_policy.value,
+                has_more=resp.has_more,
                 page=resp.page,
                 page_size=resp.page_size,
             )
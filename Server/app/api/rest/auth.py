@@ -185,6 +185,9 @@ Allows an admin to create multiple user accounts in a single request.
 Each user will be initialized with a default password (from environment settings).
 No email notifications are sent. This endpoint is rate-limited.
 
+The response reports every input row as `created`, `exists` (email already
+registered), `duplicate` (email repeated in the request) or `failed`.
+
 Authentication:
 - Requires a valid JWT token with `admin` role.
 - Enforced via `request.state.user.role`
@@ -318,6 +321,7 @@ async def generate_api_key(request: Request, body: APIKeyRequest):
         APIKeyAuthProcessor.add(APIKeyConfig(
             user_id=user.id,
             key=key_obj.hashed_key,
+            key_id=key_obj.key_id,
             role=user.role
         ))  # type: ignore
 
@@ -364,7 +368,7 @@ async def delete_api_key(request: Request, payload: APIKeyDeleteRequest):
 
     try:
         deleted_key = await delete_api_key_for_user(user.id, payload.label)
-        APIKeyAuthProcessor.remove(deleted_key)
+        await APIKeyAuthProcessor.remove(deleted_key)
 
         logger.info("[AUTH] Deleted API key | user=%s | label=%s", user.id, payload.label)
 
@@ -1,8 +1,12 @@
 from typing import List
 from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
 from loguru import logger
 from app.utils.exceptions_base import AppException
+from app.constants.export import EXPORT_MEDIA_TYPES
+from app.domain.sensor_data_export import export_sensor_data
 from app.domain.sensor_data_logic import (
+    aggregate_sensor_data,
     create_sensor_data_entry,
     get_all_data_by_sensor,
     get_latest_entries_for_sensors,
@@ -10,6 +14,9 @@ from app.domain.sensor_data_logic import (
     query_sensor_data_by_timestamps,
 )
 from app.models.schemas.rest.sensor_data_schemas import (
+    SensorAggregateBucket,
+    SensorAggregateQuery,
+    SensorDataExportQuery,
     SensorDataIn,
     SensorDataPartialOut,
     SensorListInput,
@@ -62,6 +69,7 @@ async def get_latest_sensor_data(request: Request, payload: SensorListInput):
     description=f"""
 Returns paginated sensor readings filtered by numeric [min, max] bounds for any field,
 Use `null` to represent infinity (i.e., no bound).
+Send `use_cursor: true` (first page) or the returned `next_cursor` as `cursor` for keyset paging.
 Authentication is required via API Key.
 Rate limited: {settings.SENSOR_QUERY_RATE_LIMIT}
 """
@@ -70,7 +78,7 @@ Rate limited: {settings.SENSOR_QUERY_RATE_LIMIT}
 async def get_sensor_data_by_ranges(request: Request, payload: SensorRangeQuery):
     try:
         result = await query_sensor_data_by_ranges(payload)
-        logger.info("[SENSOR] Range query | total=%d | page=%d", result.total, result.page)
+        logger.info("[SENSOR] Range query | total=%s | page=%d", result.total, result.page)
         return result
     except AppException as ae:
         logger.warning("[SENSOR] %s | payload=%s", ae.message, payload)
@@ -88,6 +96,7 @@ async def get_sensor_data_by_ranges(request: Request, payload: SensorRangeQuery)
     description=f"""
 Returns paginated sensor readings that match either exact list of timestamps
 or fall within the inclusive time range if exact is false. Must give only two timestamps.
+Send `use_cursor: true` (first page) or the returned `next_cursor` as `cursor` for keyset paging.
 Authentication is required via API Key.
 Rate limited: {settings.SENSOR_QUERY_RATE_LIMIT}
 """
@@ -96,7 +105,7 @@ Rate limited: {settings.SENSOR_QUERY_RATE_LIMIT}
 async def get_sensor_data_by_timestamps(request: Request, payload: SensorTimestampQuery):
     try:
         result = await query_sensor_data_by_timestamps(payload)
-        logger.info("[SENSOR] Timestamp query | total=%d | page=%d", result.total, result.page)
+        logger.info("[SENSOR] Timestamp query | total=%s | page=%d", result.total, result.page)
         return result
     except AppException as ae:
         logger.warning("[SENSOR] %s | payload=%s", ae.message, payload)
@@ -113,6 +122,7 @@ async def get_sensor_data_by_timestamps(request: Request, payload: SensorTimesta
     summary="Query sensor data by sensor UUID",
     description=f"""
 Returns all readings from a specific sensor, paginated by timestamp.
+Send `use_cursor: true` (first page) or the returned `next_cursor` as `cursor` for keyset paging.
 Authentication is required via API Key.
 Rate limited: {settings.SENSOR_QUERY_RATE_LIMIT}
 """
@@ -121,7 +131,7 @@ Rate limited: {settings.SENSOR_QUERY_RATE_LIMIT}
 async def get_data_by_sensor(request: Request, payload: SensorQuery):
     try:
         result = await get_all_data_by_sensor(payload)
-        logger.info("[SENSOR] Sensor data fetch | sensor_id=%s | total=%d", payload.sensor_id, result.total)
+        logger.info("[SENSOR] Sensor data fetch | sensor_id=%s | total=%s", payload.sensor_id, result.total)
         return result
     except AppException as ae:
         logger.warning("[SENSOR] %s | payload=%s", ae.message, payload)
@@ -129,3 +139,60 @@ async def get_data_by_sensor(request: Request, payload: SensorQuery):
     except Exception as e:
         logger.exception("[SENSOR] Unexpected error during sensor fetch | payload=%s", payload)
         raise AppException.from_internal_error("Failed to fetch sensor data", domain="sensor")
+
+
+
+# ──────────────── Aggregation ───────────────────────── #
+
+@router.post(
+    "/aggregate",
+    response_model=List[SensorAggregateBucket],
+    response_model_exclude_none=True,
+    tags=["Sensor Data"],
+    summary="Aggregate sensor data into time buckets",
+    description=f"""
+Returns count/min/max/avg/p95 per time bucket for the requested fields, computed in the database.
+Filter by `sensor_ids` and/or `locations`; set `group_by_sensor` for one series per sensor.
+Set `include_p95: false` to let bucket-aligned ranges be served from the 1m/1h/1d rollup tables.
+Authentication is required via API Key.
+Rate limited: {settings.SENSOR_QUERY_RATE_LIMIT}
+"""
+)
+@limiter.limit(settings.SENSOR_QUERY_RATE_LIMIT)
+async def get_sensor_data_aggregates(request: Request, payload: SensorAggregateQuery):
+    try:
+        result = await aggregate_sensor_data(payload)
+        logger.info("[SENSOR] Aggregation | buckets=%d", len(result))
+        return result
+    except AppException as ae:
+        logger.warning("[SENSOR] %s | payload=%s", ae.message, payload)
+        raise ae
+    except Exception as e:
+        logger.exception("[SENSOR] Aggregation failed | payload=%s", payload)
+        raise AppException.from_internal_error("Failed to aggregate sensor data", domain="sensor")
+
+
+# ──────────────── Export ────────────────────────────── #
+
+@router.post(
+    "/export",
+    response_class=StreamingResponse,
+    tags=["Sensor Data"],
+    summary="Stream a bulk export of sensor data",
+    description=f"""
+Streams every reading matching the filters (same as the GraphQL `sensorData` query) as
+NDJSON (`format: "ndjson"`), CSV (`"csv"`), Arrow IPC stream (`"arrow"`) or Parquet (`"parquet"`),
+without pagination. `fields` restricts the exported columns; `id`, `device_id` and `timestamp`
+are always included. Set `include_archive: true` to also read archived historical readings.
+Authentication is required via API Key.
+Rate limited: {settings.SENSOR_EXPORT_RATE_LIMIT}
+"""
+)
+@limiter.limit(settings.SENSOR_EXPORT_RATE_LIMIT)
+async def export_sensor_data_stream(request: Request, payload: SensorDataExportQuery):
+    logger.info("[SENSOR] Export requested | format=%s", payload.format.value)
+    return StreamingResponse(
+        export_sensor_data(payload),
+        media_type=EXPORT_MEDIA_TYPES[payload.format],
+        headers={"Content-Disposition": f'attachment; filename="sensor_data.{payload.format.value}"'},
+    )
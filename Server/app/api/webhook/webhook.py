@@ -7,7 +7,7 @@ from app.models.schemas.webhook.webhook_schema import (
 )
 from app.domain.webhooks.webhook_logic import (
     get_user_webhooks, get_allowed_events_for_role,
-    create_webhook, delete_webhook, update_webhook
+    create_webhook, delete_webhook, update_webhook, to_webhook_read
 )
 from app.middleware.rate_limit_middleware import limiter
 from app.utils.config import settings
@@ -25,7 +25,8 @@ router = APIRouter(
     tags=["Webhooks"],
     summary="List all webhooks for the authenticated user",
     description=f"""
-Returns all webhooks created by the authenticated user.
+Returns all webhooks created by the authenticated user, with their delivery
+health (circuit state, consecutive failures, health score).
 Authentication required via JWT or API key.
 Rate limited: {settings.WEBHOOK_QUERY_RATE_LIMIT}
 """
@@ -35,7 +36,7 @@ async def get_user_webhooks_route(request: Request):
     try:
         webhooks = await get_user_webhooks(request.state.user_id)
         logger.info("[WEBHOOK] Retrieved user webhooks | user=%s | count=%d", request.state.user_id, len(webhooks))
-        return webhooks
+        return [to_webhook_read(w) for w in webhooks]
     except AppException as ae:
         logger.warning("[WEBHOOK] %s | user=%s", ae.message, request.state.user_id)
         raise ae
@@ -93,7 +94,7 @@ async def create_webhook_route(payload: WebhookCreate, request: Request):
             data=payload
         )
         logger.info("[WEBHOOK] Created webhook | user=%s | event=%s", request.state.user.id, payload.event_type)
-        return result
+        return to_webhook_read(result)
     except AppException as ae:
         logger.warning("[WEBHOOK] %s | user=%s | payload=%s", ae.message, request.state.user.id, payload)
         raise ae
@@ -119,7 +120,7 @@ async def update_webhook_route(request: Request, payload: WebhookUpdatePayload):
     try:
         result = await update_webhook(user_id=request.state.user.id, payload=payload)
         logger.info("[WEBHOOK] Updated webhook | user=%s | webhook_id=%s", request.state.user.id, payload.webhook_id)
-        return result
+        return to_webhook_read(result)
     except AppException as ae:
         logger.warning("[WEBHOOK] %s | user=%s | payload=%s", ae.message, request.state.user.id, payload)
         raise ae
@@ -0,0 +1,26 @@
+from datetime import timedelta
+
+# Supported bucket widths for time-bucketed aggregation (name → width)
+AGGREGATION_BUCKETS: dict[str, timedelta] = {
+    "1m": timedelta(minutes=1),
+    "5m": timedelta(minutes=5),
+    "15m": timedelta(minutes=15),
+    "1h": timedelta(hours=1),
+    "6h": timedelta(hours=6),
+    "1d": timedelta(days=1),
+    "7d": timedelta(days=7),
+}
+
+# Percentile reported alongside min/max/avg
+AGGREGATION_PERCENTILE = 0.95
+
+# Pre-computed rollup resolutions (name → width), coarsest first.
+# Rollup buckets are aligned like aggregation buckets (UTC, origin 2000-01-01).
+ROLLUP_RESOLUTIONS: dict[str, timedelta] = {
+    "1d": timedelta(days=1),
+    "1h": timedelta(hours=1),
+    "1m": timedelta(minutes=1),
+}
+
+# Common origin of all bucket grids
+BUCKET_ORIGIN = "2000-01-01 00:00:00+00"
@@ -0,0 +1,19 @@
+from enum import Enum
+
+
+class ExportFormat(str, Enum):
+    """
+    Output formats of the streaming sensor data export.
+    """
+    NDJSON = "ndjson"    # one JSON object per line
+    CSV = "csv"          # header row + one line per reading
+    ARROW = "arrow"      # Arrow IPC stream, one record batch per fetched batch
+    PARQUET = "parquet"  # zstd-compressed Parquet, one row group per fetched batch
+
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.ARROW: "application/vnd.apache.arrow.stream",
+    ExportFormat.PARQUET: "application/vnd.apache.parquet",
+}
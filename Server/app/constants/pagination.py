@@ -0,0 +1,11 @@
+from enum import Enum
+
+
+class CountPolicy(str, Enum):
+    """
+    How `paginate_query` computes the `total` of a paginated response.
+    """
+    EXACT = "exact"          # SELECT count(*) over the full query
+    ESTIMATED = "estimated"  # Planner row estimate from EXPLAIN
+    CACHED = "cached"        # Exact count, cached per normalized query for a TTL
+    NONE = "none"            # No count; rely on `has_more`
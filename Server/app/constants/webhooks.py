@@ -15,3 +15,21 @@ ROLE_TO_WEBHOOK_EVENTS = {
     "guest": [],
 }
 
+
+
+# Events produced by sensor data ingestion; with WEBHOOK_OUTBOX_ENABLED their
+# deliveries are written to the outbox in the insert transaction.
+OUTBOX_EVENTS = (WebhookEvent.SENSOR_DATA_RECEIVED, WebhookEvent.ALERT_TRIGGERED)
+
+
+class CircuitState(str, Enum):
+    """Delivery circuit of a webhook target (see circuit_breaker.py)."""
+    CLOSED = "closed"        # deliveries flow normally
+    OPEN = "open"            # receiver considered down; deliveries skipped or deferred
+    HALF_OPEN = "half_open"  # one probe delivery decides whether to close again
+
+
+class AlertState(str, Enum):
+    """Transition reported in an ALERT_TRIGGERED payload (`alert_state`)."""
+    TRIGGERED = "triggered"  # a reading entered the rule's range
+    CLEARED = "cleared"      # readings left the range (and its hysteresis band)
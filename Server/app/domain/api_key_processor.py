@@ -1,5 +1,9 @@
+import hashlib
+import hmac
+import secrets
 from uuid import UUID
-from typing import List
+from typing import Callable, Dict, List
+from cachetools import TTLCache
 from pydantic import SecretStr
 from loguru import logger
 
@@ -8,8 +12,10 @@ from app.infrastructure.database.repository.restAPI.api_key_repository import ge
 from app.infrastructure.database.repository.restAPI.user_repository import get_user_by_id
 from app.models.schemas.rest.auth_schemas import APIKeyConfig
 from app.utils.exceptions_base import AuthValidationError
-from app.utils.hashing import verify_value
+from app.utils.hashing import pwd_context, verify_value_async
+from app.utils.api_key_utils import parse_api_key
 from app.models.DB_tables.user import User
+from app.utils.config import settings
 
 
 class APIKeyAuthProcessor:
@@ -20,9 +26,24 @@ class APIKeyAuthProcessor:
     - Matching provided API keys to users
     - Adding/removing/replacing/invalidation of cached keys
     - Stateless key validation using bcrypt-secured hashing
+
+    Keys of the form "<key_id>.<secret>" are found through a dict index on their
+    ID, so matching costs at most one bcrypt verification. Legacy keys (no ID)
+    are still matched by comparing against every legacy hash.
+
+    Successful verifications are cached for API_KEY_CACHE_TTL_SECONDS, keyed by an
+    HMAC-SHA256 digest of the presented key (with a per-process random key), so a
+    client repeating the same key skips both bcrypt and the user lookup. Removing,
+    replacing or invalidating keys evicts their cache entries immediately.
     """
 
     _api_keys: List[APIKeyConfig] = []
+    _by_id: Dict[str, APIKeyConfig] = {}
+    _verified: TTLCache[bytes, tuple[APIKeyConfig, User]] = TTLCache(
+        maxsize=settings.API_KEY_CACHE_MAXSIZE,
+        ttl=settings.API_KEY_CACHE_TTL_SECONDS
+    )
+    _digest_key: bytes = secrets.token_bytes(32)
 
     @classmethod
     async def load(cls) -> None:
@@ -35,6 +56,8 @@ class APIKeyAuthProcessor:
         async with run_in_transaction() as session:
             db_keys = await get_all_active_keys(session)
             cls._api_keys = []
+            cls._by_id = {}
+            cls._verified.clear()
 
             for key_obj in db_keys:
                 user = await get_user_by_id(session, key_obj.user_id)
@@ -45,10 +68,13 @@ class APIKeyAuthProcessor:
                 config = APIKeyConfig(
                     user_id=key_obj.user_id,
                     key=SecretStr(key_obj.key),  # Hashed key
+                    key_id=key_obj.key_id,
                     expires_at=key_obj.expires_at,
                     role=user.role
                 )
                 cls._api_keys.append(config)
+                if config.key_id:
+                    cls._by_id[config.key_id] = config
 
             logger.info("[API_KEY] Loaded %d API keys", len(cls._api_keys))
 
@@ -68,22 +94,33 @@ class APIKeyAuthProcessor:
             config: The key object to cache.
         """
         cls._api_keys.append(config)
+        if config.key_id:
+            cls._by_id[config.key_id] = config
         logger.info("[API_KEY] Added | user_id=%s | role=%s", config.user_id, config.role)
 
     @classmethod
-    def remove(cls, key_value: str) -> None:
+    async def remove(cls, key_value: str) -> None:
         """
-        Remove any key(s) from cache that match the given raw key.
+        Remove any key(s) from cache that match the given key.
 
         Args:
-            key_value: The plaintext key string to remove.
+            key_value: The stored hash of the key, or the plaintext key.
 
-        Note: Secure match via bcrypt hash comparison.
+        Note: A stored hash is matched by equality only; a plaintext key is
+        verified against its candidates in the hashing pool (see `_find`).
         """
+        doomed = [k for k in cls._api_keys if k.key.get_secret_value() == key_value]
+        if not doomed and pwd_context.identify(key_value) is None:
+            found = await cls._find(key_value)
+            doomed = [found] if found else []
+
         before = len(cls._api_keys)
-        cls._api_keys = [
-            k for k in cls._api_keys if not verify_value(key_value, k.key.get_secret_value())
-        ]
+        doomed_ids = {id(k) for k in doomed}
+        cls._api_keys = [k for k in cls._api_keys if id(k) not in doomed_ids]
+        for config in doomed:
+            if config.key_id:
+                cls._by_id.pop(config.key_id, None)
+        cls._evict(lambda cached: id(cached) in doomed_ids)
         after = len(cls._api_keys)
         logger.info("[API_KEY] Removed key | count_removed=%d", before - after)
 
@@ -111,6 +148,8 @@ class APIKeyAuthProcessor:
         """
         before = len(cls._api_keys)
         cls._api_keys = [k for k in cls._api_keys if k.user_id != user_id]
+        cls._by_id = {key_id: k for key_id, k in cls._by_id.items() if k.user_id != user_id}
+        cls._evict(lambda cached: cached.user_id == user_id)
         after = len(cls._api_keys)
         logger.info("[API_KEY] Invalidated keys for user | user_id=%s | count_removed=%d", user_id, before - after)
 
@@ -120,6 +159,8 @@ class APIKeyAuthProcessor:
         Attempt to match the given raw API key against in-memory hashed keys.
 
         If a match is found, returns the associated User object.
+        At most one bcrypt verification for keys with an ID, none for a key
+        verified within the cache TTL.
 
         Args:
             raw_key: The plaintext API key provided by the client.
@@ -130,16 +171,71 @@ class APIKeyAuthProcessor:
         Raises:
             AuthValidationError: If no match is found or user no longer exists.
         """
-        for config in cls._api_keys:
-            if verify_value(raw_key, config.key.get_secret_value()):
-                async with run_in_transaction() as session:
-                    user = await get_user_by_id(session, config.user_id)
-                    if not user:
-                        logger.error("[API_KEY] Matched key but user not found | user_id=%s", config.user_id)
-                        raise AuthValidationError("User for API key not found")
+        digest = cls._digest(raw_key)
+        cached = cls._verified.get(digest)
+        if cached is not None:
+            logger.debug("[API_KEY] Cache hit | user_id=%s", cached[1].id)
+            return cached[1]
+
+        config = await cls._find(raw_key)
+        if config is None:
+            logger.warning("[API_KEY] No match for provided key")
+            raise AuthValidationError("Invalid or inactive API key")
+
+        async with run_in_transaction() as session:
+            user = await get_user_by_id(session, config.user_id)
+            if not user:
+                logger.error("[API_KEY] Matched key but user not found | user_id=%s", config.user_id)
+                raise AuthValidationError("User for API key not found")
 
-                    logger.info("[API_KEY] Match found | user_id=%s | role=%s", user.id, user.role)
-                    return user
+            logger.info("[API_KEY] Match found | user_id=%s | role=%s", user.id, user.role)
+            # The key may have been removed while we awaited; never cache a revoked key
+            if cls._is_live(config):
+                cls._verified[digest] = (config, user)
+            return user
 
-        logger.warning("[API_KEY] No match for provided key")
-        raise AuthValidationError("Invalid or inactive API key")
+    @classmethod
+    def _digest(cls, raw_key: str) -> bytes:
+        """Cache key of a presented API key; the key itself is never stored."""
+        return hmac.new(cls._digest_key, raw_key.encode("utf-8"), hashlib.sha256).digest()
+
+    @classmethod
+    def _is_live(cls, config: APIKeyConfig) -> bool:
+        """True if `config` is still one of the cached keys (not removed, replaced or reloaded)."""
+        if config.key_id:
+            return cls._by_id.get(config.key_id) is config
+        return any(k is config for k in cls._api_keys)
+
+    @classmethod
+    def _evict(cls, predicate: Callable[[APIKeyConfig], bool]) -> None:
+        """Drop verified-key cache entries whose key config matches `predicate`."""
+        stale = [digest for digest, (config, _) in list(cls._verified.items()) if predicate(config)]
+        for digest in stale:
+            cls._verified.pop(digest, None)
+
+    @classmethod
+    def _candidates(cls, raw_key: str) -> tuple[str, List[APIKeyConfig]]:
+        """
+        Split a plaintext key into its secret and the cached configs it may belong to.
+
+        A key with an ID has at most one candidate (none for an unknown ID, so it
+        fails without hashing); a legacy key has every legacy config.
+        """
+        key_id, secret = parse_api_key(raw_key)
+        if key_id is not None:
+            config = cls._by_id.get(key_id)
+            return secret, [config] if config is not None else []
+        return secret, [k for k in cls._api_keys if k.key_id is None]
+
+    @classmethod
+    async def _find(cls, raw_key: str) -> APIKeyConfig | None:
+        """
+        Return the cached config of a plaintext key, or None.
+
+        Candidates are verified in the hashing pool, so bcrypt never blocks the event loop.
+        """
+        secret, candidates = cls._candidates(raw_key)
+        for config in candidates:
+            if await verify_value_async(secret, config.key.get_secret_value()):
+                return config
+        return None
@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 from typing import List, Optional
-from uuid import UUID
+from uuid import UUID, uuid4
 from loguru import logger
 import re
 
@@ -8,7 +8,8 @@ from pydantic import SecretStr
 
 # --- Import internal modules ---
 from app.utils.crypto_utils import decrypt_secret, encrypt_secret
-from app.utils.hashing import hash_value, verify_value
+from app.utils.hashing import hash_value_async, hash_values_async, verify_value_async
+from app.utils.api_key_utils import format_api_key, generate_key_id, parse_api_key
 from app.utils.jwt_utils import decode_jwt, decode_jwt_unverified, generate_jwt
 from app.utils.secret_utils import generate_api_key, generate_secret, get_api_key_expiry, get_secret_expiry
 from app.utils.config import settings
@@ -20,19 +21,20 @@ from app.utils.exceptions_base import (
 from app.models.DB_tables.user import User
 from app.models.DB_tables.user_secrets import UserSecret
 from app.models.schemas.rest.auth_schemas import (
-    GeneratedAPIKey, LoginResponse, NewUserInput, OnboardResult,
+    GeneratedAPIKey, LoginResponse, NewUserInput, OnboardResult, OnboardRowResult,
     SecretCreateRequest, SecretCreateResponse, SecretInfo
 )
 
 from app.infrastructure.database.transaction import run_in_transaction
+from app.domain.api_key_processor import APIKeyAuthProcessor
 from app.infrastructure.database.repository.restAPI import (
     user_repository, secret_repository, api_key_repository
 )
 from app.infrastructure.database.repository.restAPI.user_repository import (
-    get_user_by_email, create_user, get_user_by_id, update_last_login
+    get_user_by_email, get_existing_emails, create_users_bulk, get_user_by_id, update_last_login
 )
 from app.infrastructure.database.repository.restAPI.secret_repository import (
-    create_user_secret, delete_user_secret_by_label, get_all_active_user_secrets,
+    create_user_secret, create_user_secrets_bulk, delete_user_secret_by_label, get_all_active_user_secrets,
     get_user_secret_by_label, get_user_secret_labels, get_user_secrets_info,
     set_user_secret_active_status
 )
@@ -42,61 +44,71 @@ from app.infrastructure.database.repository.restAPI.secret_repository import (
 # USER ONBOARDING
 # -------------------------------
 
-# Onboards a list of new users, skipping existing ones
+# Onboards a list of new users in bulk, skipping existing ones
 async def onboard_users_from_inputs(users: List[NewUserInput]) -> OnboardResult:
-    created_users: List[str] = []
-    skipped_users: List[str] = []
-
+    results: List[OnboardRowResult] = []
+    pending: dict[str, tuple[OnboardRowResult, str, NewUserInput]] = {}  # email -> (row, username, input)
+
+    # Derive email and username; repeated emails in the request are reported, not retried
+    for user in users:
+        name = user.name.strip()
+        first, last = parse_full_name(name)
+        email = f"{first.lower()}.{last.lower()}@tuni.fi"
+        row = OnboardRowResult(name=name, email=email, status="created")
+        results.append(row)
+        if email in pending:
+            row.status, row.detail = "duplicate", "Email repeated in this request"
+            continue
+        pending[email] = (row, f"{first}_{last}".lower(), user)
+
+    # One existence check for the whole batch
     async with run_in_transaction() as db:
-        for user in users:
-            # Normalize and parse the full name into first and last
-            name = user.name.strip()
-            first, last = parse_full_name(name)
-            email = f"{first.lower()}.{last.lower()}@tuni.fi"
-
-            # Skip user if email already exists
-            existing = await get_user_by_email(db, email)
-            if existing:
-                logger.info("[AUTH] Skipping existing user | email=%s", email)
-                skipped_users.append(email)
-                continue
-
-            # Generate hashed default password
-            hashed_pw = hash_value(settings.DEFAULT_USER_PASSWORD.get_secret_value())
-
-            try:
-                # Create user entry
-                new_user = await create_user(
-                    db,
-                    email=email,
-                    username=f"{first}_{last}".lower(),
-                    hashed_password=hashed_pw,
-                    role=user.role
-                )
-
-                # Create default login secret
-                await create_user_secret(
-                    db,
-                    user_id=new_user.id,
-                    secret=encrypt_secret(generate_secret()),
-                    label="login",
-                    is_active=True,
-                    expires_at=get_secret_expiry()
-                )
-
-                created_users.append(email)
-                logger.info("[AUTH] User onboarded | email=%s | role=%s", email, user.role)
-
-            except Exception as e:
-                logger.exception("[AUTH] Failed to onboard user | name=%s | email=%s", name, email)
-                skipped_users.append(email)  # Could separate failed vs skipped
+        existing = await get_existing_emails(db, list(pending))
+    for email in existing:
+        row = pending.pop(email)[0]
+        row.status, row.detail = "exists", "User already exists"
+        logger.info("[AUTH] Skipping existing user | email=%s", email)
+
+    if pending:
+        # Hash outside the transaction: every user gets its own salt, hashed in parallel
+        hashes = await hash_values_async([settings.DEFAULT_USER_PASSWORD.get_secret_value()] * len(pending))
+        now = datetime.now(timezone.utc)
+        user_rows = [
+            {"id": uuid4(), "email": email, "username": username, "hashed_password": hashed,
+             "role": user.role, "created_at": now, "last_login": None}
+            for (email, (_, username, user)), hashed in zip(pending.items(), hashes)
+        ]
 
+        try:
+            async with run_in_transaction() as db:
+                # Users registered concurrently since the check are skipped by the insert
+                inserted = await create_users_bulk(db, user_rows)
+                await create_user_secrets_bulk(db, [
+                    {"user_id": r["id"], "secret": encrypt_secret(generate_secret()), "label": "login",
+                     "is_active": True, "expires_at": get_secret_expiry()}
+                    for r in user_rows if r["id"] in inserted
+                ])
+        except Exception:
+            logger.exception("[AUTH] Failed to onboard users | count=%d", len(user_rows))
+            for row, _, _ in pending.values():
+                row.status, row.detail = "failed", "Could not create user"
+        else:
+            for r in user_rows:
+                row = pending[r["email"]][0]
+                if r["id"] not in inserted:
+                    row.status, row.detail = "exists", "User already exists"
+                    continue
+                logger.info("[AUTH] User onboarded | email=%s | role=%s", r["email"], r["role"])
+
+    created_users = [row.email for row in results if row.status == "created"]
+    skipped_users = [row.email for row in results if row.status != "created"]
     logger.info("[AUTH] Onboarding completed | created=%d | skipped=%d", len(created_users), len(skipped_users))
 
     return OnboardResult(
         created_count=len(created_users),
         users=created_users,
-        skipped=skipped_users
+        skipped=skipped_users,
+        results=results
     )
 
 
@@ -108,7 +120,7 @@ async def onboard_users_from_inputs(users: List[NewUserInput]) -> OnboardResult:
 # Changes the user's password after validating the old one
 async def change_user_password(user: User, old_password: str, new_password: str):
     # Check if the old password is correct
-    if not verify_value(old_password, user.hashed_password):
+    if not await verify_value_async(old_password, user.hashed_password):
         logger.warning("[AUTH] Incorrect old password | user_id=%s", user.id)
         raise AuthValidationError("Old password is incorrect")
 
@@ -118,7 +130,7 @@ async def change_user_password(user: User, old_password: str, new_password: str)
         raise AuthValidationError("New password does not meet complexity requirements")
 
     # Hash the new password
-    hashed = hash_value(new_password)
+    hashed = await hash_value_async(new_password)
 
     async with run_in_transaction() as session:
         # Update the user's password in the database
@@ -146,7 +158,7 @@ async def login_user(email: str, password: str) -> LoginResponse:
     async with run_in_transaction() as db:
         # Look up user by email and check password
         user = await get_user_by_email(db, email)
-        if not user or not verify_value(password, user.hashed_password):
+        if not user or not await verify_value_async(password, user.hashed_password):
             logger.warning("[AUTH] Login failed | email=%s", email)
             raise AuthValidationError("Invalid email or password")
 
@@ -230,36 +242,45 @@ async def generate_api_key_for_user(user_id: UUID, label: str) -> GeneratedAPIKe
             logger.warning("[API_KEY] Duplicate label | user_id=%s | label=%s", user_id, label)
             raise AuthConflictError(f"API key label '{label}' already in use")
 
-        # Generate a new raw key and hash it
-        raw_key = generate_api_key()
-        hashed_key = hash_value(raw_key)
+        # Generate a new key "<key_id>.<secret>"; only the secret is hashed
+        key_id = generate_key_id()
+        secret = generate_api_key()
+        raw_key = format_api_key(key_id, secret)
+        hashed_key = await hash_value_async(secret)
 
         # Ensure new key doesn’t match an existing hash (rare, but safe check)
         for existing in keys:
-            if verify_value(raw_key, existing.key):
+            if await verify_value_async(secret, existing.key):
                 logger.warning("[API_KEY] Generated key matched existing key | user_id=%s", user_id)
                 raise AuthConflictError("Generated API key matches existing one — try again")
 
         # Store the new hashed key in DB
         await api_key_repository.create_api_key(
-            session, user_id, hashed_key, label, expires_at=get_api_key_expiry()
+            session, user_id, hashed_key, label, expires_at=get_api_key_expiry(), key_id=key_id
         )
 
         logger.info("[API_KEY] Created | user_id=%s | label=%s", user_id, label)
 
     # Return both raw and hashed key for display + confirmation
-    return GeneratedAPIKey(raw_key=raw_key, hashed_key=SecretStr(hashed_key))
+    return GeneratedAPIKey(raw_key=raw_key, hashed_key=SecretStr(hashed_key), key_id=key_id)
 
 
 # Validates an API key and returns the associated user
 async def validate_api_key(api_key: str) -> User:
+    key_id, secret = parse_api_key(api_key)
     async with run_in_transaction() as session:
-        # Load all active API keys
-        all_keys = await api_key_repository.get_all_active_keys(session)
+        if key_id is not None:
+            # Current format: look the key up by its ID, one hash check
+            key_obj = await api_key_repository.get_active_api_key_by_id(session, key_id)
+            candidates = [key_obj] if key_obj else []
+        else:
+            # Legacy key: compare against every key issued without an ID
+            all_keys = await api_key_repository.get_all_active_keys(session)
+            candidates = [k for k in all_keys if k.key_id is None]
 
         # Match input key against stored hashes
-        for key_obj in all_keys:
-            if verify_value(api_key, key_obj.key):
+        for key_obj in candidates:
+            if await verify_value_async(secret, key_obj.key):
                 user = await get_user_by_id(session, key_obj.user_id)
                 if not user:
                     logger.error("[API_KEY] Matched key but user not found | user_id=%s", key_obj.user_id)
@@ -377,8 +398,10 @@ async def delete_user_by_identifier(user_id: Optional[UUID], email: Optional[str
         await api_key_repository.delete_all_user_api_keys(session, user.id)
         await user_repository.delete_user(session, user.id)
 
-        logger.info("[ADMIN] Deleted user and associated data | user_id=%s | email=%s", user.id, user.email)
-        return user.email
+    # Drop the user's cached keys (and verified-key cache entries)
+    APIKeyAuthProcessor.invalidate_user(user.id)
+    logger.info("[ADMIN] Deleted user and associated data | user_id=%s | email=%s", user.id, user.email)
+    return user.email
 
 
 # Retrieves a list of all users in the system
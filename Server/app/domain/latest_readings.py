@@ -0,0 +1,77 @@
+from uuid import UUID
+from typing import Dict, Iterable, List
+from loguru import logger
+
+from app.infrastructure.database.repository.restAPI import sensor_data_repository
+from app.models.schemas.rest.sensor_data_schemas import SensorDataOut
+
+
+class LatestReadingStore:
+    """
+    In-memory table of the most recent reading per sensor.
+
+    Warmed at startup with a single per-sensor `LATERAL` query and then kept current
+    by the MQTT ingest path, so `/sensor/data/latest` can be answered from RAM.
+    While the store is cold (startup failed or not yet run) callers fall back
+    to the database.
+    """
+
+    _latest: Dict[UUID, SensorDataOut] = {}
+    _loaded: bool = False
+
+    @classmethod
+    async def load(cls) -> None:
+        """
+        Load the latest reading of every registered sensor from the database.
+        """
+        rows = await sensor_data_repository.fetch_latest_for_sensors()
+        cls._latest = {}
+        cls.update_many(SensorDataOut.model_validate(row) for row in rows)
+        cls._loaded = True
+        logger.info("[SENSOR_DATA] Latest readings loaded | sensors=%d", len(cls._latest))
+
+    @classmethod
+    def is_loaded(cls) -> bool:
+        return cls._loaded
+
+    @classmethod
+    def update(cls, entry: SensorDataOut) -> None:
+        """
+        Record a stored reading, ignoring it if an equal or newer one is already held.
+
+        Args:
+            entry: Reading that has been persisted.
+        """
+        current = cls._latest.get(entry.device_id)
+        if current is not None:
+            try:
+                if current.timestamp >= entry.timestamp:
+                    return
+            except TypeError:
+                # Mixed naive/aware timestamps: trust arrival order
+                pass
+        cls._latest[entry.device_id] = entry
+
+    @classmethod
+    def update_many(cls, entries: Iterable[SensorDataOut]) -> None:
+        for entry in entries:
+            cls.update(entry)
+
+    @classmethod
+    def get_many(cls, sensor_ids: Iterable[UUID]) -> List[SensorDataOut]:
+        """
+        Return the cached latest reading for each sensor that has one.
+        """
+        return [cls._latest[sid] for sid in sensor_ids if sid in cls._latest]
+
+    @classmethod
+    def remove(cls, sensor_id: UUID) -> None:
+        cls._latest.pop(sensor_id, None)
+
+    @classmethod
+    def clear(cls) -> None:
+        """
+        Empty the store and mark it cold.
+        """
+        cls._latest = {}
+        cls._loaded = False
@@ -11,7 +11,10 @@ from pydantic import ValidationError
 from app.constants.webhooks import WebhookEvent
 from app.domain.webhooks.dispatcher import dispatcher
 from app.domain.sensor_logic import create_sensor, safe_get_sensor_by_id
+from app.domain.sensor_registry import SensorRegistry
+from app.domain.latest_readings import LatestReadingStore
 from app.domain.sensor_data_logic import create_sensor_data_entry
+from app.domain.sensor_data_batch_writer import sensor_data_batch_writer
 from app.infrastructure.database.repository.restAPI.sensor_repository import modify_sensor
 from app.models.schemas.rest.sensor_schemas import SensorCreate, SensorOut, SensorUpdate
 from app.models.schemas.rest.sensor_data_schemas import SensorDataIn, SensorDataOut
@@ -52,6 +55,7 @@ async def process_status_message(topic: str, text: str):
         sensor = await modify_sensor(sensor_id, update_data)
         if sensor:
             sensor_out = SensorOut.model_validate(sensor)
+            SensorRegistry.upsert(sensor_out)
             await dispatcher.dispatch(WebhookEvent.SENSOR_STATUS_CHANGED, sensor_out)
             logger.info(f"Updated sensor {sensor_id} status to {'active' if is_active else 'inactive'} via MQTT")
 
@@ -61,7 +65,9 @@ async def process_sensor_data(text: str):
     Process and store sensor data received from MQTT.
 
     If sensor does not exist, creates a placeholder.
-    Dispatches webhook events for:
+    When batch ingestion is enabled the reading is queued for the batch
+    writer, which persists it and dispatches the webhooks after commit.
+    Otherwise it is stored inline and dispatches webhook events for:
     - SENSOR_DATA_RECEIVED
     - ALERT_TRIGGERED
     """
@@ -82,11 +88,16 @@ async def process_sensor_data(text: str):
         await create_sensor(placeholder)  # type: ignore
         logger.info("[MQTT] Created placeholder sensor | sensor_id=%s", data.device_id)
 
-    stored: SensorDataOut = await create_sensor_data_entry(data)
-    await dispatcher.dispatch(WebhookEvent.SENSOR_DATA_RECEIVED, stored)
-    await dispatcher.dispatch(WebhookEvent.ALERT_TRIGGERED, stored)
+    if settings.MQTT_BATCH_INGEST_ENABLED:
+        await sensor_data_batch_writer.enqueue(data)
+        logger.debug("[MQTT] Queued sensor data for batch insert | sensor_id=%s", data.device_id)
+    else:
+        stored: SensorDataOut = await create_sensor_data_entry(data, outbox=dispatcher.outbox_builder())
+        LatestReadingStore.update(stored)
+        await dispatcher.dispatch(WebhookEvent.SENSOR_DATA_RECEIVED, stored)
+        await dispatcher.dispatch(WebhookEvent.ALERT_TRIGGERED, stored)
 
-    logger.info("[MQTT] Dispatched SENSOR_DATA_RECEIVED and ALERT_TRIGGERED | sensor_id=%s", data.device_id)
+        logger.info("[MQTT] Dispatched SENSOR_DATA_RECEIVED and ALERT_TRIGGERED | sensor_id=%s", data.device_id)
 
     # Update local state
     mqtt_state.is_running = True
@@ -98,12 +109,20 @@ async def process_sensor_data(text: str):
 
 async def ensure_sensor_exists(sensor_id: UUID, is_active: bool | None = None) -> bool:
     """
-    Check if a sensor exists in DB, and if its active status matches expectation.
+    Check if a sensor exists, and if its active status matches expectation.
+
+    Served from the sensor registry once it is warm; the DB is only consulted
+    while the registry is cold or for IDs it does not know yet (e.g. sensors
+    created by another worker).
 
     Returns:
         bool: True if sensor is valid and no action needed.
     """
-    sensor = await safe_get_sensor_by_id(sensor_id)
+    sensor = SensorRegistry.get(sensor_id) if SensorRegistry.is_loaded() else None
+    if sensor is None:
+        sensor = await safe_get_sensor_by_id(sensor_id)
+        if sensor and SensorRegistry.is_loaded():
+            SensorRegistry.upsert(sensor)
 
     if not sensor:
         logger.debug(f"[MQTT] Sensor {sensor_id} not found. Skipping (creation handled elsewhere).")
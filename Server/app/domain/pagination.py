@@ -1,9 +1,19 @@
-from typing import TypeVar, Generic, List, Type
+import base64
+import hashlib
+import json
+from datetime import datetime
+from typing import Any, Optional, Tuple, TypeVar, Generic, List, Type
+from uuid import UUID
+from cachetools import TTLCache
 from pydantic import BaseModel
-from sqlalchemy import select, func
+from sqlalchemy import select, func, tuple_
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import Select
+from app.constants.pagination import CountPolicy
 from app.infrastructure.database.transaction import run_in_transaction
 from app.utils.config import settings
+from app.utils.exceptions_base import AppException
 from loguru import logger
 
 
@@ -15,67 +25,212 @@ class PaginatedResponse(BaseModel, Generic[T]):
 
     Attributes:
         items (List[T]): List of returned items of type T.
-        total (int): Total number of records (unpaginated).
+        total (int | None): Total number of records (unpaginated); None when counting is disabled.
+        total_policy (CountPolicy): Policy that produced `total` (exact, estimated, cached or none).
+        has_more (bool): Whether another page exists after this one.
         page (int): Current page number.
         page_size (int): Number of items per page.
+        next_cursor (str | None): Opaque cursor for the next page (keyset mode only,
+            None on the last page).
     """
     items: List[T]
-    total: int
+    total: Optional[int]
+    total_policy: CountPolicy = CountPolicy.EXACT
+    has_more: bool = False
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
 
     model_config = {
         "from_attributes": True  # Supports ORM or dict inputs
     }
 
 
+# ─── Keyset Cursors ──────────────────────────────────────
+
+def encode_cursor(timestamp: datetime, row_id: UUID) -> str:
+    """
+    Encode a `(timestamp, id)` keyset position as an opaque URL-safe token.
+    """
+    raw = json.dumps([timestamp.isoformat(), str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    Decode a cursor produced by `encode_cursor`.
+
+    Raises:
+        AppException: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        ts_raw, id_raw = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(ts_raw), UUID(id_raw)
+    except Exception:
+        raise AppException(
+            message=f"Invalid pagination cursor: {cursor!r}",
+            status_code=400,
+            public_message="Invalid pagination cursor.",
+            domain="pagination"
+        )
+
+
+# ─── Total Counts ────────────────────────────────────────
+
+_count_cache: TTLCache[str, int] = TTLCache(
+    maxsize=settings.PAGINATION_COUNT_CACHE_MAXSIZE,
+    ttl=settings.PAGINATION_COUNT_CACHE_TTL_SECONDS
+)
+
+
+def _default_count_policy() -> CountPolicy:
+    try:
+        return CountPolicy(settings.PAGINATION_COUNT_POLICY.lower())
+    except ValueError:
+        logger.warning("[PAGINATION] Unknown PAGINATION_COUNT_POLICY=%s, using exact", settings.PAGINATION_COUNT_POLICY)
+        return CountPolicy.EXACT
+
+
+def _query_cache_key(query: Select) -> str:
+    """
+    Normalize a query into a stable key: compiled SQL plus its bound parameters.
+    """
+    compiled = query.compile(dialect=postgresql.dialect())
+    params = sorted((k, repr(v)) for k, v in compiled.params.items())
+    return hashlib.sha256(f"{compiled}|{params}".encode()).hexdigest()
+
+
+async def _exact_count(session: AsyncSession, query: Select) -> int:
+    count_q = select(func.count()).select_from(query.subquery())
+    return await session.scalar(count_q) or 0
+
+
+async def _estimated_count(session: AsyncSession, query: Select) -> int:
+    """
+    Return the planner's row estimate for `query` using EXPLAIN (no execution).
+
+    The SQL, with values inlined, goes to the driver as-is, so a `:word` inside a
+    string value is not taken for a bind parameter. It runs in a savepoint: if
+    EXPLAIN fails (e.g. a statement timeout), the transaction stays usable for
+    the exact-count fallback.
+    """
+    async with session.begin_nested():
+        conn = await session.connection()
+        sql = query.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+        result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")
+        plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])  # type: ignore[index]
+
+
+async def _resolve_total(
+    session: AsyncSession,
+    query: Select,
+    policy: CountPolicy
+) -> Tuple[Optional[int], CountPolicy]:
+    """
+    Compute the total for `query` under `policy`.
+
+    Returns:
+        (total, policy actually used). An estimate that cannot be produced falls back
+        to an exact count and reports it as such.
+    """
+    if policy == CountPolicy.NONE:
+        return None, policy
+
+    if policy == CountPolicy.ESTIMATED:
+        try:
+            return await _estimated_count(session, query), policy
+        except Exception as e:
+            logger.warning("[PAGINATION] Estimated count failed, falling back to exact | error=%s", str(e))
+            return await _exact_count(session, query), CountPolicy.EXACT
+
+    if policy == CountPolicy.CACHED:
+        key = _query_cache_key(query)
+        cached = _count_cache.get(key)
+        if cached is None:
+            cached = await _exact_count(session, query)
+            _count_cache[key] = cached
+        return cached, policy
+
+    return await _exact_count(session, query), CountPolicy.EXACT
+
+
 async def paginate_query(
     base_query: Select,
     schema: Type[T],
     page: int = 1,
-    page_size: int | None = None
+    page_size: int | None = None,
+    cursor: str | None = None,
+    keyset: Tuple[Any, Any] | None = None,
+    count_policy: CountPolicy | None = None
 ) -> PaginatedResponse[T]:
     """
     Execute and paginate any SQLAlchemy query.
 
+    Two modes are supported:
+    - Offset (default): `OFFSET (page-1)*page_size`.
+    - Keyset: enabled by passing `keyset=(timestamp_col, id_col)`. Rows are ordered by
+      both columns descending and the page starts strictly after `cursor` (or at the
+      top when no cursor is given), so every page costs the same regardless of depth.
+      `next_cursor` in the response points at the following page.
+
+    The `total` is produced according to `count_policy` (defaults to
+    settings.PAGINATION_COUNT_POLICY in offset mode, and to no total in keyset mode,
+    where a count would scan the whole filtered set on every page); `has_more` is
+    always reported by fetching one extra row, so callers can page without a total.
+
     Args:
         base_query (Select): A SQLAlchemy select query.
         schema (Type[T]): Pydantic model to validate and serialize each row.
-        page (int): Page number (1-based).
+        page (int): Page number (1-based). Ignored for row selection in keyset mode.
         page_size (int | None): Number of items per page. Defaults to settings.DEFAULT_PAGE_SIZE.
+        cursor (str | None): Opaque cursor from a previous response (keyset mode only).
+        keyset (tuple | None): `(timestamp_col, id_col)` ORM columns enabling keyset mode.
+        count_policy (CountPolicy | None): How to compute `total`; pass one to get a
+            total in keyset mode.
 
     Returns:
         PaginatedResponse[T]: Paginated result set.
+
+    Raises:
+        AppException: If the cursor is malformed.
     """
     page_size = page_size or settings.DEFAULT_PAGE_SIZE
     col_count = len(base_query._raw_columns)
 
+    if keyset is not None:
+        policy = count_policy or CountPolicy.NONE
+        return await _paginate_keyset(base_query, schema, page, page_size, cursor, keyset, policy)
+
+    policy = count_policy or _default_count_policy()
+
     try:
         async with run_in_transaction() as session:
             # ── Get total count ──
-            count_q = select(func.count()).select_from(base_query.subquery())
-            total = await session.scalar(count_q) or 0
+            total, used_policy = await _resolve_total(session, base_query, policy)
 
-            # ── Apply pagination ──
-            paged = base_query.offset((page - 1) * page_size).limit(page_size)
+            # ── Apply pagination (one extra row to detect a next page) ──
+            paged = base_query.offset((page - 1) * page_size).limit(page_size + 1)
             result = await session.execute(paged)
 
             # ── Deserialize results ──
-            if col_count == 1:
-                records = result.scalars().all()
-                items = [schema.model_validate(r) for r in records]
-            else:
-                maps = result.mappings().all()
-                items = [schema.model_validate(m) for m in maps]
+            rows = result.scalars().all() if col_count == 1 else result.mappings().all()
+            has_more = len(rows) > page_size
+            items = [schema.model_validate(r) for r in rows[:page_size]]
 
             logger.info(
-                "[PAGINATION] Queried page=%d page_size=%d total=%d returned=%d",
-                page, page_size, total, len(items)
+                "[PAGINATION] Queried page=%d page_size=%d total=%s (%s) returned=%d",
+                page, page_size, total, used_policy.value, len(items)
             )
 
             return PaginatedResponse[T](
                 items=items,
                 total=total,
+                total_policy=used_policy,
+                has_more=has_more,
                 page=page,
                 page_size=page_size
             )
@@ -83,3 +238,70 @@ async def paginate_query(
     except Exception as e:
         logger.exception("[PAGINATION] Query failed | page=%d page_size=%d", page, page_size)
         raise
+
+
+async def _paginate_keyset(
+    base_query: Select,
+    schema: Type[T],
+    page: int,
+    page_size: int,
+    cursor: str | None,
+    keyset: Tuple[Any, Any],
+    policy: CountPolicy
+) -> PaginatedResponse[T]:
+    """
+    Keyset variant of `paginate_query`; see its docstring.
+    """
+    ts_col, id_col = keyset
+    col_count = len(base_query._raw_columns)
+
+    # Projections must expose both key columns to build the next cursor
+    selected_keys = {c.key for c in base_query.selected_columns}
+    paged = base_query
+    for col in (ts_col, id_col):
+        if col_count > 1 and col.key not in selected_keys:
+            paged = paged.add_columns(col)
+
+    paged = paged.order_by(None).order_by(ts_col.desc(), id_col.desc())
+    if cursor:
+        after_ts, after_id = decode_cursor(cursor)
+        paged = paged.where(tuple_(ts_col, id_col) < tuple_(after_ts, after_id))
+    paged = paged.limit(page_size + 1)
+
+    try:
+        async with run_in_transaction() as session:
+            total, used_policy = await _resolve_total(session, base_query, policy)
+
+            result = await session.execute(paged)
+            rows = result.scalars().all() if col_count == 1 else result.mappings().all()
+
+            has_more = len(rows) > page_size
+            rows = rows[:page_size]
+            items = [schema.model_validate(r) for r in rows]
+
+            next_cursor = None
+            if has_more and rows:
+                last = rows[-1]
+                if col_count == 1:
+                    next_cursor = encode_cursor(getattr(last, ts_col.key), getattr(last, id_col.key))
+                else:
+                    next_cursor = encode_cursor(last[ts_col.key], last[id_col.key])
+
+            logger.info(
+                "[PAGINATION] Keyset page | page_size=%d total=%s (%s) returned=%d has_more=%s",
+                page_size, total, used_policy.value, len(items), has_more
+            )
+
+            return PaginatedResponse[T](
+                items=items,
+                total=total,
+                total_policy=used_policy,
+                has_more=has_more,
+                page=page,
+                page_size=page_size,
+                next_cursor=next_cursor
+            )
+
+    except Exception:
+        logger.exception("[PAGINATION] Keyset query failed | page_size=%d", page_size)
+        raise
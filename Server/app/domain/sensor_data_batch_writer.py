@@ -0,0 +1,133 @@
+# sensor_data_batch_writer.py
+import asyncio
+import time
+from loguru import logger
+
+from app.constants.webhooks import WebhookEvent
+from app.domain.webhooks.dispatcher import dispatcher
+from app.domain.sensor_data_logic import create_sensor_data_entries
+from app.domain.latest_readings import LatestReadingStore
+from app.models.schemas.rest.sensor_data_schemas import SensorDataIn, SensorDataOut
+from app.utils.config import settings
+
+
+class SensorDataBatchWriter:
+    """
+    Write-behind buffer for MQTT sensor data.
+
+    Readings are pushed onto a bounded queue and persisted by a single
+    background flusher as multi-row inserts. A batch is flushed as soon as
+    it reaches `max_size` rows or its oldest reading has waited `max_latency`
+    seconds, whichever comes first. Webhooks are dispatched per reading only
+    after the batch transaction has committed.
+
+    When the queue is full, `enqueue` blocks, which applies back-pressure to
+    the MQTT consumer instead of growing memory without bound.
+    """
+
+    def __init__(self, max_size: int, max_latency_ms: int, queue_size: int):
+        self.max_size = max(1, max_size)
+        self.max_latency = max(0, max_latency_ms) / 1000
+        self.queue_size = queue_size
+        self._queue: asyncio.Queue[SensorDataIn | None] | None = None
+        self._task: asyncio.Task | None = None
+
+        # Metrics
+        self.flushed_batches: int = 0
+        self.flushed_rows: int = 0
+        self.failed_rows: int = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def pending(self) -> int:
+        """Number of readings waiting to be flushed."""
+        return self._queue.qsize() if self._queue else 0
+
+    def start(self) -> None:
+        """Start the background flusher (idempotent)."""
+        if self.is_running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            "[SENSOR_DATA] Batch writer started | max_size=%d | max_latency_ms=%d",
+            self.max_size, int(self.max_latency * 1000)
+        )
+
+    async def stop(self) -> None:
+        """Flush everything still queued and stop the flusher."""
+        if not self.is_running or self._queue is None or self._task is None:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+        logger.info("[SENSOR_DATA] Batch writer stopped | rows=%d | batches=%d", self.flushed_rows, self.flushed_batches)
+
+    async def enqueue(self, data: SensorDataIn) -> None:
+        """
+        Queue a validated reading for persistence.
+
+        Raises:
+            RuntimeError: If the writer has not been started.
+        """
+        if not self.is_running or self._queue is None:
+            raise RuntimeError("SensorDataBatchWriter is not running")
+        await self._queue.put(data)
+
+    async def _run(self) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        stopping = False
+
+        while not stopping:
+            first = await queue.get()
+            if first is None:
+                break
+
+            batch: list[SensorDataIn] = [first]
+            deadline = time.monotonic() + self.max_latency
+
+            while len(batch) < self.max_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining <= 0:
+                        item = queue.get_nowait()
+                    else:
+                        item = await asyncio.wait_for(queue.get(), timeout=remaining)
+                except (asyncio.TimeoutError, asyncio.QueueEmpty):
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[SensorDataIn]) -> None:
+        try:
+            stored: list[SensorDataOut] = await create_sensor_data_entries(batch, outbox=dispatcher.outbox_builder())
+        except Exception as e:
+            self.failed_rows += len(batch)
+            logger.error("[SENSOR_DATA] Batch insert failed | rows=%d | error=%s", len(batch), str(e))
+            return
+
+        self.flushed_batches += 1
+        self.flushed_rows += len(stored)
+        LatestReadingStore.update_many(stored)
+        logger.debug("[SENSOR_DATA] Flushed batch | rows=%d", len(stored))
+
+        for entry in stored:
+            try:
+                await dispatcher.dispatch(WebhookEvent.SENSOR_DATA_RECEIVED, entry)
+                await dispatcher.dispatch(WebhookEvent.ALERT_TRIGGERED, entry)
+            except Exception as e:
+                logger.error("[SENSOR_DATA] Webhook dispatch failed | sensor_id=%s | error=%s", entry.device_id, str(e))
+
+
+sensor_data_batch_writer = SensorDataBatchWriter(
+    max_size=settings.MQTT_BATCH_MAX_SIZE,
+    max_latency_ms=settings.MQTT_BATCH_MAX_LATENCY_MS,
+    queue_size=settings.MQTT_INGEST_QUEUE_SIZE,
+)
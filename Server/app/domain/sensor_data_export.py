@@ -0,0 +1,173 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import AsyncIterator, Iterable, Sequence
+from uuid import UUID
+from loguru import logger
+from sqlalchemy.sql import Select
+
+from app.constants.export import ExportFormat
+from app.constants.sensor_fields import ALLOWED_SENSOR_FIELDS
+from app.domain.sensor_registry import SensorRegistry
+from app.infrastructure.database import archive
+from app.infrastructure.database.repository.graphQL import sensor_data_graphql_repository
+from app.infrastructure.database.repository.restAPI import sensor_data_repository
+from app.models.DB_tables.sensor_data import SensorData
+from app.models.schemas.rest.sensor_data_schemas import SensorDataExportQuery
+from app.utils.arrow_utils import encode_arrow_stream, encode_parquet
+from app.utils.config import settings
+
+
+EXPORT_KEY_COLUMNS = ["id", "device_id", "timestamp"]
+
+
+def export_columns(fields: list[str] | None) -> list[str]:
+    """
+    Column order of an export: identifiers first, then the requested metrics.
+    """
+    return EXPORT_KEY_COLUMNS + list(fields or ALLOWED_SENSOR_FIELDS)
+
+
+async def build_export_query(payload: SensorDataExportQuery, columns: list[str]) -> Select:
+    """
+    The advanced-query filters, projected to plain columns (no ORM entities).
+    """
+    query = await sensor_data_graphql_repository.build_sensor_data_query(payload)
+    return query.with_only_columns(*(getattr(SensorData, c) for c in columns))
+
+
+# ─── Encoders ───────────────────────────────────────────────
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_ndjson(columns: list[str], rows: Iterable[Sequence]) -> bytes:
+    """
+    One JSON object per row, newline-terminated.
+    """
+    return "".join(
+        json.dumps(dict(zip(columns, row)), default=_json_default, separators=(",", ":")) + "\n"
+        for row in rows
+    ).encode()
+
+
+def encode_csv(rows: Iterable[Sequence]) -> bytes:
+    """
+    CSV lines for `rows`; datetimes as ISO 8601, NULL as an empty field.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([v.isoformat() if isinstance(v, datetime) else v for v in row])
+    return buffer.getvalue().encode()
+
+
+# ─── Row Sources ────────────────────────────────────────────
+
+async def _archive_device_ids(payload: SensorDataExportQuery) -> list[UUID] | None:
+    """
+    Resolve the sensor metadata filters to device IDs (archive files carry no metadata).
+    None means no device restriction.
+    """
+    if not (payload.locations or payload.models or payload.is_active is not None):
+        return payload.sensor_ids
+
+    if not SensorRegistry.is_loaded():
+        await SensorRegistry.load()
+
+    ids = []
+    for sensor_id in payload.sensor_ids or SensorRegistry.get_all_ids():
+        sensor = SensorRegistry.get(sensor_id)
+        if sensor is None:
+            continue
+        if payload.locations and sensor.location not in payload.locations:
+            continue
+        if payload.models and sensor.model not in payload.models:
+            continue
+        if payload.is_active is not None and sensor.is_active != payload.is_active:
+            continue
+        ids.append(sensor_id)
+    return ids
+
+
+async def _row_batches(payload: SensorDataExportQuery, columns: list[str]) -> AsyncIterator[Sequence[Sequence]]:
+    """
+    Live rows (server-side cursor) followed, if requested, by archived rows.
+    """
+    query = await build_export_query(payload, columns)
+    async for batch in sensor_data_repository.stream_rows(query, settings.SENSOR_EXPORT_BATCH_SIZE):
+        yield batch
+
+    if payload.include_archive:
+        expression = archive.archive_filter(
+            device_ids=await _archive_device_ids(payload),
+            start=payload.timestamp_range_start,
+            end=payload.timestamp_range_end,
+            timestamps=payload.timestamps,
+            field_ranges=payload.field_ranges,
+        )
+        start, end = payload.timestamp_range_start, payload.timestamp_range_end
+        if payload.timestamps:
+            start, end = min(payload.timestamps), max(payload.timestamps)
+        async for batch in archive.read_archive(columns, expression, start, end):
+            yield batch
+
+
+# ─── Export ─────────────────────────────────────────────────
+
+async def _encode_text(
+    payload: SensorDataExportQuery, columns: list[str], batches: AsyncIterator[Sequence[Sequence]]
+) -> AsyncIterator[bytes]:
+    if payload.format == ExportFormat.CSV:
+        yield encode_csv([columns])
+    async for batch in batches:
+        if payload.format == ExportFormat.CSV:
+            yield encode_csv(batch)
+        else:
+            yield encode_ndjson(columns, batch)
+
+
+async def export_sensor_data(payload: SensorDataExportQuery) -> AsyncIterator[bytes]:
+    """
+    Stream every reading matching `payload` in the requested format.
+
+    Rows come from a server-side cursor in SENSOR_EXPORT_BATCH_SIZE batches (then from
+    the Parquet archive when `include_archive` is set) and are encoded straight from the
+    row tuples, so memory stays constant for any range. Arrow and Parquet output contain
+    only the projected columns.
+
+    Yields:
+        bytes: Encoded chunks, roughly one per fetched batch.
+    """
+    columns = export_columns(payload.fields)
+    logger.info("[SENSOR_DATA] Export started | format=%s | columns=%d", payload.format.value, len(columns))
+
+    rows = 0
+
+    async def counted() -> AsyncIterator[Sequence[Sequence]]:
+        nonlocal rows
+        async for batch in _row_batches(payload, columns):
+            rows += len(batch)
+            yield batch
+
+    if payload.format == ExportFormat.ARROW:
+        chunks = encode_arrow_stream(columns, counted())
+    elif payload.format == ExportFormat.PARQUET:
+        chunks = encode_parquet(columns, counted())
+    else:
+        chunks = _encode_text(payload, columns, counted())
+
+    try:
+        async for chunk in chunks:
+            if chunk:
+                yield chunk
+    except Exception:
+        # Headers are already sent; the client sees a truncated body
+        logger.exception("[SENSOR_DATA] Export aborted after %d rows", rows)
+        raise
+
+    logger.info("[SENSOR_DATA] Export finished | rows=%d", rows)
@@ -4,13 +4,28 @@ from app.models.schemas.graphQL.Sensor_data_query import SensorDataAdvancedQuery
 from app.models.DB_tables.sensor import Sensor
 from app.infrastructure.database.repository.restAPI import sensor_repository
 from app.infrastructure.database.repository.restAPI import sensor_data_repository
+from app.infrastructure.database.repository.restAPI.sensor_data_repository import OutboxBuilder
 from app.domain.pagination import paginate_query
-from app.models.schemas.rest.sensor_data_schemas import SensorDataIn, SensorDataOut, SensorDataPartialOut, SensorQuery, SensorRangeQuery, SensorTimestampQuery
+from app.domain.sensor_registry import SensorRegistry
+from app.domain.latest_readings import LatestReadingStore
+from app.models.schemas.rest.sensor_data_schemas import (
+    FieldAggregate, SensorAggregateBucket, SensorAggregateQuery,
+    SensorDataIn, SensorDataOut, SensorDataPartialOut, SensorQuery, SensorRangeQuery, SensorTimestampQuery
+)
 from app.utils.config import settings
 from app.utils.exceptions_base import AppException
 from loguru import logger
 
 
+def _keyset_args(payload) -> dict:
+    """
+    Extra `paginate_query` arguments enabling keyset pagination when the payload asks for it.
+    Offset-paged requests get no extra arguments.
+    """
+    if not payload.keyset_mode:
+        return {}
+    return {"cursor": payload.cursor, "keyset": sensor_data_repository.SENSOR_DATA_KEYSET}
+
 
 async def query_sensor_data_by_ranges(payload: SensorRangeQuery):
     """
@@ -19,51 +34,74 @@ async def query_sensor_data_by_ranges(payload: SensorRangeQuery):
     """
     logger.info("[SENSOR_DATA] Range query | fields=%s | page=%d", payload.ranges, payload.page)
     query = await sensor_data_repository.search_by_attribute_ranges(payload)
-    return await paginate_query(query, page=payload.page, schema=SensorDataPartialOut, page_size=settings.DEFAULT_PAGE_SIZE)
+    return await paginate_query(query, page=payload.page, schema=SensorDataPartialOut, page_size=settings.DEFAULT_PAGE_SIZE, **_keyset_args(payload))
 
 
-async def create_sensor_data_entry(payload: SensorDataIn) -> SensorDataOut:
+async def create_sensor_data_entry(payload: SensorDataIn, outbox: OutboxBuilder | None = None) -> SensorDataOut:
     """
     Insert a new sensor data row into the database.
 
     Args:
         payload (SensorDataIn): Sensor data payload.
+        outbox (OutboxBuilder | None): Webhook outbox rows to store with the reading.
 
     Returns:
         SensorDataOut: The stored and validated response object.
     """
-    db_obj = await sensor_data_repository.insert_sensor_data(payload)
+    db_obj = await sensor_data_repository.insert_sensor_data(payload, outbox=outbox)
     logger.info("[SENSOR_DATA] Created data entry | sensor_id=%s | ts=%s", payload.device_id, payload.timestamp)
     return SensorDataOut.model_validate(db_obj)
 
 
+async def create_sensor_data_entries(payloads: list[SensorDataIn], outbox: OutboxBuilder | None = None) -> list[SensorDataOut]:
+    """
+    Insert a batch of sensor data rows in one transaction.
+
+    Args:
+        payloads (list[SensorDataIn]): Sensor data payloads.
+        outbox (OutboxBuilder | None): Webhook outbox rows to store with the readings.
+
+    Returns:
+        list[SensorDataOut]: The stored rows, in input order.
+    """
+    rows = await sensor_data_repository.insert_sensor_data_batch(payloads, outbox=outbox)
+    logger.info("[SENSOR_DATA] Created data entries | count=%d", len(rows))
+    return [SensorDataOut.model_validate(row) for row in rows]
+
+
 async def get_latest_entries_for_sensors(sensor_ids: list[UUID] | None):
     """
     Return the most recent sensor data entry for each sensor in the provided list.
     If no list is provided, fetches entries for all known sensors.
 
+    Served from the in-memory latest-value table when both it and the sensor
+    registry are warm; otherwise falls back to a single per-sensor LATERAL query.
+
     Returns:
-        list[SensorDataOut]: One per sensor.
-    """
-    if not sensor_ids:
-        sensors = await sensor_repository.fetch_all_sensors()
-        sensor_ids = [sensor.sensor_id for sensor in sensors]
-        logger.info("[SENSOR_DATA] No sensor_ids provided, defaulting to all (%d)", len(sensor_ids))
-
-    valid_ids = []
-    for sid in sensor_ids:
-        if await sensor_repository.fetch_sensor_by_id(sid):
-            valid_ids.append(sid)
-        else:
-            logger.warning("[SENSOR_DATA] Skipping invalid sensor ID: %s", sid)
-
-    results = []
-    for sid in valid_ids:
-        entry = await sensor_data_repository.fetch_latest_by_sensor(sid)
-        if entry:
-            results.append(entry)
-
-    logger.info("[SENSOR_DATA] Fetched latest entries | sensors=%d | results=%d", len(valid_ids), len(results))
+        list[SensorDataOut]: One per sensor that has data.
+    """
+    if SensorRegistry.is_loaded() and LatestReadingStore.is_loaded():
+        if not sensor_ids:
+            sensor_ids = SensorRegistry.get_all_ids()
+            logger.info("[SENSOR_DATA] No sensor_ids provided, defaulting to all (%d)", len(sensor_ids))
+
+        valid_ids = []
+        for sid in sensor_ids:
+            if SensorRegistry.contains(sid):
+                valid_ids.append(sid)
+            else:
+                logger.warning("[SENSOR_DATA] Skipping invalid sensor ID: %s", sid)
+
+        results = LatestReadingStore.get_many(valid_ids)
+        logger.info("[SENSOR_DATA] Fetched latest entries from memory | sensors=%d | results=%d", len(valid_ids), len(results))
+        return results
+
+    rows = await sensor_data_repository.fetch_latest_for_sensors(sensor_ids)
+    results = [SensorDataOut.model_validate(row) for row in rows]
+    LatestReadingStore.update_many(results)
+
+    logger.info("[SENSOR_DATA] Fetched latest entries from DB | requested=%s | results=%d",
+                len(sensor_ids) if sensor_ids else "all", len(results))
     return results
 
 
@@ -75,7 +113,7 @@ async def query_sensor_data_by_timestamps(payload: SensorTimestampQuery):
     """
     logger.info("[SENSOR_DATA] Timestamp query | timestamps=%s | exact=%s | page=%d", payload.timestamps, payload.exact, payload.page)
     query = await sensor_data_repository.search_by_timestamps(payload)
-    return await paginate_query(query, page=payload.page, schema=SensorDataOut, page_size=settings.DEFAULT_PAGE_SIZE)
+    return await paginate_query(query, page=payload.page, schema=SensorDataOut, page_size=settings.DEFAULT_PAGE_SIZE, **_keyset_args(payload))
 
 
 async def get_all_data_by_sensor(payload: SensorQuery):
@@ -97,7 +135,7 @@ async def get_all_data_by_sensor(payload: SensorQuery):
 
     logger.info("[SENSOR_DATA] Querying all data for sensor | id=%s | page=%d", payload.sensor_id, payload.page)
     query = await sensor_data_repository.search_by_sensor_id(payload.sensor_id)
-    return await paginate_query(query, schema=SensorDataOut, page=payload.page, page_size=settings.DEFAULT_PAGE_SIZE)
+    return await paginate_query(query, schema=SensorDataOut, page=payload.page, page_size=settings.DEFAULT_PAGE_SIZE, **_keyset_args(payload))
 
 
 async def query_sensor_data_advanced(payload: SensorDataAdvancedQuery):
@@ -112,4 +150,40 @@ async def query_sensor_data_advanced(payload: SensorDataAdvancedQuery):
     """
     logger.info("[SENSOR_DATA] Advanced GraphQL query | query=%s | page=%d", payload.model_dump(), payload.page)
     query = await sensor_data_graphql_repository.build_sensor_data_query(payload)
-    return await paginate_query(query, page=payload.page, schema=SensorDataOut, page_size=payload.page_size or settings.DEFAULT_PAGE_SIZE)
+    return await paginate_query(query, page=payload.page, schema=SensorDataOut, page_size=payload.page_size or settings.DEFAULT_PAGE_SIZE, **_keyset_args(payload))
+
+
+
+async def aggregate_sensor_data(payload: SensorAggregateQuery) -> list[SensorAggregateBucket]:
+    """
+    Compute count/min/max/avg/p95 per time bucket for the requested fields.
+
+    Returns:
+        list[SensorAggregateBucket]: Buckets ordered by start time (and sensor when grouped).
+    """
+    logger.info(
+        "[SENSOR_DATA] Aggregation query | fields=%s | bucket=%s | range=%s..%s",
+        payload.fields, payload.bucket, payload.start, payload.end
+    )
+    rows = await sensor_data_repository.fetch_aggregates(payload)
+
+    buckets = [
+        SensorAggregateBucket(
+            bucket_start=row["bucket_start"],
+            device_id=row.get("device_id"),
+            count=row["count"],
+            aggregates=[
+                FieldAggregate(
+                    field=field,
+                    min=row[f"{field}__min"],
+                    max=row[f"{field}__max"],
+                    avg=row[f"{field}__avg"],
+                    p95=row[f"{field}__p95"],
+                )
+                for field in payload.fields
+            ],
+        )
+        for row in rows
+    ]
+    logger.info("[SENSOR_DATA] Aggregation returned %d buckets", len(buckets))
+    return buckets
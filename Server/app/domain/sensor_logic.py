@@ -5,6 +5,8 @@ from loguru import logger
 from app.models.schemas.webhook.webhook_schema import SensorDeletedPayload, SensorCreatedPayload
 from app.constants.webhooks import WebhookEvent
 from app.domain.pagination import paginate_query
+from app.domain.sensor_registry import SensorRegistry
+from app.domain.latest_readings import LatestReadingStore
 from app.infrastructure.database.repository.graphQL.sensor_metadata_graphql_repository import sensor_metadata_graphql_repository
 from app.models.schemas.graphQL.sensor_meta_data_query import SensorMetadataQuery
 from app.models.DB_tables.sensor import Sensor
@@ -26,6 +28,7 @@ async def create_sensor(sensor_data: SensorCreate):
     """
     sensor = await sensor_repository.insert_sensor(sensor_data)
     logger.info(f"Sensor created with ID={sensor.sensor_id}")
+    SensorRegistry.upsert(sensor)
 
     payload = SensorCreatedPayload(
         sensor_id=sensor.sensor_id,
@@ -86,6 +89,7 @@ async def update_sensor(sensor_id: UUID, update_data: SensorUpdate) -> SensorOut
         raise SensorNotFoundError(sensor_id)
 
     sensor_out = SensorOut.model_validate(sensor)
+    SensorRegistry.upsert(sensor_out)
 
     logger.info(f"Sensor {sensor_id} updated. Dispatching 'SENSOR_STATUS_CHANGED' event.")
     await dispatcher.dispatch(WebhookEvent.SENSOR_STATUS_CHANGED, sensor_out)
@@ -105,6 +109,8 @@ async def delete_sensor(sensor_id: UUID):
         logger.warning(f"Tried to delete sensor {sensor_id}, but it doesn't exist.")
         raise SensorNotFoundError(sensor_id)
 
+    SensorRegistry.remove(sensor_id)
+    LatestReadingStore.remove(sensor_id)
     logger.info(f"Sensor {sensor_id} deleted. Dispatching 'SENSOR_DELETED' event.")
     await dispatcher.dispatch(
         WebhookEvent.SENSOR_DELETED,
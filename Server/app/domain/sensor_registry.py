@@ -0,0 +1,83 @@
+from uuid import UUID
+from typing import Any, Dict, List
+from loguru import logger
+
+from app.infrastructure.database.repository.restAPI import sensor_repository
+from app.models.schemas.rest.sensor_schemas import SensorOut
+
+
+class SensorRegistry:
+    """
+    Process-wide, in-memory view of the `sensors` table keyed by sensor UUID.
+
+    Warmed once at startup and kept current by the sensor domain logic, so hot
+    paths (MQTT ingestion, latest-entry lookups) can check existence and
+    `is_active` without a database round-trip.
+
+    Until `load()` has completed the registry is considered cold and callers
+    are expected to fall back to the database.
+    """
+
+    _sensors: Dict[UUID, SensorOut] = {}
+    _loaded: bool = False
+
+    @classmethod
+    async def load(cls) -> None:
+        """
+        Load all sensors from the database into memory, replacing any cached entries.
+        """
+        sensors = await sensor_repository.fetch_all_sensors()
+        cls._sensors = {s.sensor_id: SensorOut.model_validate(s) for s in sensors}
+        cls._loaded = True
+        logger.info("[SENSOR] Registry loaded | sensors=%d", len(cls._sensors))
+
+    @classmethod
+    def is_loaded(cls) -> bool:
+        return cls._loaded
+
+    @classmethod
+    def get(cls, sensor_id: UUID) -> SensorOut | None:
+        """
+        Return the cached sensor or None if it is unknown.
+        """
+        return cls._sensors.get(sensor_id)
+
+    @classmethod
+    def contains(cls, sensor_id: UUID) -> bool:
+        return sensor_id in cls._sensors
+
+    @classmethod
+    def get_all_ids(cls) -> List[UUID]:
+        return list(cls._sensors.keys())
+
+    @classmethod
+    def upsert(cls, sensor: Any) -> SensorOut:
+        """
+        Add or refresh a sensor entry.
+
+        Args:
+            sensor: ORM row, dict or SensorOut describing the sensor.
+
+        Returns:
+            SensorOut: The cached entry.
+        """
+        entry = sensor if isinstance(sensor, SensorOut) else SensorOut.model_validate(sensor)
+        cls._sensors[entry.sensor_id] = entry
+        logger.debug("[SENSOR] Registry upsert | sensor_id=%s | is_active=%s", entry.sensor_id, entry.is_active)
+        return entry
+
+    @classmethod
+    def remove(cls, sensor_id: UUID) -> None:
+        """
+        Drop a sensor from the registry (no-op if absent).
+        """
+        if cls._sensors.pop(sensor_id, None) is not None:
+            logger.debug("[SENSOR] Registry removed | sensor_id=%s", sensor_id)
+
+    @classmethod
+    def clear(cls) -> None:
+        """
+        Empty the registry and mark it cold.
+        """
+        cls._sensors = {}
+        cls._loaded = False
@@ -1,9 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar
+from typing import Callable, Generic, TypeVar
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 
+from app.domain.webhooks.fanout import FanOutResult
 from app.models.schemas.webhook.webhook_schema import WebhookConfig
 
 # Define a generic type for the event payloads
@@ -21,7 +22,7 @@ class WebhookProcessorInterface(ABC, Generic[T]):
     """
 
     @abstractmethod
-    async def handle(self, payload: T, session: AsyncSession) -> None:
+    async def handle(self, payload: T, session: AsyncSession) -> FanOutResult:
         """
         Trigger this webhook processor for a specific event payload.
 
@@ -30,6 +31,9 @@ class WebhookProcessorInterface(ABC, Generic[T]):
         Args:
             payload (T): The event payload (must match the processor's expected input model).
             session (AsyncSession): DB session, optionally used for logging failures, etc.
+
+        Returns:
+            FanOutResult: How many deliveries succeeded or failed.
         """
         ...
 
@@ -43,6 +47,18 @@ class WebhookProcessorInterface(ABC, Generic[T]):
         """
         ...
 
+    @abstractmethod
+    def set_all(self, configs: list[WebhookConfig]) -> None:
+        """
+        Replace every in-memory configuration with `configs`.
+
+        Used by `load` and by the dispatcher, which loads all events in one query.
+
+        Args:
+            configs (list[WebhookConfig]): Configurations of this processor's event.
+        """
+        ...
+
     @abstractmethod
     def get_all(self) -> list[WebhookConfig]:
         """
@@ -53,6 +69,73 @@ class WebhookProcessorInterface(ABC, Generic[T]):
         """
         ...
 
+    def get(self, webhook_id: UUID) -> WebhookConfig | None:
+        """
+        Return the loaded configuration with this ID, or None.
+
+        Scans `get_all()`; processors keep an ID index and override this.
+
+        Args:
+            webhook_id (UUID): Webhook ID.
+        """
+        return next((w for w in self.get_all() if w.id == webhook_id), None)
+
+    def targets(self, payload: T) -> list[WebhookConfig]:
+        """
+        Return the webhooks that should receive `payload`.
+
+        Processors that filter (e.g. alert thresholds) override this;
+        by default every loaded webhook is a target.
+
+        Args:
+            payload (T): The event payload.
+        """
+        return self.get_all()
+
+    def targets_batch(self, payloads: list[T]) -> list[list[WebhookConfig]]:
+        """
+        Return the targets of each payload in `payloads`.
+
+        Processors with a cheaper bulk evaluation override this.
+
+        Args:
+            payloads (list[T]): Event payloads.
+        """
+        return [self.targets(payload) for payload in payloads]
+
+    def deliveries_batch(self, payloads: list[T]) -> list[list[tuple[WebhookConfig, dict]]]:
+        """
+        Return the (webhook, body) deliveries of each payload in `payloads`.
+
+        By default every target receives the payload itself; processors whose
+        bodies depend on the target (e.g. alert transitions) override this.
+        Targets of one payload that receive the same body share the same dict.
+
+        Args:
+            payloads (list[T]): Event payloads.
+        """
+        deliveries = []
+        for payload, targets in zip(payloads, self.targets_batch(payloads)):
+            body = payload.model_dump() if targets else {}
+            deliveries.append([(webhook, body) for webhook in targets])
+        return deliveries
+
+    def stage_deliveries_batch(
+        self, payloads: list[T]
+    ) -> tuple[list[list[tuple[WebhookConfig, dict]]], Callable[[], None]]:
+        """
+        `deliveries_batch` for deliveries that are stored before they are sent.
+
+        Returns the deliveries and a callback applying the state their evaluation
+        changed; call it once the deliveries are durably stored, or drop it to
+        leave the processor as if the payloads were never seen. Stateless
+        processors have nothing to apply.
+
+        Args:
+            payloads (list[T]): Event payloads.
+        """
+        return self.deliveries_batch(payloads), _nothing_to_commit
+
     @abstractmethod
     def add(self, config: WebhookConfig) -> None:
         """
@@ -82,3 +165,7 @@ class WebhookProcessorInterface(ABC, Generic[T]):
             config (WebhookConfig): New configuration to replace an old one with the same ID.
         """
         ...
+
+
+def _nothing_to_commit() -> None:
+    pass
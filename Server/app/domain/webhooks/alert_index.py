@@ -0,0 +1,220 @@
+import math
+import random
+from itertools import count
+from typing import Any, Iterable, Iterator
+from uuid import UUID
+
+from app.models.schemas.webhook.webhook_schema import WebhookConfig
+
+
+# ─── Interval Tree ──────────────────────────────────────────
+
+class _Node:
+    __slots__ = ("key", "high", "value", "priority", "max_high", "left", "right")
+
+    def __init__(self, key: tuple[float, int], high: float, value: Any):
+        self.key = key  # (low, sequence) — unique, ordered by the interval's low end
+        self.high = high
+        self.value = value
+        self.priority = random.random()
+        self.max_high = high  # largest `high` in this subtree
+        self.left: _Node | None = None
+        self.right: _Node | None = None
+
+    def update(self) -> None:
+        self.max_high = self.high
+        if self.left is not None and self.left.max_high > self.max_high:
+            self.max_high = self.left.max_high
+        if self.right is not None and self.right.max_high > self.max_high:
+            self.max_high = self.right.max_high
+
+
+class IntervalTree:
+    """
+    Closed intervals [low, high] supporting insert, delete and stabbing queries.
+
+    A treap (randomised balanced BST) keyed by `low`, where every node also stores
+    the largest `high` of its subtree. Insert and delete are O(log n) expected;
+    `stab(x)` returns every interval containing x in O(k · log n), pruning subtrees
+    whose intervals all end before x or start after it.
+    """
+
+    def __init__(self):
+        self._root: _Node | None = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def insert(self, key: tuple[float, int], high: float, value: Any) -> None:
+        self._root = self._insert(self._root, _Node(key, high, value))
+        self._size += 1
+
+    def delete(self, key: tuple[float, int]) -> None:
+        self._root, removed = self._delete(self._root, key)
+        if removed:
+            self._size -= 1
+
+    def stab(self, x: float) -> Iterator[Any]:
+        """Yield the value of every interval with low <= x <= high."""
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node is None or node.max_high < x:
+                continue
+            stack.append(node.left)
+            if node.key[0] <= x:
+                if x <= node.high:
+                    yield node.value
+                stack.append(node.right)
+
+    # Treap internals
+
+    @staticmethod
+    def _rotate_right(node: _Node) -> _Node:
+        pivot = node.left
+        assert pivot is not None
+        node.left, pivot.right = pivot.right, node
+        node.update()
+        pivot.update()
+        return pivot
+
+    @staticmethod
+    def _rotate_left(node: _Node) -> _Node:
+        pivot = node.right
+        assert pivot is not None
+        node.right, pivot.left = pivot.left, node
+        node.update()
+        pivot.update()
+        return pivot
+
+    def _insert(self, root: _Node | None, node: _Node) -> _Node:
+        if root is None:
+            return node
+        if node.key < root.key:
+            root.left = self._insert(root.left, node)
+            if root.left.priority > root.priority:
+                return self._rotate_right(root)
+        else:
+            root.right = self._insert(root.right, node)
+            if root.right.priority > root.priority:
+                return self._rotate_left(root)
+        root.update()
+        return root
+
+    def _delete(self, root: _Node | None, key: tuple[float, int]) -> tuple[_Node | None, bool]:
+        if root is None:
+            return None, False
+        if key < root.key:
+            root.left, removed = self._delete(root.left, key)
+        elif key > root.key:
+            root.right, removed = self._delete(root.right, key)
+        else:
+            if root.left is None:
+                return root.right, True
+            if root.right is None:
+                return root.left, True
+            # Rotate the node down towards a leaf, then retry
+            if root.left.priority > root.right.priority:
+                root = self._rotate_right(root)
+                root.right, removed = self._delete(root.right, key)
+            else:
+                root = self._rotate_left(root)
+                root.left, removed = self._delete(root.left, key)
+        root.update()
+        return root, removed
+
+
+# ─── Alert Rule Index ───────────────────────────────────────
+
+def _bounds(bounds: Iterable[float | None]) -> tuple[float, float]:
+    min_val, max_val = bounds
+    return (
+        -math.inf if min_val is None else float(min_val),
+        math.inf if max_val is None else float(max_val),
+    )
+
+
+class AlertRuleIndex:
+    """
+    Index of ALERT_TRIGGERED webhooks by their parameter ranges.
+
+    A webhook matches a reading if any of its `{field: [min, max]}` conditions holds
+    (None = unbounded), the same rule as `AlertWebhookProcessor._matches_any_condition`.
+    Each field has an `IntervalTree` of the conditions on it, so a reading costs one
+    stabbing query per field instead of a scan over every rule. Webhooks are added,
+    removed and replaced individually.
+
+    Matches are returned in the order the webhooks were added.
+    """
+
+    def __init__(self, webhooks: Iterable[WebhookConfig] = ()):
+        self._trees: dict[str, IntervalTree] = {}
+        self._entries: dict[UUID, tuple[int, WebhookConfig, list[tuple[str, tuple[float, int]]]]] = {}
+        self._sequence = count()
+        for webhook in webhooks:
+            self.add(webhook)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, webhook_id: UUID) -> bool:
+        return webhook_id in self._entries
+
+    def get(self, webhook_id: UUID) -> WebhookConfig | None:
+        entry = self._entries.get(webhook_id)
+        return entry[1] if entry else None
+
+    def add(self, webhook: WebhookConfig) -> None:
+        """
+        Index a webhook's conditions. Webhooks without parameters never match.
+        Re-adding an indexed ID replaces it.
+        """
+        if webhook.id in self._entries:
+            self.remove(webhook.id)
+        order = next(self._sequence)
+        keys: list[tuple[str, tuple[float, int]]] = []
+        for field, bounds in (webhook.parameters or {}).items():
+            low, high = _bounds(bounds)
+            if low > high:
+                continue  # empty range can never match
+            key = (low, next(self._sequence))
+            self._trees.setdefault(field, IntervalTree()).insert(key, high, webhook.id)
+            keys.append((field, key))
+        self._entries[webhook.id] = (order, webhook, keys)
+
+    def remove(self, webhook_id: UUID) -> None:
+        entry = self._entries.pop(webhook_id, None)
+        if entry is None:
+            return
+        for field, key in entry[2]:
+            tree = self._trees[field]
+            tree.delete(key)
+            if not len(tree):
+                del self._trees[field]
+
+    def replace(self, webhook: WebhookConfig) -> None:
+        self.add(webhook)
+
+    def clear(self) -> None:
+        self._trees.clear()
+        self._entries.clear()
+
+    def match_ids(self, data: dict[str, Any]) -> set[UUID]:
+        """
+        IDs of the webhooks with at least one condition satisfied by `data`.
+        """
+        matched: set[UUID] = set()
+        for field, tree in self._trees.items():
+            value = data.get(field)
+            if value is None:
+                continue
+            matched.update(tree.stab(value))
+        return matched
+
+    def match(self, data: dict[str, Any]) -> list[WebhookConfig]:
+        """
+        Webhooks matching `data`, in insertion order.
+        """
+        entries = sorted(self._entries[webhook_id] for webhook_id in self.match_ids(data))
+        return [webhook for _, webhook, _ in entries]
@@ -0,0 +1,82 @@
+from typing import Any, Sequence
+import numpy as np
+
+from app.models.schemas.webhook.webhook_schema import WebhookConfig
+
+
+# Largest reading×rule boolean block evaluated at once (bounds temporary memory)
+MATCH_BLOCK_CELLS = 4_000_000
+
+
+def readings_matrix(readings: Sequence[dict[str, Any]], fields: Sequence[str]) -> np.ndarray:
+    """
+    Pack readings into an (n_readings × n_fields) float matrix; missing values are NaN.
+    """
+    matrix = np.empty((len(readings), len(fields)))
+    for j, field in enumerate(fields):
+        # dtype=float turns None into NaN
+        matrix[:, j] = np.array([reading.get(field) for reading in readings], dtype=float)
+    return matrix
+
+
+class AlertRuleMatrix:
+    """
+    Alert conditions as dense threshold matrices for batch evaluation with NumPy.
+
+    The fields are those named in any rule's parameters. `lows` and `highs` are
+    (n_fields × n_rules): rule r's condition on field f is
+    lows[f, r] <= value <= highs[f, r], with ±inf for unbounded ends. A field a rule
+    does not constrain gets the empty range (+inf, -inf), so it never matches; NaN
+    (missing) readings never match either. A rule matches a reading if any of its
+    conditions holds — the same rule as `AlertWebhookProcessor._matches_any_condition`.
+
+    Fields whose conditions are all empty ranges are not evaluated.
+    """
+
+    def __init__(self, webhooks: Sequence[WebhookConfig]):
+        self.webhooks = list(webhooks)
+        field_pos: dict[str, int] = {}
+        for webhook in self.webhooks:
+            for field in webhook.parameters or {}:
+                field_pos.setdefault(field, len(field_pos))
+        self.fields = list(field_pos)
+        self._webhook_array = np.empty(len(self.webhooks), dtype=object)
+        self._webhook_array[:] = self.webhooks
+
+        self.lows = np.full((len(self.fields), len(self.webhooks)), np.inf)
+        self.highs = np.full((len(self.fields), len(self.webhooks)), -np.inf)
+        for r, webhook in enumerate(self.webhooks):
+            for field, (min_val, max_val) in (webhook.parameters or {}).items():
+                f = field_pos[field]
+                self.lows[f, r] = -np.inf if min_val is None else min_val
+                self.highs[f, r] = np.inf if max_val is None else max_val
+
+        self.active_fields = np.flatnonzero((self.lows <= self.highs).any(axis=1))
+
+    def match(self, values: np.ndarray) -> np.ndarray:
+        """
+        Boolean (n_readings × n_rules) match matrix for a `readings_matrix`.
+        """
+        n_readings, n_rules = values.shape[0], len(self.webhooks)
+        matches = np.zeros((n_readings, n_rules), dtype=bool)
+        if not n_readings or not n_rules:
+            return matches
+
+        block = max(1, MATCH_BLOCK_CELLS // n_rules)
+        for start in range(0, n_readings, block):
+            rows = values[start:start + block]
+            out = matches[start:start + block]
+            for f in self.active_fields:
+                column = rows[:, f, None]
+                out |= (column >= self.lows[f]) & (column <= self.highs[f])
+        return matches
+
+    def match_readings(self, readings: Sequence[dict[str, Any]]) -> list[list[WebhookConfig]]:
+        """
+        Matching webhooks for each reading, in rule order.
+        """
+        matches = self.match(readings_matrix(readings, self.fields))
+        _, rules = np.nonzero(matches)  # row-major: grouped by reading, rules ascending
+        matched = self._webhook_array[rules]
+        bounds = np.cumsum(matches.sum(axis=1))[:-1]
+        return [group.tolist() for group in np.split(matched, bounds)] if len(readings) else []
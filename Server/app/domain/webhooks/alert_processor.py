@@ -1,18 +1,19 @@
-from typing import Any, List
+import time
+from typing import Any, Callable, List
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from pydantic import AnyHttpUrl, SecretStr, TypeAdapter
 
 from app.domain.webhooks.WebhookProcessorInterface import WebhookProcessorInterface
+from app.domain.webhooks.alert_index import AlertRuleIndex
+from app.domain.webhooks.alert_matrix import AlertRuleMatrix
+from app.domain.webhooks.alert_state import AlertStateTracker
 from app.models.schemas.rest.sensor_data_schemas import SensorDataIn
 from app.models.schemas.webhook.webhook_schema import WebhookConfig
-from app.infrastructure.database.repository.webhook.webhook_repository import get_active_webhooks_by_event
-from app.infrastructure.database.repository.restAPI.secret_repository import get_user_secret_by_id
-from app.models.DB_tables.webhook import Webhook
-from app.utils.crypto_utils import decrypt_secret
-from app.constants.webhooks import WebhookEvent
-from app.domain.webhooks.send_webhook import send_webhook
+from app.constants.webhooks import AlertState, WebhookEvent
+from app.domain.webhooks.fanout import FanOutResult, webhook_fanout
+from app.domain.webhooks.webhook_configs import load_webhook_configs
+from app.utils.config import settings
 
 
 class AlertWebhookProcessor(WebhookProcessorInterface[SensorDataIn]):
@@ -20,47 +21,47 @@ class AlertWebhookProcessor(WebhookProcessorInterface[SensorDataIn]):
     A webhook processor for the ALERT_TRIGGERED event.
 
     Loads webhook configurations from the DB, evaluates sensor data against alert thresholds,
-    and dispatches webhook calls when matches occur.
+    and dispatches webhook calls when matches occur. Thresholds are kept in an
+    `AlertRuleIndex`, so matching a reading does not scan every rule; large batches
+    of readings are matched at once against an `AlertRuleMatrix`.
+
+    With ALERT_STATEFUL_ENABLED, a rule notifies when a device's readings enter its
+    range (and, per its `AlertPolicy`, when they leave it) instead of on every
+    matching reading; see `AlertStateTracker`. Payloads carry `alert_state`.
 
     Implements the WebhookProcessorInterface for SensorDataIn payloads.
     """
 
-    _webhooks: List[WebhookConfig] = []
     payload_model = SensorDataIn  # Static typing of expected payloads
 
+    def __init__(self):
+        self._webhooks: List[WebhookConfig] = []
+        self._index = AlertRuleIndex()
+        self._matrix: AlertRuleMatrix | None = None  # built on first batch use after a change
+        self._states = AlertStateTracker(default_hold_off=settings.ALERT_HOLD_OFF_SECONDS)
+
     async def load(self, session: AsyncSession) -> None:
         """
-        Load all active alert-triggering webhooks from the database.
-
-        Decrypts user secrets, parses config into WebhookConfig,
-        and stores them in memory for fast access.
+        Load all active alert-triggering webhooks (with decrypted secrets) from the database.
         """
-        db_webhooks: List[Webhook] = await get_active_webhooks_by_event(
-            session, WebhookEvent.ALERT_TRIGGERED.value
-        )
-
-        parsed: List[WebhookConfig] = []
-        for row in db_webhooks:
-            # Must have parameters and a valid secret
-            if not row.parameters or not row.secret_id:
-                continue
+        configs = await load_webhook_configs(session, [WebhookEvent.ALERT_TRIGGERED])
+        self.set_all(configs[WebhookEvent.ALERT_TRIGGERED])
 
-            secret_obj = await get_user_secret_by_id(session, row.secret_id)
-            if not secret_obj:
-                continue
+    def set_all(self, configs: List[WebhookConfig]) -> None:
+        """
+        Replace the in-memory configs with `configs` and rebuild the rule index.
 
-            config = WebhookConfig(
-                id=row.id,
-                target_url=TypeAdapter(AnyHttpUrl).validate_python(row.target_url),
-                secret=SecretStr(decrypt_secret(secret_obj.secret)),
-                custom_headers=row.custom_headers,
-                parameters=row.parameters,
-                event_type=WebhookEvent.ALERT_TRIGGERED
-            )
-            parsed.append(config)
+        Webhooks without parameters can never trigger, and webhooks without a
+        secret cannot be signed; both are dropped.
 
+        Args:
+            configs (List[WebhookConfig]): Configs of the ALERT_TRIGGERED event.
+        """
         # Sort webhooks based on parameter keys for consistent triggering order
-        self._webhooks = sorted(parsed, key=self._sort_key)
+        self._webhooks = sorted((c for c in configs if self._usable(c)), key=self._sort_key)
+        self._index = AlertRuleIndex(self._webhooks)
+        self._matrix = None
+        self._states.clear()
 
     def get_all(self) -> List[WebhookConfig]:
         """
@@ -71,15 +72,26 @@ class AlertWebhookProcessor(WebhookProcessorInterface[SensorDataIn]):
         """
         return self._webhooks
 
+    def get(self, webhook_id: UUID) -> WebhookConfig | None:
+        """
+        Return the loaded config with this ID (from the rule index), or None.
+        """
+        return self._index.get(webhook_id)
+
     def add(self, config: WebhookConfig) -> None:
         """
-        Add a new webhook configuration and keep the list sorted.
+        Add a webhook configuration and index its conditions, replacing any
+        loaded config with the same ID. Skipped like in `set_all` if unusable.
 
         Args:
             config (WebhookConfig): Webhook definition to add.
         """
+        self.remove(config.id)
+        if not self._usable(config):
+            return
         self._webhooks.append(config)
-        self._webhooks.sort(key=self._sort_key)
+        self._index.add(config)
+        self._matrix = None
 
     def remove(self, webhook_id: UUID) -> None:
         """
@@ -89,6 +101,9 @@ class AlertWebhookProcessor(WebhookProcessorInterface[SensorDataIn]):
             webhook_id (UUID): ID of the webhook to remove.
         """
         self._webhooks = [w for w in self._webhooks if w.id != webhook_id]
+        self._index.remove(webhook_id)
+        self._matrix = None
+        self._states.forget(webhook_id)
 
     def replace(self, config: WebhookConfig) -> None:
         """
@@ -100,23 +115,120 @@ class AlertWebhookProcessor(WebhookProcessorInterface[SensorDataIn]):
         self.remove(config.id)
         self.add(config)
 
-    async def handle(self, payload: SensorDataIn, session: AsyncSession) -> None:
+    async def handle(self, payload: SensorDataIn, session: AsyncSession) -> FanOutResult:
         """
         Handle a sensor data event. Check all loaded webhook conditions.
 
-        If any condition matches the payload, trigger the associated webhook(s).
+        Notify the webhooks whose alert the payload triggers (or clears).
 
         Args:
             payload (SensorDataIn): Incoming sensor data.
             session (AsyncSession): DB session for webhook logging/tracking.
+
+        Returns:
+            FanOutResult: Aggregated delivery outcome for the matching webhooks.
         """
-        data_dict: dict[str, Any] = payload.model_dump()
+        result = FanOutResult(event=WebhookEvent.ALERT_TRIGGERED)
+        groups: dict[int, tuple[dict, List[WebhookConfig]]] = {}
+        for webhook, body in self.deliveries_batch([payload])[0]:
+            groups.setdefault(id(body), (body, []))[1].append(webhook)
+        for body, webhooks in groups.values():
+            result.merge(await webhook_fanout.deliver(WebhookEvent.ALERT_TRIGGERED, webhooks, body, session))
+        return result
 
-        for webhook in self._webhooks:
-            if not webhook.parameters:
-                continue
-            if self._matches_any_condition(data_dict, webhook.parameters):
-                await send_webhook(session, webhook, data_dict)
+    def targets(self, payload: SensorDataIn) -> List[WebhookConfig]:
+        """
+        Return the webhooks whose conditions match the payload, regardless of alert state.
+
+        Args:
+            payload (SensorDataIn): Incoming sensor data.
+        """
+        return self._index.match(payload.model_dump())
+
+    def targets_batch(self, payloads: List[SensorDataIn]) -> List[List[WebhookConfig]]:
+        """
+        Return the matching webhooks of each payload, regardless of alert state.
+
+        Args:
+            payloads (List[SensorDataIn]): Incoming sensor data.
+        """
+        return self._match([payload.model_dump() for payload in payloads])
+
+    def deliveries_batch(
+        self, payloads: List[SensorDataIn], now: float | None = None
+    ) -> List[List[tuple[WebhookConfig, dict]]]:
+        """
+        Evaluate readings in order against the alert state of each (rule, device)
+        and return the notifications to send for each one.
+
+        The body is the reading plus `alert_state` ("triggered" or "cleared").
+
+        Args:
+            payloads (List[SensorDataIn]): Incoming sensor data, oldest first.
+            now (float | None): Monotonic time of the readings.
+        """
+        return self._deliveries(payloads, self._states, now)
+
+    def stage_deliveries_batch(
+        self, payloads: List[SensorDataIn], now: float | None = None
+    ) -> tuple[List[List[tuple[WebhookConfig, dict]]], Callable[[], None]]:
+        """
+        `deliveries_batch` evaluated against a staged copy of the alert state;
+        the returned callback commits it.
+
+        Args:
+            payloads (List[SensorDataIn]): Incoming sensor data, oldest first.
+            now (float | None): Monotonic time of the readings.
+        """
+        staged = self._states.stage()
+        return self._deliveries(payloads, staged, now), staged.commit
+
+    def _deliveries(
+        self, payloads: List[SensorDataIn], states: AlertStateTracker, now: float | None
+    ) -> List[List[tuple[WebhookConfig, dict]]]:
+        readings = [payload.model_dump() for payload in payloads]
+        matched = self._match(readings)
+        if not settings.ALERT_STATEFUL_ENABLED:
+            deliveries = []
+            for data, targets in zip(readings, matched):
+                body = {**data, "alert_state": AlertState.TRIGGERED.value}
+                deliveries.append([(webhook, body) for webhook in targets])
+            return deliveries
+
+        now = time.monotonic() if now is None else now
+        deliveries = []
+        for data, targets in zip(readings, matched):
+            device_id = data["device_id"]
+            candidates = [(webhook, True) for webhook in targets]
+            matched_ids = {webhook.id for webhook in targets}
+            for webhook_id in states.active_ids(device_id) - matched_ids:
+                webhook = self._index.get(webhook_id)
+                if webhook is not None:
+                    candidates.append((webhook, False))
+
+            bodies: dict[AlertState, dict] = {}
+            notifications = []
+            for webhook, is_match in candidates:
+                state = states.observe(webhook, device_id, data, is_match, now)
+                if state is None:
+                    continue
+                body = bodies.get(state)
+                if body is None:
+                    body = bodies[state] = {**data, "alert_state": state.value}
+                notifications.append((webhook, body))
+            deliveries.append(notifications)
+        return deliveries
+
+    def _match(self, readings: List[dict[str, Any]]) -> List[List[WebhookConfig]]:
+        """
+        Matching webhooks of each reading. Batches of at least ALERT_VECTORIZE_MIN_BATCH
+        readings are evaluated in one pass over the rule matrix; smaller ones go through the index.
+        """
+        if len(readings) < settings.ALERT_VECTORIZE_MIN_BATCH or not self._webhooks:
+            return [self._index.match(data) for data in readings]
+        if self._matrix is None:
+            self._matrix = AlertRuleMatrix(self._webhooks)
+        return self._matrix.match_readings(readings)
 
     def _matches_any_condition(
         self,
@@ -125,6 +237,7 @@ class AlertWebhookProcessor(WebhookProcessorInterface[SensorDataIn]):
     ) -> bool:
         """
         Check if the sensor data matches at least one parameter condition.
+        Reference implementation of the rule `AlertRuleIndex` and `AlertRuleMatrix` evaluate.
 
         Each parameter is treated as [min, max] range.
         Returns True if value lies in range for any defined parameter.
@@ -144,6 +257,11 @@ class AlertWebhookProcessor(WebhookProcessorInterface[SensorDataIn]):
                 return True
         return False
 
+    @staticmethod
+    def _usable(config: WebhookConfig) -> bool:
+        """A rule can trigger (has conditions) and its deliveries can be signed."""
+        return bool(config.parameters) and bool(config.secret.get_secret_value())
+
     def _sort_key(self, w: WebhookConfig):
         """
         Create a deterministic sort key for webhook configs.
@@ -0,0 +1,215 @@
+import math
+import time
+from dataclasses import dataclass, replace
+from typing import Any
+from uuid import UUID
+
+from app.constants.webhooks import AlertState
+from app.models.schemas.webhook.webhook_schema import AlertPolicy, WebhookConfig
+
+
+DEFAULT_POLICY = AlertPolicy()
+
+
+@dataclass
+class _RuleState:
+    active: bool = False
+    notified: bool = False  # the current (or last) episode's trigger was delivered
+    last_triggered_at: float = -math.inf
+
+
+def within_band(webhook: WebhookConfig, policy: AlertPolicy, data: dict[str, Any]) -> bool:
+    """
+    True if any condition of `webhook` holds once its [min, max] is widened by the
+    policy's hysteresis band for that field.
+    """
+    for field, (min_val, max_val) in (webhook.parameters or {}).items():
+        value = data.get(field)
+        if value is None:
+            continue
+        band = policy.hysteresis.get(field, 0.0)
+        if (min_val is None or value >= min_val - band) and (max_val is None or value <= max_val + band):
+            return True
+    return False
+
+
+class AlertStateTracker:
+    """
+    Alert state of every (rule, device) pair.
+
+    A pair becomes active when a reading of the device matches the rule, which
+    triggers a notification unless the rule triggered for that device less than
+    the hold-off ago; such a deferred trigger is sent with the first reading after
+    the hold-off if the pair is still active. It stays active, silently, while
+    readings remain within the rule's range widened by its hysteresis band, and
+    clears on the first reading outside it — notifying only if the policy asks for
+    exit notifications and the episode's trigger was delivered.
+
+    Times are monotonic. State is per process: after a restart, ongoing excursions
+    trigger once more. Use `stage()` when the notifications are stored before they
+    are sent, so the state only advances once they are.
+    """
+
+    def __init__(self, default_hold_off: float):
+        self.default_hold_off = default_hold_off
+        self._states: dict[tuple[UUID, UUID], _RuleState] = {}
+        self._active: dict[UUID, set[UUID]] = {}  # device ID -> IDs of its active rules
+        self._generation = 0  # bumped by forget/clear; invalidates pending stages
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def active_ids(self, device_id: UUID) -> set[UUID]:
+        return self._active.get(device_id, set())
+
+    def stage(self) -> "StagedAlertStates":
+        """Start a set of state changes that only apply to this tracker on `commit()`."""
+        return StagedAlertStates(self)
+
+    def _load(self, key: tuple[UUID, UUID]) -> _RuleState | None:
+        return self._states.get(key)
+
+    def _store(self, key: tuple[UUID, UUID], state: _RuleState | None) -> None:
+        if state is None:
+            self._states.pop(key, None)
+        else:
+            self._states[key] = state
+
+    def _set_active(self, device_id: UUID, webhook_id: UUID, active: bool) -> None:
+        rules = self._active.setdefault(device_id, set())
+        if active:
+            rules.add(webhook_id)
+        else:
+            rules.discard(webhook_id)
+        if not rules:
+            del self._active[device_id]
+
+    def hold_off(self, policy: AlertPolicy) -> float:
+        return self.default_hold_off if policy.hold_off_seconds is None else policy.hold_off_seconds
+
+    def observe(
+        self,
+        webhook: WebhookConfig,
+        device_id: UUID,
+        data: dict[str, Any],
+        matched: bool,
+        now: float | None = None,
+    ) -> AlertState | None:
+        """
+        Feed one reading to the state of (webhook, device).
+
+        Args:
+            webhook (WebhookConfig): Alert rule.
+            device_id (UUID): Device the reading came from.
+            data (dict): The reading.
+            matched (bool): Whether the reading satisfies the rule's conditions.
+            now (float | None): Monotonic time of the reading.
+
+        Returns:
+            AlertState | None: The notification to send, if any.
+        """
+        key = (webhook.id, device_id)
+        state = self._load(key)
+        if state is None:
+            if not matched:
+                return None
+            state = _RuleState()
+            self._store(key, state)
+
+        now = time.monotonic() if now is None else now
+        policy = webhook.alert_policy or DEFAULT_POLICY
+
+        if not state.active:
+            if not matched:
+                return None
+            state.active = True
+            self._set_active(device_id, webhook.id, True)
+            if now - state.last_triggered_at < self.hold_off(policy):
+                state.notified = False
+                return None
+            state.notified = True
+            state.last_triggered_at = now
+            return AlertState.TRIGGERED
+
+        if matched or within_band(webhook, policy, data):
+            if state.notified or now - state.last_triggered_at < self.hold_off(policy):
+                return None
+            # Excursion began within the hold-off and outlasted it: send its deferred trigger
+            state.notified = True
+            state.last_triggered_at = now
+            return AlertState.TRIGGERED
+
+        state.active = False
+        self._set_active(device_id, webhook.id, False)
+        notify = policy.notify_on_exit and state.notified
+        if now - state.last_triggered_at >= self.hold_off(policy):
+            self._store(key, None)  # nothing left to remember
+        return AlertState.CLEARED if notify else None
+
+    def forget(self, webhook_id: UUID) -> None:
+        """Drop all state of a rule (e.g. after it was removed or its thresholds changed)."""
+        for key in [key for key in self._states if key[0] == webhook_id]:
+            del self._states[key]
+        for device_id in list(self._active):
+            self._set_active(device_id, webhook_id, False)
+        self._generation += 1
+
+    def clear(self) -> None:
+        self._states.clear()
+        self._active.clear()
+        self._generation += 1
+
+
+class StagedAlertStates(AlertStateTracker):
+    """
+    State changes computed on top of an `AlertStateTracker` without touching it.
+
+    Reads fall through to the tracker; written states are copies kept here until
+    `commit()` applies them. Dropped instead if the tracker's rules were changed
+    (forget/clear) in the meantime, as they were computed against the old rules.
+    """
+
+    def __init__(self, tracker: AlertStateTracker):
+        super().__init__(tracker.default_hold_off)
+        self._tracker = tracker
+        self._base_generation = tracker._generation
+        self._states: dict[tuple[UUID, UUID], _RuleState | None] = {}  # None: removed
+
+    def active_ids(self, device_id: UUID) -> set[UUID]:
+        if device_id in self._active:
+            return self._active[device_id]
+        return self._tracker.active_ids(device_id)
+
+    def _load(self, key: tuple[UUID, UUID]) -> _RuleState | None:
+        if key in self._states:
+            return self._states[key]
+        state = self._tracker._load(key)
+        if state is not None:
+            state = self._states[key] = replace(state)
+        return state
+
+    def _store(self, key: tuple[UUID, UUID], state: _RuleState | None) -> None:
+        self._states[key] = state
+
+    def _set_active(self, device_id: UUID, webhook_id: UUID, active: bool) -> None:
+        rules = self._active.get(device_id)
+        if rules is None:
+            rules = self._active[device_id] = set(self._tracker.active_ids(device_id))
+        if active:
+            rules.add(webhook_id)
+        else:
+            rules.discard(webhook_id)
+
+    def commit(self) -> None:
+        """Apply the staged changes to the tracker (once, and only if its rules are unchanged)."""
+        tracker = self._tracker
+        if tracker._generation == self._base_generation:
+            for key, state in self._states.items():
+                tracker._store(key, state)
+            for device_id, rules in self._active.items():
+                if rules:
+                    tracker._active[device_id] = rules
+                else:
+                    tracker._active.pop(device_id, None)
+        self._states = {}
+        self._active = {}
@@ -0,0 +1,226 @@
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.constants.webhooks import CircuitState
+from app.domain.webhooks.send_webhook import DeliveryResult, deliver_with_retry
+from app.infrastructure.database.repository.restAPI.secret_repository import update_webhook_retry
+from app.models.schemas.webhook.webhook_schema import WebhookConfig
+from app.utils.config import settings
+
+
+# Weight of the newest outcome in the health score (exponential moving average)
+HEALTH_SCORE_WEIGHT = 0.2
+
+
+@dataclass
+class CircuitBreaker:
+    """
+    Delivery circuit of one webhook.
+
+    CLOSED: deliveries flow. After `failure_threshold` consecutive failed deliveries
+    the circuit OPENs and deliveries are refused for the reset timeout, which doubles
+    (up to `max_reset_seconds`) each time the circuit re-opens. Once it elapses the
+    circuit is HALF_OPEN: a single probe delivery is let through; success closes the
+    circuit, failure opens it again.
+
+    Times are monotonic; `retry_at` converts the reopening time to wall-clock for display.
+    """
+    failure_threshold: int
+    reset_seconds: float
+    max_reset_seconds: float
+
+    state: CircuitState = CircuitState.CLOSED
+    consecutive_failures: int = 0
+    trips: int = 0  # consecutive times the circuit opened without closing
+    opened_at: float = 0.0
+    probe_in_flight: bool = False
+    health_score: float = 1.0
+
+    def current_reset_seconds(self) -> float:
+        return min(self.max_reset_seconds, self.reset_seconds * 2 ** max(self.trips - 1, 0))
+
+    def allow(self, now: float | None = None) -> bool:
+        """
+        True if a delivery may be attempted now. Moves OPEN → HALF_OPEN when the
+        reset timeout has elapsed and reserves the single probe.
+        """
+        now = time.monotonic() if now is None else now
+        if self.state == CircuitState.OPEN:
+            if now - self.opened_at < self.current_reset_seconds():
+                return False
+            self.state = CircuitState.HALF_OPEN
+        if self.state == CircuitState.HALF_OPEN:
+            if self.probe_in_flight:
+                return False
+            self.probe_in_flight = True
+        return True
+
+    def record_success(self) -> bool:
+        """
+        Returns:
+            bool: True if this closed an open circuit.
+        """
+        reopened = self.state != CircuitState.CLOSED
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.trips = 0
+        self.probe_in_flight = False
+        self.health_score += HEALTH_SCORE_WEIGHT * (1.0 - self.health_score)
+        return reopened
+
+    def record_failure(self, now: float | None = None) -> bool:
+        """
+        Returns:
+            bool: True if this failure opened the circuit.
+        """
+        now = time.monotonic() if now is None else now
+        self.consecutive_failures += 1
+        self.health_score -= HEALTH_SCORE_WEIGHT * self.health_score
+        if self.state == CircuitState.HALF_OPEN or (
+            self.state == CircuitState.CLOSED and self.consecutive_failures >= self.failure_threshold
+        ):
+            self.state = CircuitState.OPEN
+            self.trips += 1
+            self.opened_at = now
+            self.probe_in_flight = False
+            return True
+        return False
+
+    def release_probe(self) -> None:
+        """Give back a probe slot that was reserved but not used for an attempt."""
+        self.probe_in_flight = False
+
+    def retry_in(self, now: float | None = None) -> float:
+        """Seconds until the circuit lets a probe through (0 unless OPEN)."""
+        if self.state != CircuitState.OPEN:
+            return 0.0
+        now = time.monotonic() if now is None else now
+        return max(0.0, self.opened_at + self.current_reset_seconds() - now)
+
+    def retry_at(self) -> datetime | None:
+        if self.state != CircuitState.OPEN:
+            return None
+        return datetime.now(timezone.utc) + timedelta(seconds=self.retry_in())
+
+
+class CircuitBreakerRegistry:
+    """
+    Circuit breakers of all webhook targets, keyed by webhook ID and created on first use.
+    State is per process and starts CLOSED after a restart.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float, max_reset_seconds: float):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self.max_reset_seconds = max(reset_seconds, max_reset_seconds)
+        self._breakers: dict[UUID, CircuitBreaker] = {}
+
+    def get(self, webhook_id: UUID) -> CircuitBreaker:
+        breaker = self._breakers.get(webhook_id)
+        if breaker is None:
+            breaker = self._breakers[webhook_id] = CircuitBreaker(
+                self.failure_threshold, self.reset_seconds, self.max_reset_seconds
+            )
+        return breaker
+
+    def peek(self, webhook_id: UUID) -> CircuitBreaker | None:
+        """The breaker if the webhook has delivered at least once in this process."""
+        return self._breakers.get(webhook_id)
+
+    def forget(self, webhook_id: UUID) -> None:
+        """Reset a webhook's circuit (e.g. after it was deleted or reconfigured)."""
+        self._breakers.pop(webhook_id, None)
+
+    def record(self, webhook_id: UUID, ok: bool, retryable: bool) -> str | None:
+        """
+        Feed a delivery outcome to the webhook's breaker.
+
+        Only retryable failures (5xx, network errors) count against the circuit:
+        a 4xx means the receiver is up but rejects the payload.
+
+        Returns:
+            str | None: "opened" or "closed" when the circuit changed state.
+        """
+        breaker = self.get(webhook_id)
+        if ok:
+            if breaker.record_success():
+                logger.info("[WEBHOOK] Circuit closed | id=%s", webhook_id)
+                return "closed"
+            return None
+        if not retryable:
+            breaker.release_probe()
+            return None
+        if breaker.record_failure():
+            logger.warning(
+                "[WEBHOOK] Circuit opened | id=%s | failures=%d | retry_in=%.0fs",
+                webhook_id, breaker.consecutive_failures, breaker.retry_in()
+            )
+            return "opened"
+        return None
+
+
+# ─── Singleton Registry ────────────────────────────────────────
+webhook_breakers = CircuitBreakerRegistry(
+    failure_threshold=settings.WEBHOOK_BREAKER_FAILURE_THRESHOLD,
+    reset_seconds=settings.WEBHOOK_BREAKER_RESET_SECONDS,
+    max_reset_seconds=settings.WEBHOOK_BREAKER_MAX_RESET_SECONDS,
+)
+
+
+# ─── Guarded Delivery ──────────────────────────────────────────
+
+CIRCUIT_OPEN_RESULT = DeliveryResult(ok=False, retryable=True, error="Circuit open", deferred=True)
+
+
+async def deliver_through_circuit(webhook: WebhookConfig, payload_json: str, retry: bool = True) -> DeliveryResult:
+    """
+    Deliver unless the webhook's circuit is open, and feed the outcome back to it.
+
+    A half-open probe is a single attempt, whatever `retry` says.
+
+    Args:
+        webhook (WebhookConfig): Target webhook.
+        payload_json (str): Body from `serialize_payload`.
+        retry (bool): Use the MAX_ATTEMPTS_PER_WEBHOOK retry loop (False: one attempt).
+
+    Returns:
+        DeliveryResult: `deferred` if the circuit refused the delivery; `circuit` set
+        if the outcome opened or closed the circuit.
+    """
+    breaker = webhook_breakers.get(webhook.id)
+    if not breaker.allow():
+        return CIRCUIT_OPEN_RESULT
+
+    max_attempts = None if retry and breaker.state == CircuitState.CLOSED else 1
+    try:
+        result = await deliver_with_retry(webhook, payload_json, max_attempts=max_attempts)
+    except BaseException:
+        breaker.release_probe()
+        raise
+
+    change = webhook_breakers.record(webhook.id, result.ok, result.retryable)
+    return replace(result, circuit=change) if change else result
+
+
+async def record_circuit_change(session: AsyncSession, webhook_id: UUID, result: DeliveryResult) -> bool:
+    """
+    Write a circuit transition to the webhook's `last_error` (cleared when it closes).
+
+    Returns:
+        bool: True if `result` changed the circuit and was recorded.
+    """
+    if result.circuit == "opened":
+        breaker = webhook_breakers.get(webhook_id)
+        await update_webhook_retry(
+            session, webhook_id,
+            last_error=f"Circuit open after {breaker.consecutive_failures} failed deliveries: {result.error}"
+        )
+        return True
+    if result.circuit == "closed":
+        await update_webhook_retry(session, webhook_id, last_error=None)
+        return True
+    return False
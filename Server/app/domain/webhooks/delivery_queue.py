@@ -0,0 +1,148 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+from loguru import logger
+from pydantic import BaseModel
+
+from app.constants.webhooks import WebhookEvent
+
+
+# What happens when a job arrives and the queue is full
+OVERFLOW_DROP_OLDEST = "drop_oldest"  # evict the oldest queued job, keep the new one
+OVERFLOW_DROP_NEWEST = "drop_newest"  # reject the new job
+OVERFLOW_BLOCK = "block"              # wait for a free slot (back-pressure on the caller)
+OVERFLOW_POLICIES = (OVERFLOW_DROP_OLDEST, OVERFLOW_DROP_NEWEST, OVERFLOW_BLOCK)
+
+
+@dataclass(frozen=True)
+class DeliveryJob:
+    """One validated event waiting to be delivered to its subscribers."""
+    event: WebhookEvent
+    payload: BaseModel
+
+
+DeliveryHandler = Callable[[WebhookEvent, BaseModel], Awaitable[None]]
+
+
+class WebhookDeliveryQueue:
+    """
+    Bounded queue of webhook delivery jobs drained by a pool of workers.
+
+    `submit` never waits on a receiver: it only enqueues (subject to the overflow
+    policy), so event producers such as MQTT ingestion are decoupled from external
+    endpoints. `workers` tasks pull jobs and run `handler`; a failing job is logged
+    and counted, never retried here.
+
+    If the queue is not running (tests, scripts), `submit` runs the handler inline.
+    """
+
+    def __init__(self, handler: DeliveryHandler, queue_size: int, workers: int, overflow: str):
+        if overflow not in OVERFLOW_POLICIES:
+            logger.warning("[WEBHOOK] Unknown overflow policy %r; using %s", overflow, OVERFLOW_DROP_OLDEST)
+            overflow = OVERFLOW_DROP_OLDEST
+        self.handler = handler
+        self.queue_size = max(1, queue_size)
+        self.worker_count = max(1, workers)
+        self.overflow = overflow
+        self._queue: asyncio.Queue[DeliveryJob | None] | None = None
+        self._workers: list[asyncio.Task] = []
+
+        # Metrics
+        self.enqueued: int = 0
+        self.delivered: int = 0
+        self.failed: int = 0
+        self.dropped: int = 0
+
+    @property
+    def is_running(self) -> bool:
+        return any(not w.done() for w in self._workers)
+
+    def pending(self) -> int:
+        """Number of jobs waiting for a worker."""
+        return self._queue.qsize() if self._queue else 0
+
+    def start(self) -> None:
+        """Start the worker pool (idempotent)."""
+        if self.is_running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._workers = [asyncio.create_task(self._run(self._queue)) for _ in range(self.worker_count)]
+        logger.info(
+            "[WEBHOOK] Delivery queue started | workers=%d | size=%d | overflow=%s",
+            self.worker_count, self.queue_size, self.overflow
+        )
+
+    async def stop(self, drain_timeout: float = 10.0) -> None:
+        """
+        Let the workers finish queued jobs for up to `drain_timeout` seconds, then cancel them.
+        """
+        if not self.is_running or self._queue is None:
+            return
+        queue, workers = self._queue, self._workers
+        self._queue, self._workers = None, []  # new submissions run inline from here on
+
+        for _ in workers:
+            await queue.put(None)
+        _, still_running = await asyncio.wait(workers, timeout=drain_timeout)
+        for task in still_running:
+            task.cancel()
+        if still_running:
+            logger.warning("[WEBHOOK] Delivery queue stopped with %d jobs undelivered", queue.qsize())
+        logger.info(
+            "[WEBHOOK] Delivery queue stopped | delivered=%d | failed=%d | dropped=%d",
+            self.delivered, self.failed, self.dropped
+        )
+
+    async def submit(self, event: WebhookEvent, payload: BaseModel) -> bool:
+        """
+        Queue an event for delivery according to the overflow policy.
+
+        Returns:
+            bool: False if the job (or, for drop_oldest, an older one) was dropped.
+        """
+        job = DeliveryJob(event, payload)
+        if self._queue is None or not self.is_running:
+            await self._execute(job)
+            return True
+
+        if self.overflow == OVERFLOW_BLOCK:
+            await self._queue.put(job)
+            self.enqueued += 1
+            return True
+
+        accepted = True
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            accepted = False
+            self.dropped += 1
+            if self.overflow == OVERFLOW_DROP_NEWEST:
+                logger.warning("[WEBHOOK] Delivery queue full, dropped new job | event=%s", event.value)
+                return False
+            dropped = self._queue.get_nowait()
+            self._queue.task_done()
+            self._queue.put_nowait(job)
+            logger.warning(
+                "[WEBHOOK] Delivery queue full, dropped oldest job | event=%s",
+                dropped.event.value if dropped else None
+            )
+        self.enqueued += 1
+        return accepted
+
+    async def _execute(self, job: DeliveryJob) -> None:
+        try:
+            await self.handler(job.event, job.payload)
+            self.delivered += 1
+        except Exception as e:
+            self.failed += 1
+            logger.error("[WEBHOOK] Delivery job failed | event=%s | error=%s", job.event.value, str(e))
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        while True:
+            job = await queue.get()
+            try:
+                if job is None:
+                    return
+                await self._execute(job)
+            finally:
+                queue.task_done()
@@ -1,12 +1,17 @@
-from typing import Dict
+import json
+from typing import Callable, Dict
 from uuid import UUID
 from pydantic import BaseModel, ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 from loguru import logger
 
-from app.constants.webhooks import WebhookEvent
+from app.constants.webhooks import OUTBOX_EVENTS, WebhookEvent
 from app.models.schemas.webhook.webhook_schema import WebhookConfig
 from app.domain.webhooks.WebhookProcessorInterface import WebhookProcessorInterface
+from app.domain.webhooks.delivery_queue import WebhookDeliveryQueue
+from app.domain.webhooks.send_webhook import serialize_payload
+from app.domain.webhooks.webhook_configs import load_webhook_configs
+from app.models.schemas.rest.sensor_data_schemas import SensorDataOut
 
 # Import all concrete processors
 from app.domain.webhooks.alert_processor import AlertWebhookProcessor
@@ -15,6 +20,7 @@ from app.domain.webhooks.sensor_created_processor import SensorCreatedProcessor
 from app.domain.webhooks.sensor_data_received_processor import SensorDataReceivedProcessor
 from app.domain.webhooks.sensor_deleted_processor import SensorDeletedProcessor
 
+from app.utils.config import settings
 from app.utils.exceptions_base import AppException
 from app.infrastructure.database.transaction import run_in_transaction
 
@@ -27,12 +33,20 @@ class WebhookDispatcher:
     Allows:
     - Dynamic webhook config updates (add/remove/replace)
     - Lazy dispatch with runtime payload validation
+    - Asynchronous delivery through a bounded queue and worker pool
+    - Durable delivery of ingestion events through the webhook outbox
     - Full registry refresh from DB
     """
 
     def __init__(self):
         # Dictionary of event type → processor
         self._processors: Dict[WebhookEvent, WebhookProcessorInterface] = {}
+        self.delivery_queue = WebhookDeliveryQueue(
+            handler=self._deliver,
+            queue_size=settings.WEBHOOK_QUEUE_SIZE,
+            workers=settings.WEBHOOK_WORKERS,
+            overflow=settings.WEBHOOK_QUEUE_OVERFLOW,
+        )
 
     def register(self, event: WebhookEvent, processor: WebhookProcessorInterface) -> None:
         """
@@ -94,26 +108,96 @@ class WebhookDispatcher:
     async def load_all_registries(self) -> None:
         """
         Refresh all webhook processors by reloading their configs from the DB.
+
+        All events are loaded with a single query (see `load_webhook_configs`).
         """
         async with run_in_transaction() as session:
-            for processor in self._processors.values():
-                await processor.load(session)
+            configs = await load_webhook_configs(session, self._processors.keys())
+        for event, processor in self._processors.items():
+            processor.set_all(configs[event])
+
+    def find_webhook(self, webhook_id: UUID, event: WebhookEvent) -> WebhookConfig | None:
+        """
+        Look up a loaded webhook config by ID, through the processor's ID index.
+        """
+        processor = self._processors.get(event)
+        return processor.get(webhook_id) if processor else None
+
+    # ─── Outbox ────────────────────────────────────────────
+
+    def is_durable(self, event: WebhookEvent) -> bool:
+        """
+        True if deliveries of `event` go through the outbox instead of the queue.
+        """
+        return settings.WEBHOOK_OUTBOX_ENABLED and event in OUTBOX_EVENTS
+
+    def outbox_builder(self) -> Callable[[list[dict]], tuple[list[dict], Callable[[], None]]] | None:
+        """
+        Return `build_outbox_rows` when the outbox is enabled, else None.
+        Passed to the sensor data insert functions.
+        """
+        return self.build_outbox_rows if settings.WEBHOOK_OUTBOX_ENABLED else None
+
+    def build_outbox_rows(self, readings: list[dict]) -> tuple[list[dict], Callable[[], None]]:
+        """
+        Outbox rows for the ingestion events of freshly inserted readings.
+
+        One row per (reading, target webhook); alert webhooks are evaluated here so
+        only alert transitions are stored. The payload is the same JSON document
+        the queued path would sign and send.
+
+        The alert transitions are only staged: the returned callback applies them
+        to the processors' alert state and must run once the rows are committed,
+        so a rolled-back insert leaves no alert marked as notified.
+
+        Args:
+            readings (list[dict]): Inserted sensor_data rows (including `id`).
+
+        Returns:
+            tuple[list[dict], Callable[[], None]]: Values for `webhook_outbox`
+            inserts, and the post-commit callback.
+        """
+        stored = [SensorDataOut.model_validate(reading) for reading in readings]
+        deliveries_by_event = []
+        commits: list[Callable[[], None]] = []
+        for event in OUTBOX_EVENTS:
+            if processor := self._processors.get(event):
+                deliveries, commit = processor.stage_deliveries_batch(stored)
+                deliveries_by_event.append((event, deliveries))
+                commits.append(commit)
+
+        rows: list[dict] = []
+        for i in range(len(stored)):
+            documents: dict[int, dict] = {}  # id(body) -> JSON document, shared between rows
+            for event, deliveries in deliveries_by_event:
+                for webhook, body in deliveries[i]:
+                    document = documents.get(id(body))
+                    if document is None:
+                        document = documents[id(body)] = json.loads(serialize_payload(body))
+                    rows.append({"webhook_id": webhook.id, "event_type": event.value, "payload": document})
+
+        def on_commit() -> None:
+            for commit in commits:
+                commit()
+
+        return rows, on_commit
 
     async def dispatch(self, event: WebhookEvent, payload: BaseModel | dict) -> None:
         """
-        Trigger a webhook event processor with a given payload.
+        Validate an event payload and queue it for webhook delivery.
 
         Performs:
         - Payload validation (if raw dict)
         - Type enforcement
-        - Webhook delivery via the correct processor
+        - Hand-off to the delivery queue; receivers are contacted by the
+          queue workers, so the caller never waits on an external endpoint
+
+        Events covered by the outbox (see `is_durable`) are skipped here:
+        the outbox relay delivers them.
 
         Args:
             event (WebhookEvent): Type of event to dispatch.
             payload (BaseModel | dict): The event payload.
-
-        Raises:
-            AppException: On unrecoverable internal error during dispatch.
         """
         processor = self._processors.get(event)
         if not processor:
@@ -135,11 +219,28 @@ class WebhookDispatcher:
             logger.warning("[WEBHOOK] Payload validation failed for event %s: %s", event, str(e))
             return
 
-        # ─── Dispatch the Event ────────────────────────────
+        # ─── Queue the Event ───────────────────────────────
+        if self.is_durable(event):
+            return  # already stored in the outbox with the data
+        if not processor.get_all():
+            return  # nobody subscribed; skip the queue entirely
+        await self.delivery_queue.submit(event, payload)
+
+    async def _deliver(self, event: WebhookEvent, payload: BaseModel) -> None:
+        """
+        Run the event's processor (called by the delivery queue workers).
+
+        Raises:
+            AppException: On unrecoverable internal error during delivery.
+        """
+        processor = self._processors[event]
         try:
             async with run_in_transaction() as session:
-                await processor.handle(payload, session=session)
-                logger.info("[WEBHOOK] Dispatched event successfully | event=%s", event)
+                result = await processor.handle(payload, session=session)
+                logger.info(
+                    "[WEBHOOK] Dispatched event | event=%s | succeeded=%d | failed=%d",
+                    event, result.succeeded, result.failed
+                )
         except AppException:
             raise
         except Exception as e:
@@ -0,0 +1,158 @@
+import asyncio
+from dataclasses import dataclass, field
+from uuid import UUID
+from loguru import logger
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.constants.webhooks import WebhookEvent
+from app.domain.webhooks.circuit_breaker import deliver_through_circuit, record_circuit_change
+from app.domain.webhooks.send_webhook import DeliveryResult, serialize_payload
+from app.infrastructure.database.repository.restAPI.secret_repository import update_webhook_retry
+from app.models.schemas.webhook.webhook_schema import WebhookConfig
+from app.utils.config import settings
+
+
+@dataclass
+class FanOutResult:
+    """Aggregated outcome of delivering one event to its subscribers."""
+    event: WebhookEvent
+    succeeded: int = 0
+    failed: int = 0
+    skipped: int = 0  # not attempted: circuit open
+    failed_ids: list[UUID] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return self.succeeded + self.failed + self.skipped
+
+    @property
+    def ok(self) -> bool:
+        return self.failed == 0 and self.skipped == 0
+
+    def merge(self, other: "FanOutResult") -> "FanOutResult":
+        """Add the counts of another fan-out of the same event."""
+        self.succeeded += other.succeeded
+        self.failed += other.failed
+        self.skipped += other.skipped
+        self.failed_ids.extend(other.failed_ids)
+        return self
+
+
+class WebhookFanOut:
+    """
+    Concurrent delivery of one event to many webhooks.
+
+    All targets of an event are contacted at once, bounded by a global limit
+    (across every event in flight) and a per-event-type limit, so one busy event
+    type cannot take every slot. Deliveries to the same webhook still happen in
+    the order their events reached the fan-out: each one waits for the previous
+    delivery to that webhook before taking a slot.
+
+    Webhooks whose circuit is open (see circuit_breaker.py) are skipped without a request.
+    The payload is serialized once per event; only the signature differs per webhook.
+    Failures and circuit changes are persisted to the webhooks table after the fan-out, one at a time,
+    because the DB session cannot be shared by concurrent tasks.
+    """
+
+    def __init__(self, global_limit: int, per_event_limit: int):
+        self.global_limit = max(1, global_limit)
+        self.per_event_limit = max(1, per_event_limit)
+        self._global = asyncio.Semaphore(self.global_limit)
+        self._per_event: dict[WebhookEvent, asyncio.Semaphore] = {}
+        self._tails: dict[UUID, asyncio.Future] = {}
+
+    def _event_limit(self, event: WebhookEvent) -> asyncio.Semaphore:
+        limit = self._per_event.get(event)
+        if limit is None:
+            limit = self._per_event[event] = asyncio.Semaphore(self.per_event_limit)
+        return limit
+
+    def _release(self, webhook_id: UUID, done: asyncio.Future) -> None:
+        """Let the next delivery to this webhook proceed."""
+        if not done.done():
+            done.set_result(None)
+        if self._tails.get(webhook_id) is done:
+            del self._tails[webhook_id]
+
+    async def deliver(
+        self,
+        event: WebhookEvent,
+        webhooks: list[WebhookConfig],
+        payload: dict | BaseModel,
+        session: AsyncSession,
+    ) -> FanOutResult:
+        """
+        Deliver `payload` to every webhook in `webhooks` and wait for all of them.
+
+        Args:
+            event (WebhookEvent): Event type (selects the per-event limit).
+            webhooks (list[WebhookConfig]): Targets.
+            payload (dict | BaseModel): Event payload.
+            session (AsyncSession): Used to record failed deliveries.
+
+        Returns:
+            FanOutResult: How many deliveries succeeded or failed.
+        """
+        result = FanOutResult(event=event)
+        if not webhooks:
+            return result
+
+        payload_json = serialize_payload(payload)
+        event_limit = self._event_limit(event)
+
+        # Claim each webhook's ordering slot before the first await
+        loop = asyncio.get_running_loop()
+        slots = []
+        for webhook in webhooks:
+            done = loop.create_future()
+            slots.append((webhook, self._tails.get(webhook.id), done))
+            self._tails[webhook.id] = done
+
+        async def deliver_one(webhook: WebhookConfig, previous: asyncio.Future | None, done: asyncio.Future) -> DeliveryResult:
+            try:
+                if previous is not None:
+                    await asyncio.shield(previous)
+                async with event_limit, self._global:
+                    return await deliver_through_circuit(webhook, payload_json)
+            except Exception as e:
+                logger.exception("[WEBHOOK] Delivery crashed | id=%s", webhook.id)
+                return DeliveryResult(ok=False, error=str(e))
+            finally:
+                self._release(webhook.id, done)
+
+        try:
+            outcomes = await asyncio.gather(*(deliver_one(*slot) for slot in slots))
+        finally:
+            # Tasks cancelled before they started never reach their `finally`
+            for webhook, _, done in slots:
+                self._release(webhook.id, done)
+
+        for webhook, outcome in zip(webhooks, outcomes):
+            if outcome.ok:
+                result.succeeded += 1
+            elif outcome.deferred:
+                result.skipped += 1
+            else:
+                result.failed += 1
+                result.failed_ids.append(webhook.id)
+            try:
+                if await record_circuit_change(session, webhook.id, outcome):
+                    continue
+                if not outcome.ok and outcome.retryable and not outcome.deferred:
+                    await update_webhook_retry(session, webhook.id, last_error=outcome.error)
+            except Exception as e:
+                logger.error("[WEBHOOK] Could not record failure | id=%s | error=%s", webhook.id, str(e))
+
+        logger.info(
+            "[WEBHOOK] Fan-out done | event=%s | targets=%d | succeeded=%d | failed=%d | skipped=%d",
+            event.value, result.total, result.succeeded, result.failed, result.skipped
+        )
+        return result
+
+
+# ─── Singleton Fan-out Instance ────────────────────────────────
+webhook_fanout = WebhookFanOut(
+    global_limit=settings.WEBHOOK_FANOUT_MAX_CONCURRENCY,
+    per_event_limit=settings.WEBHOOK_FANOUT_MAX_PER_EVENT,
+)
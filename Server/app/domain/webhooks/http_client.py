@@ -0,0 +1,99 @@
+import asyncio
+from urllib.parse import urlsplit
+import httpx
+from loguru import logger
+
+from app.utils.config import settings
+
+
+class WebhookHTTPClient:
+    """
+    Process-wide HTTP connection pool for webhook delivery.
+
+    One `httpx.AsyncClient` is shared by all deliveries so connections to a receiver
+    stay warm between events (keep-alive, HTTP/2 when the receiver negotiates it).
+    httpx only limits the pool as a whole, so concurrent requests per host are capped
+    with a semaphore per `scheme://host:port`. Receiver URLs are user-supplied, so a
+    host's semaphore only lives while requests to it are queued or in flight.
+
+    Started and closed by the FastAPI lifespan; used lazily (e.g. in tests or scripts)
+    it creates the client on first use.
+    """
+
+    def __init__(self):
+        self._client: httpx.AsyncClient | None = None
+        self._host_limits: dict[str, asyncio.Semaphore] = {}
+        self._host_users: dict[str, int] = {}
+
+    def _build_client(self) -> httpx.AsyncClient:
+        timeout = httpx.Timeout(
+            settings.WEBHOOK_HTTP_TIMEOUT_SECONDS,
+            connect=settings.WEBHOOK_HTTP_CONNECT_TIMEOUT_SECONDS,
+        )
+        limits = httpx.Limits(
+            max_connections=settings.WEBHOOK_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.WEBHOOK_HTTP_MAX_CONNECTIONS,
+            keepalive_expiry=settings.WEBHOOK_HTTP_KEEPALIVE_SECONDS,
+        )
+        return httpx.AsyncClient(
+            timeout=timeout,
+            limits=limits,
+            http2=settings.WEBHOOK_HTTP2_ENABLED,
+            follow_redirects=True,
+            verify=True,
+        )
+
+    async def start(self) -> None:
+        if self._client is None:
+            self._client = self._build_client()
+            logger.info(
+                "[WEBHOOK] HTTP client pool started | max_connections=%d | per_host=%d | http2=%s",
+                settings.WEBHOOK_HTTP_MAX_CONNECTIONS,
+                settings.WEBHOOK_HTTP_MAX_CONNECTIONS_PER_HOST,
+                settings.WEBHOOK_HTTP2_ENABLED,
+            )
+
+    async def stop(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._host_limits.clear()
+            self._host_users.clear()
+            logger.info("[WEBHOOK] HTTP client pool closed")
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = self._build_client()
+        return self._client
+
+    @staticmethod
+    def _host_key(url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.hostname}:{parts.port or ''}"
+
+    async def post(self, url: str, content: str | bytes, headers: dict[str, str]) -> httpx.Response:
+        """
+        POST through the shared pool, waiting for a per-host slot first.
+
+        The semaphore is dropped once its last user leaves, so idle hosts hold no state.
+        """
+        key = self._host_key(url)
+        limit = self._host_limits.get(key)
+        if limit is None:
+            limit = asyncio.Semaphore(max(1, settings.WEBHOOK_HTTP_MAX_CONNECTIONS_PER_HOST))
+            self._host_limits[key] = limit
+        self._host_users[key] = self._host_users.get(key, 0) + 1
+        try:
+            async with limit:
+                return await self.client.post(url, content=content, headers=headers)
+        finally:
+            remaining = self._host_users.pop(key, 1) - 1
+            if remaining:
+                self._host_users[key] = remaining
+            else:
+                self._host_limits.pop(key, None)
+
+
+# ─── Singleton Client Instance ─────────────────────────────────
+webhook_http_client = WebhookHTTPClient()
@@ -0,0 +1,244 @@
+import asyncio
+import random
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+from uuid import UUID
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.constants.webhooks import WebhookEvent
+from app.domain.webhooks.dispatcher import dispatcher
+from app.domain.webhooks.circuit_breaker import deliver_through_circuit, record_circuit_change, webhook_breakers
+from app.domain.webhooks.send_webhook import DeliveryResult, serialize_payload
+from app.infrastructure.database.repository.restAPI.secret_repository import update_webhook_retry
+from app.infrastructure.database.repository.webhook.webhook_outbox_repository import (
+    claim_due_deliveries,
+    delete_deliveries,
+    mark_delivery_dead,
+    purge_settled_deliveries,
+    reschedule_delivery,
+)
+from app.infrastructure.database.transaction import run_in_transaction
+from app.models.DB_tables.webhook_outbox import WebhookOutbox
+from app.models.schemas.webhook.webhook_schema import WebhookConfig
+from app.utils.config import settings
+
+
+WebhookLookup = Callable[[UUID, WebhookEvent], WebhookConfig | None]
+
+
+def backoff_delay(attempts: int, base: float | None = None, cap: float | None = None) -> float:
+    """
+    Seconds to wait before the next attempt: exponential in `attempts`, capped,
+    with random jitter so failed deliveries to one receiver don't retry in lockstep.
+
+    Args:
+        attempts (int): Attempts made so far (>= 1).
+        base (float | None): Defaults to WEBHOOK_OUTBOX_BACKOFF_BASE_SECONDS.
+        cap (float | None): Defaults to WEBHOOK_OUTBOX_BACKOFF_MAX_SECONDS.
+
+    Returns:
+        float: A delay in [base, min(cap, base * 2**attempts)].
+    """
+    base = settings.WEBHOOK_OUTBOX_BACKOFF_BASE_SECONDS if base is None else base
+    cap = settings.WEBHOOK_OUTBOX_BACKOFF_MAX_SECONDS if cap is None else cap
+    ceiling = min(cap, base * 2 ** min(max(attempts, 0), 32))
+    return random.uniform(min(base, ceiling), ceiling)
+
+
+class WebhookOutboxRelay:
+    """
+    Delivers the rows of the webhook outbox.
+
+    Each worker repeatedly leases a batch of due rows (SKIP LOCKED, so workers and
+    other app instances never share a row), delivers them, and records the outcome:
+    delivered rows are deleted, retryable failures are rescheduled with `backoff_delay`,
+    and permanent failures or rows out of attempts are marked dead and reported in the
+    webhook's `last_error`. Rows for a webhook whose circuit is open are pushed back to
+    its next probe window without spending an attempt.
+
+    Delivery is at-least-once: a row whose relay dies mid-delivery becomes due again
+    when its lease expires. Rows of one webhook within a batch are sent in order.
+
+    Alongside the workers, a purge task deletes dead rows older than the retention
+    every `purge_seconds`, so the table does not grow with abandoned deliveries.
+    """
+
+    def __init__(
+        self,
+        lookup: WebhookLookup,
+        workers: int,
+        batch_size: int,
+        poll_seconds: float,
+        lease_seconds: float,
+        max_attempts: int,
+        retention_seconds: float = 0.0,
+        purge_seconds: float = 3600.0,
+    ):
+        self.lookup = lookup
+        self.worker_count = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.poll_seconds = poll_seconds
+        self.lease = timedelta(seconds=lease_seconds)
+        self.max_attempts = max(1, max_attempts)
+        self.retention = timedelta(seconds=max(0.0, retention_seconds))  # 0: keep settled rows
+        self.purge_seconds = max(1.0, purge_seconds)
+        self._workers: list[asyncio.Task] = []
+
+        # Metrics
+        self.delivered: int = 0
+        self.retried: int = 0
+        self.deferred: int = 0
+        self.dead: int = 0
+        self.purged: int = 0
+
+    @property
+    def is_running(self) -> bool:
+        return any(not w.done() for w in self._workers)
+
+    def start(self) -> None:
+        """Start the relay workers (idempotent)."""
+        if self.is_running:
+            return
+        self._workers = [asyncio.create_task(self._run()) for _ in range(self.worker_count)]
+        if self.retention:
+            self._workers.append(asyncio.create_task(self._run_purge()))
+        logger.info("[WEBHOOK] Outbox relay started | workers=%d | batch=%d", self.worker_count, self.batch_size)
+
+    async def stop(self) -> None:
+        """Cancel the workers; rows they had claimed are retried after the lease."""
+        workers, self._workers = self._workers, []
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        if workers:
+            logger.info(
+                "[WEBHOOK] Outbox relay stopped | delivered=%d | retried=%d | dead=%d | purged=%d",
+                self.delivered, self.retried, self.dead, self.purged
+            )
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                handled = await self.relay_batch()
+            except Exception:
+                logger.exception("[WEBHOOK] Outbox relay batch failed")
+                handled = 0
+            if handled < self.batch_size:
+                await asyncio.sleep(self.poll_seconds)
+
+    async def _run_purge(self) -> None:
+        while True:
+            try:
+                await self.purge_settled()
+            except Exception:
+                logger.exception("[WEBHOOK] Outbox purge failed")
+            await asyncio.sleep(self.purge_seconds)
+
+    async def purge_settled(self, now: datetime | None = None) -> int:
+        """
+        Delete dead rows settled more than the retention ago (none if retention is 0).
+
+        Returns:
+            int: Number of rows deleted.
+        """
+        if not self.retention:
+            return 0
+        cutoff = (now or datetime.now(timezone.utc)) - self.retention
+        async with run_in_transaction() as session:
+            purged = await purge_settled_deliveries(session, cutoff)
+        if purged:
+            self.purged += purged
+            logger.info("[WEBHOOK] Purged %d settled outbox rows older than %s", purged, cutoff.isoformat())
+        return purged
+
+    async def relay_batch(self) -> int:
+        """
+        Claim, deliver and settle one batch of due rows.
+
+        Returns:
+            int: Number of rows claimed.
+        """
+        async with run_in_transaction() as session:
+            claimed = await claim_due_deliveries(session, self.batch_size, self.lease)
+        if not claimed:
+            return 0
+
+        results = await self._deliver_all(claimed)
+
+        async with run_in_transaction() as session:
+            await delete_deliveries(session, [row.id for row in claimed if results[row.id].ok])
+            for row in claimed:
+                await self._settle(session, row, results[row.id])
+        return len(claimed)
+
+    async def _deliver_all(self, rows: list[WebhookOutbox]) -> dict[UUID, DeliveryResult]:
+        # Webhooks are delivered concurrently, each one's rows sequentially
+        by_webhook: dict[UUID, list[WebhookOutbox]] = defaultdict(list)
+        for row in sorted(rows, key=lambda r: r.created_at):
+            by_webhook[row.webhook_id].append(row)
+
+        results: dict[UUID, DeliveryResult] = {}
+
+        async def deliver_in_order(group: list[WebhookOutbox]) -> None:
+            for row in group:
+                results[row.id] = await self._deliver(row)
+
+        await asyncio.gather(*(deliver_in_order(group) for group in by_webhook.values()))
+        return results
+
+    async def _deliver(self, row: WebhookOutbox) -> DeliveryResult:
+        webhook = self.lookup(row.webhook_id, WebhookEvent(row.event_type))
+        if webhook is None:
+            return DeliveryResult(ok=False, error="Webhook is no longer active")
+        return await deliver_through_circuit(webhook, serialize_payload(row.payload), retry=False)
+
+    async def _settle(self, session: AsyncSession, row: WebhookOutbox, result: DeliveryResult) -> None:
+        if result.ok:
+            self.delivered += 1
+            await record_circuit_change(session, row.webhook_id, result)
+            return
+
+        if result.deferred:
+            # Circuit open: wait for the probe window without spending an attempt
+            delay = max(webhook_breakers.get(row.webhook_id).retry_in(), self.poll_seconds)
+            await reschedule_delivery(
+                session, row.id, datetime.now(timezone.utc) + timedelta(seconds=delay), result.error,
+                attempts=row.attempts - 1
+            )
+            self.deferred += 1
+            return
+
+        if result.retryable and row.attempts < self.max_attempts:
+            delay = backoff_delay(row.attempts)
+            await reschedule_delivery(
+                session, row.id, datetime.now(timezone.utc) + timedelta(seconds=delay), result.error
+            )
+            self.retried += 1
+            await record_circuit_change(session, row.webhook_id, result)
+            logger.warning(
+                "[WEBHOOK] Outbox delivery failed, retrying in %.1fs | id=%s | attempt=%d | error=%s",
+                delay, row.webhook_id, row.attempts, result.error
+            )
+            return
+
+        await mark_delivery_dead(session, row.id, result.error)
+        self.dead += 1
+        logger.error(
+            "[WEBHOOK] Outbox delivery abandoned | id=%s | attempts=%d | error=%s",
+            row.webhook_id, row.attempts, result.error
+        )
+        await update_webhook_retry(session, row.webhook_id, last_error=result.error)
+
+
+outbox_relay = WebhookOutboxRelay(
+    lookup=dispatcher.find_webhook,
+    workers=settings.WEBHOOK_OUTBOX_WORKERS,
+    batch_size=settings.WEBHOOK_OUTBOX_BATCH_SIZE,
+    poll_seconds=settings.WEBHOOK_OUTBOX_POLL_SECONDS,
+    lease_seconds=settings.WEBHOOK_OUTBOX_LEASE_SECONDS,
+    max_attempts=settings.WEBHOOK_OUTBOX_MAX_ATTEMPTS,
+    retention_seconds=settings.WEBHOOK_OUTBOX_RETENTION_HOURS * 3600,
+    purge_seconds=settings.WEBHOOK_OUTBOX_PURGE_INTERVAL_SECONDS,
+)
@@ -1,40 +1,42 @@
+from dataclasses import dataclass
 from uuid import UUID
 import hmac
 import hashlib
 import json
-import httpx
 from loguru import logger
 from pydantic import BaseModel
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.domain.webhooks.http_client import webhook_http_client
 from app.infrastructure.database.repository.restAPI.secret_repository import update_webhook_retry
 from app.models.schemas.webhook.webhook_schema import WebhookConfig
 from app.utils.config import settings
 
 
-async def send_webhook(session: AsyncSession, webhook: WebhookConfig, payload: dict | BaseModel) -> None:
-    """
-    Send a signed JSON POST request to a webhook target.
+@dataclass(frozen=True)
+class DeliveryResult:
+    """Outcome of a single delivery attempt."""
+    ok: bool
+    retryable: bool = False  # 5xx / network errors; 4xx are permanent
+    error: str | None = None
+    deferred: bool = False  # not attempted because the webhook's circuit is open
+    circuit: str | None = None  # "opened" / "closed" if this outcome changed the circuit
 
-    Uses HMAC-SHA256 with the user-defined secret to generate a signature,
-    retries on 5xx server errors, and logs all outcomes.
-
-    Args:
-        session (AsyncSession): DB session for logging retry status if needed.
-        webhook (WebhookConfig): Config object containing target URL, headers, and secret.
-        payload (dict | BaseModel): The payload to send.
 
-    Raises:
-        None directly. Logs all exceptions and saves failure state.
+def serialize_payload(payload: dict | BaseModel) -> str:
+    """
+    Canonical JSON body of a webhook payload (the exact bytes that get signed).
     """
-    # ─── Serialize Payload ─────────────────────────────
     if isinstance(payload, BaseModel):
-        payload_json = payload.model_dump_json()
-    else:
-        payload_json = json.dumps(payload, default=fallback_serializer, separators=(",", ":"), sort_keys=True)
+        return payload.model_dump_json()
+    return json.dumps(payload, default=fallback_serializer, separators=(",", ":"), sort_keys=True)
+
 
-    # ─── Generate HMAC-SHA256 Signature ───────────────
+def build_headers(webhook: WebhookConfig, payload_json: str) -> dict[str, str]:
+    """
+    Request headers including the HMAC-SHA256 signature and the webhook's custom headers.
+    """
     raw_secret = webhook.secret.get_secret_value()
     signature = hmac.new(
         raw_secret.encode("utf-8"),
@@ -49,41 +51,91 @@ async def send_webhook(session: AsyncSession, webhook: WebhookConfig, payload: d
 
     if webhook.custom_headers:
         headers.update(webhook.custom_headers)
+    return headers
+
+
+async def deliver_once(webhook: WebhookConfig, payload_json: str, headers: dict[str, str]) -> DeliveryResult:
+    """
+    Make one POST attempt and classify the outcome. Never raises.
+    """
+    try:
+        response = await webhook_http_client.post(str(webhook.target_url), payload_json, headers)
+    except Exception as e:
+        # Network or unexpected exception
+        return DeliveryResult(ok=False, retryable=True, error=str(e))
+
+    status = response.status_code
+    if 200 <= status < 300:
+        return DeliveryResult(ok=True)
+    if 500 <= status < 600:
+        # Retryable server error
+        return DeliveryResult(ok=False, retryable=True, error=f"HTTP {status}: {response.text}")
+    # Client error or other non-retryable status
+    return DeliveryResult(ok=False, retryable=False, error=f"HTTP {status}: {response.text}")
+
+
+async def deliver_with_retry(webhook: WebhookConfig, payload_json: str, max_attempts: int | None = None) -> DeliveryResult:
+    """
+    Deliver a serialized payload, retrying 5xx and network errors up to
+    `max_attempts` (default MAX_ATTEMPTS_PER_WEBHOOK) times. Never raises and
+    never touches the DB.
+
+    Args:
+        webhook (WebhookConfig): Target webhook.
+        payload_json (str): Body from `serialize_payload`.
+        max_attempts (int | None): Override of the attempt budget.
+
+    Returns:
+        DeliveryResult: The final outcome; `retryable` is set if retries ran out.
+    """
+    headers = build_headers(webhook, payload_json)
 
     # ─── Attempt Delivery with Retry ───────────────────
-    max_attempts = settings.MAX_ATTEMPTS_PER_WEBHOOK
-    last_error = None
+    max_attempts = max_attempts or settings.MAX_ATTEMPTS_PER_WEBHOOK
+    result = DeliveryResult(ok=False, retryable=True)
 
     for attempt in range(max_attempts):
-        try:
-            async with httpx.AsyncClient(timeout=5.0, follow_redirects=True, verify=True) as client:
-                response = await client.post(str(webhook.target_url), content=payload_json, headers=headers)
+        result = await deliver_once(webhook, payload_json, headers)
+
+        if result.ok:
+            logger.info("[WEBHOOK] Sent successfully | id=%s | url=%s | attempt=%d", webhook.id, webhook.target_url, attempt + 1)
+            return result
 
-            status = response.status_code
+        if not result.retryable:
+            logger.error("[WEBHOOK] Permanent failure | id=%s | error=%s", webhook.id, result.error)
+            return result
 
-            if 200 <= status < 300:
-                logger.info("[WEBHOOK] Sent successfully | id=%s | url=%s | attempt=%d", webhook.id, webhook.target_url, attempt + 1)
-                return
+        logger.warning("[WEBHOOK] Delivery error | id=%s | attempt=%d | error=%s", webhook.id, attempt + 1, result.error)
 
-            elif 500 <= status < 600:
-                # Retryable server error
-                last_error = f"HTTP {status}: {response.text}"
-                logger.warning("[WEBHOOK] Server error | id=%s | attempt=%d | error=%s", webhook.id, attempt + 1, last_error)
+    logger.error("[WEBHOOK] Failed after %d attempts | id=%s | last_error=%s", max_attempts, webhook.id, result.error)
+    return result
 
-            else:
-                # Client error or other non-retryable status
-                logger.error("[WEBHOOK] Permanent failure | id=%s | status=%d | response=%s", webhook.id, status, response.text)
-                return
 
-        except Exception as e:
-            # Network or unexpected exception
-            last_error = str(e)
-            logger.warning("[WEBHOOK] Network/Send error | id=%s | attempt=%d | error=%s", webhook.id, attempt + 1, last_error)
+async def send_webhook(session: AsyncSession, webhook: WebhookConfig, payload: dict | BaseModel) -> bool:
+    """
+    Send a signed JSON POST request to a webhook target.
 
-    # ─── Final Failure: Log & Persist Error ────────────
-    logger.error("[WEBHOOK] Failed after %d attempts | id=%s | last_error=%s", max_attempts, webhook.id, last_error)
-    await update_webhook_retry(session, webhook.id, last_error=last_error)
+    Uses HMAC-SHA256 with the user-defined secret to generate a signature,
+    retries on 5xx server errors, and logs all outcomes. Requests go through the
+    shared `webhook_http_client` pool, so connections to a receiver are reused.
+
+    Args:
+        session (AsyncSession): DB session for logging retry status if needed.
+        webhook (WebhookConfig): Config object containing target URL, headers, and secret.
+        payload (dict | BaseModel): The payload to send.
+
+    Returns:
+        bool: True if the receiver accepted the payload.
+
+    Raises:
+        None directly. Logs all exceptions and saves failure state.
+    """
+    result = await deliver_with_retry(webhook, serialize_payload(payload))
 
+    # ─── Final Failure: Persist Error ──────────────────
+    if not result.ok and result.retryable:
+        await update_webhook_retry(session, webhook.id, last_error=result.error)
+    return result.ok
 
 
 def fallback_serializer(obj):
@@ -1,18 +1,15 @@
-from typing import Any, List
+from typing import Dict, List
 from uuid import UUID
 from loguru import logger
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from pydantic import SecretStr, TypeAdapter, AnyHttpUrl
 
 from app.domain.webhooks.WebhookProcessorInterface import WebhookProcessorInterface
 from app.models.schemas.rest.sensor_data_schemas import SensorDataOut
 from app.models.schemas.webhook.webhook_schema import WebhookConfig
-from app.infrastructure.database.repository.webhook.webhook_repository import get_active_webhooks_by_event
-from app.infrastructure.database.repository.restAPI.secret_repository import get_user_secret_by_id
-from app.utils.crypto_utils import decrypt_secret
 from app.constants.webhooks import WebhookEvent
-from app.domain.webhooks.send_webhook import send_webhook
+from app.domain.webhooks.fanout import FanOutResult, webhook_fanout
+from app.domain.webhooks.webhook_configs import load_webhook_configs
 
 
 class SensorDataReceivedProcessor(WebhookProcessorInterface[SensorDataOut]):
@@ -24,41 +21,26 @@ class SensorDataReceivedProcessor(WebhookProcessorInterface[SensorDataOut]):
     """
 
     _webhooks: List[WebhookConfig] = []
+    _by_id: Dict[UUID, WebhookConfig] = {}
     payload_model = SensorDataOut
 
     async def load(self, session: AsyncSession) -> None:
         """
-        Load all SENSOR_DATA_RECEIVED webhook configs from the database.
-
-        Decrypts user secrets and parses configs into memory.
-        Logs warnings for incomplete rows.
+        Load all SENSOR_DATA_RECEIVED webhook configs (with decrypted secrets) from the database.
         """
-        db_webhooks = await get_active_webhooks_by_event(
-            session, WebhookEvent.SENSOR_DATA_RECEIVED.value
-        )
-
-        parsed: List[WebhookConfig] = []
-        for row in db_webhooks:
-            if not row.secret_id:
-                logger.warning("[SENSOR_DATA_RECEIVED] Webhook %s skipped: no secret_id", row.id)
-                continue
-
-            secret_obj = await get_user_secret_by_id(session, row.secret_id)
-            if not secret_obj:
-                logger.warning("[SENSOR_DATA_RECEIVED] Webhook %s skipped: secret not found", row.id)
-                continue
+        configs = await load_webhook_configs(session, [WebhookEvent.SENSOR_DATA_RECEIVED])
+        self.set_all(configs[WebhookEvent.SENSOR_DATA_RECEIVED])
 
-            parsed.append(WebhookConfig(
-                id=row.id,
-                event_type=WebhookEvent(row.event_type),
-                target_url=TypeAdapter(AnyHttpUrl).validate_python(row.target_url),
-                secret=SecretStr(decrypt_secret(secret_obj.secret)),
-                custom_headers=row.custom_headers,
-                parameters=row.parameters
-            ))
+    def set_all(self, configs: List[WebhookConfig]) -> None:
+        """
+        Replace the in-memory configs with `configs`.
 
-        self._webhooks = parsed
-        logger.info("[SENSOR_DATA_RECEIVED] Loaded %d webhooks", len(parsed))
+        Args:
+            configs (List[WebhookConfig]): Configs of this event.
+        """
+        self._webhooks = list(configs)
+        self._by_id = {c.id: c for c in self._webhooks}
+        logger.info("[SENSOR_DATA_RECEIVED] Loaded %d webhooks", len(self._webhooks))
 
     def get_all(self) -> List[WebhookConfig]:
         """
@@ -66,11 +48,18 @@ class SensorDataReceivedProcessor(WebhookProcessorInterface[SensorDataOut]):
         """
         return self._webhooks
 
+    def get(self, webhook_id: UUID) -> WebhookConfig | None:
+        """
+        Return the loaded config with this ID, or None.
+        """
+        return self._by_id.get(webhook_id)
+
     def add(self, config: WebhookConfig) -> None:
         """
         Add a new webhook configuration to memory.
         """
         self._webhooks.append(config)
+        self._by_id[config.id] = config
         logger.info("[SENSOR_DATA_RECEIVED] Webhook added | id=%s", config.id)
 
     def remove(self, webhook_id: UUID) -> None:
@@ -78,6 +67,7 @@ class SensorDataReceivedProcessor(WebhookProcessorInterface[SensorDataOut]):
         Remove a webhook config by ID.
         """
         self._webhooks = [w for w in self._webhooks if w.id != webhook_id]
+        self._by_id.pop(webhook_id, None)
         logger.info("[SENSOR_DATA_RECEIVED] Webhook removed | id=%s", webhook_id)
 
     def replace(self, config: WebhookConfig) -> None:
@@ -88,7 +78,7 @@ class SensorDataReceivedProcessor(WebhookProcessorInterface[SensorDataOut]):
         self.add(config)
         logger.info("[SENSOR_DATA_RECEIVED] Webhook replaced | id=%s", config.id)
 
-    async def handle(self, payload: SensorDataOut, session: AsyncSession) -> None:
+    async def handle(self, payload: SensorDataOut, session: AsyncSession) -> FanOutResult:
         """
         Trigger all registered webhooks with the full sensor data output.
 
@@ -97,18 +87,10 @@ class SensorDataReceivedProcessor(WebhookProcessorInterface[SensorDataOut]):
         Args:
             payload (SensorDataOut): The sensor data output model.
             session (AsyncSession): DB session for tracking delivery/logging.
+
+        Returns:
+            FanOutResult: Aggregated delivery outcome.
         """
-        payload_dict: dict[str, Any] = payload.model_dump()
-
-        for webhook in self._webhooks:
-            try:
-                logger.info(
-                    "[SENSOR_DATA_RECEIVED] Dispatching webhook | sensor_id=%s | target=%s",
-                    payload.id, webhook.target_url
-                )
-                await send_webhook(session, webhook, payload_dict)
-            except Exception as e:
-                logger.exception(
-                    "[SENSOR_DATA_RECEIVED] Failed to send webhook | sensor_id=%s | target=%s",
-                    payload.id, webhook.target_url
-                )
+        targets = self.targets(payload)
+        logger.info("[SENSOR_DATA_RECEIVED] Dispatching webhooks | sensor_id=%s | targets=%d", payload.id, len(targets))
+        return await webhook_fanout.deliver(WebhookEvent.SENSOR_DATA_RECEIVED, targets, payload.model_dump(), session)
@@ -0,0 +1,86 @@
+from typing import Iterable
+from uuid import UUID
+from loguru import logger
+from pydantic import AnyHttpUrl, SecretStr, TypeAdapter, ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.constants.webhooks import WebhookEvent
+from app.infrastructure.database.repository.webhook.webhook_repository import get_active_webhooks_with_secrets
+from app.models.schemas.webhook.webhook_schema import WebhookConfig
+from app.utils.crypto_utils import decrypt_secret
+
+
+WILDCARD_EVENT = "*"
+
+_url_adapter = TypeAdapter(AnyHttpUrl)
+
+
+async def load_webhook_configs(
+    session: AsyncSession,
+    events: Iterable[WebhookEvent] | None = None,
+) -> dict[WebhookEvent, list[WebhookConfig]]:
+    """
+    Load enabled webhooks with their secrets in one query and partition them by event.
+
+    Wildcard (`*`) webhooks are listed under every requested event. Each distinct
+    secret is decrypted once, however many webhooks share it. Rows without an
+    active secret, with an unknown event or an invalid URL are skipped.
+
+    Args:
+        session (AsyncSession): DB session.
+        events (Iterable[WebhookEvent] | None): Events to load (default: all).
+
+    Returns:
+        dict[WebhookEvent, list[WebhookConfig]]: Configs per requested event.
+    """
+    wanted = list(WebhookEvent) if events is None else list(events)
+    rows = await get_active_webhooks_with_secrets(
+        session, None if events is None else [event.value for event in wanted]
+    )
+
+    configs: dict[WebhookEvent, list[WebhookConfig]] = {event: [] for event in wanted}
+    secrets: dict[UUID, SecretStr] = {}
+
+    for webhook, secret in rows:
+        if secret is None:
+            logger.warning("[WEBHOOK] Webhook %s skipped: no active secret", webhook.id)
+            continue
+
+        if webhook.event_type == WILDCARD_EVENT:
+            targets = wanted
+        else:
+            try:
+                event = WebhookEvent(webhook.event_type)
+            except ValueError:
+                logger.warning("[WEBHOOK] Webhook %s skipped: unknown event %s", webhook.id, webhook.event_type)
+                continue
+            if event not in configs:
+                continue
+            targets = [event]
+
+        try:
+            target_url = _url_adapter.validate_python(webhook.target_url)
+        except ValidationError:
+            logger.warning("[WEBHOOK] Webhook %s skipped: invalid target URL", webhook.id)
+            continue
+
+        raw_secret = secrets.get(secret.id)
+        if raw_secret is None:
+            raw_secret = secrets[secret.id] = SecretStr(decrypt_secret(secret.secret))
+
+        for event in targets:
+            configs[event].append(WebhookConfig(
+                id=webhook.id,
+                event_type=event,
+                target_url=target_url,
+                secret=raw_secret,
+                custom_headers=webhook.custom_headers,
+                parameters=webhook.parameters,
+                alert_policy=webhook.alert_policy,
+            ))
+
+    logger.info(
+        "[WEBHOOK] Loaded webhook configs | rows=%d | secrets=%d | %s",
+        len(rows), len(secrets), ", ".join(f"{e.value}={len(c)}" for e, c in configs.items())
+    )
+    return configs
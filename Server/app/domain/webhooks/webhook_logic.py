@@ -12,14 +12,31 @@ from app.infrastructure.database.repository.webhook.webhook_repository import (
     delete_webhook as delete_webhook_in_db,
 )
 from app.constants.webhooks import ROLE_TO_WEBHOOK_EVENTS, WebhookEvent
-from app.models.schemas.webhook.webhook_schema import WebhookConfig, WebhookCreate, WebhookUpdatePayload
+from app.models.schemas.webhook.webhook_schema import WebhookConfig, WebhookCreate, WebhookRead, WebhookUpdatePayload
 from app.models.DB_tables.webhook import Webhook
 from app.utils.exceptions_base import AppException
 from app.utils.config import settings
 from app.domain.webhooks.dispatcher import dispatcher
+from app.domain.webhooks.circuit_breaker import webhook_breakers
 
 
 
+def to_webhook_read(webhook: Webhook) -> WebhookRead:
+    """
+    API view of a webhook, including the delivery health of its circuit breaker.
+    """
+    read = WebhookRead.model_validate(webhook)
+    breaker = webhook_breakers.peek(webhook.id)
+    if breaker is None:
+        return read
+    return read.model_copy(update={
+        "circuit_state": breaker.state,
+        "consecutive_failures": breaker.consecutive_failures,
+        "health_score": round(breaker.health_score, 3),
+        "circuit_retry_at": breaker.retry_at(),
+    })
+
+
 async def get_user_webhooks(user_id: UUID) -> List[Webhook]:
     """
     Fetch all webhook records owned by the user.
@@ -102,6 +119,7 @@ async def create_webhook(user_id: UUID, user_role: str, data: WebhookCreate) ->
             secret_id=secret_id,
             custom_headers=data.custom_headers or {},
             parameters=data.parameters,
+            alert_policy=data.alert_policy.model_dump() if data.alert_policy else None,
         )
         created = await create_webhook_in_db(session, webhook)
         logger.info("[WEBHOOK] Created webhook | id=%s | user=%s", created.id, user_id)
@@ -138,6 +156,7 @@ async def delete_webhook(user_id: UUID, webhook_id: UUID) -> bool:
 
         if deleted and event_type:
             dispatcher.remove_from_registry(webhook_id, WebhookEvent(event_type))
+            webhook_breakers.forget(webhook_id)
             logger.info("[WEBHOOK] Deleted webhook | id=%s | user=%s", webhook_id, user_id)
 
         if not deleted:
@@ -161,6 +180,7 @@ async def update_webhook(user_id: UUID, payload: WebhookUpdatePayload) -> Webhoo
     - Custom headers
     - Event type
     - Parameters
+    - Alert policy
     - Secret reference (by label)
 
     Raises:
@@ -178,6 +198,8 @@ async def update_webhook(user_id: UUID, payload: WebhookUpdatePayload) -> Webhoo
 
         # ─── Apply field updates ───
         if payload.target_url is not None:
+            if str(payload.target_url) != webhook.target_url:
+                webhook_breakers.forget(webhook.id)  # new receiver, fresh circuit
             webhook.target_url = str(payload.target_url)
         if payload.event_type is not None:
             webhook.event_type = payload.event_type
@@ -187,6 +209,8 @@ async def update_webhook(user_id: UUID, payload: WebhookUpdatePayload) -> Webhoo
             webhook.custom_headers = payload.custom_headers
         if payload.parameters is not None:
             webhook.parameters = payload.parameters
+        if payload.alert_policy is not None:
+            webhook.alert_policy = payload.alert_policy.model_dump()
 
         # ─── Update secret reference ───
         if payload.secret_label:
@@ -0,0 +1,181 @@
+import asyncio
+import os
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import AsyncIterator, Iterator, Sequence
+from uuid import UUID
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from loguru import logger
+from sqlalchemy import column, select, table
+
+from app.infrastructure.database.partitions import add_months, parse_partition_month, partition_name
+from app.infrastructure.database.repository.restAPI.sensor_data_repository import stream_rows
+from app.models.DB_tables.sensor_data import SensorData
+from app.utils.arrow_utils import encode_parquet, table_to_rows
+from app.utils.config import settings
+
+
+ARCHIVE_COLUMNS = [c.name for c in SensorData.__table__.columns]
+ARCHIVE_SUFFIX = ".parquet"
+
+# Rows are archived newest first, the order queries return them in
+ARCHIVE_SORTING = [
+    pq.SortingColumn(ARCHIVE_COLUMNS.index("timestamp"), descending=True),
+    pq.SortingColumn(ARCHIVE_COLUMNS.index("id"), descending=True),
+]
+
+
+def archive_dir() -> Path:
+    return Path(settings.SENSOR_ARCHIVE_DIR)
+
+
+def archive_path(month: date) -> Path:
+    """
+    File holding the archived readings of `month`, e.g. archive/sensor_data_y2025m01.parquet.
+    """
+    return archive_dir() / f"{partition_name(month)}{ARCHIVE_SUFFIX}"
+
+
+# ─── Archiving ──────────────────────────────────────────────
+
+async def archive_partition(month: date) -> Path:
+    """
+    Write the `month` partition of sensor_data to a compressed Parquet file.
+
+    Rows are streamed from the partition table newest first (see ARCHIVE_SORTING)
+    in SENSOR_EXPORT_BATCH_SIZE batches, one row group each, so reading them back
+    needs no sort. The file is written under a temporary name and renamed when
+    complete, so a crash never leaves a truncated archive behind.
+
+    Args:
+        month (date): First day of the partition's month.
+
+    Returns:
+        Path: The archive file.
+    """
+    path = archive_path(month)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    partition = table(partition_name(month), *(column(c) for c in ARCHIVE_COLUMNS))
+    query = select(*partition.c).order_by(partition.c.timestamp.desc(), partition.c.id.desc())
+    batches = stream_rows(query, settings.SENSOR_EXPORT_BATCH_SIZE)
+
+    with open(tmp_path, "wb") as f:
+        async for chunk in encode_parquet(ARCHIVE_COLUMNS, batches, sorting_columns=ARCHIVE_SORTING):
+            await asyncio.to_thread(f.write, chunk)
+        await asyncio.to_thread(os.fsync, f.fileno())
+    os.replace(tmp_path, path)
+
+    logger.info("[ARCHIVE] Archived %s to %s", partition_name(month), path)
+    return path
+
+
+# ─── Read-back ──────────────────────────────────────────────
+
+def archived_months(start: datetime | None = None, end: datetime | None = None) -> list[date]:
+    """
+    Months present in the archive overlapping [start, end], newest first.
+    """
+    if not archive_dir().is_dir():
+        return []
+
+    months = []
+    for path in archive_dir().glob(f"*{ARCHIVE_SUFFIX}"):
+        month = parse_partition_month(path.stem)
+        if month is None:
+            continue
+        month_begin = datetime(month.year, month.month, 1, tzinfo=timezone.utc)
+        next_month = add_months(month, 1)
+        month_end = datetime(next_month.year, next_month.month, 1, tzinfo=timezone.utc)
+        if start is not None and month_end <= _as_utc(start):
+            continue
+        if end is not None and month_begin > _as_utc(end):
+            continue
+        months.append(month)
+    return sorted(months, reverse=True)
+
+
+def _as_utc(ts: datetime) -> datetime:
+    return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+
+def archive_filter(
+    device_ids: Sequence[UUID] | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    timestamps: Sequence[datetime] | None = None,
+    field_ranges: dict[str, list[float | None]] | None = None,
+) -> ds.Expression | None:
+    """
+    Arrow filter expression equivalent to the advanced-query filters (inclusive bounds).
+    Pushed down to Parquet row-group statistics when reading.
+    """
+    conditions = []
+    if device_ids is not None:
+        conditions.append(ds.field("device_id").isin([str(d) for d in device_ids]))
+    if timestamps:
+        conditions.append(ds.field("timestamp").isin(pa.array([_as_utc(t) for t in timestamps], pa.timestamp("us", tz="UTC"))))
+    else:
+        if start is not None:
+            conditions.append(ds.field("timestamp") >= pa.scalar(_as_utc(start), pa.timestamp("us", tz="UTC")))
+        if end is not None:
+            conditions.append(ds.field("timestamp") <= pa.scalar(_as_utc(end), pa.timestamp("us", tz="UTC")))
+    for field, (min_val, max_val) in (field_ranges or {}).items():
+        if min_val is not None:
+            conditions.append(ds.field(field) >= min_val)
+        if max_val is not None:
+            conditions.append(ds.field(field) <= max_val)
+
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def _newest_first(path: Path) -> bool:
+    metadata = pq.read_metadata(path)
+    if metadata.num_row_groups == 0:
+        return True
+    return list(metadata.row_group(0).sorting_columns)[:1] == ARCHIVE_SORTING[:1]
+
+
+def _month_batches(
+    month: date, columns: list[str], expression: ds.Expression | None, batch_size: int
+) -> Iterator[pa.RecordBatch]:
+    """
+    Record batches of one archived month, newest first, read lazily: the filter is
+    pushed down to row-group statistics and only one batch is held at a time.
+    """
+    path = archive_path(month)
+    if not _newest_first(path):
+        # Archives written oldest first, before ARCHIVE_SORTING
+        result = pq.read_table(path, columns=list({*columns, "timestamp"}), filters=expression)
+        result = result.sort_by([("timestamp", "descending")]).select(columns)
+        return iter(result.to_batches(max_chunksize=batch_size))
+    dataset = ds.dataset(path, format="parquet")
+    return iter(dataset.to_batches(columns=columns, filter=expression, batch_size=batch_size))
+
+
+async def read_archive(
+    columns: list[str],
+    expression: ds.Expression | None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    batch_size: int | None = None,
+) -> AsyncIterator[list[tuple]]:
+    """
+    Stream archived readings as row tuples (in `columns` order), newest month first
+    and newest reading first within a month, mirroring the live query ordering.
+
+    Only the requested columns are decoded, a batch at a time, and file reads run
+    in a worker thread.
+    """
+    batch_size = batch_size or settings.SENSOR_EXPORT_BATCH_SIZE
+    for month in archived_months(start, end):
+        batches = await asyncio.to_thread(_month_batches, month, columns, expression, batch_size)
+        while (batch := await asyncio.to_thread(next, batches, None)) is not None:
+            if batch.num_rows:
+                yield table_to_rows(batch, columns)
@@ -1,6 +1,7 @@
 from loguru import logger
 from app.utils.crypto_utils import encrypt_secret
 
+from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
 from app.infrastructure.database.repository.restAPI import secret_repository, user_repository
 from app.infrastructure.database.transaction import run_in_transaction
@@ -8,21 +9,37 @@ from app.utils.hashing import hash_value
 from app.utils.secret_utils import generate_secret, get_secret_expiry
 from app.utils.config import settings
 from .session import engine
+from .partitions import ensure_sensor_data_partitions
 from app.models.DB_tables.base import Base
 
-from app.models.DB_tables.sensor_data import SensorData
+from app.models.DB_tables.sensor_data import LEGACY_INDEXES, SensorData
+from app.models.DB_tables.sensor_data_rollup import ROLLUP_MODELS
 from app.models.DB_tables.user import RoleEnum, User
 from app.models.DB_tables.api_keys import APIKey
 from app.models.DB_tables.user_secrets import UserSecret
 from app.models.DB_tables.sensor import Sensor
 from app.models.DB_tables.webhook import Webhook
+from app.models.DB_tables.webhook_outbox import WebhookOutbox
 
 async def init_db():
     # Step 1: Create Tables
     try:
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+            # create_all skips indexes of tables that already exist
+            for index in SensorData.__table__.indexes:
+                await conn.run_sync(index.create, checkfirst=True)
+            for name in LEGACY_INDEXES:
+                await conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+            # ...and columns added to existing tables
+            await conn.execute(text("ALTER TABLE webhooks ADD COLUMN IF NOT EXISTS alert_policy JSON"))
+            await conn.execute(text("ALTER TABLE api_keys ADD COLUMN IF NOT EXISTS key_id VARCHAR"))
+            for index in APIKey.__table__.indexes:
+                await conn.run_sync(index.create, checkfirst=True)
         logger.info("[DB INIT] Database tables checked and initialized.")
+
+        if settings.SENSOR_DATA_PARTITIONING_ENABLED:
+            await ensure_sensor_data_partitions()
     except SQLAlchemyError as e:
         logger.exception("[DB INIT] SQLAlchemy error during initialization")
         return
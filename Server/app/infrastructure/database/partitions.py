@@ -0,0 +1,214 @@
+import asyncio
+import re
+from datetime import date, datetime, timezone
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.infrastructure.database.session import engine
+from app.utils.config import settings
+
+
+SENSOR_DATA_TABLE = "sensor_data"
+DEFAULT_PARTITION = f"{SENSOR_DATA_TABLE}_default"
+_PARTITION_NAME_RE = re.compile(rf"^{SENSOR_DATA_TABLE}_y(\d{{4}})m(\d{{2}})$")
+
+
+# ─── Month Helpers ──────────────────────────────────────────
+
+def month_start(d: date | datetime) -> date:
+    return date(d.year, d.month, 1)
+
+
+def add_months(d: date, months: int) -> date:
+    """
+    Shift a first-of-month date by `months` (may be negative).
+    """
+    index = d.year * 12 + (d.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """
+    Name of the monthly partition holding `month`, e.g. sensor_data_y2025m06.
+    """
+    return f"{SENSOR_DATA_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def parse_partition_month(name: str) -> date | None:
+    """
+    Inverse of `partition_name`; None for the default or foreign partitions.
+    """
+    match = _PARTITION_NAME_RE.match(name)
+    if not match:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def month_bounds(month: date) -> tuple[date, date]:
+    """
+    [start, end) of the month holding `month`.
+    """
+    start = month_start(month)
+    return start, add_months(start, 1)
+
+
+def partition_ddl(month: date) -> str:
+    """
+    DDL creating the monthly partition for `month` if it does not exist yet.
+    """
+    start, end = month_bounds(month)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(start)} "
+        f"PARTITION OF {SENSOR_DATA_TABLE} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+
+
+def default_partition_ddl() -> str:
+    return f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {SENSOR_DATA_TABLE} DEFAULT"
+
+
+def migrate_default_rows_ddl(month: date) -> list[str]:
+    """
+    Statements creating the partition for `month` when the DEFAULT partition already
+    holds rows of that month (Postgres refuses the plain CREATE then).
+
+    DEFAULT is detached, the month created, its rows moved out of DEFAULT through the
+    parent (so they land in the new partition) and DEFAULT re-attached. Run them in one
+    transaction: other writers to `sensor_data` wait on its lock meanwhile.
+    """
+    start, end = month_bounds(month)
+    return [
+        f"ALTER TABLE {SENSOR_DATA_TABLE} DETACH PARTITION {DEFAULT_PARTITION}",
+        partition_ddl(month),
+        (
+            f"WITH moved AS ("
+            f"DELETE FROM {DEFAULT_PARTITION} "
+            f"WHERE timestamp >= '{start.isoformat()}' AND timestamp < '{end.isoformat()}' "
+            f"RETURNING *) "
+            f"INSERT INTO {SENSOR_DATA_TABLE} SELECT * FROM moved"
+        ),
+        f"ALTER TABLE {SENSOR_DATA_TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT",
+    ]
+
+
+# ─── Partition Management ───────────────────────────────────
+
+async def is_sensor_data_partitioned(conn: AsyncConnection) -> bool:
+    """
+    Check whether `sensor_data` exists as a partitioned (parent) table.
+    """
+    result = await conn.execute(text(
+        "SELECT 1 FROM pg_partitioned_table pt "
+        "JOIN pg_class c ON c.oid = pt.partrelid "
+        "WHERE c.relname = :name"
+    ), {"name": SENSOR_DATA_TABLE})
+    return result.scalar() is not None
+
+
+async def list_sensor_data_partitions(conn: AsyncConnection) -> list[str]:
+    """
+    Names of the partitions currently attached to `sensor_data`.
+    """
+    result = await conn.execute(text(
+        "SELECT child.relname FROM pg_inherits i "
+        "JOIN pg_class parent ON parent.oid = i.inhparent "
+        "JOIN pg_class child ON child.oid = i.inhrelid "
+        "WHERE parent.relname = :name ORDER BY child.relname"
+    ), {"name": SENSOR_DATA_TABLE})
+    return list(result.scalars().all())
+
+
+async def _table_exists(conn: AsyncConnection, name: str) -> bool:
+    result = await conn.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name})
+    return bool(result.scalar())
+
+
+async def _default_has_rows_in(conn: AsyncConnection, month: date) -> bool:
+    """
+    Whether the DEFAULT partition holds rows that belong to `month`.
+    """
+    if not await _table_exists(conn, DEFAULT_PARTITION):
+        return False
+    start, end = month_bounds(month)
+    result = await conn.execute(text(
+        f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE timestamp >= :start AND timestamp < :end)"
+    ), {"start": start, "end": end})
+    return bool(result.scalar())
+
+
+async def ensure_month_partition(month: date) -> None:
+    """
+    Create the partition for `month` in its own transaction, first moving any rows of
+    that month out of the DEFAULT partition. No-op if the partition exists.
+    """
+    name = partition_name(month_start(month))
+    async with engine.begin() as conn:
+        if await _table_exists(conn, name):
+            return
+
+        if await _default_has_rows_in(conn, month):
+            for statement in migrate_default_rows_ddl(month):
+                await conn.execute(text(statement))
+            logger.info("[DB PARTITION] Created %s and moved its rows out of %s", name, DEFAULT_PARTITION)
+        else:
+            await conn.execute(text(partition_ddl(month)))
+
+
+async def ensure_sensor_data_partitions(months_ahead: int | None = None, today: date | None = None) -> list[str]:
+    """
+    Create the current month's partition, the next `months_ahead` ones and a DEFAULT
+    partition for out-of-range timestamps. Idempotent.
+
+    Each month is created in its own transaction, so a month that fails (logged) does
+    not block the others; it is retried on the next maintenance tick.
+
+    Args:
+        months_ahead (int | None): Future months to pre-create. Defaults to settings.
+        today (date | None): Reference date (for tests). Defaults to now (UTC).
+
+    Returns:
+        list[str]: Names of the partitions ensured (excluding the default one).
+    """
+    months_ahead = settings.SENSOR_DATA_PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    current = month_start(today or datetime.now(timezone.utc))
+    months = [add_months(current, i) for i in range(months_ahead + 1)]
+
+    async with engine.connect() as conn:
+        if not await is_sensor_data_partitioned(conn):
+            logger.warning(
+                "[DB PARTITION] %s is not a partitioned table; an existing table must be migrated manually",
+                SENSOR_DATA_TABLE
+            )
+            return []
+
+    names = []
+    for month in months:
+        try:
+            await ensure_month_partition(month)
+            names.append(partition_name(month))
+        except Exception:
+            logger.exception("[DB PARTITION] Failed to create partition %s", partition_name(month))
+
+    async with engine.begin() as conn:
+        await conn.execute(text(default_partition_ddl()))
+
+    logger.info("[DB PARTITION] Ensured partitions | %s", ", ".join(names))
+    return names
+
+
+async def run_partition_maintenance() -> None:
+    """
+    Long-running loop that keeps future monthly partitions created.
+
+    `init_db` ensures partitions at startup; this loop re-checks every
+    SENSOR_DATA_PARTITION_CHECK_HOURS. Errors are logged and retried on the next tick.
+    """
+    interval = max(1, settings.SENSOR_DATA_PARTITION_CHECK_HOURS) * 3600
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await ensure_sensor_data_partitions()
+        except Exception:
+            logger.exception("[DB PARTITION] Partition maintenance failed")
@@ -0,0 +1,68 @@
+"""
+Backfill / rebuild the sensor data rollup tables from raw readings.
+
+Usage (from the Server directory):
+    python -m app.infrastructure.database.rebuild_rollups --start 2025-01-01 --end 2025-07-01
+    python -m app.infrastructure.database.rebuild_rollups --resolution 1h --start 2025-06-01 --chunk-days 1
+
+Each chunk is rebuilt in its own transaction, so a long backfill can be interrupted
+and resumed. Safe to run while ingestion is live for ranges that are no longer written to.
+"""
+import argparse
+import asyncio
+from datetime import datetime, timedelta, timezone
+from loguru import logger
+
+from app.constants.aggregation import ROLLUP_RESOLUTIONS
+from app.infrastructure.database.repository.restAPI.rollup_repository import rebuild_rollups
+from app.infrastructure.database.session import engine
+
+
+def _parse_ts(value: str) -> datetime:
+    ts = datetime.fromisoformat(value)
+    return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+
+async def rebuild(resolutions: list[str], start: datetime, end: datetime, chunk: timedelta) -> None:
+    """
+    Rebuild `resolutions` over [start, end) in `chunk`-sized transactions.
+    """
+    try:
+        for resolution in resolutions:
+            cursor = start
+            while cursor < end:
+                chunk_end = min(cursor + chunk, end)
+                aligned_start, aligned_end = await rebuild_rollups(resolution, cursor, chunk_end)
+                logger.info("[ROLLUP] Rebuilt %s | %s..%s", resolution, aligned_start, aligned_end)
+                cursor = aligned_end
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild sensor data rollup tables from raw readings.")
+    parser.add_argument(
+        "--resolution", choices=list(ROLLUP_RESOLUTIONS), action="append",
+        help="Resolution to rebuild (repeatable). Defaults to all."
+    )
+    parser.add_argument("--start", required=True, type=_parse_ts, help="Range start (ISO 8601, UTC if naive)")
+    parser.add_argument(
+        "--end", type=_parse_ts, default=None, help="Range end, exclusive (ISO 8601). Defaults to now."
+    )
+    parser.add_argument("--chunk-days", type=int, default=7, help="Days per transaction (default 7)")
+    args = parser.parse_args()
+
+    end = args.end or datetime.now(timezone.utc)
+    if args.start >= end:
+        parser.error("--start must be before --end")
+
+    asyncio.run(rebuild(
+        args.resolution or list(ROLLUP_RESOLUTIONS),
+        args.start,
+        end,
+        timedelta(days=max(1, args.chunk_days)),
+    ))
+
+
+if __name__ == "__main__":
+    main()
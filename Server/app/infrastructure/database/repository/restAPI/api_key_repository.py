@@ -16,7 +16,8 @@ async def create_api_key(
     user_id: UUID,
     key: str,
     label: str | None = None,
-    expires_at: datetime | None = None
+    expires_at: datetime | None = None,
+    key_id: str | None = None
 ) -> APIKey:
     """
     Create a new API key for the given user.
@@ -27,6 +28,7 @@ async def create_api_key(
         key (str): Hashed key to store.
         label (str | None): Optional label for human reference.
         expires_at (datetime | None): Optional expiration timestamp.
+        key_id (str | None): Public lookup ID of the key.
 
     Returns:
         APIKey: Newly created APIKey record.
@@ -37,6 +39,7 @@ async def create_api_key(
     try:
         new_key = APIKey(
             key=key,
+            key_id=key_id,
             user_id=user_id,
             label=label,
             is_active=True,
@@ -152,6 +155,30 @@ async def get_active_api_key(session: AsyncSession, key: str) -> APIKey | None:
         )
 
 
+async def get_active_api_key_by_id(session: AsyncSession, key_id: str) -> APIKey | None:
+    """
+    Retrieve an active API key by its public lookup ID.
+
+    Returns:
+        APIKey | None: Active APIKey record or None.
+
+    Raises:
+        AppException: On query failure.
+    """
+    try:
+        result = await session.execute(
+            select(APIKey).where(APIKey.key_id == key_id, APIKey.is_active.is_(True))
+        )
+        return result.scalar_one_or_none()
+    except Exception as e:
+        raise AppException(
+            message=f"Failed to get API key by ID: {e}",
+            status_code=500,
+            public_message="Failed to validate API key.",
+            domain="auth"
+        )
+
+
 async def get_all_active_keys(session: AsyncSession) -> list[APIKey]:
     """
     List all active API keys in the system.
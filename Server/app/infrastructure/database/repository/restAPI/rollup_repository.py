@@ -0,0 +1,238 @@
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Iterable
+from sqlalchemy import and_, delete, func, literal_column, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.constants.aggregation import BUCKET_ORIGIN, ROLLUP_RESOLUTIONS
+from app.constants.sensor_fields import ALLOWED_SENSOR_FIELDS
+from app.infrastructure.database.transaction import run_in_transaction
+from app.models.DB_tables.sensor_data import SensorData
+from app.models.DB_tables.sensor_data_rollup import ROLLUP_MODELS
+from app.utils.exceptions_base import AppException
+
+
+_ORIGIN = datetime.fromisoformat(BUCKET_ORIGIN)
+
+# Most bind parameters Postgres (and asyncpg) accept in one statement
+MAX_BIND_PARAMS = 32767
+
+
+def bucket_expression(width: timedelta, column):
+    """
+    SQL expression mapping `column` onto a `width` bucket grid (`date_bin`, UTC origin 2000-01-01).
+    """
+    interval = literal_column(f"INTERVAL '{int(width.total_seconds())} seconds'")
+    origin = literal_column(f"TIMESTAMPTZ '{BUCKET_ORIGIN}'")
+    return func.date_bin(interval, column, origin)
+
+
+def truncate_to_bucket(ts: datetime, width: timedelta) -> datetime:
+    """
+    Floor `ts` onto the `width` bucket grid shared with SQL `date_bin` (UTC, origin 2000-01-01).
+    Naive timestamps are treated as UTC.
+    """
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return _ORIGIN + ((ts - _ORIGIN) // width) * width
+
+
+def merge_readings(readings: Iterable[dict], resolution: str) -> list[dict]:
+    """
+    Pre-aggregate raw readings into one rollup row per (device_id, bucket_start).
+
+    Merging in memory keeps a single upsert from touching the same row twice and
+    makes the lock order deterministic (rows are sorted by key).
+
+    Args:
+        readings: Dicts with `device_id`, `timestamp` and numeric sensor fields.
+        resolution: Key of ROLLUP_RESOLUTIONS.
+
+    Returns:
+        list[dict]: Rollup rows ready for `upsert_rollups`.
+    """
+    width = ROLLUP_RESOLUTIONS[resolution]
+    merged: dict[tuple, dict] = {}
+
+    for reading in readings:
+        key = (reading["device_id"], truncate_to_bucket(reading["timestamp"], width))
+        row = merged.get(key)
+        if row is None:
+            row = {"device_id": key[0], "bucket_start": key[1], "count": 0}
+            for field in ALLOWED_SENSOR_FIELDS:
+                row[f"{field}_count"] = 0
+                row[f"{field}_min"] = None
+                row[f"{field}_max"] = None
+                row[f"{field}_sum"] = None
+            merged[key] = row
+
+        row["count"] += 1
+        for field in ALLOWED_SENSOR_FIELDS:
+            value = reading.get(field)
+            if value is None:
+                continue
+            cur_min, cur_max, cur_sum = row[f"{field}_min"], row[f"{field}_max"], row[f"{field}_sum"]
+            row[f"{field}_count"] += 1
+            row[f"{field}_min"] = value if cur_min is None else min(cur_min, value)
+            row[f"{field}_max"] = value if cur_max is None else max(cur_max, value)
+            row[f"{field}_sum"] = value if cur_sum is None else cur_sum + value
+
+    return [merged[k] for k in sorted(merged, key=lambda k: (str(k[0]), k[1]))]
+
+
+def build_rollup_upsert(resolution: str, rows: list[dict]):
+    """
+    Build the `INSERT ... ON CONFLICT DO UPDATE` merging `rows` into a rollup table.
+    """
+    table = ROLLUP_MODELS[resolution].__table__
+    stmt = pg_insert(table).values(rows)
+    excluded = stmt.excluded
+
+    set_ = {"count": table.c.count + excluded.count}
+    for field in ALLOWED_SENSOR_FIELDS:
+        set_[f"{field}_count"] = table.c[f"{field}_count"] + excluded[f"{field}_count"]
+        set_[f"{field}_min"] = func.least(table.c[f"{field}_min"], excluded[f"{field}_min"])
+        set_[f"{field}_max"] = func.greatest(table.c[f"{field}_max"], excluded[f"{field}_max"])
+        set_[f"{field}_sum"] = func.coalesce(table.c[f"{field}_sum"], 0) + func.coalesce(excluded[f"{field}_sum"], 0)
+
+    return stmt.on_conflict_do_update(index_elements=["device_id", "bucket_start"], set_=set_)
+
+
+@lru_cache
+def upsert_chunk_size(resolution: str) -> int:
+    """
+    Most rows one `build_rollup_upsert` statement can carry within MAX_BIND_PARAMS,
+    allowing for the parameters of its ON CONFLICT clause.
+    """
+    sample = merge_readings([{"device_id": None, "timestamp": _ORIGIN}], resolution)
+    compiled = build_rollup_upsert(resolution, sample).compile(dialect=postgresql.dialect())
+    per_row = len(sample[0])
+    return (MAX_BIND_PARAMS - (len(compiled.params) - per_row)) // per_row
+
+
+async def upsert_rollups(session: AsyncSession, readings: list[dict]) -> None:
+    """
+    Fold newly stored readings into every rollup resolution.
+
+    Runs in the caller's session so rollups commit atomically with the raw rows.
+    Large batches are split into statements of `upsert_chunk_size` rows, kept in
+    (device, bucket) order so row locks are always taken in the same order.
+
+    Args:
+        session (AsyncSession): Active transaction.
+        readings (list[dict]): Stored readings (`device_id`, `timestamp`, numeric fields).
+    """
+    if not readings:
+        return
+    for resolution in ROLLUP_RESOLUTIONS:
+        rows = merge_readings(readings, resolution)
+        chunk = upsert_chunk_size(resolution)
+        for i in range(0, len(rows), chunk):
+            await session.execute(build_rollup_upsert(resolution, rows[i:i + chunk]))
+
+
+def build_rollup_rebuild_select(resolution: str, start: datetime, end: datetime):
+    """
+    Select recomputing rollup rows for [start, end) straight from `sensor_data`.
+    """
+    bucket = bucket_expression(ROLLUP_RESOLUTIONS[resolution], SensorData.timestamp).label("bucket_start")
+    columns = [SensorData.device_id, bucket, func.count().label("count")]
+    for field in ALLOWED_SENSOR_FIELDS:
+        column = getattr(SensorData, field)
+        columns.extend([
+            func.count(column).label(f"{field}_count"),
+            func.min(column).label(f"{field}_min"),
+            func.max(column).label(f"{field}_max"),
+            func.sum(column).label(f"{field}_sum"),
+        ])
+
+    return (
+        select(*columns)
+        .where(and_(SensorData.timestamp >= start, SensorData.timestamp < end))
+        .group_by(SensorData.device_id, bucket)
+    )
+
+
+async def rebuild_rollups(resolution: str, start: datetime, end: datetime) -> tuple[datetime, datetime]:
+    """
+    Recompute one rollup resolution for a time range from raw data.
+
+    The range is widened to whole buckets; existing rollup rows in it are replaced.
+
+    Args:
+        resolution (str): Key of ROLLUP_RESOLUTIONS ("1m", "1h", "1d").
+        start (datetime): Range start.
+        end (datetime): Range end (exclusive).
+
+    Returns:
+        tuple[datetime, datetime]: The bucket-aligned range actually rebuilt.
+
+    Raises:
+        AppException: On unknown resolution or DB failure.
+    """
+    if resolution not in ROLLUP_RESOLUTIONS:
+        raise AppException(
+            message=f"Unknown rollup resolution: {resolution}",
+            status_code=400,
+            public_message="Unknown rollup resolution.",
+            domain="sensor"
+        )
+
+    width = ROLLUP_RESOLUTIONS[resolution]
+    aligned_start = truncate_to_bucket(start, width)
+    aligned_end = truncate_to_bucket(end, width)
+    if aligned_end < (end if end.tzinfo else end.replace(tzinfo=timezone.utc)):
+        aligned_end += width
+
+    table = ROLLUP_MODELS[resolution].__table__
+    source = build_rollup_rebuild_select(resolution, aligned_start, aligned_end)
+
+    try:
+        async with run_in_transaction() as session:
+            await session.execute(
+                delete(table).where(and_(table.c.bucket_start >= aligned_start, table.c.bucket_start < aligned_end))
+            )
+            await session.execute(
+                pg_insert(table).from_select([c.name for c in source.selected_columns], source)
+            )
+        return aligned_start, aligned_end
+    except Exception as e:
+        raise AppException(
+            message=f"Failed to rebuild {resolution} rollups for {aligned_start}..{aligned_end}: {e}",
+            status_code=500,
+            public_message="Failed to rebuild rollups.",
+            domain="sensor"
+        )
+
+
+def build_rollup_prune(resolution: str, cutoff: datetime):
+    """
+    DELETE of every rollup row of `resolution` whose bucket starts before `cutoff`.
+    """
+    table = ROLLUP_MODELS[resolution].__table__
+    return delete(table).where(table.c.bucket_start < cutoff)
+
+
+async def prune_rollups(resolution: str, cutoff: datetime) -> int:
+    """
+    Remove the rollup rows of one resolution older than `cutoff`.
+
+    Returns:
+        int: Number of rows removed.
+
+    Raises:
+        AppException: On DB failure.
+    """
+    try:
+        async with run_in_transaction() as session:
+            result = await session.execute(build_rollup_prune(resolution, cutoff))
+            return result.rowcount
+    except Exception as e:
+        raise AppException(
+            message=f"Failed to prune {resolution} rollups before {cutoff}: {e}",
+            status_code=500,
+            public_message="Failed to prune rollups.",
+            domain="sensor"
+        )
@@ -1,6 +1,6 @@
 from collections.abc import Sequence
 from typing import Optional
-from sqlalchemy import delete, select, update
+from sqlalchemy import delete, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID, uuid4
 from datetime import datetime, timezone
@@ -58,6 +58,37 @@ async def create_user_secret(
         )
 
 
+# Create many user secrets at once (e.g. login secrets of onboarded users)
+async def create_user_secrets_bulk(db: AsyncSession, rows: list[dict]) -> None:
+    """
+    Insert many secrets in the caller's transaction.
+
+    SQLAlchemy sends the rows as batched multi-row INSERT statements.
+
+    Args:
+        rows: Dicts with `user_id`, `secret` (encrypted), `label`, `is_active`
+            and `expires_at`; IDs and `created_at` are filled in when missing.
+
+    Raises:
+        AppException: On DB failure.
+    """
+    if not rows:
+        return
+    now = datetime.now(timezone.utc)
+    try:
+        await db.execute(
+            insert(UserSecret),
+            [{"id": uuid4(), "created_at": now, "revoked_at": None, **row} for row in rows]
+        )
+    except Exception as e:
+        raise AppException(
+            message=f"Failed to create {len(rows)} user secrets: {e}",
+            status_code=500,
+            public_message="Failed to create user secrets.",
+            domain="auth"
+        )
+
+
 # ----------------------------- READ (GET) -------------------------------------
 
 async def get_user_secret_by_id(session: AsyncSession, secret_id: UUID) -> UserSecret | None:
@@ -1,9 +1,31 @@
-from uuid import UUID
-from sqlalchemy import desc, select, and_
+from datetime import datetime, timezone
+from typing import AsyncIterator, Callable, Sequence
+from uuid import UUID, uuid4
+from sqlalchemy import desc, func, insert, literal, select, true, and_
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql import Select
+from app.constants.aggregation import AGGREGATION_BUCKETS, AGGREGATION_PERCENTILE, ROLLUP_RESOLUTIONS
+from app.models.DB_tables.sensor import Sensor
 from app.models.DB_tables.sensor_data import SensorData
-from app.models.schemas.rest.sensor_data_schemas import SensorDataIn, SensorRangeQuery, SensorTimestampQuery
+from app.models.schemas.rest.sensor_data_schemas import SensorAggregateQuery, SensorDataIn, SensorRangeQuery, SensorTimestampQuery
+from app.infrastructure.database.session import AsyncSessionLocal
 from app.infrastructure.database.transaction import run_in_transaction
+from app.infrastructure.database.repository.restAPI import rollup_repository
+from app.infrastructure.database.repository.restAPI.rollup_repository import bucket_expression
+from app.infrastructure.database.repository.webhook.webhook_outbox_repository import insert_outbox_rows
+from app.models.DB_tables.sensor_data_rollup import ROLLUP_MODELS
+from app.utils.config import settings
 from app.utils.exceptions_base import AppException
+from app.utils.retention_utils import raw_data_expired, rollup_retention_cutoff
+
+
+# Columns used for keyset (cursor) pagination of sensor data queries
+SENSOR_DATA_KEYSET = (SensorData.timestamp, SensorData.id)
+
+# Maps inserted rows to webhook_outbox rows, plus a callback to run once they are
+# committed (see WebhookDispatcher.build_outbox_rows)
+OutboxBuilder = Callable[[list[dict]], tuple[list[dict], Callable[[], None]]]
 
 
 async def search_by_attribute_ranges(payload: SensorRangeQuery):
@@ -39,12 +61,15 @@ async def search_by_attribute_ranges(payload: SensorRangeQuery):
 
 
 
-async def insert_sensor_data(payload: SensorDataIn) -> SensorData:
+async def insert_sensor_data(payload: SensorDataIn, outbox: OutboxBuilder | None = None) -> SensorData:
     """
     Insert a new sensor data row into the database.
 
     Args:
         payload (SensorDataIn): Sensor input model (validated).
+        outbox (OutboxBuilder | None): If given, the webhook deliveries it returns
+            for the row are written in the same transaction; its callback runs
+            after the commit.
 
     Returns:
         SensorData: Inserted SQLAlchemy object (not committed yet).
@@ -52,11 +77,17 @@ async def insert_sensor_data(payload: SensorDataIn) -> SensorData:
     Raises:
         AppException: On any failure to insert.
     """
+    on_commit = None
     try:
         async with run_in_transaction() as session:
-            entry = SensorData(**payload.model_dump())
+            data = {"id": uuid4(), **payload.model_dump()}
+            entry = SensorData(**data)
             session.add(entry)
-            return entry
+            if settings.ROLLUPS_ENABLED:
+                await rollup_repository.upsert_rollups(session, [data])
+            if outbox is not None:
+                outbox_rows, on_commit = outbox([data])
+                await insert_outbox_rows(session, outbox_rows)
     except Exception as e:
         raise AppException(
             message=f"Failed to insert sensor data: {e}",
@@ -64,7 +95,54 @@ async def insert_sensor_data(payload: SensorDataIn) -> SensorData:
             public_message="Internal error while saving sensor data.",
             domain="sensor"
         )
+    if on_commit is not None:
+        on_commit()
+    return entry
+
+
+async def insert_sensor_data_batch(payloads: list[SensorDataIn], outbox: OutboxBuilder | None = None) -> list[dict]:
+    """
+    Insert many sensor data rows in a single transaction.
+
+    Row IDs are generated client-side so the stored rows can be returned
+    without a RETURNING round-trip; SQLAlchemy sends the rows as batched
+    multi-row INSERT statements. With ROLLUPS_ENABLED the rollup tables are
+    updated in the same transaction, and so is the webhook outbox when
+    `outbox` is given (its callback runs after the commit).
+
+    Args:
+        payloads (list[SensorDataIn]): Validated sensor readings.
+        outbox (OutboxBuilder | None): Builds the webhook deliveries for the rows.
+
+    Returns:
+        list[dict]: The inserted rows (including generated IDs), in input order.
+
+    Raises:
+        AppException: On any failure to insert; no row of the batch is stored.
+    """
+    if not payloads:
+        return []
 
+    rows = [{"id": uuid4(), **payload.model_dump()} for payload in payloads]
+    on_commit = None
+    try:
+        async with run_in_transaction() as session:
+            await session.execute(insert(SensorData), rows)
+            if settings.ROLLUPS_ENABLED:
+                await rollup_repository.upsert_rollups(session, rows)
+            if outbox is not None:
+                outbox_rows, on_commit = outbox(rows)
+                await insert_outbox_rows(session, outbox_rows)
+    except Exception as e:
+        raise AppException(
+            message=f"Failed to insert sensor data batch of {len(rows)} rows: {e}",
+            status_code=500,
+            public_message="Internal error while saving sensor data.",
+            domain="sensor"
+        )
+    if on_commit is not None:
+        on_commit()
+    return rows
 
 
 async def fetch_latest_by_sensor(sensor_id: UUID) -> SensorData | None:
@@ -88,6 +166,48 @@ async def fetch_latest_by_sensor(sensor_id: UUID) -> SensorData | None:
         return result.scalar_one_or_none()
 
 
+async def fetch_latest_for_sensors(sensor_ids: list[UUID] | None = None) -> list[SensorData]:
+    """
+    Fetch the latest data point of every requested sensor in a single query.
+
+    Walks `sensors` and, per sensor, reads its newest row through a
+    `LATERAL (... ORDER BY timestamp DESC LIMIT 1)` subquery: one index probe
+    of ix_sensor_data_device_id_timestamp per sensor, however much history it has.
+    IDs of unknown sensors are dropped by the walk itself.
+
+    Args:
+        sensor_ids (list[UUID] | None): Sensors to include; all registered sensors if None/empty.
+
+    Returns:
+        list[SensorData]: At most one row per sensor (sensors without data are omitted).
+
+    Raises:
+        AppException: On DB failure.
+    """
+    latest = (
+        select(SensorData)
+        .where(SensorData.device_id == Sensor.sensor_id)
+        .order_by(desc(SensorData.timestamp))
+        .limit(1)
+        .lateral("latest")
+    )
+    query = select(aliased(SensorData, latest)).select_from(Sensor).join(latest, true())
+    if sensor_ids:
+        query = query.where(Sensor.sensor_id.in_(sensor_ids))
+
+    try:
+        async with run_in_transaction() as session:
+            result = await session.execute(query)
+            return list(result.scalars().all())
+    except Exception as e:
+        raise AppException(
+            message=f"Failed to fetch latest sensor data: {e}",
+            status_code=500,
+            public_message="Failed to retrieve latest sensor data.",
+            domain="sensor"
+        )
+
+
 async def search_by_timestamps(payload: SensorTimestampQuery):
     """
     Search sensor data by timestamp(s).
@@ -137,3 +257,207 @@ async def search_by_sensor_id(sensor_id: UUID):
     return select(SensorData).where(
         SensorData.device_id == sensor_id
     ).order_by(SensorData.timestamp.desc())
+
+
+
+def pick_rollup_resolution(payload: SensorAggregateQuery, now: datetime | None = None) -> str | None:
+    """
+    Choose the coarsest rollup table able to answer `payload`.
+
+    While raw data covers the range, a rollup qualifies when rollups are maintained,
+    p95 is not requested (percentiles cannot be merged), its width divides the bucket
+    width and both range ends fall on its bucket grid.
+
+    Once the range starts before the raw retention cutoff, raw rows may be gone, so
+    any maintained rollup whose width divides the bucket width and which still covers
+    the range start is used: p95 is dropped and the range is snapped to its grid.
+
+    Returns:
+        str | None: Key of ROLLUP_RESOLUTIONS, or None to aggregate raw data.
+    """
+    if not settings.ROLLUPS_ENABLED:
+        return None
+    expired = raw_data_expired(payload.start, now)
+    if payload.include_p95 and not expired:
+        return None
+
+    width = AGGREGATION_BUCKETS[payload.bucket]
+    for resolution, rollup_width in ROLLUP_RESOLUTIONS.items():
+        if width % rollup_width:
+            continue
+        if expired:
+            cutoff = rollup_retention_cutoff(resolution, now)
+            if cutoff is None or cutoff <= _as_utc(payload.start):
+                return resolution
+        elif (
+            rollup_repository.truncate_to_bucket(payload.start, rollup_width) == _as_utc(payload.start)
+            and rollup_repository.truncate_to_bucket(payload.end, rollup_width) == _as_utc(payload.end)
+        ):
+            return resolution
+    return None
+
+
+def _as_utc(ts):
+    return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+
+def build_aggregation_query(payload: SensorAggregateQuery) -> Select:
+    """
+    Build a time-bucketed aggregation query over sensor data.
+
+    Buckets are computed with Postgres `date_bin` (aligned to 2000-01-01 UTC). For each
+    requested field the query returns `<field>__min`, `__max`, `__avg` and `__p95`
+    columns, plus `bucket_start`, `count` and (when grouped) `device_id`.
+
+    When `pick_rollup_resolution` finds a matching rollup table the query reads it
+    instead of `sensor_data`; `__p95` is then NULL.
+
+    Raises:
+        AppException: 400 if the range needs expired raw data and no rollup covers it.
+
+    Args:
+        payload (SensorAggregateQuery): Validated aggregation request.
+
+    Returns:
+        SQLAlchemy Select: Executable query ordered by bucket (and device).
+    """
+    resolution = pick_rollup_resolution(payload)
+    if resolution is not None:
+        return _build_rollup_aggregation_query(payload, resolution)
+    if raw_data_expired(payload.start):
+        raise AppException(
+            message=f"Aggregation from {payload.start} needs expired raw data and no rollup covers it",
+            status_code=400,
+            public_message=(
+                f"Raw sensor data older than {settings.RAW_RETENTION_DAYS} days has expired and no rollup "
+                "covers this range; use a later start or a bucket of at least 1m with rollups enabled."
+            ),
+            domain="sensor"
+        )
+
+    width = AGGREGATION_BUCKETS[payload.bucket]
+    bucket = bucket_expression(width, SensorData.timestamp).label("bucket_start")
+
+    columns = [bucket, func.count().label("count")]
+    for field in payload.fields:
+        column = getattr(SensorData, field)
+        p95 = (
+            func.percentile_cont(AGGREGATION_PERCENTILE).within_group(column)
+            if payload.include_p95 else literal(None)
+        )
+        columns.extend([
+            func.min(column).label(f"{field}__min"),
+            func.max(column).label(f"{field}__max"),
+            func.avg(column).label(f"{field}__avg"),
+            p95.label(f"{field}__p95"),
+        ])
+
+    group_by = [bucket]
+    if payload.group_by_sensor:
+        columns.insert(1, SensorData.device_id)
+        group_by.append(SensorData.device_id)
+
+    filters = [SensorData.timestamp >= payload.start, SensorData.timestamp < payload.end]
+    if payload.sensor_ids:
+        filters.append(SensorData.device_id.in_(payload.sensor_ids))
+
+    query = select(*columns)
+    if payload.locations:
+        query = query.join(Sensor, Sensor.sensor_id == SensorData.device_id)
+        filters.append(Sensor.location.in_(payload.locations))
+
+    return query.where(and_(*filters)).group_by(*group_by).order_by(*group_by)
+
+
+def _build_rollup_aggregation_query(payload: SensorAggregateQuery, resolution: str) -> Select:
+    """
+    Same result shape as `build_aggregation_query`, re-bucketing rollup rows:
+    counts and sums add up, min/max of mins/maxes, avg = field sum / field count.
+    The range is widened to whole rollup buckets.
+    """
+    rollup = ROLLUP_MODELS[resolution]
+    width = AGGREGATION_BUCKETS[payload.bucket]
+    bucket = bucket_expression(width, rollup.bucket_start).label("bucket_start")
+    total = func.sum(rollup.count)
+
+    columns = [bucket, total.label("count")]
+    for field in payload.fields:
+        columns.extend([
+            func.min(getattr(rollup, f"{field}_min")).label(f"{field}__min"),
+            func.max(getattr(rollup, f"{field}_max")).label(f"{field}__max"),
+            (
+                func.sum(getattr(rollup, f"{field}_sum"))
+                / func.nullif(func.sum(getattr(rollup, f"{field}_count")), 0)
+            ).label(f"{field}__avg"),
+            literal(None).label(f"{field}__p95"),
+        ])
+
+    group_by = [bucket]
+    if payload.group_by_sensor:
+        columns.insert(1, rollup.device_id)
+        group_by.append(rollup.device_id)
+
+    # Whole rollup buckets: a no-op for grid-aligned ranges, a snap for expired raw ranges
+    rollup_width = ROLLUP_RESOLUTIONS[resolution]
+    start = rollup_repository.truncate_to_bucket(payload.start, rollup_width)
+    end = rollup_repository.truncate_to_bucket(payload.end, rollup_width)
+    if end < _as_utc(payload.end):
+        end += rollup_width
+    filters = [rollup.bucket_start >= start, rollup.bucket_start < end]
+    if payload.sensor_ids:
+        filters.append(rollup.device_id.in_(payload.sensor_ids))
+
+    query = select(*columns)
+    if payload.locations:
+        query = query.join(Sensor, Sensor.sensor_id == rollup.device_id)
+        filters.append(Sensor.location.in_(payload.locations))
+
+    return query.where(and_(*filters)).group_by(*group_by).order_by(*group_by)
+
+
+async def fetch_aggregates(payload: SensorAggregateQuery) -> list:
+    """
+    Execute the aggregation query built by `build_aggregation_query`.
+
+    Returns:
+        list[RowMapping]: One mapping per bucket (per sensor when grouped).
+
+    Raises:
+        AppException: 400 if the range needs expired raw data (see `build_aggregation_query`); 500 on DB failure.
+    """
+    query = build_aggregation_query(payload)
+    try:
+        async with run_in_transaction() as session:
+            result = await session.execute(query)
+            return list(result.mappings().all())
+    except Exception as e:
+        raise AppException(
+            message=f"Failed to aggregate sensor data: {e}",
+            status_code=500,
+            public_message="Failed to aggregate sensor data.",
+            domain="sensor"
+        )
+
+
+async def stream_rows(query: Select, batch_size: int) -> AsyncIterator[Sequence[Row]]:
+    """
+    Stream the rows of `query` through a server-side cursor, `batch_size` rows at a time.
+
+    Memory stays bounded by one batch regardless of the result size. The session
+    (and its read-only transaction) lives as long as the iteration.
+
+    Raises:
+        AppException: If the query cannot be started.
+    """
+    async with AsyncSessionLocal() as session:
+        try:
+            result = await session.stream(query.execution_options(yield_per=batch_size))
+        except Exception as e:
+            raise AppException(
+                message=f"Failed to start sensor data stream: {e}",
+                status_code=500,
+                public_message="Failed to export sensor data.",
+                domain="sensor"
+            )
+        async for batch in result.partitions():
+            yield batch
@@ -1,6 +1,7 @@
 from collections.abc import Sequence
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from app.models.DB_tables.user import User
 from uuid import UUID, uuid4
 from datetime import datetime, timezone
@@ -31,6 +32,29 @@ async def get_user_by_email(session: AsyncSession, email: str) -> User | None:
         )
 
 
+async def get_existing_emails(session: AsyncSession, emails: Sequence[str]) -> set[str]:
+    """
+    Return which of `emails` already belong to a user, in one `IN (...)` query.
+
+    Raises:
+        AppException: On DB error.
+    """
+    if not emails:
+        return set()
+    try:
+        result = await session.execute(
+            select(User.email).where(User.email.in_(emails))
+        )
+        return set(result.scalars().all())
+    except Exception as e:
+        raise AppException(
+            message=f"Failed to check existing emails ({len(emails)}): {e}",
+            status_code=500,
+            public_message="Could not check existing users.",
+            domain="auth"
+        )
+
+
 async def get_user_by_id(db: AsyncSession, user_id: UUID) -> User | None:
     """
     Fetch a user by UUID.
@@ -122,6 +146,48 @@ async def create_user(
         )
 
 
+BULK_INSERT_CHUNK = 1000  # rows per multi-row INSERT (6 bind parameters each)
+
+
+def build_users_bulk_insert(rows: list[dict]):
+    """
+    Multi-row `INSERT ... ON CONFLICT DO NOTHING RETURNING id` for user rows.
+
+    Rows clashing with an existing email or username are skipped rather than
+    failing the batch; the returned IDs tell which rows were stored.
+    """
+    return pg_insert(User).values(rows).on_conflict_do_nothing().returning(User.id)
+
+
+async def create_users_bulk(session: AsyncSession, rows: list[dict]) -> set[UUID]:
+    """
+    Insert many users in the caller's transaction.
+
+    Args:
+        rows: Dicts with `id`, `email`, `username`, `hashed_password`, `role`
+            and `created_at`; IDs are generated by the caller.
+
+    Returns:
+        set[UUID]: IDs of the rows actually inserted (conflicting rows are skipped).
+
+    Raises:
+        AppException: On DB write failure.
+    """
+    inserted: set[UUID] = set()
+    try:
+        for start in range(0, len(rows), BULK_INSERT_CHUNK):
+            result = await session.execute(build_users_bulk_insert(rows[start:start + BULK_INSERT_CHUNK]))
+            inserted.update(result.scalars().all())
+        return inserted
+    except Exception as e:
+        raise AppException(
+            message=f"Failed to create {len(rows)} users: {e}",
+            status_code=500,
+            public_message="Could not create users.",
+            domain="auth"
+        )
+
+
 async def update_last_login(session: AsyncSession, user_id: UUID):
     """
     Record the current time as the user's last login.
@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta, timezone
+from typing import List
+from uuid import UUID
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.DB_tables.webhook_outbox import OUTBOX_DEAD, OUTBOX_PENDING, WebhookOutbox
+
+
+async def insert_outbox_rows(session: AsyncSession, rows: list[dict]) -> None:
+    """
+    Add pending deliveries in the caller's transaction.
+
+    Args:
+        rows: Dicts with `webhook_id`, `event_type` and a JSON-ready `payload`.
+    """
+    if rows:
+        await session.execute(insert(WebhookOutbox), rows)
+
+
+def build_claim_statement(limit: int, lease: timedelta):
+    """
+    UPDATE ... RETURNING that leases up to `limit` due deliveries.
+
+    Rows are picked with `FOR UPDATE SKIP LOCKED`, so concurrent relays (other
+    workers or processes) never claim the same row. The lease pushes
+    `next_attempt_at` forward; if the claimer dies, the row becomes due again.
+    """
+    due = (
+        select(WebhookOutbox.id)
+        .where(WebhookOutbox.status == OUTBOX_PENDING, WebhookOutbox.next_attempt_at <= func.now())
+        .order_by(WebhookOutbox.next_attempt_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    return (
+        update(WebhookOutbox)
+        .where(WebhookOutbox.id.in_(due))
+        .values(
+            attempts=WebhookOutbox.attempts + 1,
+            next_attempt_at=func.now() + lease,
+        )
+        .returning(WebhookOutbox)
+    )
+
+
+async def claim_due_deliveries(session: AsyncSession, limit: int, lease: timedelta) -> List[WebhookOutbox]:
+    """
+    Lease a batch of due deliveries (see `build_claim_statement`).
+    """
+    result = await session.execute(build_claim_statement(limit, lease))
+    return list(result.scalars().all())
+
+
+async def delete_deliveries(session: AsyncSession, ids: list[UUID]) -> None:
+    """
+    Remove delivered rows.
+    """
+    if ids:
+        await session.execute(delete(WebhookOutbox).where(WebhookOutbox.id.in_(ids)))
+
+
+async def reschedule_delivery(
+    session: AsyncSession,
+    delivery_id: UUID,
+    next_attempt_at: datetime,
+    error: str | None,
+    attempts: int | None = None,
+) -> None:
+    """
+    Put a failed delivery back in the queue for `next_attempt_at`.
+    `attempts` overrides the attempt count (e.g. to refund a claim that made no request).
+    """
+    values: dict = {"next_attempt_at": next_attempt_at, "last_error": error}
+    if attempts is not None:
+        values["attempts"] = attempts
+    await session.execute(
+        update(WebhookOutbox)
+        .where(WebhookOutbox.id == delivery_id)
+        .values(**values)
+    )
+
+
+async def mark_delivery_dead(session: AsyncSession, delivery_id: UUID, error: str | None) -> None:
+    """
+    Stop retrying a delivery; the row is kept for inspection.
+    """
+    await session.execute(
+        update(WebhookOutbox)
+        .where(WebhookOutbox.id == delivery_id)
+        .values(status=OUTBOX_DEAD, last_error=error, next_attempt_at=datetime.now(timezone.utc))
+    )
+
+
+def build_purge_statement(cutoff: datetime):
+    """
+    DELETE of settled rows (anything but pending, i.e. dead) settled before `cutoff`.
+
+    Delivered rows are deleted as they are delivered; dead rows are kept for
+    inspection until purged. A dead row's `next_attempt_at` is when it was given up.
+    """
+    return (
+        delete(WebhookOutbox)
+        .where(WebhookOutbox.status != OUTBOX_PENDING, WebhookOutbox.next_attempt_at < cutoff)
+    )
+
+
+async def purge_settled_deliveries(session: AsyncSession, cutoff: datetime) -> int:
+    """
+    Delete settled rows older than `cutoff` (see `build_purge_statement`).
+
+    Returns:
+        int: Number of rows deleted.
+    """
+    result = await session.execute(build_purge_statement(cutoff))
+    return result.rowcount or 0
@@ -1,8 +1,9 @@
-from typing import List
+from typing import Iterable, List
 from uuid import UUID
-from sqlalchemy import select, delete
+from sqlalchemy import Select, and_, select, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.DB_tables.webhook import Webhook
+from app.models.DB_tables.user_secrets import UserSecret
 from app.utils.exceptions_base import AppException
 from loguru import logger
 
@@ -44,6 +45,35 @@ async def get_active_webhooks_by_event(session: AsyncSession, event_type: str) -
     return list(result.scalars().all())
 
 
+def build_active_webhooks_with_secrets_query(event_types: Iterable[str] | None = None) -> Select:
+    """
+    Enabled webhooks LEFT JOINed with their active signing secret.
+
+    Args:
+        event_types: Restrict to these events (wildcard `*` rows are always included).
+    """
+    stmt = (
+        select(Webhook, UserSecret)
+        .outerjoin(UserSecret, and_(UserSecret.id == Webhook.secret_id, UserSecret.is_active.is_(True)))
+        .where(Webhook.enabled == True)
+    )
+    if event_types is not None:
+        stmt = stmt.where(Webhook.event_type.in_([*event_types, "*"]))
+    return stmt
+
+
+async def get_active_webhooks_with_secrets(
+    session: AsyncSession, event_types: Iterable[str] | None = None
+) -> List[tuple[Webhook, UserSecret | None]]:
+    """
+    Fetch enabled webhooks together with their secret in a single query.
+
+    The secret is None when the webhook has none or it is inactive.
+    """
+    result = await session.execute(build_active_webhooks_with_secrets_query(event_types))
+    return [(webhook, secret) for webhook, secret in result.all()]
+
+
 async def get_webhook_by_id_and_user(session: AsyncSession, webhook_id: UUID, user_id: UUID) -> Webhook | None:
     """
     Fetch a specific webhook for a user.
@@ -0,0 +1,168 @@
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+from loguru import logger
+from sqlalchemy import and_, delete, func, select, text
+
+from app.constants.aggregation import ROLLUP_RESOLUTIONS
+from app.infrastructure.database.archive import archive_partition
+from app.infrastructure.database.partitions import (
+    SENSOR_DATA_TABLE,
+    add_months,
+    is_sensor_data_partitioned,
+    list_sensor_data_partitions,
+    parse_partition_month,
+    partition_name,
+)
+from app.infrastructure.database.repository.restAPI.rollup_repository import prune_rollups, rebuild_rollups
+from app.infrastructure.database.session import engine
+from app.infrastructure.database.transaction import run_in_transaction
+from app.models.DB_tables.sensor_data import SensorData
+from app.utils.config import settings
+from app.utils.retention_utils import day_start, retention_cutoff, rollup_retention_cutoff
+
+
+RETENTION_ACTIONS = ("drop", "detach", "archive")
+
+
+# ─── Helpers ────────────────────────────────────────────────
+
+def expired_partition_months(names: list[str], cutoff: datetime) -> list[date]:
+    """
+    Months of the monthly partitions lying entirely before `cutoff`, oldest first.
+    The default partition and unrecognised names are never selected.
+    """
+    months = [parse_partition_month(n) for n in names]
+    return sorted(
+        m for m in months
+        if m is not None and _as_datetime(add_months(m, 1)) <= cutoff
+    )
+
+
+def _as_datetime(d: date) -> datetime:
+    return datetime(d.year, d.month, d.day, tzinfo=timezone.utc)
+
+
+async def _rollup_range(start: datetime, end: datetime) -> None:
+    """
+    Make sure every rollup resolution covers [start, end) before its raw rows go away.
+    """
+    for resolution in ROLLUP_RESOLUTIONS:
+        await rebuild_rollups(resolution, start, end)
+
+
+# ─── Retention ──────────────────────────────────────────────
+
+async def _expire_partitions(months: list[date], action: str) -> list[str]:
+    handled = []
+    for month in months:
+        name = partition_name(month)
+        await _rollup_range(_as_datetime(month), _as_datetime(add_months(month, 1)))
+        if action == "archive":
+            # The file is complete before the partition is dropped
+            await archive_partition(month)
+        async with engine.begin() as conn:
+            if action == "detach":
+                await conn.execute(text(f"ALTER TABLE {SENSOR_DATA_TABLE} DETACH PARTITION {name}"))
+            else:
+                await conn.execute(text(f"DROP TABLE IF EXISTS {name}"))
+        logger.info("[RETENTION] Partition %s removed | action=%s", name, action)
+        handled.append(name)
+    return handled
+
+
+async def _delete_expired_days(cutoff: datetime) -> list[str]:
+    """
+    Fallback for an unpartitioned table: one set-based DELETE per expired day.
+    """
+    async with run_in_transaction() as session:
+        oldest = (await session.execute(select(func.min(SensorData.timestamp)))).scalar()
+    if oldest is None:
+        return []
+
+    handled = []
+    day = day_start(oldest)
+    while day < cutoff:
+        next_day = day + timedelta(days=1)
+        await _rollup_range(day, next_day)
+        async with run_in_transaction() as session:
+            result = await session.execute(
+                delete(SensorData).where(and_(SensorData.timestamp >= day, SensorData.timestamp < next_day))
+            )
+        logger.info("[RETENTION] Deleted %s raw rows | day=%s", result.rowcount, day.date())
+        handled.append(day.date().isoformat())
+        day = next_day
+    return handled
+
+
+async def apply_rollup_retention(now: datetime | None = None) -> dict[str, int]:
+    """
+    Delete rollup rows older than their resolution's ROLLUP_RETENTION_DAYS_<RES>.
+
+    Returns:
+        dict[str, int]: Rows removed per pruned resolution.
+    """
+    removed = {}
+    for resolution in ROLLUP_RESOLUTIONS:
+        cutoff = rollup_retention_cutoff(resolution, now)
+        if cutoff is None:
+            continue
+        removed[resolution] = await prune_rollups(resolution, cutoff)
+        logger.info("[RETENTION] Pruned %s rollups | cutoff=%s | rows=%d", resolution, cutoff, removed[resolution])
+    return removed
+
+
+async def apply_raw_retention(now: datetime | None = None) -> list[str]:
+    """
+    Remove raw readings older than RAW_RETENTION_DAYS, keeping them as rollups.
+
+    On a partitioned table whole monthly partitions are dropped, detached
+    (RAW_RETENTION_ACTION="detach") or written to a Parquet archive file and then
+    dropped ("archive") once they end before the cutoff, so a partition is removed
+    only after its last day has expired. Rollups for the
+    range are rebuilt from raw data first. An unpartitioned table falls back to
+    per-day range deletes (drop action only).
+
+    Args:
+        now (datetime | None): Reference time (for tests). Defaults to now (UTC).
+
+    Returns:
+        list[str]: Partitions (or days) removed.
+    """
+    action = settings.RAW_RETENTION_ACTION
+    if action not in RETENTION_ACTIONS:
+        logger.error("[RETENTION] Unknown RAW_RETENTION_ACTION %r; expected one of %s", action, RETENTION_ACTIONS)
+        return []
+
+    cutoff = retention_cutoff(now, settings.RAW_RETENTION_DAYS)
+    async with engine.connect() as conn:
+        partitioned = await is_sensor_data_partitioned(conn)
+        names = await list_sensor_data_partitions(conn) if partitioned else []
+
+    if partitioned:
+        handled = await _expire_partitions(expired_partition_months(names, cutoff), action)
+    elif action == "drop":
+        handled = await _delete_expired_days(cutoff)
+    else:
+        logger.warning("[RETENTION] %s is not partitioned; cannot %s partitions", SENSOR_DATA_TABLE, action)
+        handled = []
+
+    logger.info("[RETENTION] Retention pass done | cutoff=%s | removed=%d", cutoff, len(handled))
+    return handled
+
+
+async def run_retention_job() -> None:
+    """
+    Long-running loop applying raw data and rollup retention every RAW_RETENTION_CHECK_HOURS.
+    Errors are logged and retried on the next tick.
+    """
+    interval = max(1, settings.RAW_RETENTION_CHECK_HOURS) * 3600
+    while True:
+        try:
+            await apply_raw_retention()
+        except Exception:
+            logger.exception("[RETENTION] Retention pass failed")
+        try:
+            await apply_rollup_retention()
+        except Exception:
+            logger.exception("[RETENTION] Rollup retention pass failed")
+        await asyncio.sleep(interval)
@@ -12,27 +12,33 @@ from slowapi.errors import RateLimitExceeded
 
 
 from app.domain.api_key_processor import APIKeyAuthProcessor
+from app.domain.sensor_registry import SensorRegistry
+from app.domain.latest_readings import LatestReadingStore
 from app.exception_handlers import app_exception_handler, fallback_exception_handler, validation_error_handler
 from app.utils.exceptions_base import AppException
 
-from app.middleware.login_auth_middleware import LoginAuthMiddleware
-from app.middleware.api_key_auth_middleware import APIKeyAuthMiddleware
+from app.middleware.auth_middleware import AuthMiddleware
 from app.middleware.rate_limit_middleware import limiter, rate_limit_exceeded_handler
-from app.middleware.enforce_https_middleware import EnforceHTTPSMiddleware
 
 from app.utils.config import settings
+from app.utils.hashing import shutdown_hash_executor
 from app.infrastructure.database.init_db import init_db
+from app.infrastructure.database.partitions import run_partition_maintenance
+from app.infrastructure.database.retention import run_retention_job
 from app.infrastructure.database.session import engine
 from app.api.rest.router import router as rest_router
 from app.api.graphql.router import router as graphql_router
 from app.api.webhook.router import router as webhook_router
 from app.domain.webhooks.dispatcher import dispatcher
+from app.domain.webhooks.http_client import webhook_http_client
+from app.domain.webhooks.outbox_relay import outbox_relay
 
 
 
 from app.domain.logging.logging_config import setup_logger
 from loguru import logger
 from app.domain.mqtt_listener import listen_to_mqtt
+from app.domain.sensor_data_batch_writer import sensor_data_batch_writer
 
 
 
@@ -44,19 +50,43 @@ setup_logger()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
+    await webhook_http_client.start()
     await dispatcher.load_all_registries()
+    dispatcher.delivery_queue.start()
+    if settings.WEBHOOK_OUTBOX_ENABLED:
+        outbox_relay.start()
     await APIKeyAuthProcessor.load()
+    await SensorRegistry.load()
+    await LatestReadingStore.load()
+    if settings.MQTT_BATCH_INGEST_ENABLED:
+        sensor_data_batch_writer.start()
+    background_tasks = []
+    if settings.SENSOR_DATA_PARTITIONING_ENABLED:
+        background_tasks.append(asyncio.create_task(run_partition_maintenance()))
+    if settings.RAW_RETENTION_ENABLED:
+        background_tasks.append(asyncio.create_task(run_retention_job()))
     task = asyncio.create_task(listen_to_mqtt())
     yield
+    for bg in background_tasks:
+        bg.cancel()
     task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    # Flush readings still buffered once the listener can no longer enqueue
+    await sensor_data_batch_writer.stop()
+    # Stopped after the writer: its final flush may still dispatch webhooks
+    await dispatcher.delivery_queue.stop(settings.WEBHOOK_QUEUE_DRAIN_SECONDS)
+    await outbox_relay.stop()
+    await webhook_http_client.stop()
+    shutdown_hash_executor()
 
 # ─── Middleware List ─────────────────────────────────────────
 middleware = [
     Middleware(ProxyHeadersMiddleware,  # type: ignore[arg-type]
                trusted_hosts=["tamkairquality.duckdns.org"]),
-    Middleware(EnforceHTTPSMiddleware),
-    Middleware(LoginAuthMiddleware),
-    Middleware(APIKeyAuthMiddleware),
+    Middleware(AuthMiddleware),  # HTTPS enforcement, JWT / API key auth and RBAC
 ]
 
 # ─── FastAPI App Init ────────────────────────────────────────
@@ -0,0 +1,222 @@
+from dataclasses import dataclass
+from typing import Optional
+from uuid import UUID
+from loguru import logger
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.domain.api_key_processor import APIKeyAuthProcessor
+from app.domain.login_auth_processor import LoginAuthProcessor
+from app.infrastructure.database.transaction import run_in_transaction
+from app.infrastructure.database.repository.restAPI.secret_repository import get_user_secret_by_label
+from app.infrastructure.database.repository.restAPI.user_repository import get_user_by_id
+from app.models.DB_tables.user import RoleEnum, User
+from app.utils.config import settings
+from app.utils.crypto_utils import decrypt_secret
+from app.utils.exceptions_base import AppException, AuthValidationError
+from app.utils.jwt_utils import decode_jwt, decode_jwt_unverified
+from app.utils.path_trie import PathPrefixTrie
+
+# API versioning prefix
+base = f"/api/{settings.API_VERSION}"
+
+# Auth methods
+LOGIN = "login"  # Bearer JWT; required when the route lists roles, else optional
+API_KEY = "apikey"  # X-API-Key header, always required
+
+_ANY_USER = frozenset({RoleEnum.admin, RoleEnum.developer, RoleEnum.authenticated})
+
+
+@dataclass(frozen=True)
+class RoutePolicy:
+    method: str
+    roles: Optional[frozenset[RoleEnum]] = None  # None: no role check
+    public_methods: frozenset[str] = frozenset()  # HTTP methods exempt from authentication
+
+
+# Role-based access per URL prefix; the longest matching prefix wins
+ROUTE_POLICIES: dict[str, RoutePolicy] = {
+    f"{base}/auth/admin": RoutePolicy(LOGIN, frozenset({RoleEnum.admin})),
+    f"{base}/auth/developer": RoutePolicy(LOGIN, frozenset({RoleEnum.admin, RoleEnum.developer})),
+    f"{base}/auth/authenticated": RoutePolicy(LOGIN, _ANY_USER),
+    f"{base}/auth/webhooks": RoutePolicy(LOGIN, _ANY_USER),
+    f"{base}/sensor": RoutePolicy(API_KEY, _ANY_USER),
+    f"{base}/sensor/admin": RoutePolicy(API_KEY, frozenset({RoleEnum.admin})),
+    f"{base}/sensor/developer": RoutePolicy(API_KEY, frozenset({RoleEnum.admin, RoleEnum.developer})),
+    f"{base}/sensor/authenticated": RoutePolicy(API_KEY, _ANY_USER),
+    # GraphQL IDEs are served on GET; queries (POST) need a key
+    f"{base}/sensor/data/graphql": RoutePolicy(API_KEY, _ANY_USER, public_methods=frozenset({"GET"})),
+    f"{base}/sensor/meta/graphql": RoutePolicy(API_KEY, _ANY_USER, public_methods=frozenset({"GET"})),
+}
+
+# Exact paths served without authentication, checked before any other work
+PUBLIC_PATHS: frozenset[str] = frozenset({
+    f"{base}/sensor/data/latest",
+})
+
+DEFAULT_POLICY = RoutePolicy(LOGIN)
+
+
+async def authenticate_bearer(token: str) -> User:
+    """
+    Resolve a Bearer JWT to its user, through the `LoginAuthProcessor` cache.
+
+    The token is verified with the user's login secret, found via the (unverified) `sub` claim.
+
+    Raises:
+        AppException: If the token, login secret or user is invalid.
+    """
+    user = LoginAuthProcessor.get(token)
+    if user:
+        return user
+
+    unverified = decode_jwt_unverified(token)
+    user_id = UUID(unverified.get("sub", ""))
+
+    async with run_in_transaction() as session:
+        login_secret = await get_user_secret_by_label(session, user_id, label="login")
+        if not login_secret or not login_secret.is_active:
+            raise AuthValidationError("Login secret not found or inactive")
+
+        decode_jwt(token, secret=decrypt_secret(login_secret.secret))
+
+        user = await get_user_by_id(session, user_id)
+        if not user:
+            raise AuthValidationError("User not found")
+
+    # Cache for future requests
+    LoginAuthProcessor.add(token, user)
+    logger.debug("[Auth] Token validated and user %s cached", user.id)
+    return user
+
+
+class AuthMiddleware:
+    """
+    Pure-ASGI authentication and authorization for every HTTP request.
+
+    - Outside local development, rejects non-HTTPS requests.
+    - Resolves each path once, through a prefix trie of `ROUTE_POLICIES`, to
+      its auth method (Bearer JWT or API key) and allowed roles.
+    - Attaches the authenticated user to `request.state` (`user`, `user_id`,
+      `auth_method`).
+
+    Unlike `BaseHTTPMiddleware`, it neither wraps the request in extra tasks
+    nor buffers the response, so streaming responses pass through untouched.
+    Paths in `PUBLIC_PATHS` skip everything but the HTTPS check.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.require_https = settings.ENV != "local"
+        self.policies: PathPrefixTrie[RoutePolicy] = PathPrefixTrie(ROUTE_POLICIES.items())
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path: str = scope["path"]
+        headers = None
+
+        if self.require_https:
+            # Determine the protocol from the proxy header, or the connection itself
+            headers = _auth_headers(scope)
+            if headers.get(b"x-forwarded-proto", scope["scheme"].encode()) != b"https":
+                logger.warning("[Auth] Blocked non-HTTPS request to %s", path)
+                await _reply(scope, receive, send, 403, {"detail": "HTTPS is required"})
+                return
+
+        if path in PUBLIC_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        policy = self.policies.match(path) or DEFAULT_POLICY
+        if scope["method"] in policy.public_methods:
+            await self.app(scope, receive, send)
+            return
+
+        if headers is None:
+            headers = _auth_headers(scope)
+        if policy.method == API_KEY:
+            response = await self._api_key(scope, headers, policy)
+        else:
+            response = await self._login(scope, headers, policy)
+
+        if response is not None:
+            await _reply(scope, receive, send, *response)
+            return
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    async def _api_key(scope: Scope, headers: dict[bytes, bytes], policy: RoutePolicy) -> Optional[tuple[int, dict]]:
+        """Authenticate by X-API-Key; returns an error response, or None to proceed."""
+        api_key = headers.get(b"x-api-key")
+        if not api_key:
+            logger.warning("[Auth] Missing X-API-Key header")
+            return 401, {"detail": "Missing API key"}
+
+        try:
+            # Match API key using loaded key cache (raises if no key matches)
+            user = await APIKeyAuthProcessor.match(api_key.decode("latin-1"))
+        except AuthValidationError as ae:
+            logger.warning("[Auth] API key rejected: %s", ae.public_message)
+            return 401, {"detail": ae.public_message}
+        except Exception:
+            logger.exception("[Auth] Unexpected error during API key auth")
+            return 500, {"detail": "Internal auth error"}
+
+        _set_user(scope, user, API_KEY)
+        if policy.roles is not None and user.role not in policy.roles:
+            logger.warning("[Auth] Access denied: %s not in %s", user.role, sorted(policy.roles))
+            return 403, {"detail": "Access denied"}
+        return None
+
+    @staticmethod
+    async def _login(scope: Scope, headers: dict[bytes, bytes], policy: RoutePolicy) -> Optional[tuple[int, dict]]:
+        """Authenticate by Bearer JWT (if given); returns an error response, or None to proceed."""
+        user = None
+        auth_header = headers.get(b"authorization", b"").decode("latin-1")
+        if auth_header.startswith("Bearer "):
+            try:
+                user = await authenticate_bearer(auth_header.removeprefix("Bearer ").strip())
+            except AppException as ae:
+                logger.warning("[Auth] Auth exception: %s", ae.public_message)
+                return ae.status_code, {"error": ae.public_message}
+            except Exception:
+                logger.exception("[Auth] Unexpected JWT error")
+                return 401, {"detail": "Token validation failed"}
+
+        _set_user(scope, user, LOGIN if user else None)
+        if policy.roles is None:
+            return None
+        if user is None:
+            logger.warning("[Auth] Access denied to unauthenticated user on %s", scope["path"])
+            return 401, {"detail": "Authentication required"}
+        if user.role not in policy.roles:
+            logger.warning("[Auth] Access denied for user %s with role %s", user.id, user.role)
+            return 403, {"detail": f"Access denied for role: {user.role}"}
+        return None
+
+
+_AUTH_HEADERS = frozenset({b"authorization", b"x-api-key", b"x-forwarded-proto"})
+
+
+def _auth_headers(scope: Scope) -> dict[bytes, bytes]:
+    """The headers this middleware reads (first occurrence), in one pass over the raw headers."""
+    found: dict[bytes, bytes] = {}
+    for name, value in scope["headers"]:  # names are lowercase per the ASGI spec
+        if name in _AUTH_HEADERS and name not in found:
+            found[name] = value
+    return found
+
+
+def _set_user(scope: Scope, user: Optional[User], method: Optional[str]) -> None:
+    # Same dict Starlette exposes as `request.state`
+    state = scope.setdefault("state", {})
+    state["user"] = user
+    state["user_id"] = user.id if user else None
+    state["auth_method"] = method
+
+
+async def _reply(scope: Scope, receive: Receive, send: Send, status_code: int, content: dict) -> None:
+    await JSONResponse(status_code=status_code, content=content)(scope, receive, send)
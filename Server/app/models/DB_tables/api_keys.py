@@ -9,6 +9,7 @@ class APIKey(Base):
     __tablename__ = "api_keys"
 
     key: Mapped[str] = mapped_column(String, primary_key=True)  # public token
+    key_id: Mapped[str | None] = mapped_column(String, unique=True, index=True, nullable=True)  # lookup ID (None: legacy key)
     user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"))
     label: Mapped[str | None]
     is_active: Mapped[bool] = mapped_column(default=True)
@@ -1,19 +1,32 @@
-from sqlalchemy import String, Float, Integer, TIMESTAMP
+from sqlalchemy import String, Float, Integer, TIMESTAMP, Index
 from sqlalchemy.dialects.postgresql import UUID as SQLUUID
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime, timezone
 import uuid
 from app.models.DB_tables.base import Base
+from app.utils.config import settings
 
 
+# When partitioning is enabled the table is created as `PARTITION BY RANGE (timestamp)`
+# (monthly partitions are managed by app.infrastructure.database.partitions). Postgres
+# requires the partition key in every unique constraint, hence the composite primary key.
+PARTITIONED = settings.SENSOR_DATA_PARTITIONING_ENABLED
+
 
 class SensorData(Base):
     __tablename__ = "sensor_data"
+    __table_args__ = (
+        {"postgresql_partition_by": "RANGE (timestamp)"} if PARTITIONED else {},
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(SQLUUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    device_id: Mapped[uuid.UUID] = mapped_column(SQLUUID(as_uuid=True), index=True)
-    timestamp: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), default=lambda: datetime.now(timezone.utc))
+    device_id: Mapped[uuid.UUID] = mapped_column(SQLUUID(as_uuid=True))
+    timestamp: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        primary_key=PARTITIONED,
+        default=lambda: datetime.now(timezone.utc)
+    )
 
     # Core metrics
     temperature: Mapped[float]
@@ -44,3 +57,12 @@ class SensorData(Base):
     rs2: Mapped[int]
     rs3: Mapped[int]
     co2: Mapped[int]
+
+
+# Per-device history, newest first (latest reading, by-sensor queries)
+Index("ix_sensor_data_device_id_timestamp", SensorData.device_id, SensorData.timestamp.desc())
+# Global time ordering and keyset pagination on (timestamp, id)
+Index("ix_sensor_data_timestamp_id", SensorData.timestamp.desc(), SensorData.id.desc())
+
+# Single-column index of earlier versions, superseded by ix_sensor_data_device_id_timestamp
+LEGACY_INDEXES = ("ix_sensor_data_device_id",)
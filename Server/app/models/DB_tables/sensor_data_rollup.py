@@ -0,0 +1,42 @@
+from sqlalchemy import Float, Integer, TIMESTAMP
+from sqlalchemy.dialects.postgresql import UUID as SQLUUID
+from sqlalchemy.orm import mapped_column
+from app.constants.sensor_fields import ALLOWED_SENSOR_FIELDS
+from app.models.DB_tables.base import Base
+
+
+# Rollup resolutions → table names. Each table holds one row per (device_id, bucket_start)
+# with the reading count and, for every numeric sensor field, `<field>_count` (non-null
+# readings), `<field>_min`, `<field>_max` and `<field>_sum` (avg = sum / count). All are
+# mergeable, so rows can be updated incrementally with an upsert as readings arrive.
+ROLLUP_TABLES = {
+    "1m": "sensor_data_rollup_1m",
+    "1h": "sensor_data_rollup_1h",
+    "1d": "sensor_data_rollup_1d",
+}
+
+
+def _rollup_attributes(table_name: str) -> dict:
+    attrs: dict = {
+        "__tablename__": table_name,
+        "device_id": mapped_column(SQLUUID(as_uuid=True), primary_key=True),
+        "bucket_start": mapped_column(TIMESTAMP(timezone=True), primary_key=True),
+        "count": mapped_column(Integer, nullable=False, default=0),
+    }
+    for field in ALLOWED_SENSOR_FIELDS:
+        attrs[f"{field}_count"] = mapped_column(Integer, nullable=False, default=0)
+        attrs[f"{field}_min"] = mapped_column(Float, nullable=True)
+        attrs[f"{field}_max"] = mapped_column(Float, nullable=True)
+        attrs[f"{field}_sum"] = mapped_column(Float, nullable=True)
+    return attrs
+
+
+SensorDataRollup1m = type("SensorDataRollup1m", (Base,), _rollup_attributes(ROLLUP_TABLES["1m"]))
+SensorDataRollup1h = type("SensorDataRollup1h", (Base,), _rollup_attributes(ROLLUP_TABLES["1h"]))
+SensorDataRollup1d = type("SensorDataRollup1d", (Base,), _rollup_attributes(ROLLUP_TABLES["1d"]))
+
+ROLLUP_MODELS = {
+    "1m": SensorDataRollup1m,
+    "1h": SensorDataRollup1h,
+    "1d": SensorDataRollup1d,
+}
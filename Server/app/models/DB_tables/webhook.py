@@ -18,6 +18,7 @@ class Webhook(Base):
     custom_headers: Mapped[dict | None] = mapped_column(JSON, nullable=True)
 
     parameters: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    alert_policy: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
 
     enabled: Mapped[bool] = mapped_column(Boolean, default=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.now(timezone.utc))
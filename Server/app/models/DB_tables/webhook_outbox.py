@@ -0,0 +1,38 @@
+from sqlalchemy import String, Integer, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime, timezone
+import uuid
+from app.models.DB_tables.base import Base
+
+
+# Delivery status of an outbox row. Delivered rows are deleted, so only these two remain.
+OUTBOX_PENDING = "pending"
+OUTBOX_DEAD = "dead"  # gave up after WEBHOOK_OUTBOX_MAX_ATTEMPTS
+
+
+class WebhookOutbox(Base):
+    """
+    One pending webhook delivery (event payload × target webhook), written in the
+    same transaction as the data that produced the event.
+    """
+    __tablename__ = "webhook_outbox"
+    __table_args__ = (
+        # Relay claim: due pending rows, oldest first
+        Index("ix_webhook_outbox_status_next_attempt", "status", "next_attempt_at"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    webhook_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("webhooks.id", ondelete="CASCADE"), nullable=False)
+    event_type: Mapped[str] = mapped_column(String, nullable=False)
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+
+    status: Mapped[str] = mapped_column(String, nullable=False, default=OUTBOX_PENDING)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc)
+    )
+    last_error: Mapped[str | None] = mapped_column(String, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc)
+    )
@@ -5,7 +5,7 @@
 # - timestamps (exact list or range)
 # - numeric field values (via [min, max])
 # - sensor metadata (location, model, is_active)
-# Pagination is supported via `page` and `page_size`.
+# Pagination is supported via `page` and `page_size`, or keyset paging via `cursor`/`use_cursor`.
 
 from pydantic import BaseModel, Field, field_validator
 from uuid import UUID
@@ -66,6 +66,18 @@ class SensorDataAdvancedQuery(BaseModel):
         le=200,
         description="Number of results per page (max 200)"
     )
+    cursor: Optional[str] = Field(
+        default=None,
+        description="Opaque cursor from a previous page; switches to keyset pagination"
+    )
+    use_cursor: bool = Field(
+        default=False,
+        description="Start keyset pagination from the first page"
+    )
+
+    @property
+    def keyset_mode(self) -> bool:
+        return self.use_cursor or bool(self.cursor)
 
     @field_validator("field_ranges")
     def validate_field_ranges(cls, v):
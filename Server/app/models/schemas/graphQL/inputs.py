@@ -57,7 +57,7 @@ class SensorDataQueryInput:
     - Metadata filters: location, model, is_active
     - Time filters: exact timestamps or inclusive time range
     - Field filters: numeric fields with [min, max] values
-    - Pagination: page and page_size
+    - Pagination: page and page_size, or keyset via cursor/use_cursor
     """
     sensor_ids: Optional[List[UUID]] = strawberry.field(default=None, name="sensor_ids")
     location_filter: Optional[List[str]] = strawberry.field(default=None, name="location_filter")
@@ -69,6 +69,34 @@ class SensorDataQueryInput:
 
     page: int = strawberry.field(default=1, name="page")
     page_size: Optional[int] = strawberry.field(default=None, name="page_size")
+    cursor: Optional[str] = strawberry.field(default=None, name="cursor")
+    use_cursor: bool = strawberry.field(default=False, name="use_cursor")
+
+
+# ────────────────────────────────────────────────────────
+# SENSOR DATA AGGREGATION INPUT
+# ────────────────────────────────────────────────────────
+
+@strawberry.input
+class SensorAggregateInput:
+    """
+    Input type for time-bucketed aggregation of sensor fields.
+
+    - fields: sensor fields to aggregate (e.g. ["co2", "pm2_5"])
+    - bucket: bucket width ("1m", "5m", "15m", "1h", "6h", "1d", "7d")
+    - start/end: time range [start, end)
+    - sensor_ids / location_filter: restrict the sensors
+    - group_by_sensor: one series per sensor
+    - include_p95: false lets the query be served from rollup tables (p95 null)
+    """
+    fields: List[str]
+    bucket: str
+    start: datetime
+    end: datetime
+    sensor_ids: Optional[List[UUID]] = strawberry.field(default=None, name="sensor_ids")
+    location_filter: Optional[List[str]] = strawberry.field(default=None, name="location_filter")
+    group_by_sensor: bool = strawberry.field(default=False, name="group_by_sensor")
+    include_p95: bool = strawberry.field(default=True, name="include_p95")
 
 
 # ────────────────────────────────────────────────────────
@@ -6,6 +6,7 @@
 
 import strawberry
 from datetime import datetime
+from typing import Optional
 from uuid import UUID
 
 
@@ -72,6 +73,29 @@ class SensorData:
     co2: int
 
 
+# ────────────────────────────────────────────────────────
+# AGGREGATION TYPES
+# ────────────────────────────────────────────────────────
+
+@strawberry.type
+class FieldAggregate:
+    """Aggregates of one field within a time bucket."""
+    field: str
+    min: Optional[float] = None
+    max: Optional[float] = None
+    avg: Optional[float] = None
+    p95: Optional[float] = None
+
+
+@strawberry.type
+class SensorAggregateBucket:
+    """One time bucket of aggregated sensor readings."""
+    bucket_start: datetime = strawberry.field(name="bucket_start", description="Start of the bucket")
+    device_id: Optional[UUID] = strawberry.field(name="device_id", description="Sensor UUID when grouped by sensor")
+    count: int = strawberry.field(description="Number of readings in the bucket")
+    aggregates: list[FieldAggregate] = strawberry.field(description="Per-field aggregates")
+
+
 # ────────────────────────────────────────────────────────
 # PAGINATED RESPONSE TYPES
 # ────────────────────────────────────────────────────────
@@ -80,15 +104,20 @@ class SensorData:
 class PaginatedSensorData:
     """GraphQL type for paginated sensor data response."""
     items: list[SensorData] = strawberry.field(description="List of matching sensor data records")
-    total: int = strawberry.field(description="Total number of matching records")
+    total: Optional[int] = strawberry.field(description="Total number of matching records (null when counting is disabled)")
+    total_policy: str = strawberry.field(name="total_policy", description="How total was computed: exact, estimated, cached or none")
+    has_more: bool = strawberry.field(name="has_more", description="Whether another page exists")
     page: int = strawberry.field(description="Current page number")
     page_size: int = strawberry.field(name="page_size", description="Number of results per page")
+    next_cursor: Optional[str] = strawberry.field(default=None, name="next_cursor", description="Cursor for the next page (keyset mode only)")
 
 
 @strawberry.type
 class PaginatedSensorMetadata:
     """GraphQL type for paginated sensor metadata response."""
     items: list[Sensor] = strawberry.field(description="List of matching sensor metadata entries")
-    total: int = strawberry.field(description="Total number of matching entries")
+    total: Optional[int] = strawberry.field(description="Total number of matching entries (null when counting is disabled)")
+    total_policy: str = strawberry.field(name="total_policy", description="How total was computed: exact, estimated, cached or none")
+    has_more: bool = strawberry.field(name="has_more", description="Whether another page exists")
     page: int = strawberry.field(description="Current page number")
     page_size: int = strawberry.field(name="page_size", description="Number of results per page")
@@ -51,11 +51,22 @@ class UserOnboardRequest(BaseModel):
     users: List[NewUserInput]
 
 
+class OnboardRowResult(BaseModel):
+    """Outcome of onboarding one input row."""
+    name: str = Field(..., description="Name as given in the request")
+    email: str = Field(..., description="Email derived from the name")
+    status: Literal["created", "exists", "duplicate", "failed"] = Field(
+        ..., description="created, exists (email already registered), duplicate (repeated in the request) or failed"
+    )
+    detail: Optional[str] = Field(None, description="Reason when the row was not created")
+
+
 class OnboardResult(BaseModel):
     """Result of the user onboarding operation."""
     created_count: int = Field(..., description="Number of users successfully created")
     users: List[str] = Field(..., description="Emails of the newly created users")
-    skipped: List[str] = Field(..., description="Emails that were skipped (already existed)")
+    skipped: List[str] = Field(..., description="Emails that were skipped (already existed or failed)")
+    results: List[OnboardRowResult] = Field(default_factory=list, description="Per-row outcome, in request order")
 
 
 class UserDeleteRequest(BaseModel):
@@ -105,6 +116,7 @@ class APIKeyDeleteRequest(BaseModel):
 class APIKeyConfig(BaseModel):
     """Internal structure for storing a hashed API key."""
     key: SecretStr
+    key_id: Optional[str] = Field(None, description="Public lookup ID (None for legacy keys)")
     user_id: UUID
     expires_at: Optional[datetime] = Field(None, description="Optional expiry timestamp")
     role: RoleEnum = Field(..., description="Associated role")
@@ -114,6 +126,7 @@ class GeneratedAPIKey(BaseModel):
     """Response model for newly generated API keys."""
     raw_key: str = Field(..., description="The actual key string (visible only once)")
     hashed_key: SecretStr = Field(..., description="Securely stored hashed version of the key")
+    key_id: Optional[str] = Field(None, description="Public lookup ID embedded in the key")
 
 
 # -------------------------------
@@ -9,7 +9,11 @@ from typing import Dict, List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field, model_validator
 
+from app.constants.aggregation import AGGREGATION_BUCKETS
+from app.constants.export import ExportFormat
 from app.constants.sensor_fields import ALLOWED_SENSOR_FIELDS
+from app.models.schemas.graphQL.Sensor_data_query import SensorDataAdvancedQuery
+from app.utils.config import settings
 
 
 # ────────────────────────────────────────────────────────
@@ -145,14 +149,28 @@ class SensorMetadataOut(SensorMetadataIn):
 # SENSOR QUERY INPUT MODELS
 # ────────────────────────────────────────────────────────
 
-class SensorRangeQuery(BaseModel):
+class CursorPaginationParams(BaseModel):
+    """Opt-in keyset pagination fields shared by the paginated sensor data queries.
+
+    Supplying `cursor` (or setting `use_cursor` for the first page) switches from offset
+    paging to keyset paging on (timestamp, id); `page` is then ignored.
+    """
+    cursor: Optional[str] = Field(default=None, description="Opaque `next_cursor` from the previous page")
+    use_cursor: bool = Field(default=False, description="Start keyset pagination from the first page")
+
+    @property
+    def keyset_mode(self) -> bool:
+        return self.use_cursor or bool(self.cursor)
+
+
+class SensorRangeQuery(CursorPaginationParams):
     """Query sensor data by range filters across multiple fields.
 
     Each entry in 'ranges' maps a field name to a [min, max] range.
     Use `null` to represent infinity (i.e., no bound).
     Only fields listed in ALLOWED_SENSOR_FIELDS are permitted.
     """
-    page: int = Field(..., ge=1, description="Pagination page number (starts from 1)")
+    page: int = Field(default=1, ge=1, description="Pagination page number (starts from 1)")
     ranges: Dict[str, List[Optional[float]]] = Field(..., description="Map of field name to [min, max] values")
 
     @model_validator(mode="after")
@@ -175,20 +193,20 @@ class SensorRangeQuery(BaseModel):
         return self
 
 
-class SensorTimestampQuery(BaseModel):
+class SensorTimestampQuery(CursorPaginationParams):
     """Query sensor data by one or more timestamps.
 
     Use `exact=True` for exact matches; otherwise treated as inclusive range [min(ts), max(ts)].
     """
     timestamps: List[datetime] = Field(..., description="List of datetime values")
     exact: bool = Field(default=False, description="Match timestamps exactly or as a range")
-    page: int = Field(..., ge=1, description="Pagination page number")
+    page: int = Field(default=1, ge=1, description="Pagination page number")
 
 
-class SensorQuery(BaseModel):
+class SensorQuery(CursorPaginationParams):
     """Query all data from a single sensor by its ID (paginated)."""
     sensor_id: UUID = Field(..., description="Sensor UUID")
-    page: int = Field(..., ge=1, description="Pagination page number")
+    page: int = Field(default=1, ge=1, description="Pagination page number")
 
 
 class SensorListInput(BaseModel):
@@ -199,3 +217,92 @@ class SensorListInput(BaseModel):
 class SensorIdOnly(BaseModel):
     """Lightweight wrapper for operations needing only the sensor ID."""
     sensor_id: UUID = Field(..., description="Sensor UUID")
+
+
+# ────────────────────────────────────────────────────────
+# AGGREGATION MODELS
+# ────────────────────────────────────────────────────────
+
+class SensorAggregateQuery(BaseModel):
+    """Time-bucketed aggregation over one or more sensor fields.
+
+    Buckets are aligned to `bucket` widths (e.g. "1h", "1d") and computed in the database.
+    Restrict the sensors with `sensor_ids` and/or `locations`; set `group_by_sensor`
+    to get one series per sensor instead of one across all matching sensors.
+    """
+    fields: List[str] = Field(..., min_length=1, description="Fields to aggregate (ALLOWED_SENSOR_FIELDS)")
+    bucket: str = Field(..., description=f"Bucket width: one of {', '.join(AGGREGATION_BUCKETS)}")
+    start: datetime = Field(..., description="Start of the time range (inclusive)")
+    end: datetime = Field(..., description="End of the time range (exclusive)")
+    sensor_ids: Optional[List[UUID]] = Field(default=None, description="Restrict to these sensor UUIDs")
+    locations: Optional[List[str]] = Field(default=None, description="Restrict to sensors at these locations")
+    group_by_sensor: bool = Field(default=False, description="Return one series per sensor")
+    include_p95: bool = Field(
+        default=True,
+        description=(
+            "Compute p95 (raw data only); set false to allow serving from rollup tables. "
+            "Ranges starting before the raw retention cutoff are always served from rollups, without p95."
+        )
+    )
+
+    @model_validator(mode="after")
+    def validate_query(self) -> "SensorAggregateQuery":
+        invalid = [f for f in self.fields if f not in ALLOWED_SENSOR_FIELDS]
+        if invalid:
+            raise ValueError(f"Invalid field(s): {', '.join(invalid)}")
+        if self.bucket not in AGGREGATION_BUCKETS:
+            raise ValueError(f"Invalid bucket '{self.bucket}'. Allowed: {', '.join(AGGREGATION_BUCKETS)}")
+        if self.start >= self.end:
+            raise ValueError("'start' must be before 'end'.")
+
+        bucket_count = (self.end - self.start) / AGGREGATION_BUCKETS[self.bucket]
+        if bucket_count > settings.AGGREGATION_MAX_BUCKETS:
+            raise ValueError(
+                f"Time range spans {int(bucket_count)} buckets; maximum is {settings.AGGREGATION_MAX_BUCKETS}. "
+                "Use a wider bucket or a shorter range."
+            )
+        return self
+
+
+class FieldAggregate(BaseModel):
+    """Aggregates of a single field within one bucket."""
+    field: str
+    min: Optional[float] = None
+    max: Optional[float] = None
+    avg: Optional[float] = None
+    p95: Optional[float] = None
+
+
+class SensorAggregateBucket(BaseModel):
+    """One time bucket of aggregated readings."""
+    bucket_start: datetime
+    device_id: Optional[UUID] = Field(default=None, description="Set when grouped by sensor")
+    count: int
+    aggregates: List[FieldAggregate]
+
+
+# ────────────────────────────────────────────────────────
+# EXPORT MODELS
+# ────────────────────────────────────────────────────────
+
+class SensorDataExportQuery(SensorDataAdvancedQuery):
+    """Bulk export using the same filters as the advanced (GraphQL) query.
+
+    The whole result is streamed; `page`, `page_size` and cursor fields are ignored.
+    `id`, `device_id` and `timestamp` are always included; `fields` restricts the metrics.
+    `include_archive` appends matching readings from the Parquet archive (older data
+    whose partitions were archived by the retention job).
+    """
+    format: ExportFormat = Field(default=ExportFormat.NDJSON, description="Output format")
+    fields: Optional[List[str]] = Field(
+        default=None,
+        description="Metric columns to export (ALLOWED_SENSOR_FIELDS); all when omitted"
+    )
+    include_archive: bool = Field(default=False, description="Also read archived (Parquet) readings")
+
+    @model_validator(mode="after")
+    def validate_fields(self) -> "SensorDataExportQuery":
+        invalid = [f for f in self.fields or [] if f not in ALLOWED_SENSOR_FIELDS]
+        if invalid:
+            raise ValueError(f"Invalid field(s): {', '.join(invalid)}")
+        return self
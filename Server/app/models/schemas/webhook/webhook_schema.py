@@ -6,10 +6,10 @@
 from datetime import datetime
 from uuid import UUID
 from typing import Optional
-from pydantic import BaseModel, AnyHttpUrl, ConfigDict, Field, SecretStr, TypeAdapter
+from pydantic import BaseModel, AnyHttpUrl, ConfigDict, Field, NonNegativeFloat, SecretStr, TypeAdapter
 
 from app.models.DB_tables.webhook import Webhook
-from app.constants.webhooks import WebhookEvent
+from app.constants.webhooks import CircuitState, WebhookEvent
 
 
 # ────────────────────────────────────────────────────────
@@ -35,6 +35,24 @@ class SensorDeletedPayload(BaseModel):
 # WEBHOOK CONFIGURATION MODELS
 # ────────────────────────────────────────────────────────
 
+class AlertPolicy(BaseModel):
+    """
+    Notification policy of an ALERT_TRIGGERED webhook, applied per device.
+
+    A rule triggers when a device's reading enters its range and stays active, without
+    further notifications, until the readings leave the range widened by the hysteresis band.
+    """
+    notify_on_exit: bool = Field(False, description="Also notify (alert_state='cleared') when the alert ends")
+    hold_off_seconds: Optional[NonNegativeFloat] = Field(
+        None,
+        description="Minimum time between two triggers for the same device. Null = server default."
+    )
+    hysteresis: dict[str, NonNegativeFloat] = Field(
+        default_factory=dict,
+        description="Per-field band by which an active alert's [min, max] is widened before it clears"
+    )
+
+
 class WebhookConfig(BaseModel):
     """Internal model for loading full webhook config (including resolved secret)."""
     id: UUID = Field(..., description="Webhook ID")
@@ -46,6 +64,7 @@ class WebhookConfig(BaseModel):
         None,
         description="Optional parameter filters as {field_name: [min, max]}"
     )
+    alert_policy: Optional[AlertPolicy] = Field(None, description="Alert notification policy (ALERT_TRIGGERED only)")
 
     @classmethod
     def from_orm_and_secret(cls, webhook: Webhook, raw_secret: str) -> "WebhookConfig":
@@ -55,7 +74,8 @@ class WebhookConfig(BaseModel):
             target_url=TypeAdapter(AnyHttpUrl).validate_python(webhook.target_url),
             secret=SecretStr(raw_secret),
             custom_headers=webhook.custom_headers,
-            parameters=webhook.parameters
+            parameters=webhook.parameters,
+            alert_policy=webhook.alert_policy
         )
 
 
@@ -73,6 +93,7 @@ class WebhookCreate(BaseModel):
         None,
         description="Optional filters as {field: (min, max)}. Null = unbounded."
     )
+    alert_policy: Optional[AlertPolicy] = Field(None, description="Alert notification policy (alert_triggered only)")
 
 
 class WebhookRead(BaseModel):
@@ -87,6 +108,13 @@ class WebhookRead(BaseModel):
         None,
         description="Optional field filters as {field: (min, max)}"
     )
+    alert_policy: Optional[AlertPolicy] = Field(None, description="Alert notification policy")
+
+    # Delivery health (in-memory, since the last restart)
+    circuit_state: CircuitState = Field(CircuitState.CLOSED, description="Delivery circuit: closed, open or half_open")
+    consecutive_failures: int = Field(0, description="Failed deliveries since the last success")
+    health_score: float = Field(1.0, description="Recent delivery success rate (1.0 = healthy, 0.0 = failing)")
+    circuit_retry_at: Optional[datetime] = Field(None, description="When an open circuit lets the next probe through")
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -107,4 +135,5 @@ class WebhookUpdatePayload(BaseModel):
         None,
         description="New field filters as {field: (min, max)}"
     )
+    alert_policy: Optional[AlertPolicy] = Field(None, description="New alert notification policy")
     enabled: Optional[bool] = Field(None, description="Enable or disable this webhook")
@@ -7,4 +7,39 @@ def generate_api_key(length: int = 32) -> str:
     """
     if length < 16 or length > 64:
         raise ValueError("API key length should be between 16 and 64 bytes.")
-    return secrets.token_urlsafe(length)
\ No newline at end of file
+    return secrets.token_urlsafe(length)
+
+
+# ─── Key Format ─────────────────────────────────────────────
+# "<key_id>.<secret>": the key ID is public and indexes the stored key, only the
+# secret part is hashed. Legacy keys are a bare secret (token_urlsafe never emits ".").
+
+KEY_ID_BYTES = 8  # 16 hex characters
+KEY_ID_SEPARATOR = "."
+
+
+def generate_key_id() -> str:
+    """
+    Generate the public lookup ID of a new API key.
+    """
+    return secrets.token_hex(KEY_ID_BYTES)
+
+
+def format_api_key(key_id: str, secret: str) -> str:
+    """
+    Combine a key ID and its secret into the key handed to the client.
+    """
+    return f"{key_id}{KEY_ID_SEPARATOR}{secret}"
+
+
+def parse_api_key(raw_key: str) -> tuple[str | None, str]:
+    """
+    Split a presented API key into (key_id, secret).
+
+    Returns:
+        tuple[str | None, str]: key_id is None for legacy keys, whose secret is the whole key.
+    """
+    key_id, sep, secret = raw_key.partition(KEY_ID_SEPARATOR)
+    if not sep or len(key_id) != 2 * KEY_ID_BYTES or not secret:
+        return None, raw_key
+    return key_id, secret
@@ -0,0 +1,112 @@
+import io
+from typing import AsyncIterator, Iterable, Sequence
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.models.DB_tables.sensor_data import SensorData
+
+
+# Arrow types of the exported columns; UUIDs are written as strings for portability
+_ARROW_TYPES = {
+    "id": pa.string(),
+    "device_id": pa.string(),
+    "timestamp": pa.timestamp("us", tz="UTC"),
+}
+
+PARQUET_COMPRESSION = "zstd"
+
+
+def _arrow_type(column: str) -> pa.DataType:
+    if column in _ARROW_TYPES:
+        return _ARROW_TYPES[column]
+    python_type = SensorData.__table__.c[column].type.python_type
+    return pa.int64() if python_type is int else pa.float64()
+
+
+def arrow_schema(columns: list[str]) -> pa.Schema:
+    """
+    Arrow schema for a projection of sensor_data columns (all nullable).
+    """
+    return pa.schema([pa.field(c, _arrow_type(c)) for c in columns])
+
+
+def rows_to_record_batch(schema: pa.Schema, rows: Sequence[Sequence]) -> pa.RecordBatch:
+    """
+    Transpose DB row tuples into one Arrow record batch.
+    """
+    values = list(zip(*rows)) if rows else [()] * len(schema)
+    arrays = []
+    for field, column in zip(schema, values):
+        if pa.types.is_string(field.type):
+            column = [None if v is None else str(v) for v in column]
+        arrays.append(pa.array(column, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+class _ChunkSink(io.RawIOBase):
+    """
+    Write-only file collecting bytes until drained, while reporting the absolute
+    position Arrow writers need for offsets (e.g. the Parquet footer).
+    """
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def encode_arrow_stream(columns: list[str], batches: AsyncIterator[Sequence[Sequence]]) -> AsyncIterator[bytes]:
+    """
+    Encode row batches as an Arrow IPC stream, one record batch per DB batch.
+    """
+    schema = arrow_schema(columns)
+    sink = _ChunkSink()
+    writer = pa.ipc.new_stream(sink, schema)
+    async for rows in batches:
+        writer.write_batch(rows_to_record_batch(schema, rows))
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+async def encode_parquet(
+    columns: list[str],
+    batches: AsyncIterator[Sequence[Sequence]],
+    sorting_columns: Sequence[pq.SortingColumn] | None = None,
+) -> AsyncIterator[bytes]:
+    """
+    Encode row batches as a compressed Parquet file, one row group per DB batch.
+    Row groups are flushed as they are written; the footer follows the last one.
+    `sorting_columns` records the order the rows arrive in, for readers.
+    """
+    schema = arrow_schema(columns)
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression=PARQUET_COMPRESSION, sorting_columns=sorting_columns)
+    async for rows in batches:
+        writer.write_batch(rows_to_record_batch(schema, rows))
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+def table_to_rows(table: pa.Table | pa.RecordBatch, columns: Iterable[str]) -> list[tuple]:
+    """
+    Row tuples (in `columns` order) from an Arrow table or batch, e.g. one read from the archive.
+    """
+    return list(zip(*(table.column(c).to_pylist() for c in columns)))
@@ -32,6 +32,14 @@ class Settings(BaseSettings):
     API_KEY_LENGTH: int
     API_KEY_EXPIRATION_DAYS: int
     MAX_API_KEYS_PER_USER: int
+    API_KEY_CACHE_TTL_SECONDS: int = 300  # verified keys skip bcrypt for this long
+    API_KEY_CACHE_MAXSIZE: int = 10000
+
+    # ─── Password Hashing Settings ──────────────────────────
+    BCRYPT_ROUNDS: int = 12  # cost factor of new hashes; existing hashes verify at their own cost
+    HASH_EXECUTOR: str = "thread"  # thread | process
+    HASH_WORKERS: int = 4  # bcrypt calls running at once; further calls queue
+    HASH_BULK_WORKERS: int = 0  # cap on bulk hashes in flight; 0 = HASH_WORKERS - 1; always at least 1, so HASH_WORKERS=1 reserves none
 
     # ─── Admin Bootstrap ─────────────────────────────
     ADMIN_EMAIL: str
@@ -40,6 +48,17 @@ class Settings(BaseSettings):
     # ─── Pagination Settings ────────────────────────────────
     DEFAULT_PAGE_SIZE: int
     MAX_PAGE_SIZE: int
+    PAGINATION_COUNT_POLICY: str = "exact"  # exact | estimated | cached | none
+    PAGINATION_COUNT_CACHE_TTL_SECONDS: int = 60
+    PAGINATION_COUNT_CACHE_MAXSIZE: int = 1024
+
+    # ─── Aggregation Settings ───────────────────────────────
+    AGGREGATION_MAX_BUCKETS: int = 5000
+    ROLLUPS_ENABLED: bool = False  # maintain 1m/1h/1d rollup tables on ingest
+
+    # ─── Export Settings ────────────────────────────────────
+    SENSOR_EXPORT_BATCH_SIZE: int = 2000  # rows fetched per server-side cursor round-trip
+    SENSOR_EXPORT_RATE_LIMIT: str = "5/minute"
 
     # ─── MQTT Settings ───────────────────────────────────────
     MQTT_BROKER: str
@@ -54,9 +73,70 @@ class Settings(BaseSettings):
     MQTT_USERNAME: str | None = None
     MQTT_PASSWORD: str | None = None
 
+    # ─── Sensor Data Storage Settings ───────────────────────
+    SENSOR_DATA_PARTITIONING_ENABLED: bool = False
+    SENSOR_DATA_PARTITION_MONTHS_AHEAD: int = 3
+    SENSOR_DATA_PARTITION_CHECK_HOURS: int = 24
+
+    # ─── Raw Data Retention Settings ────────────────────────
+    RAW_RETENTION_ENABLED: bool = False
+    RAW_RETENTION_DAYS: int = 90  # raw readings older than this survive only as rollups
+    RAW_RETENTION_ACTION: str = "drop"  # drop | detach (keep the partition table) | archive (Parquet, then drop)
+    RAW_RETENTION_CHECK_HOURS: int = 24
+    SENSOR_ARCHIVE_DIR: str = "archive"  # Parquet files of archived partitions
+    ROLLUP_RETENTION_DAYS_1M: int = 180  # per rollup resolution; 0 keeps rollups forever
+    ROLLUP_RETENTION_DAYS_1H: int = 1825
+    ROLLUP_RETENTION_DAYS_1D: int = 0
+
+    # ─── MQTT Batch Ingestion Settings ──────────────────────
+    MQTT_BATCH_INGEST_ENABLED: bool = False
+    MQTT_BATCH_MAX_SIZE: int = 200
+    MQTT_BATCH_MAX_LATENCY_MS: int = 500
+    MQTT_INGEST_QUEUE_SIZE: int = 10000
+
     # ─── Webhook const ─────────────────────────────────
     MAX_ATTEMPTS_PER_WEBHOOK: int
 
+    # ─── Webhook HTTP Client Settings ───────────────────────
+    WEBHOOK_HTTP_TIMEOUT_SECONDS: float = 5.0  # read/write/pool timeout per request
+    WEBHOOK_HTTP_CONNECT_TIMEOUT_SECONDS: float = 3.0
+    WEBHOOK_HTTP_MAX_CONNECTIONS: int = 100
+    WEBHOOK_HTTP_MAX_CONNECTIONS_PER_HOST: int = 10
+    WEBHOOK_HTTP_KEEPALIVE_SECONDS: float = 30.0
+    WEBHOOK_HTTP2_ENABLED: bool = True  # negotiated via ALPN; HTTP/1.1 otherwise
+
+    # ─── Webhook Delivery Queue Settings ────────────────────
+    WEBHOOK_QUEUE_SIZE: int = 10000
+    WEBHOOK_WORKERS: int = 4
+    WEBHOOK_QUEUE_OVERFLOW: str = "drop_oldest"  # drop_oldest | drop_newest | block
+    WEBHOOK_QUEUE_DRAIN_SECONDS: float = 10.0  # time allowed to finish queued jobs on shutdown
+
+    # ─── Webhook Fan-out Settings ───────────────────────────
+    WEBHOOK_FANOUT_MAX_CONCURRENCY: int = 50  # deliveries in flight across all events
+    WEBHOOK_FANOUT_MAX_PER_EVENT: int = 20  # deliveries in flight per event type
+
+    # ─── Webhook Circuit Breaker Settings ──────────────────
+    WEBHOOK_BREAKER_FAILURE_THRESHOLD: int = 5  # consecutive failed deliveries before opening
+    WEBHOOK_BREAKER_RESET_SECONDS: float = 30.0  # open time before the first half-open probe
+    WEBHOOK_BREAKER_MAX_RESET_SECONDS: float = 900.0  # open time doubles per re-open up to this
+
+    # ─── Alert Evaluation Settings ─────────────────────────
+    ALERT_VECTORIZE_MIN_BATCH: int = 16  # batches this large are matched with NumPy instead of the rule index
+    ALERT_STATEFUL_ENABLED: bool = True  # notify on entering/leaving a rule's range, not on every matching reading
+    ALERT_HOLD_OFF_SECONDS: float = 300.0  # default minimum time between two triggers of one rule for one device
+
+    # ─── Webhook Outbox Settings ────────────────────────────
+    WEBHOOK_OUTBOX_ENABLED: bool = False  # sensor data / alert deliveries survive restarts
+    WEBHOOK_OUTBOX_BATCH_SIZE: int = 100
+    WEBHOOK_OUTBOX_WORKERS: int = 2
+    WEBHOOK_OUTBOX_POLL_SECONDS: float = 1.0  # idle wait when no delivery is due
+    WEBHOOK_OUTBOX_LEASE_SECONDS: float = 60.0  # claimed rows reappear after this if the relay dies
+    WEBHOOK_OUTBOX_MAX_ATTEMPTS: int = 10
+    WEBHOOK_OUTBOX_BACKOFF_BASE_SECONDS: float = 1.0
+    WEBHOOK_OUTBOX_BACKOFF_MAX_SECONDS: float = 600.0
+    WEBHOOK_OUTBOX_RETENTION_HOURS: float = 168.0  # settled (dead) rows older than this are purged; 0 keeps them
+    WEBHOOK_OUTBOX_PURGE_INTERVAL_SECONDS: float = 3600.0
+
     # ─── Rate Limit Settings ─────────────────────────────
     REST_RATE_LIMIT: str
     LOGIN_RATE_LIMIT: str
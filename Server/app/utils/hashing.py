@@ -1,6 +1,14 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.utils.config import settings
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
+
+_executor: Executor | None = None
+_bulk_slots: asyncio.Semaphore | None = None
 
 
 def hash_value(value: str) -> str:
@@ -19,3 +27,89 @@ def verify_value(plain_value: str, hashed_value: str) -> bool:
     if not plain_value or not hashed_value:
         return False
     return pwd_context.verify(plain_value, hashed_value)
+
+
+def get_hash_executor() -> Executor:
+    """
+    Return the bounded pool bcrypt runs in, creating it on first use.
+
+    HASH_EXECUTOR selects threads (bcrypt releases the GIL) or spawned worker
+    processes; either way at most HASH_WORKERS hashes run at once and the rest queue.
+    """
+    global _executor
+    if _executor is None:
+        if settings.HASH_EXECUTOR == "process":
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        else:
+            _executor = ThreadPoolExecutor(max_workers=settings.HASH_WORKERS, thread_name_prefix="bcrypt")
+    return _executor
+
+
+def bulk_hash_limit() -> int:
+    """
+    Bulk hashes allowed in the pool at once: HASH_BULK_WORKERS, capped at
+    HASH_WORKERS - 1 so logins and key checks keep a free worker.
+
+    With HASH_WORKERS=1 nothing can be reserved: bulk hashing still gets the one
+    worker (otherwise it could never run) and interactive calls queue behind it.
+    Set HASH_WORKERS to 2 or more when bulk imports must not delay logins.
+    """
+    reserved = max(1, settings.HASH_WORKERS - 1)
+    return min(settings.HASH_BULK_WORKERS or reserved, reserved)
+
+
+def _get_bulk_slots() -> asyncio.Semaphore:
+    global _bulk_slots
+    if _bulk_slots is None:
+        _bulk_slots = asyncio.Semaphore(bulk_hash_limit())
+    return _bulk_slots
+
+
+def shutdown_hash_executor() -> None:
+    """Stop the hashing pool; the next async hash starts a new one."""
+    global _executor, _bulk_slots
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+    _bulk_slots = None
+
+
+async def hash_value_async(value: str) -> str:
+    """
+    `hash_value` run in the hashing pool, so the event loop keeps serving
+    requests and MQTT messages while bcrypt works.
+    """
+    if not isinstance(value, str) or not value.strip():
+        raise ValueError("Cannot hash an empty or non-string value.")
+    return await asyncio.get_running_loop().run_in_executor(get_hash_executor(), hash_value, value)
+
+
+async def verify_value_async(plain_value: str, hashed_value: str) -> bool:
+    """
+    `verify_value` run in the hashing pool.
+    """
+    if not plain_value or not hashed_value:
+        return False
+    return await asyncio.get_running_loop().run_in_executor(
+        get_hash_executor(), verify_value, plain_value, hashed_value
+    )
+
+
+async def hash_values_async(values: list[str]) -> list[str]:
+    """
+    Hash many values concurrently, spread over the workers of the hashing pool.
+
+    At most `bulk_hash_limit()` of them are submitted at once (across all bulk
+    callers), so interactive hashes queue behind a few bulk ones rather than all
+    of them. Each value gets its own salt, even when values repeat.
+    """
+    slots = _get_bulk_slots()
+
+    async def hash_one(value: str) -> str:
+        async with slots:
+            return await hash_value_async(value)
+
+    return list(await asyncio.gather(*(hash_one(value) for value in values)))
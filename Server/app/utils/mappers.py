@@ -1,6 +1,7 @@
 from app.models.schemas.graphQL.sensor_meta_data_query import DateRange, SensorMetadataQuery
 from app.models.schemas.graphQL.Sensor_data_query import SensorDataAdvancedQuery
-from app.models.schemas.graphQL.inputs import SensorDataQueryInput, FieldRangeInput, SensorMetadataQueryInput
+from app.models.schemas.graphQL.inputs import SensorAggregateInput, SensorDataQueryInput, FieldRangeInput, SensorMetadataQueryInput
+from app.models.schemas.rest.sensor_data_schemas import SensorAggregateQuery
 from app.utils.config import settings
 
 
@@ -37,7 +38,27 @@ def map_graphql_to_pydantic_sensor_data_query(
         models=gql_input.model_filter,
         is_active=gql_input.is_active,
         page=gql_input.page,
-        page_size=min(gql_input.page_size or 10, settings.MAX_PAGE_SIZE)
+        page_size=min(gql_input.page_size or 10, settings.MAX_PAGE_SIZE),
+        cursor=gql_input.cursor,
+        use_cursor=gql_input.use_cursor
+    )
+
+
+def map_graphql_to_pydantic_aggregate_query(
+    gql_input: SensorAggregateInput
+) -> SensorAggregateQuery:
+    """
+    Convert GraphQL aggregation input into the validated Pydantic aggregation query.
+    """
+    return SensorAggregateQuery(
+        fields=gql_input.fields,
+        bucket=gql_input.bucket,
+        start=gql_input.start,
+        end=gql_input.end,
+        sensor_ids=gql_input.sensor_ids,
+        locations=gql_input.location_filter,
+        group_by_sensor=gql_input.group_by_sensor,
+        include_p95=gql_input.include_p95
     )
 
 
@@ -0,0 +1,52 @@
+from typing import Generic, Iterable, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+
+class PathPrefixTrie(Generic[T]):
+    """
+    Longest-prefix lookup of URL paths, segment by segment.
+
+    `/api/v1/sensor` matches `/api/v1/sensor` and `/api/v1/sensor/data/...`,
+    but not `/api/v1/sensors`. A lookup walks at most one node per path segment,
+    however many prefixes are registered.
+    """
+
+    __slots__ = ("_root",)
+
+    def __init__(self, entries: Iterable[tuple[str, T]] = ()):
+        self._root = _Node()
+        for prefix, value in entries:
+            self.insert(prefix, value)
+
+    @staticmethod
+    def _segments(path: str) -> list[str]:
+        return [segment for segment in path.split("/") if segment]
+
+    def insert(self, prefix: str, value: T) -> None:
+        node = self._root
+        for segment in self._segments(prefix):
+            node = node.children.setdefault(segment, _Node())
+        node.value = value
+        node.has_value = True
+
+    def match(self, path: str) -> Optional[T]:
+        """Value of the longest registered prefix of `path`, or None."""
+        node, found = self._root, self._root.value
+        for segment in self._segments(path):
+            node = node.children.get(segment)
+            if node is None:
+                break
+            if node.has_value:
+                found = node.value
+        return found
+
+
+class _Node:
+    __slots__ = ("children", "value", "has_value")
+
+    def __init__(self):
+        self.children: dict[str, _Node] = {}
+        self.value = None
+        self.has_value = False
@@ -0,0 +1,43 @@
+from datetime import datetime, timedelta, timezone
+
+from app.utils.config import settings
+
+
+def day_start(ts: datetime) -> datetime:
+    """Midnight (UTC) of the day containing `ts`; naive timestamps are treated as UTC."""
+    ts = ts.astimezone(timezone.utc) if ts.tzinfo else ts
+    return datetime(ts.year, ts.month, ts.day, tzinfo=timezone.utc)
+
+
+def retention_cutoff(now: datetime | None = None, days: int | None = None) -> datetime:
+    """
+    Start of the oldest UTC day whose raw readings are still kept.
+    """
+    days = settings.RAW_RETENTION_DAYS if days is None else days
+    now = now or datetime.now(timezone.utc)
+    return day_start(now - timedelta(days=days))
+
+
+def rollup_retention_days(resolution: str) -> int:
+    """
+    Days of rollups kept for a resolution (ROLLUP_RETENTION_DAYS_<RES>); 0 keeps them forever.
+    """
+    return getattr(settings, f"ROLLUP_RETENTION_DAYS_{resolution.upper()}", 0)
+
+
+def rollup_retention_cutoff(resolution: str, now: datetime | None = None) -> datetime | None:
+    """
+    Start of the oldest UTC day still kept in a rollup resolution, or None if nothing expires.
+    """
+    days = rollup_retention_days(resolution)
+    return retention_cutoff(now, days) if days > 0 else None
+
+
+def raw_data_expired(start: datetime, now: datetime | None = None) -> bool:
+    """
+    True if raw readings from `start` on may already have been removed by retention.
+    """
+    if not settings.RAW_RETENTION_ENABLED:
+        return False
+    start = start if start.tzinfo else start.replace(tzinfo=timezone.utc)
+    return start < retention_cutoff(now)
@@ -0,0 +1,102 @@
+"""
+Benchmark alert-rule evaluation for a batch of sensor readings.
+
+Compares the per-reading linear scan (`AlertWebhookProcessor._matches_any_condition`),
+the interval-tree index (`AlertRuleIndex`) and the NumPy batch path (`AlertRuleMatrix`),
+and checks that all three select the same webhooks.
+
+Run from the Server directory with the app environment configured:
+
+    python -m benchmarks.bench_alert_matching --rules 1000 --readings 500
+"""
+import argparse
+import random
+import time
+from uuid import uuid4
+from pydantic import SecretStr
+
+from app.constants.sensor_fields import ALLOWED_SENSOR_FIELDS
+from app.constants.webhooks import WebhookEvent
+from app.domain.webhooks.alert_index import AlertRuleIndex
+from app.domain.webhooks.alert_matrix import AlertRuleMatrix
+from app.domain.webhooks.alert_processor import AlertWebhookProcessor
+from app.models.schemas.webhook.webhook_schema import WebhookConfig
+
+
+def make_rules(rng: random.Random, count: int, max_fields: int) -> list[WebhookConfig]:
+    rules = []
+    for _ in range(count):
+        fields = rng.sample(ALLOWED_SENSOR_FIELDS, rng.randint(1, max_fields))
+        parameters = {}
+        for field in fields:
+            # Alert thresholds: mostly one-sided, near the edges of the normal range
+            kind = rng.random()
+            if kind < 0.45:
+                parameters[field] = [rng.uniform(70, 100), None]
+            elif kind < 0.9:
+                parameters[field] = [None, rng.uniform(0, 30)]
+            else:
+                low = rng.uniform(0, 90)
+                parameters[field] = [low, low + rng.uniform(1, 10)]
+        rules.append(WebhookConfig(
+            id=uuid4(),
+            target_url="https://example.com/hook",  # type: ignore[arg-type]
+            event_type=WebhookEvent.ALERT_TRIGGERED,
+            secret=SecretStr("bench"),
+            parameters=parameters,
+        ))
+    return rules
+
+
+def make_readings(rng: random.Random, count: int) -> list[dict]:
+    return [{field: rng.uniform(0, 100) for field in ALLOWED_SENSOR_FIELDS} for _ in range(count)]
+
+
+def timed(fn, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rules", type=int, default=1000)
+    parser.add_argument("--readings", type=int, default=500)
+    parser.add_argument("--max-fields", type=int, default=3, help="conditions per rule (upper bound)")
+    parser.add_argument("--repeat", type=int, default=5, help="best-of runs per method")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    rules = make_rules(rng, args.rules, args.max_fields)
+    readings = make_readings(rng, args.readings)
+    processor = AlertWebhookProcessor()
+
+    def linear():
+        return [
+            [rule for rule in rules if processor._matches_any_condition(reading, rule.parameters)]
+            for reading in readings
+        ]
+
+    index = AlertRuleIndex(rules)
+    matrix = AlertRuleMatrix(rules)
+
+    results = {
+        "linear scan": timed(linear, args.repeat),
+        "interval index": timed(lambda: [index.match(reading) for reading in readings], args.repeat),
+        "numpy matrix": timed(lambda: matrix.match_readings(readings), args.repeat),
+    }
+
+    expected = results["linear scan"][1]
+    baseline = results["linear scan"][0]
+    print(f"{args.rules} rules × {args.readings} readings (best of {args.repeat})")
+    for name, (seconds, matched) in results.items():
+        assert matched == expected, f"{name} disagrees with the linear scan"
+        print(f"  {name:<15} {seconds * 1000:9.2f} ms  {baseline / seconds:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
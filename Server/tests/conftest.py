@@ -4,10 +4,13 @@ import pytest
 import pytest_asyncio
 from types import SimpleNamespace
 from uuid import uuid4
+from pydantic import SecretStr
 
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Request
 from app.infrastructure.database.init_db import init_db
+from app.constants.webhooks import WebhookEvent
 from app.models.DB_tables.user import User, RoleEnum
+from app.models.schemas.webhook.webhook_schema import WebhookConfig
 
 
 # ---------------------------------------------------------------------------
@@ -24,6 +27,22 @@ def _set_selector_event_loop_policy():
         asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
 
+# ---------------------------------------------------------------------------
+# Shared webhook config factory
+# ---------------------------------------------------------------------------
+def make_webhook(
+    event: WebhookEvent = WebhookEvent.SENSOR_DATA_RECEIVED,
+    parameters: dict | None = None,
+) -> WebhookConfig:
+    return WebhookConfig(
+        id=uuid4(),
+        target_url="https://example.com/hook",  # type: ignore[arg-type]
+        event_type=event,
+        secret=SecretStr("s3cret"),
+        parameters=parameters,
+    )
+
+
 # ---------------------------------------------------------------------------
 # Shared dummy user and token
 # ---------------------------------------------------------------------------
@@ -38,19 +57,15 @@ def token() -> str:
 
 
 # ---------------------------------------------------------------------------
-# FastAPI app with LoginAuthMiddleware and mocked dependencies
+# FastAPI app with AuthMiddleware and mocked dependencies
 # ---------------------------------------------------------------------------
 @pytest.fixture
 def app(monkeypatch, dummy_user, token) -> FastAPI:
-    from app.middleware.login_auth_middleware import LoginAuthMiddleware
-    from app.utils import jwt_utils
-    from app.infrastructure.database import transaction
-    from app.infrastructure.database.repository.restAPI import user_repository, secret_repository
-    from app.utils import crypto_utils
+    from app.middleware import auth_middleware
 
     # Patch JWT decode helpers
-    monkeypatch.setattr(jwt_utils, "decode_jwt_unverified", lambda _t: {"sub": str(dummy_user.id)}, raising=False)
-    monkeypatch.setattr(jwt_utils, "decode_jwt", lambda _t, **_: None, raising=False)
+    monkeypatch.setattr(auth_middleware, "decode_jwt_unverified", lambda _t: {"sub": str(dummy_user.id)})
+    monkeypatch.setattr(auth_middleware, "decode_jwt", lambda _t, **_: None)
 
     # Patch DB context
     class _FakeCM:
@@ -59,38 +74,29 @@ def app(monkeypatch, dummy_user, token) -> FastAPI:
         async def __aexit__(self, exc_type, exc, tb):
             return False
 
-    monkeypatch.setattr(transaction, "run_in_transaction", lambda *a, **k: _FakeCM(), raising=False)
+    monkeypatch.setattr(auth_middleware, "run_in_transaction", lambda *a, **k: _FakeCM())
 
     # Patch secret repo, user repo, and decryption
-    monkeypatch.setattr(
-        secret_repository,
-        "get_user_secret_by_label",
-        lambda _s, _uid, label="login": SimpleNamespace(secret="encrypted", is_active=True),
-        raising=False,
-    )
-    monkeypatch.setattr(
-        user_repository,
-        "get_user_by_id",
-        lambda _s, _uid: dummy_user,
-        raising=False,
-    )
-    monkeypatch.setattr(
-        crypto_utils,
-        "decrypt_secret",
-        lambda s: "plaintext" if s == "encrypted" else s,
-        raising=False,
-    )
+    async def get_user_secret_by_label(_s, _uid, label="login"):
+        return SimpleNamespace(secret="encrypted", is_active=True)
+
+    async def get_user_by_id(_s, _uid):
+        return dummy_user
+
+    monkeypatch.setattr(auth_middleware, "get_user_secret_by_label", get_user_secret_by_label)
+    monkeypatch.setattr(auth_middleware, "get_user_by_id", get_user_by_id)
+    monkeypatch.setattr(auth_middleware, "decrypt_secret", lambda s: "plaintext" if s == "encrypted" else s)
 
     # Build app
     app = FastAPI()
-    app.add_middleware(LoginAuthMiddleware)
+    app.add_middleware(auth_middleware.AuthMiddleware)
 
     @app.get("/api/v1/auth/authenticated")
-    async def protected(request=Depends(lambda r: r)):
-        return {"user_id": request.state.user_id}
+    async def protected(request: Request):
+        return {"user_id": str(request.state.user_id)}
 
     @app.get("/api/v1/auth/admin")
-    async def admin(request=Depends(lambda r: r)):
+    async def admin(request: Request):
         return {"admin_access": True}
 
     return app
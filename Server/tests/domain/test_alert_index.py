@@ -0,0 +1,131 @@
+import random
+from pydantic import SecretStr
+
+from app.constants.webhooks import WebhookEvent
+from app.domain.webhooks.alert_index import AlertRuleIndex, IntervalTree
+from app.domain.webhooks.alert_processor import AlertWebhookProcessor
+from app.models.schemas.webhook.webhook_schema import WebhookConfig
+from tests.conftest import make_webhook
+
+
+FIELDS = ["temperature", "humidity", "co2"]
+
+
+def make_alert(parameters: dict) -> WebhookConfig:
+    return make_webhook(WebhookEvent.ALERT_TRIGGERED, parameters)
+
+
+def random_bounds(rng: random.Random) -> list[float | None]:
+    low = rng.choice([None, rng.uniform(0, 100)])
+    high = rng.choice([None, rng.uniform(0, 100)])
+    if low is not None and high is not None and low > high:
+        low, high = high, low
+    return [low, high]
+
+
+def random_alert(rng: random.Random) -> WebhookConfig:
+    fields = rng.sample(FIELDS, rng.randint(1, len(FIELDS)))
+    return make_alert({f: random_bounds(rng) for f in fields})
+
+
+def linear_match(webhooks: list[WebhookConfig], data: dict) -> set:
+    processor = AlertWebhookProcessor()
+    return {w.id for w in webhooks if w.parameters and processor._matches_any_condition(data, w.parameters)}
+
+
+def test_interval_tree_stab_insert_delete():
+    tree = IntervalTree()
+    tree.insert((0.0, 1), 10.0, "a")
+    tree.insert((5.0, 2), 6.0, "b")
+    tree.insert((float("-inf"), 3), 2.0, "c")
+    tree.insert((8.0, 4), float("inf"), "d")
+
+    assert set(tree.stab(1)) == {"a", "c"}
+    assert set(tree.stab(5.5)) == {"a", "b"}
+    assert set(tree.stab(1000)) == {"d"}
+
+    tree.delete((0.0, 1))
+    tree.delete((0.0, 99))  # unknown key is a no-op
+    assert len(tree) == 3
+    assert set(tree.stab(1)) == {"c"}
+
+
+def test_index_matches_linear_scan():
+    rng = random.Random(7)
+    webhooks = [random_alert(rng) for _ in range(300)]
+    index = AlertRuleIndex(webhooks)
+
+    for _ in range(200):
+        data = {f: rng.uniform(-10, 110) for f in FIELDS}
+        assert index.match_ids(data) == linear_match(webhooks, data)
+
+
+def test_incremental_add_remove_replace():
+    rng = random.Random(11)
+    webhooks = {w.id: w for w in (random_alert(rng) for _ in range(100))}
+    index = AlertRuleIndex(webhooks.values())
+
+    for step in range(300):
+        action = rng.choice(["add", "remove", "replace"])
+        if action == "add" or not webhooks:
+            webhook = random_alert(rng)
+            webhooks[webhook.id] = webhook
+            index.add(webhook)
+        elif action == "remove":
+            webhook_id = rng.choice(list(webhooks))
+            del webhooks[webhook_id]
+            index.remove(webhook_id)
+        else:
+            webhook_id = rng.choice(list(webhooks))
+            webhook = make_alert({f: random_bounds(rng) for f in rng.sample(FIELDS, 2)})
+            webhook = webhook.model_copy(update={"id": webhook_id})
+            webhooks[webhook_id] = webhook
+            index.replace(webhook)
+
+        data = {f: rng.uniform(-10, 110) for f in FIELDS}
+        assert index.match_ids(data) == linear_match(list(webhooks.values()), data), step
+    assert len(index) == len(webhooks)
+
+
+def test_match_keeps_insertion_order_and_skips_empty_rules():
+    first = make_alert({"co2": [1000, None]})
+    second = make_alert({"temperature": [None, 0], "co2": [900, None]})
+    unbounded = make_alert({"humidity": [None, None]})
+    empty = make_alert({})
+    index = AlertRuleIndex([first, second, unbounded, empty])
+
+    assert index.match({"co2": 1200, "temperature": 20, "humidity": 40}) == [first, second, unbounded]
+    assert index.match({"co2": 500, "temperature": 20}) == []
+
+
+def test_processor_targets_use_index():
+    processor = AlertWebhookProcessor()
+    alert = make_alert({"temperature": [30, None]})
+    processor.add(alert)
+
+    class Reading:
+        def model_dump(self):
+            return {"temperature": 35.0}
+
+    assert processor.targets(Reading()) == [alert]  # type: ignore[arg-type]
+    processor.remove(alert.id)
+    assert processor.targets(Reading()) == []  # type: ignore[arg-type]
+    assert processor.get_all() == []
+
+
+def test_processor_add_replaces_same_id_and_skips_unusable():
+    processor = AlertWebhookProcessor()
+    alert = make_alert({"temperature": [30, None]})
+    processor.add(alert)
+    processor.add(alert.model_copy(update={"parameters": {"temperature": [20, None]}}))
+
+    class Reading:
+        def model_dump(self):
+            return {"temperature": 35.0}
+
+    assert [w.id for w in processor.targets(Reading())] == [alert.id]  # type: ignore[arg-type]
+    assert len(processor.get_all()) == 1
+
+    processor.add(make_alert({}))
+    processor.add(make_alert({"co2": [1000, None]}).model_copy(update={"secret": SecretStr("")}))
+    assert len(processor.get_all()) == 1
@@ -0,0 +1,62 @@
+import math
+import random
+from unittest.mock import patch
+
+from app.domain.webhooks.alert_matrix import AlertRuleMatrix, readings_matrix
+from app.domain.webhooks.alert_processor import AlertWebhookProcessor
+from tests.domain.test_alert_index import FIELDS, linear_match, make_alert, random_alert
+
+
+class Reading:
+    def __init__(self, data: dict):
+        self.data = data
+
+    def model_dump(self):
+        return self.data
+
+
+def test_matrix_matches_linear_scan():
+    rng = random.Random(3)
+    webhooks = [random_alert(rng) for _ in range(300)]
+    readings = [
+        {f: rng.uniform(-10, 110) for f in rng.sample(FIELDS, rng.randint(0, len(FIELDS)))}
+        for _ in range(200)
+    ]
+
+    matched = AlertRuleMatrix(webhooks).match_readings(readings)
+
+    for data, targets in zip(readings, matched):
+        assert {w.id for w in targets} == linear_match(webhooks, data)
+        assert targets == [w for w in webhooks if w.id in linear_match(webhooks, data)]  # rule order
+
+
+def test_matrix_handles_missing_values_and_empty_rules():
+    low = make_alert({"co2": [1000, None]})
+    inverted = make_alert({"temperature": [30, 10]})  # empty range never matches
+    empty = make_alert({})
+    matrix = AlertRuleMatrix([low, inverted, empty])
+
+    assert math.isnan(readings_matrix([{"co2": None}], ["co2"])[0, 0])
+    assert matrix.match_readings([{"co2": 1200}, {"co2": None}, {"temperature": 20}]) == [[low], [], []]
+    assert AlertRuleMatrix([]).match_readings([{"co2": 1}]) == [[]]
+    assert matrix.match_readings([]) == []
+
+
+def test_processor_batch_switches_to_matrix_and_tracks_changes():
+    processor = AlertWebhookProcessor()
+    hot = make_alert({"temperature": [30, None]})
+    processor.add(hot)
+    batch = [Reading({"temperature": t}) for t in (20.0, 35.0)]
+
+    with patch("app.domain.webhooks.alert_processor.settings.ALERT_VECTORIZE_MIN_BATCH", 2):
+        assert processor.targets_batch(batch) == [[], [hot]]  # type: ignore[arg-type]
+
+        cold = make_alert({"temperature": [None, 25]})
+        processor.add(cold)
+        assert processor.targets_batch(batch) == [[cold], [hot]]  # type: ignore[arg-type]
+
+        processor.remove(hot.id)
+        assert processor.targets_batch(batch) == [[cold], []]  # type: ignore[arg-type]
+
+    with patch("app.domain.webhooks.alert_processor.settings.ALERT_VECTORIZE_MIN_BATCH", 10):
+        assert processor.targets_batch(batch) == [[cold], []]  # type: ignore[arg-type]
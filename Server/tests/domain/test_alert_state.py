@@ -0,0 +1,151 @@
+import pytest
+from uuid import uuid4
+from unittest.mock import AsyncMock, patch
+
+from app.constants.webhooks import AlertState
+from app.domain.webhooks.alert_processor import AlertWebhookProcessor
+from app.domain.webhooks.alert_state import AlertStateTracker
+from app.domain.webhooks.fanout import FanOutResult
+from app.models.schemas.webhook.webhook_schema import AlertPolicy, WebhookConfig
+from tests.domain.test_alert_index import make_alert
+from tests.domain.test_sensor_data_batch_writer import make_reading
+
+
+def co2_alert(**policy) -> WebhookConfig:
+    return make_alert({"co2": [1000, None]}).model_copy(update={"alert_policy": AlertPolicy(**policy)})
+
+
+def test_tracker_triggers_once_per_excursion():
+    tracker = AlertStateTracker(default_hold_off=0)
+    alert, device = co2_alert(), uuid4()
+
+    states = [
+        tracker.observe(alert, device, {"co2": co2}, co2 >= 1000, now=t)
+        for t, co2 in enumerate([900, 1100, 1200, 1300, 900, 1100])
+    ]
+
+    assert states == [None, AlertState.TRIGGERED, None, None, None, AlertState.TRIGGERED]
+
+
+def test_tracker_exit_notification_and_hysteresis():
+    tracker = AlertStateTracker(default_hold_off=0)
+    alert, device = co2_alert(notify_on_exit=True, hysteresis={"co2": 50}), uuid4()
+
+    def feed(co2, t):
+        return tracker.observe(alert, device, {"co2": co2}, co2 >= 1000, now=t)
+
+    assert feed(1010, 0) == AlertState.TRIGGERED
+    assert feed(980, 1) is None  # still within the 50 ppm band
+    assert tracker.active_ids(device) == {alert.id}
+    assert feed(940, 2) == AlertState.CLEARED
+    assert tracker.active_ids(device) == set()
+    assert len(tracker) == 0
+
+
+def test_tracker_hold_off_suppresses_retrigger_and_its_exit():
+    tracker = AlertStateTracker(default_hold_off=60)
+    alert, device, other = co2_alert(notify_on_exit=True), uuid4(), uuid4()
+
+    def feed(co2, t, dev=device):
+        return tracker.observe(alert, dev, {"co2": co2}, co2 >= 1000, now=t)
+
+    assert feed(1100, 0) == AlertState.TRIGGERED
+    assert feed(900, 10) == AlertState.CLEARED
+    assert feed(1100, 20) is None  # within hold-off
+    assert feed(1100, 20, other) == AlertState.TRIGGERED  # hold-off is per device
+    assert feed(900, 30) is None  # its trigger was never sent
+    assert feed(1100, 61) == AlertState.TRIGGERED
+
+    tracker.forget(alert.id)
+    assert len(tracker) == 0
+    assert tracker.active_ids(other) == set()
+
+
+def test_tracker_sends_deferred_trigger_once_hold_off_expires():
+    tracker = AlertStateTracker(default_hold_off=60)
+    alert, device = co2_alert(notify_on_exit=True), uuid4()
+
+    def feed(co2, t):
+        return tracker.observe(alert, device, {"co2": co2}, co2 >= 1000, now=t)
+
+    assert feed(1100, 0) == AlertState.TRIGGERED
+    assert feed(900, 10) == AlertState.CLEARED
+    assert feed(1100, 20) is None  # re-entered within hold-off: deferred
+    assert feed(1200, 50) is None
+    assert feed(1200, 61) == AlertState.TRIGGERED  # still active after hold-off
+    assert feed(1300, 70) is None
+    assert feed(900, 80) == AlertState.CLEARED
+
+
+def test_staged_changes_apply_only_on_commit():
+    tracker = AlertStateTracker(default_hold_off=60)
+    alert, device = co2_alert(), uuid4()
+
+    staged = tracker.stage()
+    assert staged.observe(alert, device, {"co2": 1100}, True, now=0) == AlertState.TRIGGERED
+    assert staged.active_ids(device) == {alert.id}
+    assert len(tracker) == 0 and tracker.active_ids(device) == set()
+
+    staged.commit()
+    assert tracker.active_ids(device) == {alert.id}
+    assert tracker.observe(alert, device, {"co2": 1200}, True, now=1) is None
+
+
+def test_staged_changes_are_dropped_after_forget():
+    tracker = AlertStateTracker(default_hold_off=60)
+    alert, device = co2_alert(), uuid4()
+
+    staged = tracker.stage()
+    staged.observe(alert, device, {"co2": 1100}, True, now=0)
+    tracker.forget(alert.id)
+    staged.commit()
+
+    assert len(tracker) == 0 and tracker.active_ids(device) == set()
+
+
+@pytest.mark.parametrize("batch_min", [1, 100])  # matrix and index paths
+def test_processor_deliveries_follow_device_state(batch_min):
+    processor = AlertWebhookProcessor()
+    alert = co2_alert(notify_on_exit=True, hold_off_seconds=0)
+    processor.add(alert)
+    device = uuid4()
+    readings = [make_reading(sensorid=device, co2=co2) for co2 in (900, 1200, 1300, 800)]
+
+    with patch("app.domain.webhooks.alert_processor.settings.ALERT_VECTORIZE_MIN_BATCH", batch_min):
+        deliveries = processor.deliveries_batch(readings, now=0)
+
+    assert [[(w.id, body["alert_state"]) for w, body in d] for d in deliveries] == [
+        [], [(alert.id, "triggered")], [], [(alert.id, "cleared")]
+    ]
+    assert deliveries[1][0][1]["co2"] == 1200
+
+
+def test_processor_stateless_mode_notifies_every_match():
+    processor = AlertWebhookProcessor()
+    processor.add(co2_alert())
+    readings = [make_reading(co2=1200), make_reading(co2=1200)]
+
+    with patch("app.domain.webhooks.alert_processor.settings.ALERT_STATEFUL_ENABLED", False):
+        deliveries = processor.deliveries_batch(readings)
+
+    assert [len(d) for d in deliveries] == [1, 1]
+
+
+@pytest.mark.asyncio
+@patch("app.domain.webhooks.alert_processor.webhook_fanout.deliver", new_callable=AsyncMock)
+async def test_handle_fans_out_one_body_per_transition(mock_deliver):
+    mock_deliver.side_effect = lambda event, webhooks, body, session: FanOutResult(event, succeeded=len(webhooks))
+    processor = AlertWebhookProcessor()
+    first, second = co2_alert(hold_off_seconds=0), co2_alert(hold_off_seconds=0)
+    processor.add(first)
+    processor.add(second)
+    device = uuid4()
+
+    result = await processor.handle(make_reading(sensorid=device, co2=1500), session=None)  # type: ignore[arg-type]
+    assert result.succeeded == 2
+    assert mock_deliver.await_count == 1
+    assert mock_deliver.await_args.args[1] == [first, second]
+
+    result = await processor.handle(make_reading(sensorid=device, co2=1600), session=None)  # type: ignore[arg-type]
+    assert result.total == 0
+    assert mock_deliver.await_count == 1
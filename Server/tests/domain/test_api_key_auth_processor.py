@@ -2,6 +2,7 @@ import pytest
 from uuid import uuid4
 from datetime import datetime, timedelta, timezone
 from typing import List
+from unittest.mock import AsyncMock
 from pydantic import SecretStr
 
 from app.utils.hashing import hash_value, verify_value
@@ -17,6 +18,13 @@ class DummyUser:
         self.role = role
 
 
+@pytest.fixture(autouse=True)
+def empty_verified_cache():
+    APIKeyAuthProcessor._verified.clear()
+    yield
+    APIKeyAuthProcessor._verified.clear()
+
+
 @pytest.fixture
 def valid_key_config():
     return APIKeyConfig(
@@ -43,7 +51,7 @@ async def test_remove_key(valid_key_config):
     raw_key = "my-secret"
     APIKeyAuthProcessor._api_keys = [valid_key_config]
     assert verify_value(raw_key, valid_key_config.key.get_secret_value())
-    APIKeyAuthProcessor.remove(raw_key)
+    await APIKeyAuthProcessor.remove(raw_key)
     assert len(APIKeyAuthProcessor._api_keys) == 0
 
 @pytest.mark.asyncio
@@ -93,3 +101,167 @@ async def test_match_fail(monkeypatch):
     APIKeyAuthProcessor._api_keys = []
     with pytest.raises(AuthValidationError):
         await APIKeyAuthProcessor.match("wrong-key")
+
+
+# ─── Key ID Index ───────────────────────────────────────────
+
+def make_indexed_config(key_id: str, secret: str) -> APIKeyConfig:
+    return APIKeyConfig(
+        user_id=uuid4(),
+        key=SecretStr(hash_value(secret)),
+        key_id=key_id,
+        expires_at=datetime.now(timezone.utc) + timedelta(days=1),
+        role=RoleEnum.developer
+    )
+
+
+@pytest.fixture
+def indexed_keys(valid_key_config):
+    APIKeyAuthProcessor._api_keys = []
+    APIKeyAuthProcessor._by_id = {}
+    configs = [make_indexed_config(f"{i:016x}", f"secret-{i}") for i in range(5)]
+    for config in configs:
+        APIKeyAuthProcessor.add(config)
+    APIKeyAuthProcessor.add(valid_key_config)  # legacy key, no ID
+    yield configs
+    APIKeyAuthProcessor._api_keys = []
+    APIKeyAuthProcessor._by_id = {}
+
+
+def counting_verify(monkeypatch) -> list:
+    calls = []
+
+    async def verify(plain, hashed):
+        calls.append(plain)
+        return verify_value(plain, hashed)
+
+    monkeypatch.setattr("app.domain.api_key_processor.verify_value_async", verify)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_match_by_key_id_verifies_once(monkeypatch, indexed_keys):
+    target = indexed_keys[3]
+    monkeypatch.setattr(
+        "app.domain.api_key_processor.get_user_by_id",
+        AsyncMock(return_value=DummyUser(target.user_id, target.role))
+    )
+    calls = counting_verify(monkeypatch)
+
+    user = await APIKeyAuthProcessor.match(f"{target.key_id}.secret-3")
+    assert user.id == target.user_id
+    assert calls == ["secret-3"]
+
+    with pytest.raises(AuthValidationError):
+        await APIKeyAuthProcessor.match(f"{'f' * 16}.secret-3")  # unknown ID: no hashing
+    with pytest.raises(AuthValidationError):
+        await APIKeyAuthProcessor.match(f"{target.key_id}.wrong")
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_legacy_key_still_matches(monkeypatch, indexed_keys, valid_key_config):
+    monkeypatch.setattr(
+        "app.domain.api_key_processor.get_user_by_id",
+        AsyncMock(return_value=DummyUser(valid_key_config.user_id, valid_key_config.role))
+    )
+    calls = counting_verify(monkeypatch)
+
+    user = await APIKeyAuthProcessor.match("my-secret")
+    assert user.id == valid_key_config.user_id
+    assert calls == ["my-secret"]  # indexed keys are not scanned
+
+
+@pytest.mark.asyncio
+async def test_remove_by_stored_hash_and_invalidate_update_index(indexed_keys):
+    first, second = indexed_keys[0], indexed_keys[1]
+    await APIKeyAuthProcessor.remove(first.key.get_secret_value())
+    assert first.key_id not in APIKeyAuthProcessor._by_id
+    assert len(APIKeyAuthProcessor.get_all()) == 5
+
+    APIKeyAuthProcessor.invalidate_user(second.user_id)
+    assert second.key_id not in APIKeyAuthProcessor._by_id
+    assert len(APIKeyAuthProcessor.get_all()) == 4
+
+
+# ─── Verified Key Cache ─────────────────────────────────────
+
+async def prime_cache(monkeypatch, config: APIKeyConfig, raw_key: str) -> AsyncMock:
+    lookup = AsyncMock(return_value=DummyUser(config.user_id, config.role))
+    monkeypatch.setattr("app.domain.api_key_processor.get_user_by_id", lookup)
+    await APIKeyAuthProcessor.match(raw_key)
+    return lookup
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_skips_bcrypt_and_user_lookup(monkeypatch, indexed_keys):
+    target = indexed_keys[2]
+    lookup = await prime_cache(monkeypatch, target, f"{target.key_id}.secret-2")
+    calls = counting_verify(monkeypatch)
+
+    for _ in range(3):
+        user = await APIKeyAuthProcessor.match(f"{target.key_id}.secret-2")
+        assert user.id == target.user_id
+    assert calls == []
+    assert lookup.await_count == 1
+
+    with pytest.raises(AuthValidationError):
+        await APIKeyAuthProcessor.match(f"{target.key_id}.wrong")  # misses are not cached
+    assert calls == ["wrong"]
+
+
+@pytest.mark.asyncio
+async def test_cache_is_keyed_by_digest_not_raw_key(monkeypatch, indexed_keys):
+    target = indexed_keys[0]
+    raw_key = f"{target.key_id}.secret-0"
+    await prime_cache(monkeypatch, target, raw_key)
+
+    assert list(APIKeyAuthProcessor._verified.keys()) == [APIKeyAuthProcessor._digest(raw_key)]
+    assert raw_key.encode() not in APIKeyAuthProcessor._verified
+    assert len(APIKeyAuthProcessor._digest(raw_key)) == 32
+
+
+@pytest.mark.asyncio
+async def test_remove_unknown_hash_runs_no_bcrypt(monkeypatch, indexed_keys):
+    verify = AsyncMock(return_value=False)
+    monkeypatch.setattr("app.domain.api_key_processor.verify_value_async", verify)
+    before = len(APIKeyAuthProcessor.get_all())
+
+    await APIKeyAuthProcessor.remove(hash_value("no-such-key"))
+
+    verify.assert_not_awaited()
+    assert len(APIKeyAuthProcessor.get_all()) == before
+
+
+@pytest.mark.asyncio
+async def test_remove_invalidate_and_replace_evict_cache(monkeypatch, indexed_keys):
+    removed, invalidated, replaced, kept = indexed_keys[:4]
+    for i, config in enumerate(indexed_keys[:4]):
+        await prime_cache(monkeypatch, config, f"{config.key_id}.secret-{i}")
+    assert len(APIKeyAuthProcessor._verified) == 4
+
+    await APIKeyAuthProcessor.remove(removed.key.get_secret_value())
+    APIKeyAuthProcessor.invalidate_user(invalidated.user_id)
+    APIKeyAuthProcessor.replace(make_indexed_config("a" * 16, "fresh").model_copy(update={"user_id": replaced.user_id}))
+
+    assert [config for config, _ in APIKeyAuthProcessor._verified.values()] == [kept]
+    for raw_key in (f"{removed.key_id}.secret-0", f"{invalidated.key_id}.secret-1", f"{replaced.key_id}.secret-2"):
+        with pytest.raises(AuthValidationError):
+            await APIKeyAuthProcessor.match(raw_key)
+
+
+@pytest.mark.asyncio
+async def test_key_revoked_during_match_is_not_cached(monkeypatch, indexed_keys):
+    target = indexed_keys[4]
+    raw_key = f"{target.key_id}.secret-4"
+
+    async def lookup_then_revoke(session, uid):
+        APIKeyAuthProcessor.invalidate_user(uid)  # revoked while the DB lookup is in flight
+        return DummyUser(target.user_id, target.role)
+
+    monkeypatch.setattr("app.domain.api_key_processor.get_user_by_id", lookup_then_revoke)
+    await APIKeyAuthProcessor.match(raw_key)
+
+    assert len(APIKeyAuthProcessor._verified) == 0
+    with pytest.raises(AuthValidationError):
+        await APIKeyAuthProcessor.match(raw_key)
@@ -9,6 +9,7 @@ from app.utils.exceptions_base import AuthConflictError, AuthValidationError, Us
 from app.models.DB_tables.user_secrets import UserSecret
 from app.models.schemas.rest.auth_schemas import LoginResponse, NewUserInput, OnboardResult, SecretCreateRequest, SecretInfo
 from app.domain import auth_logic
+from app.utils.hashing import hash_value
 from app.models.DB_tables.user import User
 
 
@@ -18,10 +19,10 @@ from app.models.DB_tables.user import User
 # -------------------------------
 @pytest.mark.asyncio
 @patch("app.domain.auth_logic.run_in_transaction")
-@patch("app.domain.auth_logic.get_user_by_email", new_callable=AsyncMock)
-@patch("app.domain.auth_logic.create_user", new_callable=AsyncMock)
-@patch("app.domain.auth_logic.create_user_secret", new_callable=AsyncMock)
-@patch("app.domain.auth_logic.hash_value", return_value="hashed_pw")
+@patch("app.domain.auth_logic.get_existing_emails", new_callable=AsyncMock)
+@patch("app.domain.auth_logic.create_users_bulk", new_callable=AsyncMock)
+@patch("app.domain.auth_logic.create_user_secrets_bulk", new_callable=AsyncMock)
+@patch("app.domain.auth_logic.hash_values_async", new_callable=AsyncMock)
 @patch("app.domain.auth_logic.generate_secret", return_value="secret123")
 @patch("app.domain.auth_logic.encrypt_secret", return_value="encrypted123")
 @patch("app.domain.auth_logic.get_secret_expiry", return_value=datetime.now(timezone.utc) + timedelta(days=30))
@@ -30,9 +31,9 @@ async def test_onboard_users_from_inputs_success(
     mock_encrypt,
     mock_generate,
     mock_hash,
-    mock_create_secret,
-    mock_create_user,
-    mock_get_user,
+    mock_create_secrets,
+    mock_create_users,
+    mock_existing,
     mock_run_txn,
 ):
     mock_session = MagicMock()
@@ -44,47 +45,38 @@ async def test_onboard_users_from_inputs_success(
         NewUserInput(name="Bob Jones", role="guest"),
     ]
 
-    # First user doesn't exist, second one does
-    mock_get_user.side_effect = [None, MagicMock()]
-
-    # Mock user object to return from create_user
-    mock_user = User(
-        id=uuid4(),
-        email="alice.smith@tuni.fi",
-        username="alice_smith",
-        hashed_password="hashed_pw",
-        role="developer",
-        created_at=datetime.now(timezone.utc),
-        last_login=None
-    )
-    mock_create_user.return_value = mock_user
-    mock_create_secret.return_value = UserSecret(
-        id=uuid4(),
-        user_id=mock_user.id,
-        secret="encrypted123",
-        label="login",
-        is_active=True,
-        created_at=datetime.now(timezone.utc),
-        expires_at=mock_expiry.return_value,
-        revoked_at=None
-    )
+    # Second user already exists; every remaining row gets inserted
+    mock_existing.return_value = {"bob.jones@tuni.fi"}
+    mock_hash.side_effect = lambda values: [f"hashed-{i}" for i in range(len(values))]
+    mock_create_users.side_effect = lambda session, rows: {r["id"] for r in rows}
 
     result: OnboardResult = await auth_logic.onboard_users_from_inputs(inputs)
 
     assert result.created_count == 1
     assert "alice.smith@tuni.fi" in result.users
     assert "bob.jones@tuni.fi" in result.skipped
+    assert [(r.email, r.status) for r in result.results] == [
+        ("alice.smith@tuni.fi", "created"), ("bob.jones@tuni.fi", "exists")
+    ]
 
-    mock_create_user.assert_called_once()
-    mock_create_secret.assert_called_once()
+    mock_existing.assert_awaited_once_with(mock_session, ["alice.smith@tuni.fi", "bob.jones@tuni.fi"])
+    mock_hash.assert_awaited_once()
+    (user_rows,) = mock_create_users.await_args.args[1:]
+    assert [(r["email"], r["username"], r["role"]) for r in user_rows] == [
+        ("alice.smith@tuni.fi", "alice_smith", "developer")
+    ]
+    (secret_rows,) = mock_create_secrets.await_args.args[1:]
+    assert [(r["user_id"], r["secret"], r["label"]) for r in secret_rows] == [
+        (user_rows[0]["id"], "encrypted123", "login")
+    ]
 
 
 @pytest.mark.asyncio
 @patch("app.domain.auth_logic.run_in_transaction")
-@patch("app.domain.auth_logic.get_user_by_email", new_callable=AsyncMock)
-@patch("app.domain.auth_logic.create_user", new_callable=AsyncMock)
-@patch("app.domain.auth_logic.create_user_secret", new_callable=AsyncMock)
-@patch("app.domain.auth_logic.hash_value", return_value="hashed_pw")
+@patch("app.domain.auth_logic.get_existing_emails", new_callable=AsyncMock)
+@patch("app.domain.auth_logic.create_users_bulk", new_callable=AsyncMock)
+@patch("app.domain.auth_logic.create_user_secrets_bulk", new_callable=AsyncMock)
+@patch("app.domain.auth_logic.hash_values_async", new_callable=AsyncMock)
 @patch("app.domain.auth_logic.generate_secret", return_value="secret123")
 @patch("app.domain.auth_logic.encrypt_secret", return_value="encrypted123")
 @patch("app.domain.auth_logic.get_secret_expiry", return_value=datetime.now(timezone.utc) + timedelta(days=30))
@@ -93,9 +85,9 @@ async def test_onboard_users_handles_exception(
     mock_encrypt,
     mock_generate,
     mock_hash,
-    mock_create_secret,
-    mock_create_user,
-    mock_get_user,
+    mock_create_secrets,
+    mock_create_users,
+    mock_existing,
     mock_run_txn,
 ):
     mock_session = MagicMock()
@@ -105,15 +97,49 @@ async def test_onboard_users_handles_exception(
         NewUserInput(name="Crash Dummy", role="admin"),
     ]
 
-    mock_get_user.return_value = None
-    mock_create_user.side_effect = Exception("Simulated DB failure")
+    mock_existing.return_value = set()
+    mock_hash.return_value = ["hashed_pw"]
+    mock_create_users.side_effect = Exception("Simulated DB failure")
 
     result = await auth_logic.onboard_users_from_inputs(inputs)
 
     assert result.created_count == 0
     assert result.users == []
     assert "crash.dummy@tuni.fi" in result.skipped
-    mock_create_user.assert_called_once()
+    assert result.results[0].status == "failed"
+    mock_create_users.assert_called_once()
+    mock_create_secrets.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch("app.domain.auth_logic.run_in_transaction")
+@patch("app.domain.auth_logic.get_existing_emails", new_callable=AsyncMock)
+@patch("app.domain.auth_logic.create_users_bulk", new_callable=AsyncMock)
+@patch("app.domain.auth_logic.create_user_secrets_bulk", new_callable=AsyncMock)
+@patch("app.domain.auth_logic.hash_values_async", new_callable=AsyncMock)
+async def test_onboard_users_reports_duplicates_and_insert_conflicts(
+    mock_hash, mock_create_secrets, mock_create_users, mock_existing, mock_run_txn
+):
+    mock_run_txn.return_value.__aenter__.return_value = MagicMock()
+    inputs = [
+        NewUserInput(name="Ann Lee", role="guest"),
+        NewUserInput(name="ann  lee", role="guest"),  # same email
+        NewUserInput(name="Raced User", role="guest"),  # registered after the check
+    ]
+    mock_existing.return_value = set()
+    mock_hash.side_effect = lambda values: ["hashed"] * len(values)
+    mock_create_users.side_effect = lambda session, rows: {rows[0]["id"]}
+
+    result = await auth_logic.onboard_users_from_inputs(inputs)
+
+    assert [(r.email, r.status) for r in result.results] == [
+        ("ann.lee@tuni.fi", "created"),
+        ("ann.lee@tuni.fi", "duplicate"),
+        ("raced.user@tuni.fi", "exists"),
+    ]
+    assert mock_hash.await_args.args[0] == [auth_logic.settings.DEFAULT_USER_PASSWORD.get_secret_value()] * 2
+    assert len(mock_create_secrets.await_args.args[1]) == 1
+    assert result.created_count == 1
 
 
 # -------------------------------
@@ -198,7 +224,7 @@ async def test_login_user_wrong_password(mock_get_user, mock_txn, dummy_user):
     mock_session = AsyncMock()
     mock_txn.return_value.__aenter__.return_value = mock_session
 
-    dummy_user.hashed_password = auth_logic.hash_value("correct_password")
+    dummy_user.hashed_password = hash_value("correct_password")
     mock_get_user.return_value = dummy_user
 
     with pytest.raises(AuthValidationError, match="Auth validation error"):
@@ -313,8 +339,8 @@ async def test_generate_api_key_duplicate_label(mock_txn, mock_get_keys, dummy_u
 @patch("app.domain.auth_logic.api_key_repository.get_api_keys_by_user")
 @patch("app.domain.auth_logic.run_in_transaction")
 @patch("app.domain.auth_logic.generate_api_key")
-@patch("app.domain.auth_logic.hash_value")
-@patch("app.domain.auth_logic.verify_value")
+@patch("app.domain.auth_logic.hash_value_async", new_callable=AsyncMock)
+@patch("app.domain.auth_logic.verify_value_async", new_callable=AsyncMock)
 async def test_generate_api_key_collision(mock_verify, mock_hash, mock_gen, mock_txn, mock_get_keys, dummy_user):
     mock_txn.return_value.__aenter__.return_value = AsyncMock()
     mock_gen.return_value = "abc123"
@@ -341,7 +367,7 @@ async def test_generate_api_key_collision(mock_verify, mock_hash, mock_gen, mock
 @patch("app.domain.auth_logic.api_key_repository.get_all_active_keys")
 @patch("app.domain.auth_logic.get_user_by_id")
 @patch("app.domain.auth_logic.run_in_transaction")
-@patch("app.domain.auth_logic.verify_value")
+@patch("app.domain.auth_logic.verify_value_async", new_callable=AsyncMock)
 async def test_validate_api_key_success(mock_verify, mock_txn, mock_get_user, mock_get_keys, dummy_user):
     mock_verify.return_value = True
     mock_txn.return_value.__aenter__.return_value = AsyncMock()
@@ -358,7 +384,7 @@ async def test_validate_api_key_success(mock_verify, mock_txn, mock_get_user, mo
 @pytest.mark.asyncio
 @patch("app.domain.auth_logic.api_key_repository.get_all_active_keys")
 @patch("app.domain.auth_logic.run_in_transaction")
-@patch("app.domain.auth_logic.verify_value")
+@patch("app.domain.auth_logic.verify_value_async", new_callable=AsyncMock)
 async def test_validate_api_key_invalid(mock_verify, mock_txn, mock_get_keys):
     mock_verify.return_value = False
     mock_txn.return_value.__aenter__.return_value = AsyncMock()
@@ -401,7 +427,7 @@ def dummy_user() -> User:
         id=uuid4(),
         email="test.user@tuni.fi",
         username="test_user",
-        hashed_password=auth_logic.hash_value("old_password"),
+        hashed_password=hash_value("old_password"),
         role="authenticated",
         created_at=datetime.now(timezone.utc),
         last_login=None,
@@ -673,4 +699,24 @@ async def test_set_secret_active_status_not_found(mock_toggle, mock_txn):
     mock_toggle.return_value = False
 
     with pytest.raises(AuthValidationError):
-        await auth_logic.set_secret_active_status(user_id, "login", True)
\ No newline at end of file
+        await auth_logic.set_secret_active_status(user_id, "login", True)
+
+@pytest.mark.asyncio
+@patch("app.domain.auth_logic.api_key_repository.get_all_active_keys")
+@patch("app.domain.auth_logic.api_key_repository.get_active_api_key_by_id")
+@patch("app.domain.auth_logic.get_user_by_id")
+@patch("app.domain.auth_logic.run_in_transaction")
+@patch("app.domain.auth_logic.verify_value_async", new_callable=AsyncMock)
+async def test_validate_api_key_with_id_looks_up_one_key(mock_verify, mock_txn, mock_get_user, mock_by_id, mock_get_keys, dummy_user):
+    mock_verify.return_value = True
+    mock_txn.return_value.__aenter__.return_value = AsyncMock()
+    mock_get_user.return_value = dummy_user
+    mock_by_id.return_value = APIKey(key="hashed", key_id="0123456789abcdef", user_id=dummy_user.id, label="x",
+                                     is_active=True, created_at=datetime.now(timezone.utc),
+                                     expires_at=datetime.now(timezone.utc))
+
+    user = await auth_logic.validate_api_key("0123456789abcdef.the-secret")
+    assert user.id == dummy_user.id
+    mock_by_id.assert_awaited_once_with(mock_txn.return_value.__aenter__.return_value, "0123456789abcdef")
+    mock_verify.assert_awaited_once_with("the-secret", "hashed")
+    mock_get_keys.assert_not_called()
@@ -0,0 +1,63 @@
+import pytest
+from uuid import uuid4
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+from app.domain.latest_readings import LatestReadingStore
+from app.models.schemas.rest.sensor_data_schemas import SensorDataOut
+
+
+def make_sensor_data_out(sensor_id, timestamp=None) -> SensorDataOut:
+    return SensorDataOut(
+        id=uuid4(),
+        sensorid=sensor_id,
+        timestamp=timestamp or datetime.now(timezone.utc),
+        temperature=23.5, humidity=40.0,
+        pm1_0=1, pm2_5=2, pm10=3,
+        tvoc=0.1, eco2=500, aqi=30.0,
+        pmInAir1_0=5, pmInAir2_5=10, pmInAir10=15,
+        particles0_3=100, particles0_5=50, particles1_0=30,
+        particles2_5=25, particles5_0=20, particles10=10,
+        compT=23.0, compRH=50.0, rawT=22.5, rawRH=48.0,
+        rs0=100, rs1=200, rs2=300, rs3=400,
+        co2=420
+    )
+
+
+@pytest.fixture(autouse=True)
+def reset_store():
+    LatestReadingStore.clear()
+    yield
+    LatestReadingStore.clear()
+
+
+def test_update_keeps_newest_reading():
+    sid = uuid4()
+    now = datetime.now(timezone.utc)
+    newer = make_sensor_data_out(sid, now)
+    older = make_sensor_data_out(sid, now - timedelta(minutes=5))
+
+    LatestReadingStore.update(newer)
+    LatestReadingStore.update(older)
+
+    assert LatestReadingStore.get_many([sid]) == [newer]
+
+
+def test_get_many_skips_sensors_without_data():
+    sid = uuid4()
+    reading = make_sensor_data_out(sid)
+    LatestReadingStore.update(reading)
+
+    assert LatestReadingStore.get_many([uuid4(), sid]) == [reading]
+
+
+@pytest.mark.asyncio
+@patch("app.domain.latest_readings.sensor_data_repository.fetch_latest_for_sensors", new_callable=AsyncMock)
+async def test_load_marks_store_warm(mock_fetch):
+    sid = uuid4()
+    mock_fetch.return_value = [make_sensor_data_out(sid).model_dump()]
+
+    await LatestReadingStore.load()
+
+    assert LatestReadingStore.is_loaded()
+    assert LatestReadingStore.get_many([sid])[0].device_id == sid
@@ -2,6 +2,7 @@ import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from sqlalchemy import select, column
 from pydantic import BaseModel
+from types import SimpleNamespace
 
 from app.domain.pagination import paginate_query
 from app.utils.config import settings
@@ -89,3 +90,169 @@ async def test_paginate_query_uses_default_page_size(mock_txn):
     assert result.page_size == settings.DEFAULT_PAGE_SIZE
     assert result.page == 2
     assert result.items[0] == ItemSingle(name="sensorX")
+
+
+# ── Keyset (cursor) mode ─────────────────────────────────────────────────────
+def _compile(stmt) -> str:
+    from sqlalchemy.dialects import postgresql
+    return str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def test_cursor_round_trip():
+    from datetime import datetime, timezone
+    from uuid import uuid4
+    from app.domain.pagination import encode_cursor, decode_cursor
+
+    ts, rid = datetime(2025, 6, 1, 12, 0, tzinfo=timezone.utc), uuid4()
+    assert decode_cursor(encode_cursor(ts, rid)) == (ts, rid)
+
+
+def test_decode_cursor_rejects_garbage():
+    from app.domain.pagination import decode_cursor
+    from app.utils.exceptions_base import AppException
+
+    with pytest.raises(AppException) as e:
+        decode_cursor("not-a-cursor")
+    assert e.value.status_code == 400
+
+
+@pytest.mark.asyncio
+@patch("app.domain.pagination.run_in_transaction")
+async def test_paginate_query_keyset_mode(mock_txn):
+    from datetime import datetime, timezone
+    from uuid import uuid4
+    from app.constants.pagination import CountPolicy
+    from app.domain.pagination import encode_cursor, decode_cursor
+    from app.infrastructure.database.repository.restAPI.sensor_data_repository import SENSOR_DATA_KEYSET
+    from app.models.DB_tables.sensor_data import SensorData
+
+    class Row(BaseModel):
+        id: object
+        timestamp: datetime
+        model_config = {"from_attributes": True}
+
+    rows = [SimpleNamespace(id=uuid4(), timestamp=datetime(2025, 6, 1, h, tzinfo=timezone.utc)) for h in (3, 2, 1)]
+
+    mock_session = AsyncMock()
+    mock_session.scalar.return_value = 10
+    mock_scalars_result = MagicMock()
+    mock_scalars_result.all.return_value = rows
+    mock_result = AsyncMock()
+    mock_result.scalars = MagicMock(return_value=mock_scalars_result)
+    mock_session.execute.return_value = mock_result
+    mock_txn.return_value.__aenter__.return_value = mock_session
+
+    cursor = encode_cursor(datetime(2025, 6, 2, tzinfo=timezone.utc), uuid4())
+    result = await paginate_query(
+        select(SensorData).order_by(SensorData.timestamp.desc()), Row,
+        page_size=2, cursor=cursor, keyset=SENSOR_DATA_KEYSET
+    )
+
+    sql = _compile(mock_session.execute.await_args.args[0])
+    assert "(sensor_data.timestamp, sensor_data.id) <" in sql
+    assert "ORDER BY sensor_data.timestamp DESC, sensor_data.id DESC" in sql
+    assert "LIMIT 3" in sql
+    assert "OFFSET" not in sql
+
+    assert len(result.items) == 2
+    assert decode_cursor(result.next_cursor) == (rows[1].timestamp, rows[1].id)  # type: ignore[arg-type]
+    assert result.total is None  # keyset pages skip the count by default
+    mock_session.scalar.assert_not_awaited()
+
+    result = await paginate_query(
+        select(SensorData), Row, page_size=2, keyset=SENSOR_DATA_KEYSET, count_policy=CountPolicy.EXACT
+    )
+    assert result.total == 10
+
+
+# ── Count policies ───────────────────────────────────────────────────────────
+def _mock_single_column_session(mock_txn, rows, scalar_value):
+    mock_session = AsyncMock()
+    mock_session.scalar.return_value = scalar_value
+    mock_scalars_result = MagicMock()
+    mock_scalars_result.all.return_value = rows
+    mock_result = AsyncMock()
+    mock_result.scalars = MagicMock(return_value=mock_scalars_result)
+    mock_session.execute.return_value = mock_result
+    mock_txn.return_value.__aenter__.return_value = mock_session
+    return mock_session
+
+
+@pytest.mark.asyncio
+@patch("app.domain.pagination.run_in_transaction")
+async def test_paginate_query_count_policy_none_sets_has_more(mock_txn):
+    from app.constants.pagination import CountPolicy
+
+    session = _mock_single_column_session(mock_txn, [{"name": "a"}, {"name": "b"}, {"name": "c"}], 99)
+
+    result = await paginate_query(select(column("name")), ItemSingle, page_size=2, count_policy=CountPolicy.NONE)
+
+    assert result.total is None
+    assert result.total_policy == CountPolicy.NONE
+    assert result.has_more is True
+    assert len(result.items) == 2
+    session.scalar.assert_not_awaited()
+
+
+def _mock_explain(session, plan=None, error=None):
+    from sqlalchemy.dialects import postgresql
+
+    conn = MagicMock()
+    conn.dialect = postgresql.asyncpg.dialect()
+    conn.exec_driver_sql = AsyncMock(side_effect=error, return_value=MagicMock(scalar=MagicMock(return_value=plan)))
+    session.connection = AsyncMock(return_value=conn)
+    session.begin_nested = MagicMock(return_value=AsyncMock())
+    return conn
+
+
+@pytest.mark.asyncio
+@patch("app.domain.pagination.run_in_transaction")
+async def test_paginate_query_count_policy_estimated_uses_explain(mock_txn):
+    from app.constants.pagination import CountPolicy
+
+    session = _mock_single_column_session(mock_txn, [{"name": "a"}], None)
+    conn = _mock_explain(session, plan=[{"Plan": {"Plan Rows": 1234}}])
+    query = select(column("name")).where(column("location") == "Hall :b")
+
+    result = await paginate_query(query, ItemSingle, page_size=5, count_policy=CountPolicy.ESTIMATED)
+
+    assert result.total == 1234
+    assert result.total_policy == CountPolicy.ESTIMATED
+    assert result.has_more is False
+    session.begin_nested.assert_called_once()
+    sql = conn.exec_driver_sql.await_args.args[0]
+    assert sql.startswith("EXPLAIN (FORMAT JSON) SELECT name")
+    assert "location = 'Hall :b'" in sql  # sent verbatim, not parsed for binds
+
+
+@pytest.mark.asyncio
+@patch("app.domain.pagination.run_in_transaction")
+async def test_paginate_query_estimate_failure_falls_back_to_exact(mock_txn):
+    from app.constants.pagination import CountPolicy
+
+    session = _mock_single_column_session(mock_txn, [{"name": "a"}], 3)
+    _mock_explain(session, error=RuntimeError("canceling statement due to statement timeout"))
+
+    result = await paginate_query(select(column("name")), ItemSingle, page_size=5, count_policy=CountPolicy.ESTIMATED)
+
+    assert result.total == 3
+    assert result.total_policy == CountPolicy.EXACT
+    session.begin_nested.return_value.__aexit__.assert_awaited_once()  # savepoint rolled back
+
+
+@pytest.mark.asyncio
+@patch("app.domain.pagination.run_in_transaction")
+async def test_paginate_query_count_policy_cached_reuses_total(mock_txn):
+    from app.constants.pagination import CountPolicy
+    from app.domain import pagination
+
+    pagination._count_cache.clear()
+    session = _mock_single_column_session(mock_txn, [{"name": "a"}], 7)
+    query = select(column("name")).where(column("name") == "cached-test")
+
+    first = await paginate_query(query, ItemSingle, page_size=5, count_policy=CountPolicy.CACHED)
+    second = await paginate_query(query, ItemSingle, page_size=5, count_policy=CountPolicy.CACHED)
+
+    assert first.total == second.total == 7
+    assert second.total_policy == CountPolicy.CACHED
+    session.scalar.assert_awaited_once()
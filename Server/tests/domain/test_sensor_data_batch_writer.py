@@ -0,0 +1,107 @@
+import asyncio
+import pytest
+from uuid import uuid4
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+
+from app.constants.webhooks import WebhookEvent
+from app.domain.sensor_data_batch_writer import SensorDataBatchWriter
+from app.models.schemas.rest.sensor_data_schemas import SensorDataIn, SensorDataOut
+
+
+def make_reading(**overrides) -> SensorDataIn:
+    base = dict(
+        sensorid=uuid4(),
+        timestamp=datetime.now(timezone.utc),
+        temperature=23.5, humidity=50.0,
+        pm1_0=1.0, pm2_5=2.0, pm10=3.0,
+        tvoc=0.1, eco2=600, aqi=30.0,
+        pmInAir1_0=10, pmInAir2_5=20, pmInAir10=30,
+        particles0_3=1, particles0_5=2, particles1_0=3,
+        particles2_5=4, particles5_0=5, particles10=6,
+        compT=24.0, compRH=40.0, rawT=22.0, rawRH=38.0,
+        rs0=100, rs1=200, rs2=300, rs3=400,
+        co2=500,
+    )
+    base.update(overrides)
+    return SensorDataIn(**base)
+
+
+def as_stored(batch: list[SensorDataIn], outbox=None) -> list[SensorDataOut]:
+    return [SensorDataOut(id=uuid4(), **r.model_dump()) for r in batch]
+
+
+@pytest.mark.asyncio
+@patch("app.domain.sensor_data_batch_writer.dispatcher.dispatch", new_callable=AsyncMock)
+@patch("app.domain.sensor_data_batch_writer.create_sensor_data_entries", new_callable=AsyncMock)
+async def test_flushes_when_batch_is_full(mock_create, mock_dispatch):
+    mock_create.side_effect = as_stored
+    writer = SensorDataBatchWriter(max_size=3, max_latency_ms=60_000, queue_size=100)
+    writer.start()
+
+    for _ in range(3):
+        await writer.enqueue(make_reading())
+    await asyncio.sleep(0.05)
+
+    mock_create.assert_awaited_once()
+    assert len(mock_create.await_args.args[0]) == 3
+    assert writer.flushed_rows == 3
+    await writer.stop()
+
+
+@pytest.mark.asyncio
+@patch("app.domain.sensor_data_batch_writer.dispatcher.dispatch", new_callable=AsyncMock)
+@patch("app.domain.sensor_data_batch_writer.create_sensor_data_entries", new_callable=AsyncMock)
+async def test_flushes_partial_batch_after_max_latency(mock_create, mock_dispatch):
+    mock_create.side_effect = as_stored
+    writer = SensorDataBatchWriter(max_size=100, max_latency_ms=20, queue_size=100)
+    writer.start()
+
+    await writer.enqueue(make_reading())
+    await writer.enqueue(make_reading())
+    await asyncio.sleep(0.1)
+
+    mock_create.assert_awaited_once()
+    assert len(mock_create.await_args.args[0]) == 2
+    await writer.stop()
+
+
+@pytest.mark.asyncio
+@patch("app.domain.sensor_data_batch_writer.dispatcher.dispatch", new_callable=AsyncMock)
+@patch("app.domain.sensor_data_batch_writer.create_sensor_data_entries", new_callable=AsyncMock)
+async def test_stop_flushes_remaining_and_dispatches_per_reading(mock_create, mock_dispatch):
+    mock_create.side_effect = as_stored
+    writer = SensorDataBatchWriter(max_size=100, max_latency_ms=60_000, queue_size=100)
+    writer.start()
+
+    await writer.enqueue(make_reading())
+    await writer.enqueue(make_reading())
+    await writer.stop()
+
+    assert not writer.is_running
+    assert writer.flushed_rows == 2
+    events = [c.args[0] for c in mock_dispatch.await_args_list]
+    assert events.count(WebhookEvent.SENSOR_DATA_RECEIVED) == 2
+    assert events.count(WebhookEvent.ALERT_TRIGGERED) == 2
+
+
+@pytest.mark.asyncio
+@patch("app.domain.sensor_data_batch_writer.dispatcher.dispatch", new_callable=AsyncMock)
+@patch("app.domain.sensor_data_batch_writer.create_sensor_data_entries", new_callable=AsyncMock)
+async def test_failed_batch_is_not_dispatched(mock_create, mock_dispatch):
+    mock_create.side_effect = Exception("db down")
+    writer = SensorDataBatchWriter(max_size=1, max_latency_ms=10, queue_size=100)
+    writer.start()
+
+    await writer.enqueue(make_reading())
+    await writer.stop()
+
+    assert writer.failed_rows == 1
+    mock_dispatch.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_enqueue_requires_started_writer():
+    writer = SensorDataBatchWriter(max_size=10, max_latency_ms=10, queue_size=10)
+    with pytest.raises(RuntimeError):
+        await writer.enqueue(make_reading())
@@ -0,0 +1,85 @@
+import json
+from datetime import datetime, timezone
+from unittest.mock import patch
+from uuid import UUID
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.domain import sensor_data_export
+from app.models.schemas.rest.sensor_data_schemas import SensorDataExportQuery
+
+
+ROW_ID = UUID("00000000-0000-0000-0000-0000000000aa")
+DEVICE = UUID("00000000-0000-0000-0000-000000000001")
+TS = datetime(2025, 6, 1, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.mark.asyncio
+async def test_export_query_is_projected_and_keeps_filters():
+    payload = SensorDataExportQuery(fields=["co2", "pm2_5"], locations=["lab"], sensor_ids=[DEVICE])
+    columns = sensor_data_export.export_columns(payload.fields)
+    query = await sensor_data_export.build_export_query(payload, columns)
+    sql = str(query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+    assert sql.startswith(
+        "SELECT sensor_data.id, sensor_data.device_id, sensor_data.timestamp, sensor_data.co2, sensor_data.pm2_5 \nFROM sensor_data JOIN sensors"
+    )
+    assert "sensors.location IN ('lab')" in sql
+    assert "temperature" not in sql
+
+
+def test_export_query_rejects_unknown_fields():
+    with pytest.raises(ValueError):
+        SensorDataExportQuery(fields=["co2", "nope"])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fmt", ["ndjson", "csv"])
+async def test_export_streams_batches(fmt):
+    batches = [[(ROW_ID, DEVICE, TS, 410.5)], [(ROW_ID, DEVICE, TS, None)]]
+
+    async def fake_stream(query, batch_size):
+        for batch in batches:
+            yield batch
+
+    payload = SensorDataExportQuery(fields=["co2"], format=fmt)
+    with patch.object(sensor_data_export.sensor_data_repository, "stream_rows", side_effect=fake_stream):
+        chunks = [c async for c in sensor_data_export.export_sensor_data(payload)]
+
+    body = b"".join(chunks).decode()
+    if fmt == "ndjson":
+        assert len(chunks) == 2
+        lines = [json.loads(line) for line in body.splitlines()]
+        assert lines[0] == {
+            "id": str(ROW_ID), "device_id": str(DEVICE), "timestamp": TS.isoformat(), "co2": 410.5
+        }
+        assert lines[1]["co2"] is None
+    else:
+        assert len(chunks) == 3
+        assert body.splitlines() == [
+            "id,device_id,timestamp,co2",
+            f"{ROW_ID},{DEVICE},{TS.isoformat()},410.5",
+            f"{ROW_ID},{DEVICE},{TS.isoformat()},",
+        ]
+
+
+@pytest.mark.asyncio
+async def test_export_parquet_appends_archived_rows():
+    import io
+    import pyarrow.parquet as pq
+
+    async def fake_stream(query, batch_size):
+        yield [(ROW_ID, DEVICE, TS, 410)]
+
+    async def fake_archive(columns, expression, start, end):
+        yield [(str(ROW_ID), str(DEVICE), datetime(2024, 1, 1, tzinfo=timezone.utc), 390)]
+
+    payload = SensorDataExportQuery(fields=["co2"], format="parquet", include_archive=True, sensor_ids=[DEVICE])
+    with patch.object(sensor_data_export.sensor_data_repository, "stream_rows", side_effect=fake_stream), \
+         patch.object(sensor_data_export.archive, "read_archive", side_effect=fake_archive):
+        body = b"".join([c async for c in sensor_data_export.export_sensor_data(payload)])
+
+    table = pq.read_table(io.BytesIO(body))
+    assert table.column_names == ["id", "device_id", "timestamp", "co2"]
+    assert table.column("co2").to_pylist() == [410, 390]
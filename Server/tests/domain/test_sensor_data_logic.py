@@ -13,6 +13,23 @@ from app.utils.exceptions_base import AppException
 from app.models.schemas.graphQL.Sensor_data_query import SensorDataAdvancedQuery
 
 
+def make_sensor_data_out(sensor_id, timestamp=None) -> SensorDataOut:
+    return SensorDataOut(
+        id=uuid4(),
+        sensorid=sensor_id,
+        timestamp=timestamp or datetime.now(timezone.utc),
+        temperature=23.5, humidity=40.0,
+        pm1_0=1, pm2_5=2, pm10=3,
+        tvoc=0.1, eco2=500, aqi=30.0,
+        pmInAir1_0=5, pmInAir2_5=10, pmInAir10=15,
+        particles0_3=100, particles0_5=50, particles1_0=30,
+        particles2_5=25, particles5_0=20, particles10=10,
+        compT=23.0, compRH=50.0, rawT=22.5, rawRH=48.0,
+        rs0=100, rs1=200, rs2=300, rs3=400,
+        co2=420
+    )
+
+
 @pytest.mark.asyncio
 @patch("app.domain.sensor_data_logic.sensor_data_repository.search_by_attribute_ranges", new_callable=AsyncMock)
 @patch("app.domain.sensor_data_logic.paginate_query", new_callable=AsyncMock)
@@ -56,28 +73,24 @@ async def test_create_sensor_data_entry(mock_insert):
 
 
 @pytest.mark.asyncio
-@patch("app.domain.sensor_data_logic.sensor_data_repository.fetch_latest_by_sensor", new_callable=AsyncMock)
-@patch("app.domain.sensor_data_logic.sensor_repository.fetch_sensor_by_id", new_callable=AsyncMock)
-async def test_get_latest_entries_for_sensors_valid(mock_get_sensor, mock_latest):
+@patch("app.domain.sensor_data_logic.sensor_data_repository.fetch_latest_for_sensors", new_callable=AsyncMock)
+async def test_get_latest_entries_for_sensors_valid(mock_latest):
     sid = uuid4()
-    mock_get_sensor.return_value = MagicMock(sensor_id=sid)
-    mock_latest.return_value = {"device_id": sid}
+    row = make_sensor_data_out(sid)
+    mock_latest.return_value = [row]
     result = await sensor_data_logic.get_latest_entries_for_sensors([sid])
-    assert result == [{"device_id": sid}]
-    mock_latest.assert_awaited_once()
+    assert result == [row]
+    mock_latest.assert_awaited_once_with([sid])
 
 
 @pytest.mark.asyncio
-@patch("app.domain.sensor_data_logic.sensor_repository.fetch_all_sensors", new_callable=AsyncMock)
-@patch("app.domain.sensor_data_logic.sensor_data_repository.fetch_latest_by_sensor", new_callable=AsyncMock)
-@patch("app.domain.sensor_data_logic.sensor_repository.fetch_sensor_by_id", new_callable=AsyncMock)
-async def test_get_latest_entries_for_sensors_none_passed(mock_get, mock_latest, mock_all):
+@patch("app.domain.sensor_data_logic.sensor_data_repository.fetch_latest_for_sensors", new_callable=AsyncMock)
+async def test_get_latest_entries_for_sensors_none_passed(mock_latest):
     sid = uuid4()
-    mock_all.return_value = [MagicMock(sensor_id=sid)]
-    mock_get.return_value = MagicMock()
-    mock_latest.return_value = {"device_id": sid}
+    mock_latest.return_value = [make_sensor_data_out(sid)]
     result = await sensor_data_logic.get_latest_entries_for_sensors(None)
     assert len(result) == 1
+    mock_latest.assert_awaited_once_with(None)
 
 
 @pytest.mark.asyncio
@@ -147,3 +160,57 @@ async def test_query_sensor_data_advanced(mock_paginate, mock_build):
     )
 
     assert result == ["paginated"]
+
+
+@pytest.mark.asyncio
+@patch("app.domain.sensor_data_logic.sensor_data_repository.search_by_sensor_id", new_callable=AsyncMock)
+@patch("app.domain.sensor_data_logic.sensor_repository.fetch_sensor_by_id", new_callable=AsyncMock)
+@patch("app.domain.sensor_data_logic.paginate_query", new_callable=AsyncMock)
+async def test_get_all_data_by_sensor_keyset_mode(mock_paginate, mock_get_sensor, mock_search):
+    from app.infrastructure.database.repository.restAPI.sensor_data_repository import SENSOR_DATA_KEYSET
+
+    payload = SensorQuery(sensor_id=uuid4(), cursor="abc")
+    mock_get_sensor.return_value = MagicMock()
+    mock_search.return_value = "query"
+
+    await sensor_data_logic.get_all_data_by_sensor(payload)
+
+    kwargs = mock_paginate.await_args.kwargs
+    assert kwargs["cursor"] == "abc"
+    assert kwargs["keyset"] == SENSOR_DATA_KEYSET
+
+
+@pytest.mark.asyncio
+@patch("app.domain.sensor_data_logic.sensor_data_repository.fetch_aggregates", new_callable=AsyncMock)
+async def test_aggregate_sensor_data_maps_rows(mock_fetch):
+    from app.models.schemas.rest.sensor_data_schemas import SensorAggregateQuery
+
+    bucket_start = datetime(2025, 6, 1, tzinfo=timezone.utc)
+    mock_fetch.return_value = [{
+        "bucket_start": bucket_start, "count": 3,
+        "co2__min": 400.0, "co2__max": 600.0, "co2__avg": 500.0, "co2__p95": 590.0,
+    }]
+    payload = SensorAggregateQuery(
+        fields=["co2"], bucket="1h",
+        start=bucket_start, end=datetime(2025, 6, 2, tzinfo=timezone.utc)
+    )
+
+    result = await sensor_data_logic.aggregate_sensor_data(payload)
+
+    assert len(result) == 1
+    assert result[0].count == 3
+    assert result[0].device_id is None
+    assert result[0].aggregates[0].field == "co2"
+    assert result[0].aggregates[0].p95 == 590.0
+
+
+def test_aggregate_query_rejects_too_many_buckets():
+    from pydantic import ValidationError
+    from app.models.schemas.rest.sensor_data_schemas import SensorAggregateQuery
+
+    with pytest.raises(ValidationError):
+        SensorAggregateQuery(
+            fields=["co2"], bucket="1m",
+            start=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            end=datetime(2025, 1, 1, tzinfo=timezone.utc)
+        )
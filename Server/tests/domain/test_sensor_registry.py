@@ -0,0 +1,83 @@
+import pytest
+from uuid import uuid4
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.domain import sensor_data_logic
+from app.domain.mqtt_listener import ensure_sensor_exists
+from app.domain.sensor_registry import SensorRegistry
+from app.domain.latest_readings import LatestReadingStore
+from app.models.schemas.rest.sensor_schemas import SensorOut
+
+
+def make_sensor(sensor_id=None, is_active=True) -> SensorOut:
+    return SensorOut(
+        sensor_id=sensor_id or uuid4(),
+        name="Sensor",
+        location="Lab",
+        model="GENERIC",
+        is_active=is_active,
+        created_at=datetime.now(timezone.utc),
+        updated_at=datetime.now(timezone.utc),
+    )
+
+
+@pytest.fixture(autouse=True)
+def reset_registry():
+    SensorRegistry.clear()
+    LatestReadingStore.clear()
+    yield
+    SensorRegistry.clear()
+    LatestReadingStore.clear()
+
+
+@pytest.mark.asyncio
+@patch("app.domain.sensor_registry.sensor_repository.fetch_all_sensors", new_callable=AsyncMock)
+async def test_load_warms_registry(mock_fetch_all):
+    sensor = make_sensor()
+    mock_fetch_all.return_value = [sensor]
+
+    await SensorRegistry.load()
+
+    assert SensorRegistry.is_loaded()
+    assert SensorRegistry.get(sensor.sensor_id) == sensor
+
+
+def test_upsert_and_remove():
+    sensor = make_sensor()
+    SensorRegistry.upsert(sensor.model_dump())
+    assert SensorRegistry.contains(sensor.sensor_id)
+
+    SensorRegistry.upsert(sensor.model_copy(update={"is_active": False}))
+    assert SensorRegistry.get(sensor.sensor_id).is_active is False  # type: ignore
+
+    SensorRegistry.remove(sensor.sensor_id)
+    assert not SensorRegistry.contains(sensor.sensor_id)
+
+
+@pytest.mark.asyncio
+@patch("app.domain.mqtt_listener.safe_get_sensor_by_id", new_callable=AsyncMock)
+async def test_ensure_sensor_exists_uses_warm_registry(mock_get):
+    sensor = make_sensor(is_active=True)
+    SensorRegistry._loaded = True
+    SensorRegistry.upsert(sensor)
+
+    assert await ensure_sensor_exists(sensor.sensor_id, is_active=True) is True
+    assert await ensure_sensor_exists(sensor.sensor_id, is_active=False) is False
+    mock_get.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@patch("app.domain.sensor_data_logic.sensor_data_repository.fetch_latest_for_sensors", new_callable=AsyncMock)
+async def test_latest_entries_served_from_memory_when_warm(mock_latest):
+    known = make_sensor()
+    SensorRegistry._loaded = True
+    SensorRegistry.upsert(known)
+    LatestReadingStore._loaded = True
+    reading = MagicMock(device_id=known.sensor_id)
+    LatestReadingStore._latest[known.sensor_id] = reading
+
+    result = await sensor_data_logic.get_latest_entries_for_sensors([known.sensor_id, uuid4()])
+
+    assert result == [reading]
+    mock_latest.assert_not_awaited()
@@ -0,0 +1,125 @@
+import pytest
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+from unittest.mock import AsyncMock, patch
+
+from app.constants.webhooks import CircuitState, WebhookEvent
+from app.domain.webhooks.circuit_breaker import (
+    CircuitBreaker,
+    deliver_through_circuit,
+    record_circuit_change,
+    webhook_breakers,
+)
+from app.domain.webhooks.send_webhook import DeliveryResult
+from app.domain.webhooks.webhook_logic import to_webhook_read
+from tests.conftest import make_webhook
+
+
+DOWN = DeliveryResult(ok=False, retryable=True, error="HTTP 503")
+
+
+# ─── State Machine ──────────────────────────────────────────
+
+def test_opens_after_consecutive_failures_and_probes_once():
+    breaker = CircuitBreaker(failure_threshold=3, reset_seconds=10, max_reset_seconds=100)
+
+    assert not breaker.record_failure(now=0)
+    assert not breaker.record_failure(now=1)
+    assert breaker.record_failure(now=2)
+    assert breaker.state == CircuitState.OPEN
+
+    assert not breaker.allow(now=5)
+    assert breaker.allow(now=12)           # reset elapsed: the probe
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert not breaker.allow(now=12)       # only one probe at a time
+
+    assert breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED and breaker.consecutive_failures == 0
+
+
+def test_failed_probe_reopens_with_longer_timeout():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=10, max_reset_seconds=15)
+    breaker.record_failure(now=0)
+    assert breaker.allow(now=10)
+    assert breaker.record_failure(now=10)
+
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.current_reset_seconds() == 15  # doubled, capped
+    assert not breaker.allow(now=24)
+    assert breaker.allow(now=25)
+
+
+def test_success_resets_failure_streak():
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=10, max_reset_seconds=100)
+    breaker.record_failure(now=0)
+    breaker.record_success()
+    assert not breaker.record_failure(now=1)
+    assert breaker.state == CircuitState.CLOSED
+    assert 0 < breaker.health_score < 1
+
+
+# ─── Guarded Delivery ───────────────────────────────────────
+
+@pytest.mark.asyncio
+@patch("app.domain.webhooks.circuit_breaker.deliver_with_retry", new_callable=AsyncMock)
+async def test_open_circuit_skips_delivery(mock_deliver):
+    webhook = make_webhook(WebhookEvent.SENSOR_CREATED)
+    mock_deliver.return_value = DOWN
+
+    results = [await deliver_through_circuit(webhook, "{}") for _ in range(webhook_breakers.failure_threshold + 2)]
+
+    assert results[webhook_breakers.failure_threshold - 1].circuit == "opened"
+    assert results[-1].deferred
+    assert mock_deliver.await_count == webhook_breakers.failure_threshold
+    webhook_breakers.forget(webhook.id)
+
+
+@pytest.mark.asyncio
+@patch("app.domain.webhooks.circuit_breaker.deliver_with_retry", new_callable=AsyncMock)
+async def test_half_open_probe_is_single_attempt(mock_deliver):
+    webhook = make_webhook(WebhookEvent.SENSOR_CREATED)
+    breaker = webhook_breakers.get(webhook.id)
+    breaker.state, breaker.trips, breaker.opened_at = CircuitState.OPEN, 1, -1e9
+    mock_deliver.return_value = DeliveryResult(ok=True)
+
+    result = await deliver_through_circuit(webhook, "{}")
+
+    assert mock_deliver.await_args.kwargs["max_attempts"] == 1
+    assert result.circuit == "closed"
+    assert breaker.state == CircuitState.CLOSED
+    webhook_breakers.forget(webhook.id)
+
+
+@pytest.mark.asyncio
+@patch("app.domain.webhooks.circuit_breaker.update_webhook_retry", new_callable=AsyncMock)
+async def test_circuit_changes_are_written_to_last_error(mock_update_retry):
+    webhook_id = uuid4()
+    await record_circuit_change("session", webhook_id, DeliveryResult(ok=False, retryable=True, error="HTTP 503", circuit="opened"))
+    await record_circuit_change("session", webhook_id, DeliveryResult(ok=True, circuit="closed"))
+    assert not await record_circuit_change("session", webhook_id, DOWN)
+
+    first, second = mock_update_retry.await_args_list
+    assert first.kwargs["last_error"].startswith("Circuit open") and "HTTP 503" in first.kwargs["last_error"]
+    assert second.kwargs["last_error"] is None
+    webhook_breakers.forget(webhook_id)
+
+
+# ─── API View ───────────────────────────────────────────────
+
+def test_webhook_read_includes_health():
+    row = SimpleNamespace(
+        id=uuid4(), event_type="sensor_created", target_url="https://example.com/hook", enabled=True,
+        last_error=None, last_triggered_at=datetime.now(timezone.utc), parameters=None,
+    )
+    assert to_webhook_read(row).circuit_state == CircuitState.CLOSED  # type: ignore[arg-type]
+
+    breaker = webhook_breakers.get(row.id)
+    for _ in range(webhook_breakers.failure_threshold):
+        breaker.record_failure()
+
+    read = to_webhook_read(row)  # type: ignore[arg-type]
+    assert read.circuit_state == CircuitState.OPEN
+    assert read.consecutive_failures == webhook_breakers.failure_threshold
+    assert read.health_score < 1 and read.circuit_retry_at is not None
+    webhook_breakers.forget(row.id)
@@ -0,0 +1,74 @@
+import pytest
+from uuid import uuid4
+from unittest.mock import AsyncMock, patch
+
+from app.constants.webhooks import WebhookEvent
+from app.domain.webhooks.alert_processor import AlertWebhookProcessor
+from app.domain.webhooks.dispatcher import WebhookDispatcher
+from app.domain.webhooks.sensor_created_processor import SensorCreatedProcessor
+from app.domain.webhooks.webhook_configs import load_webhook_configs
+from app.models.DB_tables.user_secrets import UserSecret
+from app.models.DB_tables.webhook import Webhook
+
+
+def make_row(event_type: str, secret: UserSecret | None, **fields) -> tuple[Webhook, UserSecret | None]:
+    webhook = Webhook(
+        id=uuid4(), event_type=event_type, target_url="https://example.com/hook",
+        secret_id=secret.id if secret else None, enabled=True, **fields,
+    )
+    return webhook, secret
+
+
+def make_secret(value: str) -> UserSecret:
+    return UserSecret(id=uuid4(), secret=f"enc:{value}", is_active=True)
+
+
+@pytest.mark.asyncio
+@patch("app.domain.webhooks.webhook_configs.decrypt_secret", side_effect=lambda s: s.removeprefix("enc:"))
+@patch("app.domain.webhooks.webhook_configs.get_active_webhooks_with_secrets", new_callable=AsyncMock)
+async def test_load_partitions_by_event_and_decrypts_each_secret_once(mock_rows, mock_decrypt):
+    shared, other = make_secret("shared"), make_secret("other")
+    created = make_row("sensor_created", shared)
+    wildcard = make_row("*", shared)
+    alert = make_row("alert_triggered", other, parameters={"co2": [1000, None]})
+    no_secret = make_row("sensor_created", None)
+    unknown = make_row("sensor_exploded", other)
+    mock_rows.return_value = [created, wildcard, alert, no_secret, unknown]
+
+    configs = await load_webhook_configs(session=None)  # type: ignore[arg-type]
+
+    assert mock_rows.await_count == 1
+    assert mock_decrypt.call_count == 2
+    assert set(configs) == set(WebhookEvent)
+    assert [c.id for c in configs[WebhookEvent.SENSOR_CREATED]] == [created[0].id, wildcard[0].id]
+    assert [c.id for c in configs[WebhookEvent.ALERT_TRIGGERED]] == [wildcard[0].id, alert[0].id]
+    assert [c.id for c in configs[WebhookEvent.SENSOR_DELETED]] == [wildcard[0].id]
+    assert configs[WebhookEvent.SENSOR_DELETED][0].event_type == WebhookEvent.SENSOR_DELETED
+    assert configs[WebhookEvent.ALERT_TRIGGERED][1].secret.get_secret_value() == "other"
+
+
+@pytest.mark.asyncio
+@patch("app.domain.webhooks.webhook_configs.decrypt_secret", side_effect=lambda s: s.removeprefix("enc:"))
+@patch("app.domain.webhooks.webhook_configs.get_active_webhooks_with_secrets", new_callable=AsyncMock)
+async def test_load_all_registries_uses_one_query(mock_rows, mock_decrypt):
+    secret = make_secret("s")
+    wildcard = make_row("*", secret)
+    alert = make_row("alert_triggered", secret, parameters={"co2": [1000, None]})
+    mock_rows.return_value = [wildcard, alert]
+
+    dispatcher = WebhookDispatcher()
+    created, alerts = SensorCreatedProcessor(), AlertWebhookProcessor()
+    dispatcher.register(WebhookEvent.SENSOR_CREATED, created)
+    dispatcher.register(WebhookEvent.ALERT_TRIGGERED, alerts)
+
+    class DummyTransaction:
+        async def __aenter__(self): return None
+        async def __aexit__(self, *args): return False
+
+    with patch("app.domain.webhooks.dispatcher.run_in_transaction", new=lambda: DummyTransaction()):
+        await dispatcher.load_all_registries()
+
+    assert mock_rows.await_count == 1
+    assert mock_rows.await_args.args[1] == ["sensor_created", "alert_triggered"]
+    assert [c.id for c in created.get_all()] == [wildcard[0].id]
+    assert [c.id for c in alerts.get_all()] == [alert[0].id]  # wildcard has no thresholds
@@ -0,0 +1,82 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from pydantic import BaseModel
+
+from app.constants.webhooks import WebhookEvent
+from app.domain.webhooks.delivery_queue import WebhookDeliveryQueue
+
+
+class Payload(BaseModel):
+    n: int
+
+
+EVENT = WebhookEvent.SENSOR_DATA_RECEIVED
+
+
+@pytest.mark.asyncio
+async def test_submit_does_not_wait_for_delivery():
+    release = asyncio.Event()
+    delivered = []
+
+    async def slow_handler(event, payload):
+        await release.wait()
+        delivered.append(payload.n)
+
+    queue = WebhookDeliveryQueue(slow_handler, queue_size=10, workers=2, overflow="drop_oldest")
+    queue.start()
+
+    await asyncio.wait_for(queue.submit(EVENT, Payload(n=1)), timeout=0.1)
+    await asyncio.wait_for(queue.submit(EVENT, Payload(n=2)), timeout=0.1)
+    assert delivered == []
+
+    release.set()
+    await queue.stop(drain_timeout=1)
+    assert sorted(delivered) == [1, 2]
+    assert queue.delivered == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("policy, expected", [("drop_oldest", [3]), ("drop_newest", [2])])
+async def test_overflow_policies(policy, expected):
+    release = asyncio.Event()
+    delivered = []
+
+    async def handler(event, payload):
+        await release.wait()
+        delivered.append(payload.n)
+
+    queue = WebhookDeliveryQueue(handler, queue_size=1, workers=1, overflow=policy)
+    queue.start()
+    await queue.submit(EVENT, Payload(n=1))
+    await asyncio.sleep(0)  # worker picks up job 1 and blocks on it
+    await queue.submit(EVENT, Payload(n=2))
+    accepted = await queue.submit(EVENT, Payload(n=3))
+
+    assert accepted is False
+    assert queue.dropped == 1
+    release.set()
+    await queue.stop(drain_timeout=1)
+    assert delivered == [1] + expected
+
+
+@pytest.mark.asyncio
+async def test_failed_jobs_are_counted_and_workers_survive():
+    handler = AsyncMock(side_effect=[RuntimeError("boom"), None])
+    queue = WebhookDeliveryQueue(handler, queue_size=10, workers=1, overflow="block")
+    queue.start()
+    await queue.submit(EVENT, Payload(n=1))
+    await queue.submit(EVENT, Payload(n=2))
+    await queue.stop(drain_timeout=1)
+
+    assert queue.failed == 1
+    assert queue.delivered == 1
+
+
+@pytest.mark.asyncio
+async def test_submit_runs_inline_when_not_started():
+    handler = AsyncMock()
+    queue = WebhookDeliveryQueue(handler, queue_size=10, workers=1, overflow="drop_oldest")
+    await queue.submit(EVENT, Payload(n=1))
+    handler.assert_awaited_once_with(EVENT, Payload(n=1))
@@ -0,0 +1,104 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.constants.webhooks import WebhookEvent
+from app.domain.webhooks.fanout import WebhookFanOut
+from app.domain.webhooks.send_webhook import DeliveryResult
+from tests.conftest import make_webhook
+
+
+EVENT = WebhookEvent.SENSOR_DATA_RECEIVED
+
+
+@pytest.mark.asyncio
+@patch("app.domain.webhooks.fanout.update_webhook_retry", new_callable=AsyncMock)
+@patch("app.domain.webhooks.circuit_breaker.deliver_with_retry", new_callable=AsyncMock)
+async def test_deliveries_run_concurrently_within_limits(mock_deliver, mock_update_retry):
+    in_flight = peak = 0
+
+    async def slow_delivery(webhook, body, max_attempts=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return DeliveryResult(ok=True)
+
+    mock_deliver.side_effect = slow_delivery
+    fanout = WebhookFanOut(global_limit=50, per_event_limit=8)
+
+    result = await fanout.deliver(EVENT, [make_webhook(EVENT) for _ in range(40)], {"n": 1}, session=None)
+
+    assert result.succeeded == 40 and result.ok
+    assert 1 < peak <= 8
+    mock_update_retry.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@patch("app.domain.webhooks.fanout.update_webhook_retry", new_callable=AsyncMock)
+@patch("app.domain.webhooks.circuit_breaker.deliver_with_retry", new_callable=AsyncMock)
+async def test_global_limit_spans_events(mock_deliver, mock_update_retry):
+    in_flight = peak = 0
+
+    async def slow_delivery(webhook, body, max_attempts=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return DeliveryResult(ok=True)
+
+    mock_deliver.side_effect = slow_delivery
+    fanout = WebhookFanOut(global_limit=5, per_event_limit=5)
+
+    await asyncio.gather(
+        fanout.deliver(WebhookEvent.SENSOR_CREATED, [make_webhook(EVENT) for _ in range(10)], {}, session=None),
+        fanout.deliver(WebhookEvent.SENSOR_DELETED, [make_webhook(EVENT) for _ in range(10)], {}, session=None),
+    )
+    assert peak == 5
+
+
+@pytest.mark.asyncio
+@patch("app.domain.webhooks.fanout.update_webhook_retry", new_callable=AsyncMock)
+@patch("app.domain.webhooks.circuit_breaker.deliver_with_retry", new_callable=AsyncMock)
+async def test_deliveries_to_one_webhook_keep_event_order(mock_deliver, mock_update_retry):
+    received = []
+
+    async def delivery(webhook, body, max_attempts=None):
+        # The first event is slower; it must still arrive first
+        await asyncio.sleep(0.02 if '"n":1' in body else 0)
+        received.append(body)
+        return DeliveryResult(ok=True)
+
+    mock_deliver.side_effect = delivery
+    fanout = WebhookFanOut(global_limit=10, per_event_limit=10)
+    webhook = make_webhook(EVENT)
+
+    await asyncio.gather(
+        fanout.deliver(EVENT, [webhook], {"n": 1}, session=None),
+        fanout.deliver(EVENT, [webhook], {"n": 2}, session=None),
+    )
+    assert received == ['{"n":1}', '{"n":2}']
+    assert fanout._tails == {}
+
+
+@pytest.mark.asyncio
+@patch("app.domain.webhooks.fanout.update_webhook_retry", new_callable=AsyncMock)
+@patch("app.domain.webhooks.circuit_breaker.deliver_with_retry", new_callable=AsyncMock)
+async def test_result_aggregates_failures(mock_deliver, mock_update_retry):
+    ok, down, rejected = make_webhook(EVENT), make_webhook(EVENT), make_webhook(EVENT)
+    outcomes = {
+        ok.id: DeliveryResult(ok=True),
+        down.id: DeliveryResult(ok=False, retryable=True, error="HTTP 503"),
+        rejected.id: DeliveryResult(ok=False, error="HTTP 400"),
+    }
+    mock_deliver.side_effect = lambda webhook, body, max_attempts=None: outcomes[webhook.id]
+    session = object()
+
+    result = await WebhookFanOut(10, 10).deliver(EVENT, [ok, down, rejected], {"n": 1}, session)
+
+    assert (result.total, result.succeeded, result.failed) == (3, 1, 2)
+    assert result.failed_ids == [down.id, rejected.id]
+    # Only exhausted retries are recorded on the webhook, as before
+    mock_update_retry.assert_awaited_once_with(session, down.id, last_error="HTTP 503")
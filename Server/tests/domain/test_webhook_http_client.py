@@ -0,0 +1,106 @@
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.domain.webhooks.http_client import WebhookHTTPClient
+
+
+def _client_with(handler) -> WebhookHTTPClient:
+    pool = WebhookHTTPClient()
+    pool._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return pool
+
+
+@pytest.mark.asyncio
+async def test_build_client_uses_settings():
+    pool = WebhookHTTPClient()
+    with patch("app.domain.webhooks.http_client.settings") as settings:
+        settings.WEBHOOK_HTTP_TIMEOUT_SECONDS = 7.0
+        settings.WEBHOOK_HTTP_CONNECT_TIMEOUT_SECONDS = 2.0
+        settings.WEBHOOK_HTTP_MAX_CONNECTIONS = 20
+        settings.WEBHOOK_HTTP_KEEPALIVE_SECONDS = 15.0
+        settings.WEBHOOK_HTTP2_ENABLED = False
+        settings.WEBHOOK_HTTP_MAX_CONNECTIONS_PER_HOST = 4
+        await pool.start()
+
+    client = pool.client
+    assert client.timeout.read == 7.0
+    assert client.timeout.connect == 2.0
+    await pool.stop()
+    assert pool._client is None
+
+
+@pytest.mark.asyncio
+async def test_post_reuses_the_shared_client():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append((str(request.url), request.content, request.headers["X-Test"]))
+        return httpx.Response(204)
+
+    pool = _client_with(handler)
+    client = pool.client
+    for _ in range(3):
+        response = await pool.post("https://receiver.example/hook", "{}", {"X-Test": "1"})
+        assert response.status_code == 204
+
+    assert pool.client is client
+    assert len(seen) == 3
+    assert seen[0] == ("https://receiver.example/hook", b"{}", "1")
+    await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_post_caps_concurrency_per_host():
+    in_flight = {"a": 0, "b": 0}
+    peak = {"a": 0, "b": 0}
+    release = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        host = request.url.host[0]
+        in_flight[host] += 1
+        peak[host] = max(peak[host], in_flight[host])
+        await release.wait()
+        in_flight[host] -= 1
+        return httpx.Response(200)
+
+    pool = _client_with(handler)
+    with patch("app.domain.webhooks.http_client.settings") as settings:
+        settings.WEBHOOK_HTTP_MAX_CONNECTIONS_PER_HOST = 2
+        tasks = [asyncio.create_task(pool.post(f"https://{h}.example/x", "{}", {})) for h in "aaaab"]
+        await asyncio.sleep(0.05)
+        release.set()
+        await asyncio.gather(*tasks)
+
+    assert peak == {"a": 2, "b": 1}
+    await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_post_drops_idle_host_semaphores():
+    release = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await release.wait()
+        return httpx.Response(200)
+
+    pool = _client_with(handler)
+    tasks = [asyncio.create_task(pool.post(f"https://{h}.example/x", "{}", {})) for h in "aab"]
+    await asyncio.sleep(0.05)
+    assert pool._host_users == {"https://a.example:": 2, "https://b.example:": 1}
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert pool._host_limits == {}
+    assert pool._host_users == {}
+
+    def failing(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("refused", request=request)
+
+    pool._client = httpx.AsyncClient(transport=httpx.MockTransport(failing))
+    with pytest.raises(httpx.ConnectError):
+        await pool.post("https://c.example/x", "{}", {})
+    assert pool._host_limits == {}
+    await pool.stop()
@@ -0,0 +1,216 @@
+import time
+import pytest
+from datetime import datetime, timezone, timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+from unittest.mock import AsyncMock, patch
+
+from app.constants.webhooks import CircuitState, WebhookEvent
+from app.domain.webhooks.alert_processor import AlertWebhookProcessor
+from app.domain.webhooks.circuit_breaker import webhook_breakers
+from app.domain.webhooks.dispatcher import WebhookDispatcher
+from app.domain.webhooks.outbox_relay import WebhookOutboxRelay, backoff_delay
+from app.domain.webhooks.send_webhook import DeliveryResult
+from app.domain.webhooks.sensor_data_received_processor import SensorDataReceivedProcessor
+from tests.conftest import make_webhook
+from tests.domain.test_sensor_data_batch_writer import make_reading
+
+
+def make_row(webhook_id, attempts=1, event=WebhookEvent.SENSOR_DATA_RECEIVED):
+    return SimpleNamespace(
+        id=uuid4(), webhook_id=webhook_id, event_type=event.value,
+        payload={"n": 1}, attempts=attempts, created_at=datetime.now(timezone.utc),
+    )
+
+
+class DummyTransaction:
+    async def __aenter__(self): return object()
+    async def __aexit__(self, *args): return False
+
+
+# ─── Backoff ────────────────────────────────────────────────
+
+def test_backoff_delay_grows_and_is_capped():
+    for attempts in range(1, 6):
+        delay = backoff_delay(attempts, base=1.0, cap=100.0)
+        assert 1.0 <= delay <= 2 ** attempts
+    assert backoff_delay(40, base=1.0, cap=100.0) <= 100.0
+
+
+# ─── Outbox Rows ────────────────────────────────────────────
+
+def test_build_outbox_rows_targets_only_matching_alerts():
+    received = SensorDataReceivedProcessor()
+    received._webhooks = [make_webhook(WebhookEvent.SENSOR_DATA_RECEIVED)]
+    alerts = AlertWebhookProcessor()
+    hot = make_webhook(WebhookEvent.ALERT_TRIGGERED, {"temperature": [30.0, None]})
+    mild = make_webhook(WebhookEvent.ALERT_TRIGGERED, {"temperature": [20.0, 25.0]})
+    alerts.add(hot)
+    alerts.add(mild)
+
+    dispatcher = WebhookDispatcher()
+    dispatcher.register(WebhookEvent.SENSOR_DATA_RECEIVED, received)
+    dispatcher.register(WebhookEvent.ALERT_TRIGGERED, alerts)
+
+    reading = {"id": uuid4(), **make_reading(temperature=23.5).model_dump()}
+    rows, _ = dispatcher.build_outbox_rows([reading])
+
+    assert [(r["event_type"], r["webhook_id"]) for r in rows] == [
+        ("sensor_data_received", received._webhooks[0].id),
+        ("alert_triggered", mild.id),
+    ]
+    assert rows[0]["payload"]["id"] == str(reading["id"])
+    assert rows[1]["payload"] == {**rows[0]["payload"], "alert_state": "triggered"}
+
+
+def test_build_outbox_rows_applies_alert_state_only_on_commit():
+    alerts = AlertWebhookProcessor()
+    alerts.add(make_webhook(WebhookEvent.ALERT_TRIGGERED, {"temperature": [30.0, None]}))
+    dispatcher = WebhookDispatcher()
+    dispatcher.register(WebhookEvent.ALERT_TRIGGERED, alerts)
+    device = uuid4()
+
+    def build():
+        reading = {"id": uuid4(), **make_reading(sensorid=device, temperature=35.0).model_dump()}
+        return dispatcher.build_outbox_rows([reading])
+
+    rows, _ = build()  # transaction rolled back: callback never runs
+    assert len(rows) == 1
+
+    rows, on_commit = build()
+    assert len(rows) == 1  # still triggers, the first attempt left no state
+    on_commit()
+
+    rows, _ = build()
+    assert rows == []  # the committed trigger now holds the alert active
+
+
+def test_find_webhook_uses_processor_id_index():
+    received = SensorDataReceivedProcessor()
+    first, second = make_webhook(WebhookEvent.SENSOR_DATA_RECEIVED), make_webhook(WebhookEvent.SENSOR_DATA_RECEIVED)
+    received.set_all([first])
+    alerts = AlertWebhookProcessor()
+    alert = make_webhook(WebhookEvent.ALERT_TRIGGERED, {"temperature": [30.0, None]})
+    alerts.add(alert)
+
+    dispatcher = WebhookDispatcher()
+    dispatcher.register(WebhookEvent.SENSOR_DATA_RECEIVED, received)
+    dispatcher.register(WebhookEvent.ALERT_TRIGGERED, alerts)
+
+    received.add(second)
+    assert dispatcher.find_webhook(second.id, WebhookEvent.SENSOR_DATA_RECEIVED) is second
+    assert dispatcher.find_webhook(alert.id, WebhookEvent.ALERT_TRIGGERED) is alert
+    assert dispatcher.find_webhook(alert.id, WebhookEvent.SENSOR_DATA_RECEIVED) is None
+
+    received.remove(first.id)
+    assert dispatcher.find_webhook(first.id, WebhookEvent.SENSOR_DATA_RECEIVED) is None
+
+
+# ─── Relay ──────────────────────────────────────────────────
+
+def make_relay(webhooks: dict) -> WebhookOutboxRelay:
+    return WebhookOutboxRelay(
+        lookup=lambda webhook_id, event: webhooks.get(webhook_id),
+        workers=1, batch_size=10, poll_seconds=0.01, lease_seconds=60, max_attempts=3,
+    )
+
+
+@pytest.mark.asyncio
+@patch("app.domain.webhooks.outbox_relay.update_webhook_retry", new_callable=AsyncMock)
+@patch("app.domain.webhooks.outbox_relay.mark_delivery_dead", new_callable=AsyncMock)
+@patch("app.domain.webhooks.outbox_relay.reschedule_delivery", new_callable=AsyncMock)
+@patch("app.domain.webhooks.outbox_relay.delete_deliveries", new_callable=AsyncMock)
+@patch("app.domain.webhooks.circuit_breaker.deliver_with_retry", new_callable=AsyncMock)
+@patch("app.domain.webhooks.outbox_relay.claim_due_deliveries", new_callable=AsyncMock)
+@patch("app.domain.webhooks.outbox_relay.run_in_transaction", new=lambda: DummyTransaction())
+async def test_relay_batch_settles_each_outcome(
+    mock_claim, mock_deliver, mock_delete, mock_reschedule, mock_dead, mock_update_retry
+):
+    ok_hook = make_webhook(WebhookEvent.SENSOR_DATA_RECEIVED)
+    flaky_hook = make_webhook(WebhookEvent.SENSOR_DATA_RECEIVED)
+    broken_hook = make_webhook(WebhookEvent.SENSOR_DATA_RECEIVED)
+    relay = make_relay({w.id: w for w in (ok_hook, flaky_hook, broken_hook)})
+
+    delivered = make_row(ok_hook.id)
+    retry = make_row(flaky_hook.id, attempts=1)
+    exhausted = make_row(flaky_hook.id, attempts=3)
+    permanent = make_row(broken_hook.id)
+    orphan = make_row(uuid4())
+    mock_claim.return_value = [delivered, retry, exhausted, permanent, orphan]
+
+    outcomes = {
+        ok_hook.id: [DeliveryResult(ok=True)],
+        flaky_hook.id: [DeliveryResult(ok=False, retryable=True, error="HTTP 503")] * 2,
+        broken_hook.id: [DeliveryResult(ok=False, error="HTTP 404")],
+    }
+    mock_deliver.side_effect = lambda webhook, body, max_attempts=None: outcomes[webhook.id].pop(0)
+
+    before = datetime.now(timezone.utc)
+    assert await relay.relay_batch() == 5
+
+    assert mock_delete.await_args.args[1] == [delivered.id]
+    mock_reschedule.assert_awaited_once()
+    _, row_id, next_attempt_at, error = mock_reschedule.await_args.args
+    assert row_id == retry.id and error == "HTTP 503"
+    assert before + timedelta(seconds=1) <= next_attempt_at
+    assert {c.args[1] for c in mock_dead.await_args_list} == {exhausted.id, permanent.id, orphan.id}
+    assert mock_update_retry.await_count == 3
+    assert (relay.delivered, relay.retried, relay.dead) == (1, 1, 3)
+
+
+@pytest.mark.asyncio
+@patch("app.domain.webhooks.outbox_relay.claim_due_deliveries", new_callable=AsyncMock, return_value=[])
+@patch("app.domain.webhooks.outbox_relay.run_in_transaction", new=lambda: DummyTransaction())
+async def test_relay_batch_with_nothing_due(mock_claim):
+    assert await make_relay({}).relay_batch() == 0
+
+
+def test_dispatch_skips_outbox_events_when_enabled():
+    dispatcher = WebhookDispatcher()
+    with patch("app.domain.webhooks.dispatcher.settings.WEBHOOK_OUTBOX_ENABLED", True):
+        assert dispatcher.is_durable(WebhookEvent.ALERT_TRIGGERED)
+        assert not dispatcher.is_durable(WebhookEvent.SENSOR_CREATED)
+        assert dispatcher.outbox_builder() == dispatcher.build_outbox_rows
+    assert dispatcher.outbox_builder() is None
+
+
+@pytest.mark.asyncio
+@patch("app.domain.webhooks.outbox_relay.reschedule_delivery", new_callable=AsyncMock)
+@patch("app.domain.webhooks.outbox_relay.delete_deliveries", new_callable=AsyncMock)
+@patch("app.domain.webhooks.circuit_breaker.deliver_with_retry", new_callable=AsyncMock)
+@patch("app.domain.webhooks.outbox_relay.claim_due_deliveries", new_callable=AsyncMock)
+@patch("app.domain.webhooks.outbox_relay.run_in_transaction", new=lambda: DummyTransaction())
+async def test_open_circuit_defers_without_spending_attempts(mock_claim, mock_deliver, mock_delete, mock_reschedule):
+    webhook = make_webhook(WebhookEvent.SENSOR_DATA_RECEIVED)
+    breaker = webhook_breakers.get(webhook.id)
+    breaker.state, breaker.trips, breaker.opened_at = CircuitState.OPEN, 1, time.monotonic()
+    row = make_row(webhook.id, attempts=4)
+    mock_claim.return_value = [row]
+    relay = make_relay({webhook.id: webhook})
+
+    await relay.relay_batch()
+
+    mock_deliver.assert_not_awaited()
+    assert mock_reschedule.await_args.kwargs["attempts"] == 3
+    assert relay.deferred == 1
+    webhook_breakers.forget(webhook.id)
+
+
+@pytest.mark.asyncio
+@patch("app.domain.webhooks.outbox_relay.purge_settled_deliveries", new_callable=AsyncMock, return_value=4)
+@patch("app.domain.webhooks.outbox_relay.run_in_transaction", new=lambda: DummyTransaction())
+async def test_purge_settled_uses_retention_cutoff(mock_purge):
+    relay = WebhookOutboxRelay(
+        lookup=lambda webhook_id, event: None,
+        workers=1, batch_size=10, poll_seconds=0.01, lease_seconds=60, max_attempts=3,
+        retention_seconds=3600,
+    )
+    now = datetime(2025, 6, 1, 12, tzinfo=timezone.utc)
+
+    assert await relay.purge_settled(now) == 4
+    assert mock_purge.await_args.args[1] == now - timedelta(hours=1)
+    assert relay.purged == 4
+
+    mock_purge.reset_mock()
+    assert await make_relay({}).purge_settled(now) == 0  # no retention: keep everything
+    mock_purge.assert_not_awaited()
@@ -0,0 +1,146 @@
+import httpx
+import pytest
+from unittest.mock import AsyncMock
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+from app.domain.login_auth_processor import LoginAuthProcessor
+from app.middleware import auth_middleware
+from app.models.DB_tables.user import RoleEnum
+from app.utils.exceptions_base import AuthValidationError
+
+
+@pytest.fixture(autouse=True)
+def empty_session_cache():
+    LoginAuthProcessor._session_cache.clear()
+    yield
+    LoginAuthProcessor._session_cache.clear()
+
+
+@pytest.fixture
+def client(app):
+    @app.get("/api/v1/auth/profile")
+    async def profile(request: Request):
+        return {"user_id": str(request.state.user_id)}
+
+    @app.post("/api/v1/sensor/data/latest")
+    async def latest(request: Request):
+        return {"state": sorted(request.scope.get("state", {}))}
+
+    @app.post("/api/v1/sensor/data/by-ranges")
+    async def by_ranges(request: Request):
+        return {"user_id": str(request.state.user_id), "method": request.state.auth_method}
+
+    @app.get("/api/v1/sensor/admin/stats")
+    async def sensor_admin():
+        return {"ok": True}
+
+    @app.api_route("/api/v1/sensor/data/graphql", methods=["GET", "POST"])
+    async def graphql():
+        return {"ok": True}
+
+    @app.get("/api/v1/auth/authenticated/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield f"chunk-{i};".encode()
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.fixture
+def key_match(monkeypatch, dummy_user):
+    match = AsyncMock(return_value=dummy_user)
+    monkeypatch.setattr(auth_middleware.APIKeyAuthProcessor, "match", match)
+    return match
+
+
+BEARER = {"Authorization": "Bearer dummy.jwt.token"}
+
+
+@pytest.mark.asyncio
+async def test_bearer_routes_enforce_roles(client, dummy_user):
+    async with client:
+        ok = await client.get("/api/v1/auth/authenticated", headers=BEARER)
+        assert ok.status_code == 200
+        assert ok.json() == {"user_id": str(dummy_user.id)}
+
+        assert (await client.get("/api/v1/auth/admin", headers=BEARER)).status_code == 403
+        assert (await client.get("/api/v1/auth/authenticated")).status_code == 401
+
+        # Routes without a role requirement see the user when a token is given
+        assert (await client.get("/api/v1/auth/profile")).json() == {"user_id": "None"}
+        assert (await client.get("/api/v1/auth/profile", headers=BEARER)).json() == {"user_id": str(dummy_user.id)}
+
+
+@pytest.mark.asyncio
+async def test_invalid_bearer_is_rejected(client, monkeypatch):
+    async def no_secret(_s, _uid, label="login"):
+        return None
+
+    monkeypatch.setattr(auth_middleware, "get_user_secret_by_label", no_secret)
+    async with client:
+        response = await client.get("/api/v1/auth/profile", headers=BEARER)
+    assert response.status_code == AuthValidationError("x").status_code
+    assert "error" in response.json()
+
+
+@pytest.mark.asyncio
+async def test_sensor_routes_use_api_key_only(client, key_match, dummy_user):
+    async with client:
+        assert (await client.post("/api/v1/sensor/data/by-ranges", headers=BEARER)).json() == {
+            "detail": "Missing API key"
+        }
+
+        response = await client.post("/api/v1/sensor/data/by-ranges", headers={"X-API-Key": "abc.def"})
+        assert response.json() == {"user_id": str(dummy_user.id), "method": "apikey"}
+        key_match.assert_awaited_once_with("abc.def")
+
+        # Longest prefix wins: /sensor/admin needs the admin role
+        denied = await client.get("/api/v1/sensor/admin/stats", headers={"X-API-Key": "abc.def"})
+        assert denied.status_code == 403
+
+        key_match.side_effect = AuthValidationError("Invalid or inactive API key")
+        rejected = await client.post("/api/v1/sensor/data/by-ranges", headers={"X-API-Key": "bad"})
+        assert rejected.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_public_paths_skip_authentication(client, key_match):
+    async with client:
+        latest = await client.post("/api/v1/sensor/data/latest")
+        assert latest.status_code == 200
+        assert "user" not in latest.json()["state"]
+
+        assert (await client.get("/api/v1/sensor/data/graphql")).status_code == 200
+        assert (await client.post("/api/v1/sensor/data/graphql")).status_code == 401
+    key_match.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_https_required_outside_local(client, monkeypatch, key_match):
+    monkeypatch.setattr(auth_middleware.settings, "ENV", "docker")
+    async with client:
+        blocked = await client.post("/api/v1/sensor/data/latest")
+        assert blocked.status_code == 403
+        assert blocked.json() == {"detail": "HTTPS is required"}
+
+        proxied = await client.post("/api/v1/sensor/data/latest", headers={"X-Forwarded-Proto": "https"})
+        assert proxied.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_streaming_responses_pass_through(client):
+    async with client:
+        async with client.stream("GET", "/api/v1/auth/authenticated/stream", headers=BEARER) as response:
+            chunks = [chunk async for chunk in response.aiter_bytes()]
+    assert response.status_code == 200
+    assert b"".join(chunks) == b"chunk-0;chunk-1;chunk-2;"
+
+
+def test_admin_role_reaches_admin_routes():
+    policy = auth_middleware.AuthMiddleware(FastAPI()).policies.match("/api/v1/auth/admin/onboard-users")
+    assert policy is not None
+    assert policy.method == auth_middleware.LOGIN
+    assert policy.roles == frozenset({RoleEnum.admin})
@@ -0,0 +1,183 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+from uuid import UUID
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.infrastructure.database.repository.restAPI import rollup_repository
+from app.infrastructure.database.repository.restAPI.sensor_data_repository import (
+    build_aggregation_query,
+    pick_rollup_resolution,
+)
+from app.models.schemas.rest.sensor_data_schemas import SensorAggregateQuery
+from app.utils.exceptions_base import AppException
+
+
+DEVICE = UUID("00000000-0000-0000-0000-000000000001")
+
+
+def compile_sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def test_truncate_to_bucket_floors_to_grid():
+    ts = datetime(2025, 6, 1, 10, 42, 17, tzinfo=timezone.utc)
+    assert rollup_repository.truncate_to_bucket(ts, timedelta(minutes=1)) == datetime(2025, 6, 1, 10, 42, tzinfo=timezone.utc)
+    assert rollup_repository.truncate_to_bucket(ts, timedelta(hours=1)) == datetime(2025, 6, 1, 10, tzinfo=timezone.utc)
+    assert rollup_repository.truncate_to_bucket(ts.replace(tzinfo=None), timedelta(days=1)) == datetime(2025, 6, 1, tzinfo=timezone.utc)
+
+
+def test_merge_readings_combines_same_bucket():
+    base = datetime(2025, 6, 1, 10, 0, tzinfo=timezone.utc)
+    readings = [
+        {"device_id": DEVICE, "timestamp": base, "co2": 400.0, "pm2_5": None},
+        {"device_id": DEVICE, "timestamp": base + timedelta(seconds=30), "co2": 500.0, "pm2_5": 3.0},
+        {"device_id": DEVICE, "timestamp": base + timedelta(minutes=1), "co2": 450.0},
+    ]
+
+    minute_rows = rollup_repository.merge_readings(readings, "1m")
+    assert [r["count"] for r in minute_rows] == [2, 1]
+    first = minute_rows[0]
+    assert (first["co2_min"], first["co2_max"], first["co2_sum"], first["co2_count"]) == (400.0, 500.0, 900.0, 2)
+    assert (first["pm2_5_min"], first["pm2_5_sum"], first["pm2_5_count"]) == (3.0, 3.0, 1)
+    assert first["temperature_min"] is None and first["temperature_count"] == 0
+
+    hour_rows = rollup_repository.merge_readings(readings, "1h")
+    assert len(hour_rows) == 1
+    assert hour_rows[0]["count"] == 3
+    assert hour_rows[0]["co2_sum"] == 1350.0
+
+
+def test_build_rollup_upsert_merges_on_conflict():
+    rows = rollup_repository.merge_readings(
+        [{"device_id": DEVICE, "timestamp": datetime(2025, 6, 1, tzinfo=timezone.utc), "co2": 400.0}], "1h"
+    )
+    sql = compile_sql(rollup_repository.build_rollup_upsert("1h", rows))
+
+    assert "INSERT INTO sensor_data_rollup_1h" in sql
+    assert "ON CONFLICT (device_id, bucket_start) DO UPDATE" in sql
+    assert "count = (sensor_data_rollup_1h.count + excluded.count)" in sql
+    assert "least(sensor_data_rollup_1h.co2_min, excluded.co2_min)" in sql
+    assert "greatest(sensor_data_rollup_1h.co2_max, excluded.co2_max)" in sql
+
+
+@pytest.mark.asyncio
+async def test_upsert_rollups_splits_statements_under_bind_limit():
+    base = datetime(2025, 6, 1, tzinfo=timezone.utc)
+    readings = [
+        {"device_id": UUID(int=i % 7), "timestamp": base + timedelta(minutes=i), "co2": float(i)}
+        for i in range(1000)  # 1000 distinct minute buckets: past the single-statement limit
+    ]
+    executed = []
+
+    class RecordingSession:
+        async def execute(self, stmt):
+            executed.append(stmt.compile(dialect=postgresql.dialect()))
+
+    with patch.object(rollup_repository, "ROLLUP_RESOLUTIONS", {"1m": timedelta(minutes=1)}):
+        await rollup_repository.upsert_rollups(RecordingSession(), readings)
+
+    assert rollup_repository.upsert_chunk_size("1m") < 1000
+    assert len(executed) > 1
+    assert all(len(c.params) <= rollup_repository.MAX_BIND_PARAMS for c in executed)
+    keys = [
+        (str(c.params[f"device_id_m{i}"]), c.params[f"bucket_start_m{i}"])
+        for c in executed for i in range(sum(1 for k in c.params if k.startswith("device_id_m")))
+    ]
+    assert len(keys) == 1000
+    assert keys == sorted(keys)
+
+
+def test_rebuild_select_groups_raw_data_by_bucket():
+    sql = compile_sql(rollup_repository.build_rollup_rebuild_select(
+        "1d", datetime(2025, 6, 1, tzinfo=timezone.utc), datetime(2025, 6, 8, tzinfo=timezone.utc)
+    ))
+    assert "date_bin(INTERVAL '86400 seconds', sensor_data.timestamp" in sql
+    assert "count(sensor_data.co2) AS co2_count" in sql
+    assert "GROUP BY sensor_data.device_id" in sql
+
+
+def _aggregate_query(**overrides) -> SensorAggregateQuery:
+    params = dict(
+        fields=["co2"],
+        bucket="1d",
+        start=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        end=datetime(2025, 6, 1, tzinfo=timezone.utc),
+        include_p95=False,
+    )
+    params.update(overrides)
+    return SensorAggregateQuery(**params)
+
+
+def test_pick_rollup_resolution():
+    with patch("app.infrastructure.database.repository.restAPI.sensor_data_repository.settings") as s:
+        s.ROLLUPS_ENABLED = True
+        assert pick_rollup_resolution(_aggregate_query()) == "1d"
+        assert pick_rollup_resolution(_aggregate_query(bucket="6h")) == "1h"
+        assert pick_rollup_resolution(
+            _aggregate_query(bucket="1h", start=datetime(2025, 1, 1, 0, 30, tzinfo=timezone.utc))
+        ) == "1m"
+        assert pick_rollup_resolution(_aggregate_query(include_p95=True)) is None
+
+        s.ROLLUPS_ENABLED = False
+        assert pick_rollup_resolution(_aggregate_query()) is None
+
+
+def test_aggregation_reads_rollup_table_when_possible():
+    with patch("app.infrastructure.database.repository.restAPI.sensor_data_repository.settings") as s:
+        s.ROLLUPS_ENABLED = True
+        sql = compile_sql(build_aggregation_query(_aggregate_query(bucket="7d", locations=["lab"])))
+
+    assert "FROM sensor_data_rollup_1d JOIN sensors" in sql
+    assert "sum(sensor_data_rollup_1d.count) AS count" in sql
+    assert "sum(sensor_data_rollup_1d.co2_sum) / CAST(nullif(sum(sensor_data_rollup_1d.co2_count), 0)" in sql
+    assert "percentile_cont" not in sql
+    assert "FROM sensor_data " not in sql
+
+
+def test_build_rollup_prune_deletes_buckets_before_cutoff():
+    sql = compile_sql(rollup_repository.build_rollup_prune("1m", datetime(2025, 1, 1, tzinfo=timezone.utc)))
+    assert sql.startswith("DELETE FROM sensor_data_rollup_1m")
+    assert "bucket_start < '2025-01-01 00:00:00+00:00'" in sql
+
+
+def _expired_raw(**overrides):
+    """Patch retention settings so that 2025 raw data has expired."""
+    values = dict(RAW_RETENTION_ENABLED=True, RAW_RETENTION_DAYS=30,
+                  ROLLUP_RETENTION_DAYS_1M=30, ROLLUP_RETENTION_DAYS_1H=0, ROLLUP_RETENTION_DAYS_1D=0)
+    values.update(overrides)
+    return patch.multiple("app.utils.retention_utils.settings", **values)
+
+
+def test_expired_raw_ranges_use_rollups_even_with_p95_or_unaligned_bounds():
+    unaligned = _aggregate_query(
+        bucket="6h", include_p95=True,
+        start=datetime(2025, 1, 1, 0, 30, tzinfo=timezone.utc), end=datetime(2025, 1, 20, 5, 10, tzinfo=timezone.utc),
+    )
+    with patch("app.infrastructure.database.repository.restAPI.sensor_data_repository.settings") as s, _expired_raw():
+        s.ROLLUPS_ENABLED = True
+        assert pick_rollup_resolution(unaligned) == "1h"
+        sql = compile_sql(build_aggregation_query(unaligned))
+
+    assert "FROM sensor_data_rollup_1h" in sql
+    assert "percentile_cont" not in sql
+    # Snapped outwards to the 1h grid
+    assert "sensor_data_rollup_1h.bucket_start >= '2025-01-01 00:00:00+00:00'" in sql
+    assert "sensor_data_rollup_1h.bucket_start < '2025-01-20 06:00:00+00:00'" in sql
+
+
+def test_expired_raw_range_without_covering_rollup_is_rejected():
+    minutely = _aggregate_query(bucket="1m", end=datetime(2025, 1, 2, tzinfo=timezone.utc))
+    with patch("app.infrastructure.database.repository.restAPI.sensor_data_repository.settings") as s, _expired_raw():
+        s.ROLLUPS_ENABLED = True
+        s.RAW_RETENTION_DAYS = 30
+        assert pick_rollup_resolution(minutely) is None  # 1m rollups are pruned after 30 days
+        with pytest.raises(AppException) as exc:
+            build_aggregation_query(minutely)
+        assert exc.value.status_code == 400
+        assert "expired" in exc.value.public_message
+
+        s.ROLLUPS_ENABLED = False
+        with pytest.raises(AppException):
+            build_aggregation_query(_aggregate_query())
@@ -0,0 +1,102 @@
+from datetime import date, datetime, timezone
+from unittest.mock import patch
+from uuid import UUID
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from app.infrastructure.database import archive
+from app.utils.arrow_utils import arrow_schema, rows_to_record_batch
+
+
+DEVICE_A = UUID(int=1)
+DEVICE_B = UUID(int=2)
+
+
+def _row(row_id, device, day, co2):
+    row = {c: None for c in archive.ARCHIVE_COLUMNS}
+    row.update(id=UUID(int=row_id), device_id=device, timestamp=datetime(2025, 1, day, tzinfo=timezone.utc), co2=co2)
+    return tuple(row[c] for c in archive.ARCHIVE_COLUMNS)
+
+
+ROWS = [_row(10, DEVICE_A, 1, 400), _row(11, DEVICE_B, 2, 500), _row(12, DEVICE_A, 3, 600)]
+
+
+@pytest.fixture
+def archive_dir(tmp_path):
+    with patch.object(archive, "settings") as settings:
+        settings.SENSOR_ARCHIVE_DIR = str(tmp_path)
+        settings.SENSOR_EXPORT_BATCH_SIZE = 2
+        yield tmp_path
+
+
+async def _write_january():
+    newest_first = ROWS[::-1]
+
+    async def fake_stream(query, batch_size):
+        assert "FROM sensor_data_y2025m01" in str(query)
+        assert "ORDER BY sensor_data_y2025m01.timestamp DESC, sensor_data_y2025m01.id DESC" in str(query)
+        yield newest_first[:2]
+        yield newest_first[2:]
+
+    with patch.object(archive, "stream_rows", side_effect=fake_stream):
+        return await archive.archive_partition(date(2025, 1, 1))
+
+
+@pytest.mark.asyncio
+async def test_archive_partition_writes_parquet(archive_dir):
+    path = await _write_january()
+
+    assert path == archive_dir / "sensor_data_y2025m01.parquet"
+    assert not list(archive_dir.glob("*.tmp"))
+    parquet = pq.ParquetFile(path)
+    assert parquet.metadata.num_rows == 3
+    assert parquet.metadata.row_group(0).column(0).compression == "ZSTD"
+    assert list(parquet.metadata.row_group(0).sorting_columns) == archive.ARCHIVE_SORTING
+
+
+@pytest.mark.asyncio
+async def test_archived_months_overlap(archive_dir):
+    await _write_january()
+    (archive_dir / "unrelated.parquet").write_bytes(b"")
+
+    assert archive.archived_months() == [date(2025, 1, 1)]
+    assert archive.archived_months(start=datetime(2025, 2, 1, tzinfo=timezone.utc)) == []
+    assert archive.archived_months(end=datetime(2024, 12, 31, tzinfo=timezone.utc)) == []
+
+
+@pytest.mark.asyncio
+async def test_read_archive_filters_and_projects(archive_dir):
+    await _write_january()
+
+    expression = archive.archive_filter(
+        device_ids=[DEVICE_A],
+        start=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        end=datetime(2025, 1, 31, tzinfo=timezone.utc),
+        field_ranges={"co2": [450, None]},
+    )
+    batches = [b async for b in archive.read_archive(["device_id", "timestamp", "co2"], expression)]
+
+    assert batches == [[(str(DEVICE_A), datetime(2025, 1, 3, tzinfo=timezone.utc), 600)]]
+
+
+@pytest.mark.asyncio
+async def test_read_archive_streams_newest_first(archive_dir):
+    await _write_january()
+
+    with patch.object(archive.pq, "read_table") as read_table:
+        batches = [b async for b in archive.read_archive(["id", "co2"], None, batch_size=1)]
+
+    read_table.assert_not_called()  # streamed, never loaded whole
+    assert batches == [[(str(UUID(int=12)), 600)], [(str(UUID(int=11)), 500)], [(str(UUID(int=10)), 400)]]
+
+
+@pytest.mark.asyncio
+async def test_read_archive_sorts_legacy_oldest_first_archives(archive_dir):
+    batch = rows_to_record_batch(arrow_schema(archive.ARCHIVE_COLUMNS), ROWS)
+    pq.write_table(pa.Table.from_batches([batch]), archive.archive_path(date(2025, 1, 1)))
+
+    batches = [b async for b in archive.read_archive(["co2"], None)]
+
+    assert batches == [[(600,), (500,)], [(400,)]]
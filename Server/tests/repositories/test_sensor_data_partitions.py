@@ -0,0 +1,63 @@
+from datetime import date
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from app.infrastructure.database import partitions
+from app.infrastructure.database.partitions import (
+    add_months, migrate_default_rows_ddl, partition_ddl, partition_name
+)
+from app.models.DB_tables.sensor_data import LEGACY_INDEXES, SensorData
+
+
+def test_add_months_rolls_over_year():
+    assert add_months(date(2025, 11, 1), 3) == date(2026, 2, 1)
+    assert add_months(date(2025, 1, 1), -1) == date(2024, 12, 1)
+
+
+def test_partition_name_and_bounds():
+    assert partition_name(date(2025, 6, 1)) == "sensor_data_y2025m06"
+
+    ddl = partition_ddl(date(2025, 12, 15))
+    assert "CREATE TABLE IF NOT EXISTS sensor_data_y2025m12 PARTITION OF sensor_data" in ddl
+    assert "FROM ('2025-12-01') TO ('2026-01-01')" in ddl
+
+
+def test_migrate_default_rows_detaches_moves_and_reattaches():
+    statements = migrate_default_rows_ddl(date(2031, 2, 10))
+
+    assert statements[0] == "ALTER TABLE sensor_data DETACH PARTITION sensor_data_default"
+    assert statements[1] == partition_ddl(date(2031, 2, 1))
+    assert "DELETE FROM sensor_data_default WHERE timestamp >= '2031-02-01' AND timestamp < '2031-03-01'" in statements[2]
+    assert "INSERT INTO sensor_data SELECT * FROM moved" in statements[2]
+    assert statements[3] == "ALTER TABLE sensor_data ATTACH PARTITION sensor_data_default DEFAULT"
+
+
+@pytest.mark.asyncio
+async def test_ensure_partitions_isolates_failing_month():
+    async def fake_ensure(month):
+        if month == date(2025, 7, 1):
+            raise RuntimeError("default partition holds conflicting rows")
+
+    with patch.object(partitions, "is_sensor_data_partitioned", new_callable=AsyncMock, return_value=True), \
+         patch.object(partitions, "ensure_month_partition", side_effect=fake_ensure) as ensure_month, \
+         patch.object(partitions, "engine") as engine:
+        engine.connect.return_value = AsyncMock()
+        engine.begin.return_value = AsyncMock()
+
+        names = await partitions.ensure_sensor_data_partitions(months_ahead=2, today=date(2025, 6, 20))
+
+    assert ensure_month.await_count == 3
+    assert names == ["sensor_data_y2025m06", "sensor_data_y2025m08"]
+
+
+def test_sensor_data_composite_indexes():
+    ddl = {
+        i.name: str(CreateIndex(i).compile(dialect=postgresql.dialect()))
+        for i in SensorData.__table__.indexes
+    }
+    assert "(device_id, timestamp DESC)" in ddl["ix_sensor_data_device_id_timestamp"]
+    assert "(timestamp DESC, id DESC)" in ddl["ix_sensor_data_timestamp_id"]
+    assert not set(LEGACY_INDEXES) & set(ddl)
@@ -146,3 +146,63 @@ async def test_remove_sensor_not_found(monkeypatch):
 
     result = await sensor_repository.remove_sensor(uuid4())
     assert result is False
+
+
+@pytest.mark.asyncio
+async def test_fetch_latest_for_sensors_uses_lateral_per_sensor(monkeypatch):
+    from sqlalchemy.dialects import postgresql
+    from app.infrastructure.database.repository.restAPI import sensor_data_repository
+
+    captured = {}
+
+    class CapturingSession(DummySession):
+        async def execute(self, stmt):
+            captured["sql"] = str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+            return DummyExecute(["row"])
+
+    monkeypatch.setattr(sensor_data_repository, "run_in_transaction", lambda: CapturingSession())
+
+    sid = uuid4()
+    result = await sensor_data_repository.fetch_latest_for_sensors([sid])
+
+    assert result == ["row"]
+    sql = captured["sql"]
+    assert "DISTINCT ON" not in sql
+    assert "FROM sensors JOIN LATERAL" in sql
+    assert "WHERE sensor_data.device_id = sensors.sensor_id ORDER BY sensor_data.timestamp DESC" in sql
+    assert "LIMIT 1" in sql
+    assert "sensors.sensor_id IN" in sql
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("commit_fails", [False, True])
+async def test_insert_batch_runs_outbox_callback_only_after_commit(monkeypatch, commit_fails):
+    from app.infrastructure.database.repository.restAPI import sensor_data_repository
+    from tests.domain.test_sensor_data_batch_writer import make_reading
+
+    events = []
+
+    class CommittingSession(DummySession):
+        async def execute(self, stmt, params=None): return DummyExecute([])
+
+        async def __aexit__(self, *args):
+            events.append("commit")
+            if commit_fails:
+                raise RuntimeError("commit failed")
+
+    async def insert_outbox_rows(session, rows):
+        events.append(("outbox", len(rows)))
+
+    monkeypatch.setattr(sensor_data_repository, "run_in_transaction", lambda: CommittingSession())
+    monkeypatch.setattr(sensor_data_repository, "insert_outbox_rows", insert_outbox_rows)
+    monkeypatch.setattr(sensor_data_repository.settings, "ROLLUPS_ENABLED", False)
+    outbox = lambda rows: ([{"row": row["id"]} for row in rows], lambda: events.append("applied"))
+
+    if commit_fails:
+        with pytest.raises(AppException):
+            await sensor_data_repository.insert_sensor_data_batch([make_reading()], outbox=outbox)
+        assert events == [("outbox", 1), "commit"]
+    else:
+        rows = await sensor_data_repository.insert_sensor_data_batch([make_reading()], outbox=outbox)
+        assert len(rows) == 1
+        assert events == [("outbox", 1), "commit", "applied"]
@@ -0,0 +1,102 @@
+from datetime import date, datetime, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.infrastructure.database import retention
+from app.infrastructure.database.partitions import parse_partition_month
+
+
+def test_parse_partition_month():
+    assert parse_partition_month("sensor_data_y2025m06") == date(2025, 6, 1)
+    assert parse_partition_month("sensor_data_default") is None
+    assert parse_partition_month("other_y2025m06") is None
+
+
+def test_retention_cutoff_is_day_aligned():
+    now = datetime(2025, 6, 30, 15, 45, tzinfo=timezone.utc)
+    assert retention.retention_cutoff(now, days=30) == datetime(2025, 5, 31, tzinfo=timezone.utc)
+
+
+def test_expired_partition_months_only_whole_months_before_cutoff():
+    names = [
+        "sensor_data_default",
+        "sensor_data_y2025m03",
+        "sensor_data_y2025m01",
+        "sensor_data_y2025m02",
+        "sensor_data_y2025m04",
+    ]
+    cutoff = datetime(2025, 3, 15, tzinfo=timezone.utc)
+    assert retention.expired_partition_months(names, cutoff) == [date(2025, 1, 1), date(2025, 2, 1)]
+
+    cutoff = datetime(2025, 4, 1, tzinfo=timezone.utc)
+    assert date(2025, 3, 1) in retention.expired_partition_months(names, cutoff)
+
+
+@pytest.mark.asyncio
+async def test_apply_raw_retention_rolls_up_before_dropping_partitions():
+    calls = []
+
+    async def fake_rollup(start, end):
+        calls.append(("rollup", start.date()))
+
+    conn = AsyncMock()
+    conn.execute.side_effect = lambda stmt: calls.append(("ddl", str(stmt)))
+    begin = AsyncMock()
+    begin.__aenter__.return_value = conn
+    connect = AsyncMock()
+    connect.__aenter__.return_value = AsyncMock()
+
+    with patch.object(retention, "is_sensor_data_partitioned", new_callable=AsyncMock, return_value=True), \
+         patch.object(retention, "list_sensor_data_partitions", new_callable=AsyncMock,
+                      return_value=["sensor_data_y2025m01", "sensor_data_y2025m06"]), \
+         patch.object(retention, "_rollup_range", side_effect=fake_rollup), \
+         patch.object(retention, "engine") as engine, \
+         patch.object(retention, "settings") as settings:
+        settings.RAW_RETENTION_ACTION = "drop"
+        settings.RAW_RETENTION_DAYS = 90
+        engine.connect.return_value = connect
+        engine.begin.return_value = begin
+
+        removed = await retention.apply_raw_retention(now=datetime(2025, 6, 15, tzinfo=timezone.utc))
+
+    assert removed == ["sensor_data_y2025m01"]
+    assert calls == [("rollup", date(2025, 1, 1)), ("ddl", "DROP TABLE IF EXISTS sensor_data_y2025m01")]
+
+
+@pytest.mark.asyncio
+async def test_apply_raw_retention_rejects_unknown_action():
+    with patch.object(retention, "settings") as settings, patch.object(retention, "engine") as engine:
+        settings.RAW_RETENTION_ACTION = "truncate"
+        assert await retention.apply_raw_retention() == []
+        engine.connect.assert_not_called()
+
+
+def test_rollup_retention_cutoff_per_resolution():
+    now = datetime(2025, 6, 30, 15, 45, tzinfo=timezone.utc)
+    with patch("app.utils.retention_utils.settings") as settings:
+        settings.ROLLUP_RETENTION_DAYS_1M = 30
+        settings.ROLLUP_RETENTION_DAYS_1H = 365
+        settings.ROLLUP_RETENTION_DAYS_1D = 0
+
+        assert retention.rollup_retention_cutoff("1m", now) == datetime(2025, 5, 31, tzinfo=timezone.utc)
+        assert retention.rollup_retention_cutoff("1h", now) == datetime(2024, 6, 30, tzinfo=timezone.utc)
+        assert retention.rollup_retention_cutoff("1d", now) is None
+
+
+@pytest.mark.asyncio
+async def test_apply_rollup_retention_prunes_expiring_resolutions_only():
+    now = datetime(2025, 6, 30, tzinfo=timezone.utc)
+    with patch("app.utils.retention_utils.settings") as settings, \
+         patch.object(retention, "prune_rollups", new_callable=AsyncMock, return_value=7) as prune:
+        settings.ROLLUP_RETENTION_DAYS_1M = 30
+        settings.ROLLUP_RETENTION_DAYS_1H = 365
+        settings.ROLLUP_RETENTION_DAYS_1D = 0
+
+        removed = await retention.apply_rollup_retention(now)
+
+    assert removed == {"1h": 7, "1m": 7}
+    assert sorted(call.args for call in prune.await_args_list) == [
+        ("1h", datetime(2024, 6, 30, tzinfo=timezone.utc)),
+        ("1m", datetime(2025, 5, 31, tzinfo=timezone.utc)),
+    ]
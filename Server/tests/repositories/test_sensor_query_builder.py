@@ -99,4 +99,21 @@ async def test_query_combines_all_filters():
     assert "JOIN sensors ON sensors.sensor_id = sensor_data.device_id" in sql
     assert "sensors.location IN" in sql
     assert "sensors.model IN" in sql
-    assert "sensors.is_active = false" in sql
\ No newline at end of file
+    assert "sensors.is_active = false" in sql
+
+def test_aggregation_query_buckets_and_percentile():
+    from app.infrastructure.database.repository.restAPI.sensor_data_repository import build_aggregation_query
+    from app.models.schemas.rest.sensor_data_schemas import SensorAggregateQuery
+
+    payload = SensorAggregateQuery(
+        fields=["co2", "pm2_5"], bucket="1h",
+        start=isoparse("2025-06-01T00:00:00Z"), end=isoparse("2025-06-02T00:00:00Z"),
+        locations=["Lab"], group_by_sensor=True
+    )
+    sql = compile_query_to_sql(build_aggregation_query(payload))
+
+    assert "date_bin(INTERVAL '3600 seconds', sensor_data.timestamp" in sql
+    assert "percentile_cont(0.95) WITHIN GROUP (ORDER BY sensor_data.co2) AS co2__p95" in sql
+    assert "avg(sensor_data.pm2_5) AS pm2_5__avg" in sql
+    assert "JOIN sensors ON sensors.sensor_id = sensor_data.device_id" in sql
+    assert "GROUP BY date_bin" in sql and "sensor_data.device_id" in sql
@@ -1,6 +1,7 @@
 import pytest
 from uuid import uuid4
 from datetime import datetime, timezone
+from sqlalchemy.dialects import postgresql
 
 from app.models.DB_tables.user import User
 from app.infrastructure.database.repository.restAPI import user_repository
@@ -117,3 +118,49 @@ async def test_get_all_users_returns_list():
     assert result == users
     assert isinstance(result, list)
     assert isinstance(result[0], User)
+
+
+@pytest.mark.asyncio
+async def test_get_existing_emails_returns_set_and_skips_empty_input():
+    session = DummySession(execute_result=["a@test.com"])
+
+    assert await user_repository.get_existing_emails(session, ["a@test.com", "b@test.com"]) == {"a@test.com"}  # type: ignore
+    assert await user_repository.get_existing_emails(None, []) == set()  # type: ignore
+
+
+def test_build_users_bulk_insert_is_multi_row_and_skips_conflicts():
+    rows = [
+        {"id": uuid4(), "email": f"u{i}@test.com", "username": f"u{i}", "hashed_password": "h",
+         "role": "guest", "created_at": datetime.now(timezone.utc)}
+        for i in range(3)
+    ]
+    sql = str(user_repository.build_users_bulk_insert(rows).compile(dialect=postgresql.dialect()))
+
+    assert sql.count("%(email_m") == 3
+    assert "ON CONFLICT DO NOTHING" in sql
+    assert sql.endswith("RETURNING users.id")
+
+
+@pytest.mark.asyncio
+async def test_create_users_bulk_chunks_rows(monkeypatch):
+    monkeypatch.setattr(user_repository, "BULK_INSERT_CHUNK", 2)
+    ids = [uuid4() for _ in range(5)]
+    statements = []
+
+    class RecordingSession(DummySession):
+        async def execute(self, stmt):
+            statements.append(stmt)
+            return DummyExecute(ids[2 * (len(statements) - 1):2 * len(statements)])
+
+    rows = [{"id": i, "email": f"{i}@test.com"} for i in ids]
+    assert await user_repository.create_users_bulk(RecordingSession(), rows) == set(ids)  # type: ignore
+    assert len(statements) == 3
+
+
+@pytest.mark.asyncio
+async def test_create_users_bulk_wraps_errors():
+    class FailingSession(DummySession):
+        async def execute(self, stmt): raise RuntimeError("boom")
+
+    with pytest.raises(AppException):
+        await user_repository.create_users_bulk(FailingSession(), [{"id": uuid4()}])  # type: ignore
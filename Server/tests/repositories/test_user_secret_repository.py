@@ -155,3 +155,24 @@ async def test_delete_user_secret_by_label(monkeypatch):
     session = DummySession(execute_result=[object()])
     result = await secret_repository.delete_user_secret_by_label(session, uuid4(), "old")# type: ignore
     assert result is True
+
+
+@pytest.mark.asyncio
+async def test_create_user_secrets_bulk_sends_one_executemany():
+    calls = []
+
+    class RecordingSession(DummySession):
+        async def execute(self, stmt, params=None):
+            calls.append((stmt, params))
+
+    expires = datetime.now(timezone.utc) + timedelta(days=1)
+    rows = [{"user_id": uuid4(), "secret": "enc", "label": "login", "is_active": True, "expires_at": expires}
+            for _ in range(3)]
+    await secret_repository.create_user_secrets_bulk(RecordingSession(), rows)  # type: ignore
+    await secret_repository.create_user_secrets_bulk(RecordingSession(), [])  # type: ignore
+
+    assert len(calls) == 1
+    stmt, params = calls[0]
+    assert stmt.table.name == "user_secrets"
+    assert [p["user_id"] for p in params] == [r["user_id"] for r in rows]
+    assert all(p["id"] and p["created_at"] and p["revoked_at"] is None for p in params)
@@ -0,0 +1,30 @@
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.dialects import postgresql
+
+from app.infrastructure.database.repository.webhook.webhook_outbox_repository import (
+    build_claim_statement, build_purge_statement
+)
+
+
+def compile_sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def test_claim_statement_skips_locked_rows_and_leases():
+    sql = compile_sql(build_claim_statement(50, timedelta(seconds=60)))
+
+    assert sql.startswith("UPDATE webhook_outbox SET attempts=(webhook_outbox.attempts + 1)")
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    assert "webhook_outbox.status = 'pending'" in sql
+    assert "webhook_outbox.next_attempt_at <= now()" in sql
+    assert "ORDER BY webhook_outbox.next_attempt_at" in sql
+    assert "LIMIT 50" in sql
+    assert "RETURNING webhook_outbox.id" in sql
+
+
+def test_purge_statement_deletes_only_old_settled_rows():
+    sql = compile_sql(build_purge_statement(datetime(2025, 6, 1, tzinfo=timezone.utc)))
+
+    assert sql.startswith("DELETE FROM webhook_outbox")
+    assert "webhook_outbox.status != 'pending'" in sql
+    assert "webhook_outbox.next_attempt_at < '2025-06-01 00:00:00+00:00'" in sql
@@ -1,5 +1,6 @@
 import pytest
 from uuid import uuid4
+from sqlalchemy.dialects import postgresql
 from app.infrastructure.database.repository.webhook import webhook_repository
 from app.models.DB_tables.webhook import Webhook
 from app.utils.exceptions_base import AppException
@@ -156,4 +157,25 @@ async def test_delete_webhook_error():
 
     with pytest.raises(AppException) as exc:
         await webhook_repository.delete_webhook(BrokenSession(), uuid4(), uuid4())  # type: ignore[arg-type]
-    assert "Failed to delete webhook" in str(exc.value)
\ No newline at end of file
+    assert "Failed to delete webhook" in str(exc.value)
+
+def test_active_webhooks_with_secrets_query_joins_once():
+    sql = str(webhook_repository.build_active_webhooks_with_secrets_query(["alert_triggered"]).compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    ))
+    assert "LEFT OUTER JOIN user_secrets" in sql
+    assert "user_secrets.is_active IS true" in sql
+    assert "webhooks.event_type IN ('alert_triggered', '*')" in sql
+
+    assert " IN " not in str(webhook_repository.build_active_webhooks_with_secrets_query().compile(
+        dialect=postgresql.dialect()
+    ))
+
+
+@pytest.mark.asyncio
+async def test_get_active_webhooks_with_secrets_returns_pairs():
+    webhook = Webhook(event_type="*", enabled=True)
+    session = DummySession(execute_result=[(webhook, None)])
+
+    result = await webhook_repository.get_active_webhooks_with_secrets(session)  # type: ignore
+    assert result == [(webhook, None)]
@@ -1,5 +1,5 @@
 import pytest
-from app.utils.api_key_utils import generate_api_key
+from app.utils.api_key_utils import format_api_key, generate_api_key, generate_key_id, parse_api_key
 
 def test_generate_api_key_default_length():
     key = generate_api_key()
@@ -25,3 +25,15 @@ def test_generate_api_keys_are_random():
     key1 = generate_api_key()
     key2 = generate_api_key()
     assert key1 != key2
+
+
+def test_key_id_format_round_trip():
+    key_id = generate_key_id()
+    secret = generate_api_key()
+    assert len(key_id) == 16
+    assert parse_api_key(format_api_key(key_id, secret)) == (key_id, secret)
+
+
+@pytest.mark.parametrize("legacy", ["plain-legacy_key", "short.id", "0123456789abcdef."])
+def test_parse_api_key_falls_back_to_legacy(legacy):
+    assert parse_api_key(legacy) == (None, legacy)
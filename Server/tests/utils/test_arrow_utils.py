@@ -0,0 +1,55 @@
+import io
+from datetime import datetime, timezone
+from uuid import UUID
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from app.utils.arrow_utils import arrow_schema, encode_arrow_stream, encode_parquet, rows_to_record_batch, table_to_rows
+
+
+COLUMNS = ["id", "device_id", "timestamp", "co2", "temperature"]
+ROWS = [
+    (UUID(int=1), UUID(int=2), datetime(2025, 6, 1, tzinfo=timezone.utc), 410, 21.5),
+    (UUID(int=3), UUID(int=2), datetime(2025, 6, 2, tzinfo=timezone.utc), None, None),
+]
+
+
+async def _batches(*batches):
+    for batch in batches:
+        yield batch
+
+
+def test_arrow_schema_uses_column_types():
+    schema = arrow_schema(COLUMNS)
+    assert schema.field("id").type == pa.string()
+    assert schema.field("timestamp").type == pa.timestamp("us", tz="UTC")
+    assert schema.field("co2").type == pa.int64()
+    assert schema.field("temperature").type == pa.float64()
+
+
+def test_record_batch_round_trip():
+    batch = rows_to_record_batch(arrow_schema(COLUMNS), ROWS)
+    assert batch.num_rows == 2
+    rows = table_to_rows(batch, COLUMNS)
+    assert rows[0][0] == str(UUID(int=1))
+    assert rows[0][2:] == (datetime(2025, 6, 1, tzinfo=timezone.utc), 410, 21.5)
+    assert rows[1][3:] == (None, None)
+
+
+@pytest.mark.asyncio
+async def test_encode_parquet_writes_one_row_group_per_batch():
+    body = b"".join([c async for c in encode_parquet(COLUMNS, _batches(ROWS, ROWS[:1]))])
+    parquet = pq.ParquetFile(io.BytesIO(body))
+    assert parquet.num_row_groups == 2
+    assert parquet.read().column_names == COLUMNS
+    assert parquet.metadata.num_rows == 3
+
+
+@pytest.mark.asyncio
+async def test_encode_arrow_stream():
+    body = b"".join([c async for c in encode_arrow_stream(COLUMNS[:3], _batches([r[:3] for r in ROWS]))])
+    table = pa.ipc.open_stream(body).read_all()
+    assert table.column_names == COLUMNS[:3]
+    assert table.num_rows == 2
@@ -1,4 +1,8 @@
+import threading
+import time
 import pytest
+from app.utils import hashing
+from app.utils.config import settings
 from app.utils.hashing import hash_value, verify_value
 
 
@@ -33,3 +37,88 @@ def test_verify_value_with_empty_inputs_returns_false():
     assert verify_value("", "") is False
     assert verify_value("something", "") is False
     assert verify_value("", "something") is False
+
+
+@pytest.mark.asyncio
+async def test_async_variants_run_in_the_hash_pool(monkeypatch):
+    threads = []
+    real_verify = hashing.verify_value
+
+    def verify(plain, hashed):
+        threads.append(threading.current_thread().name)
+        return real_verify(plain, hashed)
+
+    monkeypatch.setattr(hashing, "verify_value", verify)
+    hashed = await hashing.hash_value_async("my_password")
+
+    assert await hashing.verify_value_async("my_password", hashed) is True
+    assert await hashing.verify_value_async("wrong_password", hashed) is False
+    assert await hashing.verify_value_async("", hashed) is False
+    assert threads and all(name.startswith("bcrypt") for name in threads)
+    hashing.shutdown_hash_executor()
+
+
+@pytest.mark.asyncio
+async def test_hash_value_async_rejects_empty_and_uses_configured_cost():
+    with pytest.raises(ValueError):
+        await hashing.hash_value_async("  ")
+    hashed = await hashing.hash_value_async("my_password")
+    assert hashing.pwd_context.identify(hashed) == "bcrypt"
+    assert hashed.split("$")[2] == f"{settings.BCRYPT_ROUNDS:02d}"
+
+
+@pytest.mark.asyncio
+async def test_hash_values_async_salts_each_value():
+    hashes = await hashing.hash_values_async(["Default1!"] * 3)
+
+    assert len(set(hashes)) == 3
+    assert all(verify_value("Default1!", h) for h in hashes)
+
+
+def test_bulk_hash_limit_keeps_a_worker_free(monkeypatch):
+    monkeypatch.setattr(hashing.settings, "HASH_WORKERS", 4)
+    monkeypatch.setattr(hashing.settings, "HASH_BULK_WORKERS", 0)
+    assert hashing.bulk_hash_limit() == 3
+
+    monkeypatch.setattr(hashing.settings, "HASH_BULK_WORKERS", 2)
+    assert hashing.bulk_hash_limit() == 2
+
+    monkeypatch.setattr(hashing.settings, "HASH_BULK_WORKERS", 8)
+    assert hashing.bulk_hash_limit() == 3
+
+
+def test_bulk_hash_limit_shares_a_single_worker(monkeypatch):
+    monkeypatch.setattr(hashing.settings, "HASH_WORKERS", 1)
+    for bulk in (0, 1, 4):
+        monkeypatch.setattr(hashing.settings, "HASH_BULK_WORKERS", bulk)
+        assert hashing.bulk_hash_limit() == 1
+
+
+@pytest.mark.asyncio
+async def test_bulk_hashing_leaves_workers_for_interactive_calls(monkeypatch):
+    monkeypatch.setattr(hashing.settings, "HASH_EXECUTOR", "thread")
+    monkeypatch.setattr(hashing.settings, "HASH_WORKERS", 3)
+    monkeypatch.setattr(hashing.settings, "HASH_BULK_WORKERS", 0)
+    hashing.shutdown_hash_executor()
+
+    lock = threading.Lock()
+    running, peak = 0, 0
+
+    def slow_hash(value):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.02)
+        with lock:
+            running -= 1
+        return value
+
+    monkeypatch.setattr(hashing, "hash_value", slow_hash)
+    try:
+        hashes = await hashing.hash_values_async([f"pw{i}" for i in range(8)])
+    finally:
+        hashing.shutdown_hash_executor()
+
+    assert hashes == [f"pw{i}" for i in range(8)]
+    assert peak == 2
@@ -0,0 +1,22 @@
+from app.utils.path_trie import PathPrefixTrie
+
+
+def test_longest_prefix_wins_at_segment_boundaries():
+    trie = PathPrefixTrie([("/api/v1/sensor", "sensor"), ("/api/v1/sensor/admin", "admin")])
+
+    assert trie.match("/api/v1/sensor") == "sensor"
+    assert trie.match("/api/v1/sensor/data/by-ranges") == "sensor"
+    assert trie.match("/api/v1/sensor/admin/") == "admin"
+    assert trie.match("/api/v1/sensor/admin/stats") == "admin"
+    assert trie.match("/api/v1/sensors") is None
+    assert trie.match("/api/v1") is None
+    assert trie.match("/") is None
+
+
+def test_root_prefix_and_overwrite():
+    trie = PathPrefixTrie([("/", "root")])
+    trie.insert("/a", "first")
+    trie.insert("/a/", "second")
+
+    assert trie.match("/anything") == "root"
+    assert trie.match("/a/b") == "second"